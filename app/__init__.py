@@ -1,5 +1,5 @@
-from flask import Flask
-from .extensions import db, migrate
+from flask import Flask, request, jsonify, flash, redirect
+from .extensions import db
 from .config import Config
 from flask_login import LoginManager
 
@@ -8,9 +8,52 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
-    # init extensions
-    db.init_app(app)
-    migrate.init_app(app, db)
+    # jsonify / tojson: Decimal and ISO dates natively, orjson when installed
+    from .json_provider import JSONProvider
+    app.json = JSONProvider(app)
+
+    # Compiled templates from TEMPLATE_CACHE_DIR (before anything builds app.jinja_env)
+    from .perf.startup import init_template_cache
+    init_template_cache(app)
+
+    # init extensions (engine profile: instrumented pool + per-role statement timeouts)
+    from .database.pool import init_db_pool
+    init_db_pool(app, db)
+    # Embedded SQLite: connection pragmas (WAL, ...) and `flask sqlite init|status|optimize`
+    from .database.dialect import init_sqlite, sqlite_cli
+    from .database import sequences  # noqa: F401  (register tables)
+    init_sqlite(app, db)
+    app.cli.add_command(sqlite_cli)
+    # `flask db ...`: Flask-Migrate (and Alembic) are only imported when a db command runs
+    from .database.migrations import db_cli
+    app.cli.add_command(db_cli)
+
+    # Per-request SQL / template timing (Server-Timing header, /admin/perf)
+    from .perf.instrumentation import init_perf
+    init_perf(app, db)
+
+    # Slow query log with EXPLAIN plans: `flask slow-queries top|show`
+    from .perf.slow_queries import init_slow_query_log
+    from .perf.cli import slow_queries_cli, traces_cli
+    init_slow_query_log(app, db)
+    app.cli.add_command(slow_queries_cli)
+
+    # Trace IDs on requests, jobs and log lines; spans to TRACE_LOG: `flask traces recent|show`
+    from .perf.tracing import init_tracing
+    init_tracing(app, db)
+    app.cli.add_command(traces_cli)
+
+    # Admin-only `?__profile=1` profiler (registered after init_perf so it can read the SQL counts)
+    from .perf.profiler import init_profiler
+    init_profiler(app)
+
+    # Prometheus-format `/metrics` (METRICS_TOKEN), summed across workers through METRICS_DIR
+    from .perf.metrics import init_metrics
+    init_metrics(app, db)
+
+    # Optional tracemalloc history for PDF builders and exports (/admin/memory)
+    from .perf.memory import init_memory_profiling
+    init_memory_profiling(app, db)
 
     # ==========================
     # Flask Login configuration
@@ -47,4 +90,49 @@ def create_app():
     from .auth.admin_routes import admin_bp
     app.register_blueprint(admin_bp, url_prefix="/admin")
 
+    # Background jobs (status/download endpoints + `flask worker`)
+    from .jobs import jobs_bp
+    from .jobs.worker import worker_command
+    app.register_blueprint(jobs_bp, url_prefix="/jobs")
+    app.cli.add_command(worker_command)
+
+    # Period close: reject edits dated inside closed months
+    from .periods.closing import PeriodClosedError
+    from .periods.guard import init_period_guard
+    from .periods import models as period_models  # noqa: F401  (register tables)
+    init_period_guard(db.session)
+
+    # Yearly ledger partitions (Postgres): `flask partitions ensure|list`
+    from .database.partitions import partitions_cli
+    app.cli.add_command(partitions_cli)
+
+    # Cold archive of old closed months: `flask archive run|restore|list`
+    from .archive.cli import archive_cli
+    from .archive import models as archive_models  # noqa: F401  (register tables)
+    app.cli.add_command(archive_cli)
+
+    # Fingerprinted script bundles: `asset_url()` in templates, /assets/, `flask assets build`
+    from .assets import init_assets
+    init_assets(app)
+
+    # Cold start: `flask startup imports|compile-templates|warm-up` (wsgi.py runs the warm-up itself)
+    from .perf.startup import startup_cli
+    app.cli.add_command(startup_cli)
+
+    # gzip / brotli for large HTML and JSON responses (COMPRESSION_*), outermost WSGI layer
+    from .compression import init_compression
+    init_compression(app)
+
+    # Synthetic data at production scale: `flask seed --scale N`
+    from .seed.cli import seed_command
+    app.cli.add_command(seed_command)
+
+    @app.errorhandler(PeriodClosedError)
+    def period_closed(e):
+        db.session.rollback()
+        if request.accept_mimetypes.best == "text/html":
+            flash(str(e), "danger")
+            return redirect(request.referrer or "/")
+        return jsonify({"success": False, "error": str(e)}), 409
+
     return app
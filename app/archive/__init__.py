@@ -0,0 +1,2 @@
+# app/archive/__init__.py
+"""Cold archive: closed, old ledger months moved out of the hot tables into compressed segments."""
@@ -0,0 +1,390 @@
+# app/archive/archiver.py
+"""
+Moving closed months out of the hot ledger tables and back.
+
+A month can be archived once it is closed (period close) and older than
+ARCHIVE_MIN_AGE_MONTHS. Archiving is sequential per venture, like closing:
+the archived months are always the oldest ones, so every hot row is newer than
+every archived row (construction activities, which stay editable, are the only
+rows left behind). Each (table, month) becomes one ArchiveSegment holding the
+rows as gzip-compressed JSON lines, either in the database or in a file under
+ARCHIVE_DIR with a manifest.json next to it. Child rows (purchase items) travel
+inside their parent's line, and so do the ids of rows elsewhere whose link to it
+was cleared (a wage's expense), so restoring the month links them again.
+"""
+import gzip
+import hashlib
+import json
+import os
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import current_app
+from sqlalchemy import select, func, update, insert, delete, bindparam
+
+from ..extensions import db
+from ..periods.closing import VENTURES, closed_through, earliest_data_month
+from .models import ArchiveSegment, ArchiveSegmentRef
+
+# model, date column, project/booking column (or None), [(child model, fk column, attribute)],
+# [(model, fk column)] rows elsewhere whose link is cleared, extra where-clause factory (or None),
+# column summed / column maxed into each project/booking's ArchiveSegmentRef (or None)
+ArchiveSpec = namedtuple(
+    "ArchiveSpec", "model date_column ref_column children detach where amount_column due_column",
+    defaults=(None, None),
+)
+
+ID_CHUNK = 500
+
+# Line key holding {"<table>.<fk column>": [ids of the rows whose link was cleared]}
+DETACHED_KEY = "_detached"
+
+
+def _specs():
+    """venture -> archive specs, in deletion order (restore runs in reverse)."""
+    from app.models.construction.models import ProjectExpense
+    from app.models.carenderia.models import CarenderiaTransaction, CarenderiaWage, CarenderiaPurchaseItem
+    from app.models.catering.models import CateringTransaction, CateringExpense, CateringWage, CateringPurchaseItem
+    return {
+        "construction": [
+            # Activities carry no amounts and stay editable after close, so they stay hot
+            ArchiveSpec(ProjectExpense, "expense_date", "contract_id", [], [],
+                        lambda: ProjectExpense.expense_type != "Activity"),
+        ],
+        "carenderia": [
+            ArchiveSpec(CarenderiaTransaction, "date", None,
+                        [(CarenderiaPurchaseItem, "trans_id", "purchase_items")], [], None),
+            ArchiveSpec(CarenderiaWage, "date", None, [], [], None),
+        ],
+        "catering": [
+            ArchiveSpec(CateringWage, "date", None, [], [], None),
+            # Booking payments: per-booking paid / due totals for balances without opening segments
+            ArchiveSpec(CateringTransaction, "date", "booking_id", [], [], None, "trans_amount", "booking_amount"),
+            ArchiveSpec(CateringExpense, "date", "booking_id",
+                        [(CateringPurchaseItem, "expense_id", "purchase_items")],
+                        [(CateringWage, "expense_id")], None),
+        ],
+    }
+
+
+def spec_for_table(table_name):
+    """(venture, spec) for an archivable table name; KeyError if the table is not archivable."""
+    for venture, specs in _specs().items():
+        for spec in specs:
+            if spec.model.__tablename__ == table_name:
+                return venture, spec
+    raise KeyError(table_name)
+
+
+def _next_month(d):
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+def _months_back(d, months):
+    index = d.year * 12 + (d.month - 1) - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+# ----------------------------
+# ENCODING
+# ----------------------------
+def _encode_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def column_decoders(model):
+    """column name -> function turning the JSON value back into the column's Python type."""
+    decoders = {}
+    for column in model.__table__.columns:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            continue
+        if python_type is Decimal:
+            decoders[column.key] = Decimal
+        elif python_type is datetime:
+            decoders[column.key] = datetime.fromisoformat
+        elif python_type is date:
+            decoders[column.key] = date.fromisoformat
+    return decoders
+
+
+def decode_row(model, data, decoders=None):
+    """JSON dict -> dict of column values with Decimal / date / datetime restored."""
+    decoders = decoders if decoders is not None else column_decoders(model)
+    return {k: (decoders[k](v) if v is not None and k in decoders else v) for k, v in data.items()}
+
+
+def _compress(lines):
+    raw = "".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines).encode("utf-8")
+    return gzip.compress(raw, compresslevel=9)
+
+
+def read_segment_lines(segment):
+    """Decompressed JSON lines of a segment (dicts), verifying the checksum."""
+    if segment.storage == "file":
+        with open(os.path.join(current_app.config["ARCHIVE_DIR"], segment.location), "rb") as fh:
+            blob = fh.read()
+    else:
+        blob = segment.payload
+    if hashlib.sha256(blob).hexdigest() != segment.checksum:
+        raise ValueError(f"Archive segment {segment.table_name} {segment.period:%Y-%m} failed its checksum.")
+    return [json.loads(line) for line in gzip.decompress(blob).decode("utf-8").splitlines() if line]
+
+
+# ----------------------------
+# STATE
+# ----------------------------
+def archived_through(venture):
+    """First day of the first month not archived for `venture`, or None if nothing is archived."""
+    last = db.session.query(func.max(ArchiveSegment.period)).filter(ArchiveSegment.venture == venture).scalar()
+    return _next_month(last) if last else None
+
+
+def archive_cutoff(venture, before=None, min_age_months=None):
+    """
+    Exclusive upper bound for archiving: the earliest of `before`, the venture's
+    closed watermark and today minus `min_age_months`. None when nothing is closed.
+    """
+    watermark = closed_through(venture)
+    if watermark is None:
+        return None
+    if min_age_months is None:
+        min_age_months = current_app.config["ARCHIVE_MIN_AGE_MONTHS"]
+    cutoff = min(watermark, _months_back(date.today().replace(day=1), min_age_months))
+    if before is not None:
+        cutoff = min(cutoff, before)
+    return cutoff
+
+
+def write_manifest():
+    """Rewrite ARCHIVE_DIR/manifest.json from the file-backed segments."""
+    archive_dir = current_app.config["ARCHIVE_DIR"]
+    segments = ArchiveSegment.query.filter_by(storage="file").order_by(
+        ArchiveSegment.venture, ArchiveSegment.table_name, ArchiveSegment.period
+    ).all()
+    manifest = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "segments": [
+            {
+                "venture": s.venture,
+                "table": s.table_name,
+                "period": s.period.strftime("%Y-%m"),
+                "rows": s.row_count,
+                "file": s.location,
+                "bytes": s.byte_size,
+                "sha256": s.checksum,
+                "archived_at": s.archived_at.isoformat() if s.archived_at else None,
+            }
+            for s in segments
+        ],
+    }
+    os.makedirs(archive_dir, exist_ok=True)
+    tmp_path = os.path.join(archive_dir, "manifest.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_path, os.path.join(archive_dir, "manifest.json"))
+
+
+# ----------------------------
+# ARCHIVE
+# ----------------------------
+def _chunks(ids):
+    for i in range(0, len(ids), ID_CHUNK):
+        yield ids[i:i + ID_CHUNK]
+
+
+def _month_filter(spec, start, end):
+    date_col = getattr(spec.model, spec.date_column)
+    clauses = [date_col >= start, date_col < end]
+    if spec.where is not None:
+        clauses.append(spec.where())
+    return clauses
+
+
+def _archive_table(venture, spec, month, to_files, archived_by, written):
+    """Archive one (table, month) into a segment and delete the hot rows. Returns the row count."""
+    model = spec.model
+    table = model.__table__
+    rows = db.session.execute(
+        select(table).where(*_month_filter(spec, month, _next_month(month))).order_by(table.c.id)
+    ).mappings().all()
+    if not rows:
+        return 0
+
+    ids = [r["id"] for r in rows]
+    lines = [{k: _encode_value(v) for k, v in r.items()} for r in rows]
+    by_id = {line["id"]: line for line in lines}
+    for child_model, fk_column, attr in spec.children:
+        child_table = child_model.__table__
+        for line in lines:
+            line[attr] = []
+        for chunk in _chunks(ids):
+            for child in db.session.execute(
+                select(child_table).where(child_table.c[fk_column].in_(chunk)).order_by(child_table.c.id)
+            ).mappings():
+                by_id[child[fk_column]][attr].append({k: _encode_value(v) for k, v in child.items()})
+    for other_model, fk_column in spec.detach:
+        other_table = other_model.__table__
+        key = f"{other_table.name}.{fk_column}"
+        for chunk in _chunks(ids):
+            for other_id, parent_id in db.session.execute(
+                select(other_table.c.id, other_table.c[fk_column]).where(other_table.c[fk_column].in_(chunk))
+            ):
+                by_id[parent_id].setdefault(DETACHED_KEY, {}).setdefault(key, []).append(other_id)
+
+    blob = _compress(lines)
+    segment = ArchiveSegment(
+        venture=venture,
+        table_name=table.name,
+        period=month,
+        row_count=len(rows),
+        byte_size=len(blob),
+        checksum=hashlib.sha256(blob).hexdigest(),
+        archived_by=archived_by,
+    )
+    if to_files:
+        location = os.path.join(venture, table.name, f"{month:%Y-%m}.jsonl.gz")
+        path = os.path.join(current_app.config["ARCHIVE_DIR"], location)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as fh:
+            fh.write(blob)
+        written.append(path)
+        segment.storage, segment.location = "file", location
+    else:
+        segment.storage, segment.payload = "db", blob
+    if spec.ref_column:
+        refs = {}
+        for r in rows:
+            if r[spec.ref_column] is None:
+                continue
+            ref = refs.setdefault(r[spec.ref_column], ArchiveSegmentRef(ref_id=r[spec.ref_column]))
+            if spec.amount_column:
+                ref.amount = (ref.amount or Decimal("0")) + Decimal(str(r[spec.amount_column] or 0))
+            if spec.due_column and r[spec.due_column] is not None:
+                due = Decimal(str(r[spec.due_column]))
+                ref.amount_due = due if ref.amount_due is None else max(ref.amount_due, due)
+        segment.refs = [refs[ref_id] for ref_id in sorted(refs)]
+    db.session.add(segment)
+
+    # Bulk deletes skip the session's closed-period guard: these months are closed and now archived
+    for chunk in _chunks(ids):
+        for other_model, fk_column in spec.detach:
+            db.session.execute(
+                update(other_model.__table__).where(other_model.__table__.c[fk_column].in_(chunk)).values({fk_column: None})
+            )
+        for child_model, fk_column, _attr in spec.children:
+            db.session.execute(delete(child_model.__table__).where(child_model.__table__.c[fk_column].in_(chunk)))
+        db.session.execute(delete(table).where(table.c.id.in_(chunk)))
+    return len(rows)
+
+
+def archive_month(venture, month, to_files=False, archived_by=None):
+    """Archive every table of `venture` for one month in a single transaction. Returns {table: rows}."""
+    written = []
+    counts = {}
+    try:
+        for spec in _specs()[venture]:
+            counts[spec.model.__tablename__] = _archive_table(venture, spec, month, to_files, archived_by, written)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        for path in written:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    if to_files:
+        write_manifest()
+    return counts
+
+
+def archive_through(venture, before=None, to_files=False, archived_by=None, min_age_months=None, dry_run=False):
+    """
+    Archive every eligible month of `venture` older than the cutoff (see archive_cutoff).
+    Returns [(month, {table: rows})]; with dry_run, the months that would be archived and empty counts.
+    """
+    if venture not in VENTURES:
+        raise ValueError(f"Unknown venture: {venture}")
+    cutoff = archive_cutoff(venture, before, min_age_months)
+    if cutoff is None:
+        return []
+    month = archived_through(venture) or earliest_data_month(venture)
+    if month is None:
+        return []
+
+    done = []
+    while month < cutoff:
+        done.append((month, {} if dry_run else archive_month(venture, month, to_files, archived_by)))
+        month = _next_month(month)
+    return done
+
+
+# ----------------------------
+# RESTORE
+# ----------------------------
+def restore_last(venture):
+    """Move the most recently archived month of `venture` back into the hot tables. Returns the month or None."""
+    if venture not in VENTURES:
+        raise ValueError(f"Unknown venture: {venture}")
+    last = db.session.query(func.max(ArchiveSegment.period)).filter(ArchiveSegment.venture == venture).scalar()
+    if last is None:
+        return None
+
+    segments = {s.table_name: s for s in ArchiveSegment.query.filter_by(venture=venture, period=last)}
+    files = []
+    try:
+        # Reverse of the deletion order, so parents exist before the rows that point at them
+        for spec in reversed(_specs()[venture]):
+            segment = segments.get(spec.model.__tablename__)
+            if segment is None:
+                continue
+            decoders = column_decoders(spec.model)
+            parents, children = [], {attr: [] for _m, _fk, attr in spec.children}
+            relinks = {(m, fk): [] for m, fk in spec.detach}
+            for line in read_segment_lines(segment):
+                for _child_model, _fk, attr in spec.children:
+                    children[attr].extend(line.pop(attr, []))
+                detached = line.pop(DETACHED_KEY, {})
+                for (other_model, fk_column), pairs in relinks.items():
+                    pairs.extend(
+                        {"_id": other_id, "_fk": line["id"]}
+                        for other_id in detached.get(f"{other_model.__tablename__}.{fk_column}", [])
+                    )
+                parents.append(decode_row(spec.model, line, decoders))
+            if parents:
+                db.session.execute(insert(spec.model.__table__), parents)
+            for child_model, _fk, attr in spec.children:
+                if children[attr]:
+                    child_decoders = column_decoders(child_model)
+                    db.session.execute(
+                        insert(child_model.__table__),
+                        [decode_row(child_model, c, child_decoders) for c in children[attr]],
+                    )
+            # Link rows that were detached when the month was archived back to their parent (if still there)
+            for (other_model, fk_column), pairs in relinks.items():
+                if pairs:
+                    other_table = other_model.__table__
+                    db.session.execute(
+                        update(other_table).where(other_table.c.id == bindparam("_id")).values({fk_column: bindparam("_fk")}),
+                        pairs,
+                    )
+            if segment.storage == "file":
+                files.append(os.path.join(current_app.config["ARCHIVE_DIR"], segment.location))
+        for segment in segments.values():
+            db.session.delete(segment)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for path in files:
+        if os.path.exists(path):
+            os.remove(path)
+    if files:
+        write_manifest()
+    return last
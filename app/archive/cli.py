@@ -0,0 +1,84 @@
+# app/archive/cli.py
+"""`flask archive run|restore|list`."""
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func
+
+from ..database.pool import set_db_role
+from ..extensions import db
+from ..periods.closing import VENTURES
+from ..utils.dates import month_bounds
+from .archiver import archive_through, restore_last
+from .models import ArchiveSegment
+
+
+@click.group("archive")
+def archive_cli():
+    """Move old, closed ledger months to the cold archive and back."""
+    set_db_role("cli")  # archiving a large month can outlast the web statement_timeout
+
+
+@archive_cli.command("run")
+@click.option("--venture", type=click.Choice(VENTURES + ("all",)), default="all", show_default=True)
+@click.option("--before", "before_month", default=None, help="Archive months before YYYY-MM (still capped by close + minimum age).")
+@click.option("--min-age-months", type=int, default=None, help="Override ARCHIVE_MIN_AGE_MONTHS.")
+@click.option("--to-files", is_flag=True, help="Write segments as .jsonl.gz files under ARCHIVE_DIR instead of the database.")
+@click.option("--dry-run", is_flag=True, help="Only list the months that would be archived.")
+@with_appcontext
+def run_command(venture, before_month, min_age_months, to_files, dry_run):
+    """Archive closed months older than the minimum age."""
+    before = None
+    if before_month:
+        try:
+            before, _ = month_bounds(before_month)
+        except ValueError:
+            raise click.BadParameter("Use YYYY-MM.", param_hint="--before")
+
+    for name in (VENTURES if venture == "all" else (venture,)):
+        done = archive_through(name, before, to_files=to_files, min_age_months=min_age_months, dry_run=dry_run)
+        if not done:
+            click.echo(f"{name}: nothing to archive.")
+            continue
+        for month, counts in done:
+            if dry_run:
+                click.echo(f"{name} {month:%Y-%m}: would archive")
+            else:
+                detail = ", ".join(f"{table}={rows}" for table, rows in counts.items())
+                click.echo(f"{name} {month:%Y-%m}: {detail}")
+
+
+@archive_cli.command("restore")
+@click.argument("venture", type=click.Choice(VENTURES))
+@with_appcontext
+def restore_command(venture):
+    """Move the most recently archived month of VENTURE back into the hot tables."""
+    month = restore_last(venture)
+    if month is None:
+        click.echo(f"{venture}: nothing archived.")
+    else:
+        click.echo(f"{venture}: restored {month:%Y-%m}.")
+
+
+@archive_cli.command("list")
+@with_appcontext
+def list_command():
+    """Summarise archived months per venture and table."""
+    rows = db.session.query(
+        ArchiveSegment.venture,
+        ArchiveSegment.table_name,
+        ArchiveSegment.storage,
+        func.min(ArchiveSegment.period),
+        func.max(ArchiveSegment.period),
+        func.sum(ArchiveSegment.row_count),
+        func.sum(ArchiveSegment.byte_size),
+    ).group_by(ArchiveSegment.venture, ArchiveSegment.table_name, ArchiveSegment.storage).order_by(
+        ArchiveSegment.venture, ArchiveSegment.table_name
+    ).all()
+    if not rows:
+        click.echo("Archive is empty.")
+        return
+    for venture, table, storage, first, last, row_count, size in rows:
+        click.echo(
+            f"{venture:<13} {table:<26} {storage:<5} {first:%Y-%m}..{last:%Y-%m} "
+            f"{row_count or 0:>9} rows {(size or 0) / 1024:>10.1f} KiB"
+        )
@@ -0,0 +1,49 @@
+# app/archive/models.py
+from datetime import datetime
+
+from ..extensions import db
+
+
+class ArchiveSegment(db.Model):
+    """
+    One archived (table, month): the rows, gzip-compressed as JSON lines, plus the manifest entry.
+    storage = "db":   the compressed rows are in `payload`
+    storage = "file": they live in `location` (relative to ARCHIVE_DIR) and `payload` is NULL
+    """
+    __tablename__ = "archive_segments"
+
+    id = db.Column(db.Integer, primary_key=True)
+    venture = db.Column(db.String(20), nullable=False)
+    table_name = db.Column(db.String(64), nullable=False)
+    period = db.Column(db.Date, nullable=False)  # first day of the month
+    row_count = db.Column(db.Integer, nullable=False, default=0)
+    storage = db.Column(db.String(10), nullable=False, default="db")
+    location = db.Column(db.String(500), nullable=True)
+    payload = db.Column(db.LargeBinary, nullable=True)
+    byte_size = db.Column(db.Integer, nullable=False, default=0)
+    checksum = db.Column(db.String(64), nullable=False)  # sha256 of the compressed bytes
+    archived_by = db.Column(db.BigInteger, db.ForeignKey("users.id"), nullable=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    refs = db.relationship("ArchiveSegmentRef", backref="segment", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        db.UniqueConstraint("table_name", "period", name="uix_archive_segment_table_period"),
+        db.Index("ix_archive_segments_venture_period", "venture", "period"),
+    )
+
+
+class ArchiveSegmentRef(db.Model):
+    """
+    Project / booking ids present in a segment, so per-project and per-booking reads open only the segments they need.
+    amount / amount_due: the ref's sum / max of the archive spec's amount_column / due_column in the segment
+    (NULL when the spec has none), so balances read them without opening the segment.
+    """
+    __tablename__ = "archive_segment_refs"
+
+    segment_id = db.Column(db.Integer, db.ForeignKey("archive_segments.id", ondelete="CASCADE"), primary_key=True)
+    ref_id = db.Column(db.BigInteger, primary_key=True)
+    amount = db.Column(db.Numeric(14, 2), nullable=True)
+    amount_due = db.Column(db.Numeric(14, 2), nullable=True)
+
+    __table_args__ = (db.Index("ix_archive_segment_refs_ref_id", "ref_id"),)
@@ -0,0 +1,119 @@
+# app/archive/reader.py
+"""
+Reading archived rows next to the hot tables.
+
+Reports call `archived_rows()` with the range (and project/booking) they are
+about to query. The manifest lookup is a single indexed query on a small table;
+segments are only fetched and decompressed when an archived month overlaps the
+range, so reports on recent months never touch the archive. Because archived
+months are always older than hot ones, archived rows can simply be placed
+before the hot rows in date-ordered results.
+"""
+from types import SimpleNamespace
+
+from sqlalchemy import func
+
+from ..extensions import db
+from .archiver import DETACHED_KEY, spec_for_table, read_segment_lines, decode_row, column_decoders
+from .models import ArchiveSegment, ArchiveSegmentRef
+
+
+class ArchivedRow(SimpleNamespace):
+    """A read-only row loaded from the archive; attribute names match the model's columns."""
+    archived = True
+
+
+def _segments(table_name, start, end, ref_id=None, ref_ids=None):
+    query = ArchiveSegment.query.filter(ArchiveSegment.table_name == table_name)
+    if start is not None:
+        # A segment covers [period, next month), so it overlaps when its month is start's month or later
+        query = query.filter(ArchiveSegment.period >= start.replace(day=1))
+    if end is not None:
+        query = query.filter(ArchiveSegment.period < end)
+    if ref_id is not None:
+        query = query.join(ArchiveSegmentRef).filter(ArchiveSegmentRef.ref_id == ref_id)
+    elif ref_ids is not None:
+        # A segment is read once even when it holds several of the refs
+        query = query.filter(ArchiveSegment.id.in_(
+            db.session.query(ArchiveSegmentRef.segment_id).filter(ArchiveSegmentRef.ref_id.in_(ref_ids))
+        ))
+    return query.order_by(ArchiveSegment.period.asc()).all()
+
+
+def _read_rows(model, start, end, filters, ref_id=None, ref_ids=None):
+    _venture, spec = spec_for_table(model.__tablename__)
+    segments = _segments(model.__tablename__, start, end, ref_id, ref_ids)
+    if not segments:
+        return spec, []
+    if ref_id is not None:
+        ref_ids = {ref_id}
+
+    decoders = column_decoders(model)
+    child_decoders = {attr: (child_model, column_decoders(child_model)) for child_model, _fk, attr in spec.children}
+    out = []
+    for segment in segments:
+        for line in read_segment_lines(segment):
+            children = {attr: line.pop(attr, []) for attr in child_decoders}
+            line.pop(DETACHED_KEY, None)
+            values = decode_row(model, line, decoders)
+            day = values.get(spec.date_column)
+            if start is not None and day < start or end is not None and day >= end:
+                continue
+            if ref_ids is not None and values.get(spec.ref_column) not in ref_ids:
+                continue
+            if any(values.get(k) != v for k, v in filters.items()):
+                continue
+            for attr, (child_model, cdec) in child_decoders.items():
+                values[attr] = [ArchivedRow(**decode_row(child_model, c, cdec)) for c in children[attr]]
+            out.append(ArchivedRow(**values))
+    out.sort(key=lambda r: (getattr(r, spec.date_column), r.id))
+    return spec, out
+
+
+def archived_rows(model, start=None, end=None, ref_id=None, **filters):
+    """
+    Archived rows of `model` dated in [start, end) (None = unbounded), optionally only those
+    for one project/booking (`ref_id`) and matching column == value `filters`.
+    Returns ArchivedRow objects ordered by date then id; child rows (purchase items) are lists
+    on the attribute named in the archive spec.
+    """
+    _spec, rows = _read_rows(model, start, end, filters, ref_id=ref_id)
+    return rows
+
+
+def archived_rows_by_ref(model, ref_ids):
+    """
+    {ref_id: archived rows of `model`} for several projects/bookings, opening each segment once.
+    Refs without archived rows are left out; rows are ordered as in archived_rows().
+    """
+    ref_ids = set(ref_ids)
+    if not ref_ids:
+        return {}
+    spec, rows = _read_rows(model, None, None, {}, ref_ids=ref_ids)
+    by_ref = {}
+    for row in rows:
+        by_ref.setdefault(getattr(row, spec.ref_column), []).append(row)
+    return by_ref
+
+
+def archived_ref_totals(model, ref_ids=None):
+    """
+    {ref_id: (amount, amount_due)} over the archived rows of `model`: the sum of the archive spec's
+    amount_column and the max of its due_column, from the totals recorded at archive time (no segment
+    is opened). Optionally only for `ref_ids`; refs without archived rows are left out.
+    """
+    query = db.session.query(
+        ArchiveSegmentRef.ref_id, func.sum(ArchiveSegmentRef.amount), func.max(ArchiveSegmentRef.amount_due)
+    ).join(ArchiveSegment).filter(ArchiveSegment.table_name == model.__tablename__)
+    if ref_ids is not None:
+        query = query.filter(ArchiveSegmentRef.ref_id.in_(ref_ids))
+    return {ref_id: (amount, amount_due) for ref_id, amount, amount_due in query.group_by(ArchiveSegmentRef.ref_id)}
+
+
+def archived_months(model):
+    """Months (first days) with archived rows of `model`, newest first — for month pickers."""
+    rows = db.session.query(ArchiveSegment.period).filter(
+        ArchiveSegment.table_name == model.__tablename__, ArchiveSegment.row_count > 0
+    ).order_by(ArchiveSegment.period.desc()).all()
+    return [period for (period,) in rows]
+
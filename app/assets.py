@@ -0,0 +1,173 @@
+# app/assets.py
+"""
+Fingerprinted, precompressed script bundles.
+
+`flask assets build` is a build/deploy step, run next to `flask startup compile-templates`.
+It copies every script under app/static/js into ASSETS_DIR as `<name>.<content hash>.js`.
+Each copy gets a `.gz` variant, and a `.br` one when the brotli package is installed.
+The step also writes manifest.json, which maps the source path ("js/catering/home.js") to
+the fingerprinted one.
+
+Templates link scripts with `asset_url("js/...")`:
+- with a manifest, it points at /assets/<fingerprinted name>. That URL is served with
+  `Cache-Control: public, max-age=31536000, immutable` and the best precompressed variant
+  the client accepts. A changed script gets a new name, so repeat visits never revalidate;
+- without a manifest (development, or no build step), it falls back to the plain
+  url_for("static", ...) URL, so nothing breaks.
+
+The big pages' inline scripts live in app/static/js/<module>/<page>.js, so HTML responses
+no longer carry them. The few URLs those scripts need come from a `#page-urls` JSON block.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+import click
+from flask import abort, current_app, request, send_file, url_for
+from flask.cli import with_appcontext
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+SOURCE_DIRS = ("js",)  # under app/static
+IMMUTABLE = "public, max-age=31536000, immutable"
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))  # preferred first
+
+
+def init_assets(app):
+    """`asset_url()` in templates, the /assets/ route and `flask assets ...`."""
+    app.add_url_rule("/assets/<path:filename>", "assets", serve_asset)
+    app.add_template_global(asset_url)
+    app.cli.add_command(assets_cli)
+
+
+# ----------------------------
+# MANIFEST
+# ----------------------------
+def load_manifest(app):
+    """{source path: fingerprinted name} from ASSETS_DIR, loaded once per process ({} when not built)."""
+    manifest = app.extensions.get("wvc_assets")
+    if manifest is None:
+        path = os.path.join(app.config["ASSETS_DIR"], MANIFEST)
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {}
+        except (OSError, ValueError):
+            logger.warning("assets: could not read %s; serving unfingerprinted scripts", path, exc_info=True)
+            manifest = {}
+        app.extensions["wvc_assets"] = manifest
+    return manifest
+
+
+def asset_url(filename):
+    """URL of a static script: its fingerprinted bundle when built, the plain static file otherwise."""
+    fingerprinted = load_manifest(current_app).get(filename)
+    if fingerprinted:
+        return url_for("assets", filename=fingerprinted)
+    return url_for("static", filename=filename)
+
+
+# ----------------------------
+# SERVING
+# ----------------------------
+def serve_asset(filename):
+    """A fingerprinted bundle, precompressed when the client accepts it; cacheable forever."""
+    directory = current_app.config["ASSETS_DIR"]
+    if filename not in load_manifest(current_app).values():
+        abort(404)
+    path = os.path.join(directory, filename)
+    accepted = request.accept_encodings
+    encoding = None
+    for name, suffix in _ENCODINGS:
+        if accepted[name] and os.path.exists(path + suffix):
+            encoding, path = name, path + suffix
+            break
+    if not os.path.exists(path):
+        abort(404)
+
+    response = send_file(path, mimetype="text/javascript", max_age=31536000, etag=True, conditional=True)
+    response.headers["Cache-Control"] = IMMUTABLE
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+# ----------------------------
+# BUILD
+# ----------------------------
+def _fingerprinted(relpath, content):
+    stem, ext = os.path.splitext(relpath)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def build_assets(app, clean=False):
+    """Write the fingerprinted bundles, their compressed variants and the manifest; returns the manifest.
+
+    Bundles from earlier builds are kept unless `clean` is set: workers still running the
+    previous release may keep linking to them until they are restarted.
+    """
+    static = app.static_folder
+    out = app.config["ASSETS_DIR"]
+    brotli = _brotli()
+    if clean and os.path.isdir(out):
+        shutil.rmtree(out)
+    manifest = {}
+    for source_dir in SOURCE_DIRS:
+        for root, _dirs, files in os.walk(os.path.join(static, source_dir)):
+            for name in sorted(files):
+                if not name.endswith(".js"):
+                    continue
+                relpath = os.path.relpath(os.path.join(root, name), static).replace(os.sep, "/")
+                with open(os.path.join(root, name), "rb") as f:
+                    content = f.read()
+                target = _fingerprinted(relpath, content)
+                path = os.path.join(out, target)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(content)
+                with open(path + ".gz", "wb") as f:
+                    f.write(gzip.compress(content, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    with open(path + ".br", "wb") as f:
+                        f.write(brotli.compress(content, quality=11))
+                manifest[relpath] = target
+    os.makedirs(out, exist_ok=True)
+    with open(os.path.join(out, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    app.extensions["wvc_assets"] = manifest
+    return manifest
+
+
+@click.group("assets")
+def assets_cli():
+    """Fingerprinted, precompressed script bundles."""
+
+
+@assets_cli.command("build")
+@click.option("--clean", is_flag=True, help="Delete earlier builds' bundles first.")
+@with_appcontext
+def build_command(clean):
+    """Build ASSETS_DIR from app/static/js (build / deploy step)."""
+    manifest = build_assets(current_app, clean=clean)
+    out = current_app.config["ASSETS_DIR"]
+    click.echo(f"{'bundle':<56}{'bytes':>9}{'gzip':>9}{'brotli':>9}")
+    for target in sorted(manifest.values()):
+        path = os.path.join(out, target)
+        sizes = [os.path.getsize(p) if os.path.exists(p) else None for p in (path, path + ".gz", path + ".br")]
+        click.echo(f"{target:<56}" + "".join(f"{s:>9}" if s is not None else f"{'-':>9}" for s in sizes))
+    if _brotli() is None:
+        click.echo("brotli is not installed: gzip variants only.")
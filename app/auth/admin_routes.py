@@ -1,8 +1,13 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app
 from ..extensions import db
 from ..models.user import User
 from werkzeug.security import check_password_hash
+from datetime import datetime
 from app.decorators.auth_decorators import login_required, role_required
+from app.periods.closing import VENTURES, closed_through, close_through, reopen_last, monthly_totals
+from app.database.pool import pool_snapshot
+from app.perf.instrumentation import perf_summary, reset_records
+from app.perf.memory import memory_history
 
 admin_bp = Blueprint("admin", __name__, template_folder="../../templates/admin")
 
@@ -87,6 +92,130 @@ def delete_user(user_id):
     return redirect(url_for("admin.manage_users"))
 
 
+# ----------------------------
+# PERIOD CLOSE
+# ----------------------------
+@admin_bp.route("/periods")
+@login_required
+@role_required("Admin")
+def manage_periods():
+    """Close months per venture; closed months show their snapshot totals."""
+    ventures = []
+    for venture in VENTURES:
+        watermark = closed_through(venture)
+        months = {}
+        for period, category, amount, entries in monthly_totals(venture):
+            months.setdefault(period, []).append({"category": category, "amount": amount, "entries": entries})
+        ventures.append({
+            "name": venture,
+            "open_from": watermark,
+            "months": sorted(months.items(), reverse=True),
+        })
+    return render_template("admin/periods.html", ventures=ventures)
+
+
+@admin_bp.route("/periods/close", methods=["POST"])
+@login_required
+@role_required("Admin")
+def close_period():
+    venture = request.form.get("venture", "")
+    month = request.form.get("month", "")
+    try:
+        datetime.strptime(month, "%Y-%m")
+    except ValueError:
+        flash("Invalid month format. Use YYYY-MM.", "danger")
+        return redirect(url_for("admin.manage_periods"))
+
+    try:
+        closed = close_through(venture, month, closed_by=session.get("user_id"))
+    except ValueError as e:
+        flash(str(e), "danger")
+        return redirect(url_for("admin.manage_periods"))
+
+    label = ", ".join(m.strftime("%b %Y") for m in closed)
+    flash(f"{venture.capitalize()}: closed {label}.", "success")
+    return redirect(url_for("admin.manage_periods"))
+
+
+@admin_bp.route("/periods/reopen", methods=["POST"])
+@login_required
+@role_required("Admin")
+def reopen_period():
+    venture = request.form.get("venture", "")
+    try:
+        reopened = reopen_last(venture)
+    except ValueError as e:
+        flash(str(e), "danger")
+        return redirect(url_for("admin.manage_periods"))
+
+    if reopened is None:
+        flash(f"{venture.capitalize()} has no closed months.", "warning")
+    else:
+        flash(f"{venture.capitalize()}: reopened {reopened.strftime('%B %Y')}.", "success")
+    return redirect(url_for("admin.manage_periods"))
+
+
+@admin_bp.route("/db-pool")
+@login_required
+@role_required("Admin")
+def db_pool_stats():
+    """Connection pool occupancy and checkout wait times for this worker process."""
+    payload = {
+        "success": True,
+        "profile": current_app.config["DB_ENGINE_PROFILE"],
+        "pool": pool_snapshot(db.engine),
+    }
+    replica = db.engines.get("replica")
+    if replica is not None:
+        payload["replica_profile"] = current_app.config["DB_REPLICA_ENGINE_PROFILE"]
+        payload["replica_pool"] = pool_snapshot(replica)
+    return jsonify(payload)
+
+
+@admin_bp.route("/perf")
+@login_required
+@role_required("Admin")
+def perf_overview():
+    """Slowest routes, per-route p50/p95 and repeated statements for this worker process (?format=json)."""
+    summary = perf_summary(limit=request.args.get("limit", 20, type=int))
+    if request.args.get("format") == "json":
+        return jsonify({"success": True, **summary})
+    return render_template(
+        "admin/perf.html",
+        summary=summary,
+        since=datetime.fromtimestamp(summary["since"]) if summary["since"] else None,
+        enabled=current_app.config["PERF_INSTRUMENTATION"],
+        threshold=current_app.config["PERF_REPEAT_THRESHOLD"],
+    )
+
+
+@admin_bp.route("/perf/reset", methods=["POST"])
+@login_required
+@role_required("Admin")
+def perf_reset():
+    reset_records()
+    flash("Performance samples cleared.", "success")
+    return redirect(url_for("admin.perf_overview"))
+
+
+@admin_bp.route("/memory")
+@login_required
+@role_required("Admin")
+def memory_overview():
+    """Recent memory-profiled exports from all processes (?format=json)."""
+    history = memory_history(current_app.config["MEMORY_PROFILE_LOG"], current_app.config["MEMORY_HISTORY_SIZE"])
+    if request.args.get("format") == "json":
+        return jsonify({"success": True, "enabled": current_app.config["MEMORY_PROFILING"], "runs": history})
+    for run in history:
+        run["at"] = datetime.fromtimestamp(run["at"])
+    return render_template(
+        "admin/memory.html",
+        runs=history,
+        enabled=current_app.config["MEMORY_PROFILING"],
+        budget_mb=current_app.config["MEMORY_BUDGET_MB"],
+    )
+
+
 @admin_bp.route("/go_home")
 @login_required
 def go_home():
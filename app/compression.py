@@ -0,0 +1,238 @@
+# app/compression.py
+"""
+Response compression (WSGI middleware).
+
+Large HTML pages and JSON reports compress 5-10x, which matters most on slow mobile links.
+`CompressionMiddleware` wraps `app.wsgi_app` and compresses a response when all of these
+hold:
+- the client accepts it: brotli when the `brotli` package is installed and the client
+  prefers it or ranks it equally, gzip otherwise;
+- the Content-Type is a text type (`DEFAULT_MIMETYPES`, or the COMPRESSION_MIMETYPES config
+  list when set). PDFs, XLSX and images are already compressed and pass through untouched;
+- the body has at least COMPRESSION_MIN_BYTES. Streamed bodies (generators, no
+  Content-Length) are read ahead only until they either reach the threshold or end;
+- the response is not already encoded, not a 204/206/304, and not marked `no-transform`.
+
+Buffered bodies are compressed in one go and get a new Content-Length. Streamed bodies
+(CSV exports) are compressed chunk by chunk with a sync flush, so the client keeps
+receiving rows as they are produced. Compressed responses get `Vary: Accept-Encoding`, and
+a strong ETag is weakened, because the bytes no longer match the entity it was computed for.
+
+Scripts under /assets/ are precompressed at build time (app/assets.py) and carry their own
+Content-Encoding, so this middleware leaves them alone.
+"""
+import gzip
+import zlib
+
+_SKIP_STATUS = ("204", "206", "304")
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def init_compression(app):
+    """Wrap app.wsgi_app when COMPRESSION is on."""
+    if not app.config.get("COMPRESSION", True):
+        return
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        min_bytes=app.config.get("COMPRESSION_MIN_BYTES", 1024),
+        mimetypes=app.config.get("COMPRESSION_MIMETYPES"),
+        gzip_level=app.config.get("COMPRESSION_GZIP_LEVEL", 6),
+        brotli_quality=app.config.get("COMPRESSION_BROTLI_QUALITY", 5),
+    )
+
+
+def _accepted(header):
+    """{coding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class _Gzip:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, brotli, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """gzip / brotli for compressible responses; see the module docstring for the rules."""
+
+    DEFAULT_MIMETYPES = (
+        "text/html", "text/plain", "text/css", "text/csv", "text/javascript", "application/javascript",
+        "application/json", "application/xml", "image/svg+xml",
+    )
+
+    def __init__(self, app, min_bytes=1024, mimetypes=None, gzip_level=6, brotli_quality=5):
+        self.app = app
+        self.min_bytes = min_bytes
+        self.mimetypes = frozenset(mimetypes or self.DEFAULT_MIMETYPES)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.brotli = _brotli()
+
+    def negotiate(self, header):
+        """'br', 'gzip' or None for an Accept-Encoding header."""
+        accepted = _accepted(header or "")
+        gzip_q = accepted.get("gzip", accepted.get("*", 0))
+        br_q = accepted.get("br", 0) if self.brotli is not None else 0
+        if br_q > 0 and br_q >= gzip_q:
+            return "br"
+        return "gzip" if gzip_q > 0 else None
+
+    def _compressor(self, encoding):
+        if encoding == "br":
+            return _Brotli(self.brotli, self.brotli_quality)
+        return _Gzip(self.gzip_level)
+
+    def _compressible(self, status, headers):
+        if status[:3] in _SKIP_STATUS:
+            return False
+        found = {name.lower(): value for name, value in headers}
+        if "content-encoding" in found or "no-transform" in found.get("cache-control", ""):
+            return False
+        if found.get("content-type", "").split(";", 1)[0].strip().lower() not in self.mimetypes:
+            return False
+        length = found.get("content-length")
+        return length is None or not length.isdigit() or int(length) >= self.min_bytes
+
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ.get("HTTP_ACCEPT_ENCODING"))
+        if encoding is None or environ.get("REQUEST_METHOD") == "HEAD":
+            return self.app(environ, start_response)
+
+        started = []  # [status, headers, exc_info] once the app has called start_response
+        written = []  # bytes passed to the legacy write() callable
+
+        def capture(status, headers, exc_info=None):
+            started[:] = [status, headers, exc_info]
+            return written.append
+
+        app_iter = self.app(environ, capture)
+        if started and not written and not self._compressible(started[0], started[1]):
+            start_response(*started)
+            return app_iter  # untouched, so wsgi.file_wrapper (sendfile) responses keep working
+        return self._respond(app_iter, started, written, encoding, start_response)
+
+    def _respond(self, app_iter, started, written, encoding, start_response):
+        chunks = iter(app_iter)
+        try:
+            # The app may call start_response lazily, on its first chunk
+            head = list(written)
+            while not started:
+                try:
+                    head.append(next(chunks))
+                except StopIteration:
+                    break
+            status, headers, exc_info = started
+
+            if not self._compressible(status, headers):
+                start_response(status, headers, exc_info)
+                yield from head
+                yield from chunks
+                return
+
+            # Read ahead until the threshold is reached or the body ends
+            size = sum(len(c) for c in head)
+            exhausted = False
+            while size < self.min_bytes:
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                head.append(chunk)
+                size += len(chunk)
+            if exhausted and size < self.min_bytes:
+                start_response(status, headers, exc_info)
+                yield from head
+                return
+
+            headers = self._encoded_headers(headers, encoding)
+            if exhausted or any(name.lower() == "content-length" for name, _ in headers):
+                body = b"".join(head) + b"".join(chunks)
+                if encoding == "gzip":
+                    data = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+                else:
+                    data = self.brotli.compress(body, quality=self.brotli_quality)
+                headers = [(n, v) for n, v in headers if n.lower() != "content-length"]
+                headers.append(("Content-Length", str(len(data))))
+                start_response(status, headers, exc_info)
+                yield data
+                return
+
+            compressor = self._compressor(encoding)
+            headers = [(n, v) for n, v in headers if n.lower() != "content-length"]
+            start_response(status, headers, exc_info)
+            data = compressor.compress(b"".join(head)) + compressor.flush()
+            if data:
+                yield data
+            for chunk in chunks:
+                data = compressor.compress(chunk) + compressor.flush()
+                if data:
+                    yield data
+            yield compressor.finish()
+        finally:
+            close = getattr(app_iter, "close", None)
+            if close is not None:
+                close()
+
+    @staticmethod
+    def _encoded_headers(headers, encoding):
+        out, vary = [], None
+        for name, value in headers:
+            lower = name.lower()
+            if lower == "accept-ranges":
+                continue
+            if lower == "etag" and not value.startswith("W/"):
+                value = "W/" + value
+            if lower == "vary":
+                vary = value
+                continue
+            out.append((name, value))
+        if vary is None:
+            out.append(("Vary", "Accept-Encoding"))
+        elif "accept-encoding" not in vary.lower() and vary.strip() != "*":
+            out.append(("Vary", f"{vary}, Accept-Encoding"))
+        else:
+            out.append(("Vary", vary))
+        out.append(("Content-Encoding", encoding))
+        return out
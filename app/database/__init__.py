@@ -0,0 +1,2 @@
+# app/database/__init__.py
+"""Database-level helpers that sit below the models (partition maintenance, ...)."""
@@ -0,0 +1,154 @@
+# app/database/dialect.py
+"""
+The Postgres / SQLite differences the write paths depend on, in one place.
+
+Production runs on Postgres. A single site (a carenderia branch on its own machine) can run
+on an embedded SQLite file instead, with the same code:
+
+- `BigIntegerPK`: BIGINT on Postgres, INTEGER on SQLite. Only `INTEGER PRIMARY KEY` is an
+  alias of SQLite's rowid, so a BIGINT primary key there never gets a value on insert.
+- `insert(model)`: an INSERT with `on_conflict_do_update` / `on_conflict_do_nothing` for the
+  primary engine's dialect. Postgres and SQLite (3.35+, for RETURNING) share that API.
+- `increment_counter()`: add one to a counter row, creating it on first use, and return the
+  new value in a single statement. The row stays locked until the transaction ends, so two
+  requests never get the same number (see app/database/sequences.py).
+- `init_sqlite()`: per-connection pragmas for SQLite engines (SQLITE_PRAGMAS): WAL, so
+  readers are not blocked by the writer; synchronous=NORMAL, which is durable across
+  application crashes under WAL; a busy timeout instead of immediate "database is locked"
+  errors; a larger page cache and memory-mapped reads; foreign keys enforced as on Postgres.
+
+The Alembic migrations are written for Postgres. An SQLite database is created from the
+models and stamped at the current revision by `flask sqlite init`.
+"""
+import os
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..extensions import db
+
+BigIntegerPK = db.BigInteger().with_variant(db.Integer(), "sqlite")
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def dialect_name(model=None):
+    """Dialect of the engine that writes `model` (the primary engine by default)."""
+    return db.session.get_bind(mapper=model).dialect.name
+
+
+def insert(model):
+    """Dialect INSERT for `model` that supports `on_conflict_do_update` and `returning`."""
+    name = dialect_name(model)
+    try:
+        return _INSERTS[name](model)
+    except KeyError:
+        raise NotImplementedError(f"No upsert support for the {name} dialect") from None
+
+
+def increment_counter(model, keys, column, start=1):
+    """
+    Add one to `model.<column>` in the row identified by `keys` ({primary key column: value})
+    and return the new value. A missing row is created holding `start` (an int or a scalar
+    subquery). Runs inside the caller's transaction.
+    """
+    counter = getattr(model, column)
+    stmt = (
+        insert(model)
+        .values(**keys, **{column: start})
+        .on_conflict_do_update(index_elements=list(keys), set_={column: counter + 1})
+        .returning(counter)
+    )
+    return int(db.session.execute(stmt).scalar_one())
+
+
+# ----------------------------
+# SQLITE CONNECTIONS
+# ----------------------------
+def _attach_sqlite_pragmas(engine, pragmas):
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def init_sqlite(app, db):
+    """Apply SQLITE_PRAGMAS to every new connection of the SQLite engines. Call after `init_db_pool`."""
+    pragmas = {name: value for name, value in (app.config.get("SQLITE_PRAGMAS") or {}).items() if value is not None}
+    if not pragmas:
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                _attach_sqlite_pragmas(engine, pragmas)
+
+
+def sqlite_status():
+    """Effective pragmas and file sizes of the primary SQLite database."""
+    with db.engine.connect() as conn:
+        status = {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in (*current_app.config["SQLITE_PRAGMAS"], "page_size", "page_count", "freelist_count")
+        }
+    path = db.engine.url.database
+    if path and path != ":memory:":
+        for label, suffix in (("database bytes", ""), ("wal bytes", "-wal")):
+            status[label] = os.path.getsize(path + suffix) if os.path.exists(path + suffix) else 0
+    return status
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+@click.group("sqlite")
+def sqlite_cli():
+    """Set up and maintain an embedded SQLite database."""
+
+
+def _require_sqlite():
+    if db.engine.dialect.name != "sqlite":
+        raise click.ClickException(f"DATABASE_URL is a {db.engine.dialect.name} database; these commands are for SQLite.")
+
+
+@sqlite_cli.command("init")
+@with_appcontext
+def init_command():
+    """Create the tables from the models and stamp the migrations as applied."""
+    _require_sqlite()
+    from flask_migrate import Migrate, stamp
+
+    db.create_all()
+    if "migrate" not in current_app.extensions:
+        Migrate(current_app, db)
+    stamp()
+    click.echo(f"Created {len(db.metadata.tables)} tables in {db.engine.url.database} and stamped the head revision.")
+
+
+@sqlite_cli.command("status")
+@with_appcontext
+def status_command():
+    """Show the effective pragmas and the database / WAL file sizes."""
+    _require_sqlite()
+    for name, value in sqlite_status().items():
+        click.echo(f"{name:<20} {value}")
+
+
+@sqlite_cli.command("optimize")
+@with_appcontext
+def optimize_command():
+    """Refresh planner statistics and fold the WAL back into the database file."""
+    _require_sqlite()
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA optimize")
+        busy, wal_pages, moved = conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()
+    if busy:
+        click.echo(f"Checkpoint incomplete: the database was busy ({moved}/{wal_pages} WAL pages copied).")
+    else:
+        click.echo("Statistics refreshed; WAL checkpointed and truncated.")
@@ -0,0 +1,30 @@
+# app/database/migrations.py
+"""
+`flask db ...` without importing Flask-Migrate on every start.
+
+Flask-Migrate pulls in Alembic (and Mako, Pygments) at import, about a quarter of
+create_app()'s import time, yet only the `flask db` commands use it. `db_cli` is a
+stand-in group registered under the same name: when a `flask db` command runs it
+initialises Flask-Migrate on the running app and hands the command line over to the real
+group, so `flask db upgrade` / `migrate` / `downgrade` behave exactly as before.
+"""
+import click
+from flask import current_app
+from flask.cli import ScriptInfo
+
+from ..extensions import db
+
+
+class LazyMigrateGroup(click.Group):
+    def make_context(self, info_name, args, parent=None, **extra):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as migrate_group
+
+        app = parent.ensure_object(ScriptInfo).load_app() if parent else current_app._get_current_object()
+        if "migrate" not in app.extensions:
+            Migrate(app, db)
+        # Flask-Migrate's own group parses the arguments (-d / -x) and runs the command
+        return migrate_group.make_context(info_name, args, parent=parent, **extra)
+
+
+db_cli = LazyMigrateGroup("db", help="Perform database migrations (Flask-Migrate).")
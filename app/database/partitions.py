@@ -0,0 +1,102 @@
+# app/database/partitions.py
+"""
+Yearly range partitions for the ledger tables (Postgres only).
+
+Migration f6a7b8c9d0e1 turns the tables below into `PARTITION BY RANGE (<date>)`
+tables with one partition per year plus a DEFAULT partition, and installs the
+`wvc_ensure_year_partitions()` function. `ensure_year_partitions()` calls it so
+the current and next year always have their own partition before rows arrive;
+the worker runs it once a day and `flask partitions ensure` runs it on demand.
+"""
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from ..extensions import db
+
+# table -> partition key (kept in sync with the migration)
+PARTITIONED_TABLES = {
+    "project_expenses": "expense_date",
+    "carenderia_transaction": "date",
+    "carenderia_wages": "date",
+    "catering_transaction": "date",
+    "catering_expense": "date",
+}
+
+
+def partitioning_available():
+    """True when running on Postgres with the partition maintenance function installed."""
+    if db.engine.dialect.name != "postgresql":
+        return False
+    found = db.session.execute(
+        text("SELECT to_regprocedure('wvc_ensure_year_partitions(integer)') IS NOT NULL")
+    ).scalar()
+    return bool(found)
+
+
+def ensure_year_partitions(years_ahead=1):
+    """Create any missing partitions from this year through `years_ahead` years ahead. Returns False if unsupported."""
+    if not partitioning_available():
+        return False
+    db.session.execute(text("SELECT wvc_ensure_year_partitions(:n)"), {"n": years_ahead})
+    db.session.commit()
+    return True
+
+
+def create_year_partitions(first_year, last_year):
+    """Create any missing partitions for first_year..last_year (backfills, seeding). Returns False if unsupported."""
+    if not partitioning_available():
+        return False
+    for table in PARTITIONED_TABLES:
+        for year in range(first_year, last_year + 1):
+            db.session.execute(text("SELECT wvc_create_year_partition(:t, :y)"), {"t": table, "y": year})
+    db.session.commit()
+    return True
+
+
+def list_partitions():
+    """(parent, partition, bounds, approximate rows) for every partitioned ledger table."""
+    if not partitioning_available():
+        return []
+    rows = db.session.execute(text("""
+        SELECT parent.relname, child.relname,
+               pg_get_expr(child.relpartbound, child.oid),
+               GREATEST(child.reltuples, 0)::bigint
+        FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_class child ON child.oid = i.inhrelid
+        WHERE parent.relname = ANY(:tables)
+        ORDER BY parent.relname, child.relname
+    """), {"tables": list(PARTITIONED_TABLES)}).all()
+    return rows
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+@click.group("partitions")
+def partitions_cli():
+    """Maintain the yearly ledger partitions (Postgres)."""
+
+
+@partitions_cli.command("ensure")
+@click.option("--years-ahead", type=int, default=1, show_default=True, help="Create partitions this many years past the current one.")
+@with_appcontext
+def ensure_command(years_ahead):
+    """Create missing partitions for the current and upcoming years."""
+    if ensure_year_partitions(years_ahead):
+        click.echo(f"Partitions ensured through {years_ahead} year(s) ahead.")
+    else:
+        click.echo("Partitioning is not enabled on this database (Postgres + migration f6a7b8c9d0e1 required).")
+
+
+@partitions_cli.command("list")
+@with_appcontext
+def list_command():
+    """Show each partition, its bounds and approximate row count."""
+    rows = list_partitions()
+    if not rows:
+        click.echo("No partitioned ledger tables found.")
+        return
+    for parent, child, bounds, approx_rows in rows:
+        click.echo(f"{parent:<24} {child:<32} {bounds:<60} ~{approx_rows} rows")
@@ -0,0 +1,225 @@
+# app/database/pool.py
+"""
+Connection pool instrumentation and per-role statement timeouts.
+
+`init_db_pool(app)` runs around `db.init_app()`:
+- the engine gets `InstrumentedQueuePool`, a QueuePool that records how long each
+  checkout waited for a connection (and how many timed out), plus the peak
+  number of connections in use;
+- a statement_timeout matching the process role (web / worker / cli) is applied,
+  per connection for session-safe profiles or with SET LOCAL at every BEGIN for
+  the transaction-pooler profile.
+
+`pool_snapshot()` returns the numbers; admins see them at /admin/db-pool.
+`reset_after_fork()` is for pre-forking servers (gunicorn.conf.py post_fork).
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+RECENT_WAITS = 2048
+
+_db_role = None
+
+
+def set_db_role(role):
+    """Declare what this process is (web / worker / cli); picks the statement timeout for new checkouts."""
+    global _db_role
+    _db_role = role
+
+
+def current_db_role():
+    return _db_role or os.environ.get("DB_ROLE") or "web"
+
+
+class PoolStats:
+    """Checkout wait telemetry for one process's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+            self.recent_waits = deque(maxlen=RECENT_WAITS)
+            self.peak_in_use = 0
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.recent_waits.append(seconds)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def record_in_use(self, in_use):
+        with self._lock:
+            self.peak_in_use = max(self.peak_in_use, in_use)
+
+    def snapshot(self):
+        with self._lock:
+            recent = sorted(self.recent_waits)
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_p50_ms": round(_quantile(recent, 0.50) * 1000, 3),
+                "wait_p95_ms": round(_quantile(recent, 0.95) * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_buckets": {
+                    **{f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS, self.wait_buckets)},
+                    "le_inf": self.wait_buckets[-1],
+                },
+                "peak_in_use": self.peak_in_use,
+            }
+
+    def counters(self):
+        """Raw totals for /metrics: checkouts, timeouts, wait sum (s) and per-bucket wait counts."""
+        with self._lock:
+            return self.checkouts, self.timeouts, self.wait_total, list(self.wait_buckets)
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+_pool_stats = {}
+_pool_stats_lock = threading.Lock()
+
+
+def stats_for(pool_name):
+    """Telemetry for a named pool ("primary", "replica")."""
+    with _pool_stats_lock:
+        return _pool_stats.setdefault(pool_name, PoolStats())
+
+
+def _pool_name(pool):
+    return getattr(pool, "logging_name", None) or "primary"
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout (including the wait for a free connection)."""
+
+    def _do_get(self):
+        stats = stats_for(_pool_name(self))
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        stats.record_wait(time.perf_counter() - started)
+        return conn
+
+
+# ----------------------------
+# STATEMENT TIMEOUTS
+# ----------------------------
+def _role_timeout_ms(app):
+    return int(app.config["DB_STATEMENT_TIMEOUTS_MS"].get(current_db_role(), 0))
+
+
+def _attach_session_timeout(engine, app):
+    """SET statement_timeout on the connection itself, re-applied only when the role's value changes."""
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        timeout = _role_timeout_ms(app)
+        if connection_record.info.get("statement_timeout") == timeout:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET statement_timeout = {timeout}")
+        finally:
+            cursor.close()
+        dbapi_connection.commit()  # so the pool's reset-on-return ROLLBACK cannot undo the SET
+        connection_record.info["statement_timeout"] = timeout
+
+
+def _attach_transaction_timeout(engine, app):
+    """SET LOCAL at every BEGIN: nothing leaks into the pooler's shared server connection."""
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        timeout = _role_timeout_ms(app)
+        if timeout:
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout}")
+
+
+def _attach_in_use_tracking(engine):
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        pool = engine.pool
+        if hasattr(pool, "checkedout"):
+            stats_for(_pool_name(pool)).record_in_use(pool.checkedout())
+
+
+# ----------------------------
+# SETUP / READOUT
+# ----------------------------
+def init_db_pool(app, db):
+    """Install the instrumented pool and timeout hooks. Call instead of `db.init_app(app)`."""
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    if "pool_size" in options:  # QueuePool-based profile (not in-memory SQLite)
+        options.setdefault("poolclass", InstrumentedQueuePool)
+    db.init_app(app)
+
+    from app.config import DB_ENGINE_PROFILES
+    profiles = {None: app.config["DB_ENGINE_PROFILE"], "replica": app.config.get("DB_REPLICA_ENGINE_PROFILE")}
+    with app.app_context():
+        for bind_key, engine in db.engines.items():
+            _attach_in_use_tracking(engine)
+            if engine.dialect.name != "postgresql":
+                continue
+            scope = DB_ENGINE_PROFILES[profiles.get(bind_key) or app.config["DB_ENGINE_PROFILE"]]["timeout_scope"]
+            if scope == "transaction":
+                _attach_transaction_timeout(engine, app)
+            else:
+                _attach_session_timeout(engine, app)
+
+
+def pool_snapshot(engine):
+    """Current pool occupancy plus the checkout wait telemetry."""
+    pool = engine.pool
+    occupancy = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            occupancy[name] = getattr(pool, name)()
+    occupancy["in_use"] = occupancy.get("checkedout", 0)
+    return {"role": current_db_role(), **occupancy, **stats_for(_pool_name(pool)).snapshot()}
+
+
+def reset_after_fork(app, db):
+    """
+    In a freshly forked worker: drop the pool state inherited from the master without closing
+    the parent's sockets (dispose(close=False)), and start the telemetry from zero.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    with _pool_stats_lock:
+        stats = list(_pool_stats.values())
+    for pool_stats in stats:
+        pool_stats.reset()
@@ -0,0 +1,75 @@
+# app/database/routing.py
+"""
+Read-only routing for report views.
+
+`RoutingSession` is the session class behind `db.session`. While a report holds
+the session (see `begin_read_only`), every query goes to the "replica" bind, or
+to the primary when no REPLICA_DATABASE_URL is configured or the replica cannot
+be reached. The transaction is REPEATABLE READ READ ONLY on Postgres, so a report
+that runs several queries sees a single consistent snapshot.
+"""
+import logging
+import time
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy.exc import OperationalError
+
+REPLICA_BIND = "replica"
+READ_ONLY_BIND_KEY = "read_only_bind"
+REPLICA_RETRY_SECONDS = 30
+
+log = logging.getLogger(__name__)
+
+# Monotonic time until which the replica is skipped after a failed connect
+_replica_down_until = 0.0
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that honours a per-session read-only bind."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        routed = self.info.get(READ_ONLY_BIND_KEY)
+        if bind is None and routed is not None:
+            return routed
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _read_only_options(engine):
+    if engine.dialect.name == "postgresql":
+        return {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+    return {}
+
+
+def begin_read_only(session, engines):
+    """
+    Start a read-only snapshot transaction on the replica (or the primary) for `session`.
+    Returns the bind name used: "replica" or "primary".
+    """
+    global _replica_down_until
+    # Isolation can only be chosen before the transaction starts
+    if session.in_transaction():
+        session.rollback()
+
+    replica = engines.get(REPLICA_BIND)
+    if replica is not None and time.monotonic() >= _replica_down_until:
+        session.info[READ_ONLY_BIND_KEY] = replica
+        try:
+            session.connection(execution_options=_read_only_options(replica))
+            return REPLICA_BIND
+        except OperationalError as e:
+            log.warning("Read replica unavailable, using primary for %ss: %s", REPLICA_RETRY_SECONDS, e.orig)
+            _replica_down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+            session.rollback()
+
+    primary = engines[None]
+    session.info[READ_ONLY_BIND_KEY] = primary
+    session.connection(execution_options=_read_only_options(primary))
+    return "primary"
+
+
+def end_read_only(session):
+    """Close the snapshot transaction and restore normal bind selection."""
+    try:
+        session.rollback()
+    finally:
+        session.info.pop(READ_ONLY_BIND_KEY, None)
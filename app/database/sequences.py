@@ -0,0 +1,40 @@
+# app/database/sequences.py
+"""
+Named counters for document numbers (PUR-<date>-### purchase references, ...).
+
+Each (name, key) pair, e.g. ("carenderia.purchase", "2025-06-01"), is one row of
+`sequence_counters`. `next_value()` increments it with a single upsert inside the caller's
+transaction: concurrent requests queue on the row lock (Postgres) or the write lock
+(SQLite) and each gets its own number. A rolled-back save gives its number back. Numbers
+are never reused after a delete, unlike counting the existing rows.
+
+`start` is the value of a counter's first row. Callers pass the number that counting the
+existing rows would have given, so dates that predate the counter continue where they are.
+"""
+from sqlalchemy import func, select
+
+from ..extensions import db
+from .dialect import increment_counter
+
+
+class SequenceCounter(db.Model):
+    __tablename__ = "sequence_counters"
+
+    name = db.Column(db.String(50), primary_key=True)
+    key = db.Column(db.String(50), primary_key=True)
+    last_value = db.Column(db.Integer, nullable=False, default=0)
+
+
+def next_value(name, key, start=1):
+    """Allocate the next value of counter (name, key). `start`: int or scalar subquery for a new counter."""
+    return increment_counter(SequenceCounter, {"name": name, "key": key}, "last_value", start=start)
+
+
+def peek_value(name, key, start=1):
+    """The value `next_value()` would return now, without allocating it."""
+    current = (
+        select(SequenceCounter.last_value + 1)
+        .where(SequenceCounter.name == name, SequenceCounter.key == key)
+        .scalar_subquery()
+    )
+    return int(db.session.execute(select(func.coalesce(current, start))).scalar_one())
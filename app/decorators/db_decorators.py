@@ -0,0 +1,32 @@
+# app/decorators/db_decorators.py
+from functools import wraps
+from flask import current_app, g
+
+from app.extensions import db
+from app.database.routing import begin_read_only, end_read_only
+
+
+# ----------------------------
+# READ-ONLY REPORT
+# ----------------------------
+def read_only_report(view):
+    """
+    Run a report view on the read replica (primary if none) inside a
+    REPEATABLE READ READ ONLY transaction. Put it below the auth decorators.
+    Streamed responses (CSV/XLSX exports) keep the snapshot until the download finishes.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        session = db.session()
+        g.report_bind = begin_read_only(session, db.engines)
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except BaseException:
+            end_read_only(session)
+            raise
+        if response.is_streamed:
+            response.call_on_close(lambda: end_read_only(session))
+        else:
+            end_read_only(session)
+        return response
+    return wrapper
@@ -0,0 +1,109 @@
+# app/exports.py
+"""Streaming CSV / XLSX exports.
+
+Rows come from `stream_rows()`, which runs the statement on a server-side
+cursor (psycopg2 named cursor on Postgres) and yields rows in chunks, so a
+large export never holds the whole result set in memory.
+
+- CSV is written a chunk at a time into a streamed response; the first bytes
+  go out as soon as the first chunk is fetched.
+- XLSX uses openpyxl's write-only workbook (rows are flushed to a temp file as
+  they are appended). An .xlsx is a zip, so it can only be sent once the
+  workbook is finalised; the finished file is then streamed from disk.
+"""
+import csv
+import io
+import tempfile
+
+from flask import Response, stream_with_context, jsonify, request
+
+from .extensions import db
+from .perf.memory import tracked_chunks
+from .perf.metrics import timed_chunks
+
+EXPORT_FORMATS = ("csv", "xlsx")
+CHUNK_ROWS = 1000
+CSV_FLUSH_BYTES = 64 * 1024
+FILE_CHUNK_BYTES = 64 * 1024
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def stream_rows(stmt, chunk_rows=CHUNK_ROWS):
+    """Execute a select on a server-side cursor and yield its rows as tuples."""
+    result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=chunk_rows))
+    try:
+        for partition in result.partitions():
+            for row in partition:
+                yield tuple(row)
+    finally:
+        result.close()
+
+
+def _attachment_headers(filename):
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+def _csv_chunks(header, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    buf.write("\ufeff")  # BOM so Excel opens the file as UTF-8
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buf.tell() >= CSV_FLUSH_BYTES:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate(0)
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def csv_response(filename, header, rows):
+    """Streamed CSV download. `rows` is any iterable of tuples (typically `stream_rows()`)."""
+    name = request.endpoint or "export.csv"
+    chunks = timed_chunks(name, "csv", tracked_chunks(name, _csv_chunks(header, rows), file=filename))
+    return Response(
+        stream_with_context(chunks),
+        mimetype="text/csv",
+        headers=_attachment_headers(filename),
+    )
+
+
+def _xlsx_chunks(sheet_title, header, rows):
+    from openpyxl import Workbook  # Local import: only needed for XLSX exports
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title[:31])
+    ws.append(list(header))
+    for row in rows:
+        ws.append(list(row))
+
+    with tempfile.TemporaryFile() as fh:
+        wb.save(fh)
+        fh.seek(0)
+        while True:
+            chunk = fh.read(FILE_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+
+def xlsx_response(filename, sheet_title, header, rows):
+    """Streamed XLSX download built with openpyxl's write-only mode."""
+    name = request.endpoint or "export.xlsx"
+    chunks = timed_chunks(name, "xlsx", tracked_chunks(name, _xlsx_chunks(sheet_title, header, rows), file=filename))
+    return Response(
+        stream_with_context(chunks),
+        mimetype=XLSX_MIMETYPE,
+        headers=_attachment_headers(filename),
+    )
+
+
+def export_response(fmt, basename, header, rows, sheet_title="Export"):
+    """Dispatch to the CSV or XLSX writer; 400 JSON for any other format."""
+    if fmt == "csv":
+        return csv_response(f"{basename}.csv", header, rows)
+    if fmt == "xlsx":
+        return xlsx_response(f"{basename}.xlsx", sheet_title, header, rows)
+    return jsonify({"success": False, "error": f"Unsupported export format: {fmt}"}), 400
@@ -1,6 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 
+from .database.routing import RoutingSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
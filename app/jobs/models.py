@@ -0,0 +1,40 @@
+# app/jobs/models.py
+from ..extensions import db
+from datetime import datetime
+
+
+class Job(db.Model):
+    """A queued background job (e.g. a PDF export) and the artifact it produced."""
+    __tablename__ = "jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    params = db.Column(db.JSON, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, done, failed
+    progress = db.Column(db.Integer, nullable=False, default=0)  # 0-100
+    error = db.Column(db.Text, nullable=True)
+
+    artifact_path = db.Column(db.String(500), nullable=True)
+    artifact_name = db.Column(db.String(255), nullable=True)
+    mimetype = db.Column(db.String(100), nullable=True)
+
+    created_by = db.Column(db.BigInteger, db.ForeignKey("users.id"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (db.Index("ix_jobs_status_created_at", "status", "created_at"),)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "progress": self.progress or 0,
+            "error": self.error,
+            "artifact_name": self.artifact_name,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
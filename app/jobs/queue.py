@@ -0,0 +1,168 @@
+# app/jobs/queue.py
+"""DB-backed job queue: handler registry, enqueue/claim, artifacts and cleanup.
+
+There is no external broker; the `jobs` table is the queue. Web requests call
+`enqueue_job()`, and `flask worker` claims rows with FOR UPDATE SKIP LOCKED so
+several worker processes never pick the same job.
+"""
+import os
+import shutil
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import update
+
+from ..extensions import db
+from ..perf.tracing import trace_root
+from .models import Job
+
+_handlers = {}
+_current_job_id = ContextVar("current_job_id", default=None)
+
+
+# ----------------------------
+# HANDLER REGISTRY
+# ----------------------------
+def job_handler(name):
+    """
+    Register a function as the handler for jobs called `name`.
+    The handler receives the job params as keyword arguments and must return
+    (data: bytes, filename: str, mimetype: str).
+    Usage:
+        @job_handler("catering.balance_sheet_pdf")
+        def build_pdf(month): ...
+    """
+    def decorator(fn):
+        _handlers[name] = fn
+        return fn
+    return decorator
+
+
+def get_job_handler(name):
+    return _handlers.get(name)
+
+
+def report_progress(percent):
+    """Update the progress of the job currently running in this process (no-op outside a job)."""
+    job_id = _current_job_id.get()
+    if job_id is None:
+        return
+    percent = max(0, min(100, int(percent)))
+    # Separate connection so the update is visible right away and never commits the handler's session
+    with db.engine.begin() as conn:
+        conn.execute(update(Job.__table__).where(Job.__table__.c.id == job_id).values(progress=percent))
+
+
+# ----------------------------
+# ENQUEUE / CLAIM
+# ----------------------------
+def enqueue_job(name, params=None, created_by=None):
+    """Insert a queued job and return it."""
+    if name not in _handlers:
+        raise ValueError(f"Unknown job: {name}")
+    job = Job(name=name, params=params or {}, status="queued", progress=0, created_by=created_by)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def claim_next_job():
+    """Atomically move the oldest queued job to running. Returns the job id or None."""
+    job = (
+        Job.query.filter(Job.status == "queued")
+        .order_by(Job.created_at.asc(), Job.id.asc())
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if not job:
+        db.session.rollback()
+        return None
+    job.status = "running"
+    job.progress = 0
+    job.started_at = datetime.utcnow()
+    db.session.commit()
+    return job.id
+
+
+def run_job(job_id):
+    """Execute a claimed job inside the current app context and store its artifact."""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return
+    handler = get_job_handler(job.name)
+    token = _current_job_id.set(job_id)
+    try:
+        if handler is None:
+            raise ValueError(f"No handler registered for job: {job.name}")
+        with trace_root(f"job {job.name}", job_id=job_id):
+            data, filename, mimetype = handler(**(job.params or {}))
+        path = _write_artifact(job_id, filename, data)
+        db.session.rollback()  # drop anything the handler left in the session
+        job = db.session.get(Job, job_id)
+        now = datetime.utcnow()
+        job.status = "done"
+        job.progress = 100
+        job.artifact_path = path
+        job.artifact_name = filename
+        job.mimetype = mimetype
+        job.finished_at = now
+        job.expires_at = now + timedelta(seconds=current_app.config["JOB_ARTIFACT_TTL_SECONDS"])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        mark_job_failed(job_id, str(e))
+    finally:
+        _current_job_id.reset(token)
+        db.session.remove()
+
+
+def mark_job_failed(job_id, error):
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return
+    now = datetime.utcnow()
+    job.status = "failed"
+    job.error = (error or "Unknown error")[:2000]
+    job.finished_at = now
+    job.expires_at = now + timedelta(seconds=current_app.config["JOB_ARTIFACT_TTL_SECONDS"])
+    db.session.commit()
+
+
+def requeue_stale_jobs():
+    """Put back jobs left 'running' by a worker that died. Returns how many were requeued."""
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config["JOB_STALE_AFTER_SECONDS"])
+    count = Job.query.filter(Job.status == "running", Job.started_at < cutoff).update(
+        {"status": "queued", "progress": 0, "started_at": None}, synchronize_session=False
+    )
+    db.session.commit()
+    return count
+
+
+# ----------------------------
+# ARTIFACTS
+# ----------------------------
+def _artifact_root():
+    return current_app.config["JOB_ARTIFACT_DIR"]
+
+
+def _write_artifact(job_id, filename, data):
+    job_dir = os.path.join(_artifact_root(), str(job_id))
+    os.makedirs(job_dir, exist_ok=True)
+    path = os.path.join(job_dir, os.path.basename(filename))
+    tmp_path = path + ".part"
+    with open(tmp_path, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def purge_expired_jobs():
+    """Delete finished jobs past their TTL together with their artifact directories."""
+    now = datetime.utcnow()
+    expired = Job.query.filter(Job.status.in_(["done", "failed"]), Job.expires_at < now).all()
+    for job in expired:
+        shutil.rmtree(os.path.join(_artifact_root(), str(job.id)), ignore_errors=True)
+        db.session.delete(job)
+    db.session.commit()
+    return len(expired)
@@ -0,0 +1,62 @@
+from flask import jsonify, session, send_file, url_for, abort, current_app
+from datetime import datetime
+import os
+
+from app.decorators.auth_decorators import login_required
+from ..extensions import db
+from . import jobs_bp
+from .models import Job
+from .queue import enqueue_job
+
+
+def _get_own_job_or_404(job_id):
+    """Jobs are visible to the user who queued them (and to Admins)."""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        abort(404)
+    is_admin = (session.get("role") or "").lower() == "admin"
+    if not is_admin and job.created_by != session.get("user_id"):
+        abort(404)
+    return job
+
+
+def job_response(job, status_code=200):
+    """JSON payload used by the enqueue and status endpoints."""
+    payload = job.to_dict()
+    payload["status_url"] = url_for("jobs.job_status", job_id=job.id)
+    payload["download_url"] = url_for("jobs.download_artifact", job_id=job.id) if job.status == "done" else None
+    return jsonify({"success": True, "job": payload}), status_code
+
+
+def enqueue_export(name, params):
+    """Queue an export for the current user, or 404 when background exports are disabled."""
+    if not current_app.config.get("EXPORT_JOBS_ENABLED"):
+        return jsonify({"success": False, "error": "Background exports are disabled."}), 404
+    job = enqueue_job(name, params, created_by=session.get("user_id"))
+    return job_response(job, 202)
+
+
+@jobs_bp.route("/<int:job_id>")
+@login_required
+def job_status(job_id):
+    """Poll a job's status and progress."""
+    job = _get_own_job_or_404(job_id)
+    return job_response(job)
+
+
+@jobs_bp.route("/<int:job_id>/download")
+@login_required
+def download_artifact(job_id):
+    """Download the artifact of a finished job."""
+    job = _get_own_job_or_404(job_id)
+    if job.status != "done":
+        return jsonify({"success": False, "error": f"Job is {job.status}."}), 409
+    expired = job.expires_at is not None and job.expires_at < datetime.utcnow()
+    if expired or not job.artifact_path or not os.path.exists(job.artifact_path):
+        return jsonify({"success": False, "error": "Export has expired. Please export again."}), 410
+    return send_file(
+        job.artifact_path,
+        mimetype=job.mimetype or "application/octet-stream",
+        as_attachment=True,
+        download_name=job.artifact_name
+    )
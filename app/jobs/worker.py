@@ -0,0 +1,91 @@
+# app/jobs/worker.py
+"""`flask worker`: claims queued jobs and runs them in a process pool."""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from ..database.partitions import ensure_year_partitions
+from ..database.pool import set_db_role
+from ..extensions import db
+from .queue import claim_next_job, run_job, mark_job_failed, requeue_stale_jobs, purge_expired_jobs
+
+CLEANUP_INTERVAL_SECONDS = 60
+PARTITION_CHECK_INTERVAL_SECONDS = 24 * 60 * 60
+
+# App instance owned by each pool process (built once in the initializer)
+_child_app = None
+
+
+def _init_child():
+    global _child_app
+    from app import create_app
+    set_db_role("worker")
+    _child_app = create_app()
+
+
+def _run_in_child(job_id):
+    with _child_app.app_context():
+        run_job(job_id)
+
+
+@click.command("worker")
+@click.option("--processes", type=int, default=None, help="Pool size (default: JOB_WORKER_PROCESSES).")
+@click.option("--once", is_flag=True, help="Drain the queue once and exit.")
+@with_appcontext
+def worker_command(processes, once):
+    """Run queued background jobs (exports) until interrupted."""
+    set_db_role("worker")
+    processes = processes or current_app.config["JOB_WORKER_PROCESSES"]
+    poll_interval = current_app.config["JOB_POLL_INTERVAL_SECONDS"]
+
+    requeued = requeue_stale_jobs()
+    if requeued:
+        click.echo(f"Requeued {requeued} stale job(s).")
+    click.echo(f"Worker started with {processes} process(es).")
+
+    # spawn (not fork): children build their own app and DB pool instead of sharing the parent's sockets
+    ctx = multiprocessing.get_context("spawn")
+    in_flight = {}  # future -> job_id
+    last_cleanup = 0.0
+    last_partition_check = 0.0
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=ctx, initializer=_init_child) as pool:
+        try:
+            while True:
+                for future in [f for f in in_flight if f.done()]:
+                    job_id = in_flight.pop(future)
+                    exc = future.exception()
+                    if exc is not None:
+                        # The child died before it could record the failure itself
+                        mark_job_failed(job_id, f"Worker process error: {exc}")
+
+                while len(in_flight) < processes:
+                    job_id = claim_next_job()
+                    if job_id is None:
+                        break
+                    in_flight[pool.submit(_run_in_child, job_id)] = job_id
+
+                if time.monotonic() - last_cleanup >= CLEANUP_INTERVAL_SECONDS:
+                    purged = purge_expired_jobs()
+                    if purged:
+                        click.echo(f"Purged {purged} expired job(s).")
+                    last_cleanup = time.monotonic()
+
+                if time.monotonic() - last_partition_check >= PARTITION_CHECK_INTERVAL_SECONDS:
+                    # Next year's ledger partitions exist well before the first entry lands in them
+                    try:
+                        ensure_year_partitions()
+                    except Exception as e:
+                        db.session.rollback()
+                        click.echo(f"Partition check failed: {e}")
+                    last_partition_check = time.monotonic()
+
+                if once and not in_flight:
+                    break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            click.echo("Worker stopping; waiting for running jobs to finish...")
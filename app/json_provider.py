@@ -0,0 +1,78 @@
+# app/json_provider.py
+"""
+JSON provider for `jsonify`, `tojson` and JSON responses.
+
+Views can return query values as they come from the database. The provider serializes:
+- `Decimal` (Numeric columns) as a JSON number;
+- `date`, `datetime` and `time` as ISO 8601 strings ("2025-06-01", "2025-06-01T08:30:00",
+  "08:30:00"). Flask's default uses HTTP dates for these, and the front-end never expected
+  those.
+
+orjson is used when it is installed and JSON_ORJSON is on (the default); it is several times
+faster than the json module on large month payloads. Dates and times are native to orjson,
+and Decimals go through `_default`. A payload orjson cannot handle (integers beyond 64 bits,
+unusual dump options) falls back to the stdlib encoder, which produces equivalent JSON.
+Parsing request bodies stays on the stdlib (`loads` is not overridden).
+
+    python benchmarks/json_serialization.py     # stdlib vs orjson on large month payloads
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+
+def _orjson():
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def _default(o):
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, (date, datetime, time)):  # stdlib path only; orjson serializes these itself
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class JSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with Decimal / ISO date support and an orjson fast path."""
+
+    default = staticmethod(_default)
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.orjson = _orjson() if app.config.get("JSON_ORJSON", True) else None
+
+    def _orjson_dumps(self, obj, indent=False):
+        orjson = self.orjson
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        # Only options orjson can honour take the fast path; its output is always compact
+        if self.orjson is not None and set(kwargs) <= {"indent", "separators"} and kwargs.get("indent") in (None, 2):
+            try:
+                return self._orjson_dumps(obj, indent=kwargs.get("indent") == 2).decode()
+            except TypeError:  # orjson.JSONEncodeError is a TypeError
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if self.orjson is not None:
+            try:
+                data = self._orjson_dumps(obj, indent=pretty)
+            except TypeError:  # orjson.JSONEncodeError is a TypeError
+                pass
+            else:
+                return self._app.response_class(data + b"\n", mimetype=self.mimetype)
+        return super().response(obj)
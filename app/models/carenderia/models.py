@@ -1,5 +1,6 @@
 # app/models/carenderia/models.py
 from ...extensions import db
+from ...database.dialect import BigIntegerPK
 from datetime import datetime
 
 
@@ -11,7 +12,7 @@ class MenuItem(db.Model):
 
 class CarenderiaDailySummary(db.Model):
     __tablename__ = "carenderia_daily_summary"
-    id = db.Column(db.BigInteger, primary_key=True)
+    id = db.Column(BigIntegerPK, primary_key=True)
     venture_id = db.Column(db.SmallInteger)
     summary_date = db.Column(db.Date, nullable=False)
     total_sales = db.Column(db.Numeric(14,2), default=0)
@@ -25,7 +26,7 @@ class CarenderiaDailySummary(db.Model):
 
 class CarenderiaExpense(db.Model):
     __tablename__ = "carenderia_expenses"
-    id = db.Column(db.BigInteger, primary_key=True)
+    id = db.Column(BigIntegerPK, primary_key=True)
     summary_id = db.Column(db.BigInteger, db.ForeignKey("carenderia_daily_summary.id"), nullable=False)
     account_id = db.Column(db.BigInteger)
     amount = db.Column(db.Numeric(14,2), nullable=False)
@@ -37,7 +38,9 @@ class CarenderiaExpense(db.Model):
 class CarenderiaWage(db.Model):
     __tablename__ = "carenderia_wages"
 
-    id = db.Column(db.BigInteger, primary_key=True)
+    __table_args__ = (db.Index("ix_carenderia_wages_date", "date"),)
+
+    id = db.Column(BigIntegerPK, primary_key=True)
     emp_id = db.Column(db.BigInteger, nullable=False)
     emp_name = db.Column(db.String(150), nullable=False)
     dept_id = db.Column(db.BigInteger, nullable=True)
@@ -51,7 +54,9 @@ class CarenderiaWage(db.Model):
 class CarenderiaPurchaseItem(db.Model):
     __tablename__ = "carenderia_purchase_items"
 
-    id = db.Column(db.BigInteger, primary_key=True)
+    __table_args__ = (db.Index("ix_carenderia_purchase_items_trans_id", "trans_id"),)
+
+    id = db.Column(BigIntegerPK, primary_key=True)
     trans_id = db.Column(db.BigInteger, db.ForeignKey("carenderia_transaction.id", ondelete="CASCADE"), nullable=False)
     description = db.Column(db.String(255), nullable=True)
     qty = db.Column(db.Numeric(12, 3), default=0)
@@ -63,7 +68,9 @@ class CarenderiaPurchaseItem(db.Model):
 class CarenderiaTransaction(db.Model):
     __tablename__ = "carenderia_transaction"
 
-    id = db.Column(db.BigInteger, primary_key=True)
+    __table_args__ = (db.Index("ix_carenderia_transaction_date", "date"),)
+
+    id = db.Column(BigIntegerPK, primary_key=True)
     date = db.Column(db.Date, nullable=False)
     trans_type = db.Column(db.String(100), nullable=False)
     amount = db.Column(db.Numeric(14, 2), nullable=False)
@@ -1,12 +1,27 @@
 from flask import render_template, redirect, url_for, session, request, jsonify, flash, send_file, current_app
 from app.decorators.auth_decorators import login_required, department_required, role_required
+from app.decorators.db_decorators import read_only_report
 from app.models.core import Employee, Department
 from app.extensions import db
 from sqlalchemy.orm import joinedload
 from . import carenderia_bp
 from .models import CarenderiaWage, CarenderiaTransaction, CarenderiaDailyExpense, CarenderiaPurchaseItem
-from datetime import datetime, date
-from sqlalchemy import extract, func
+from datetime import datetime, date, timedelta
+from sqlalchemy import func
+from app.jobs.queue import job_handler, report_progress
+from app.perf.memory import memory_profiled
+from app.perf.metrics import export_timed
+from app.perf.tracing import traced, trace_phase
+from app.jobs.routes import enqueue_export
+from app.exports import export_response, stream_rows
+from app.periods.closing import PeriodClosedError, is_closed
+from app.periods.models import PeriodSnapshot
+from app.utils.dates import month_bounds
+from app.utils.columnar import columnar_table, wants_columnar
+from app.database.sequences import next_value, peek_value
+from app.archive.reader import archived_rows
+from itertools import chain
+from sqlalchemy import select, case
 import calendar
 import io
 
@@ -226,21 +241,36 @@ def save_wages():
 
         db.session.commit()
         return jsonify({"success": True})
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-def _next_purchase_reference_for_date(parsed_date, same_date_count=0):
-    """Return next PUR-(date)-### for the given date. same_date_count = how many Purchases for this date we're adding in current batch."""
-    existing = CarenderiaTransaction.query.filter(
+PURCHASE_SEQUENCE = "carenderia.purchase"
+
+
+def _first_purchase_seq(parsed_date):
+    """Start of a date's counter: one past the purchases already saved (dates from before the counter)."""
+    return select(func.count() + 1).where(
         CarenderiaTransaction.date == parsed_date,
         CarenderiaTransaction.trans_type == "Purchases"
-    ).count()
-    seq = existing + same_date_count + 1
+    ).scalar_subquery()
+
+
+def _purchase_reference(parsed_date, seq):
     return f"PUR-{parsed_date.strftime('%Y-%m-%d')}-{seq:03d}"
 
 
+@traced("reference.allocate")
+def _next_purchase_reference_for_date(parsed_date):
+    """Allocate the next PUR-(date)-### for the given date; the number is released if the transaction rolls back."""
+    seq = next_value(PURCHASE_SEQUENCE, parsed_date.isoformat(), start=_first_purchase_seq(parsed_date))
+    return _purchase_reference(parsed_date, seq)
+
+
 @carenderia_bp.route("/next-purchase-reference")
 @login_required
 @department_required("Carenderia", "Corporate")
@@ -254,7 +284,8 @@ def next_purchase_reference():
             parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
         except ValueError:
             parsed_date = date.today()
-    ref = _next_purchase_reference_for_date(parsed_date, same_date_count=0)
+    seq = peek_value(PURCHASE_SEQUENCE, parsed_date.isoformat(), start=_first_purchase_seq(parsed_date))
+    ref = _purchase_reference(parsed_date, seq)
     return jsonify({"success": True, "referenceNumber": ref})
 
 
@@ -270,8 +301,6 @@ def save_transactions():
         return jsonify({"success": False, "error": "No transactions provided."}), 400
 
     try:
-        # Track how many Purchases we've added per date in this batch (for auto-increment)
-        purchases_count_per_date = {}
         for trans in transactions:
             trans_date = trans.get("date")
             trans_type = trans.get("transactionType")
@@ -286,9 +315,7 @@ def save_transactions():
                 continue
 
             if trans_type == "Purchases":
-                already_in_batch = purchases_count_per_date.get(parsed_date, 0)
-                reference_number = _next_purchase_reference_for_date(parsed_date, same_date_count=already_in_batch)
-                purchases_count_per_date[parsed_date] = already_in_batch + 1
+                reference_number = _next_purchase_reference_for_date(parsed_date)
             else:
                 reference_number = None
 
@@ -315,6 +342,9 @@ def save_transactions():
 
         db.session.commit()
         return jsonify({"success": True, "message": f"Successfully saved {len(transactions)} transaction(s)."})
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -418,6 +448,7 @@ def view_transactions():
 
 @carenderia_bp.route("/get-transactions-by-date")
 @login_required
+@read_only_report
 def get_transactions_by_date():
     """Get transactions for a specific date. Accessible to Admin role or Corporate department."""
     user_role = (session.get("role") or "").lower()
@@ -435,41 +466,64 @@ def get_transactions_by_date():
     except ValueError:
         return jsonify({"success": False, "error": "Invalid date format."}), 400
     
-    transactions = CarenderiaTransaction.query.filter_by(date=parsed_date)\
-                                              .order_by(CarenderiaTransaction.id.asc()).all()
+    day_after = parsed_date + timedelta(days=1)
+    transactions = archived_rows(CarenderiaTransaction, parsed_date, day_after) + \
+        CarenderiaTransaction.query.filter_by(date=parsed_date).order_by(CarenderiaTransaction.id.asc()).all()
 
     def trans_to_json(t):
         out = {
             "id": t.id,
-            "date": t.date.isoformat() if t.date else None,
+            "date": t.date,
             "trans_type": t.trans_type,
-            "amount": float(t.amount) if t.amount else 0,
+            "amount": t.amount or 0,
             "reference_number": t.reference_number or None
         }
         if t.trans_type == "Purchases":
-            items = CarenderiaPurchaseItem.query.filter_by(trans_id=t.id).order_by(CarenderiaPurchaseItem.id.asc()).all()
+            if getattr(t, "archived", False):
+                items = t.purchase_items
+            else:
+                items = CarenderiaPurchaseItem.query.filter_by(trans_id=t.id).order_by(CarenderiaPurchaseItem.id.asc()).all()
             out["items"] = [
                 {
                     "description": it.description or "",
-                    "qty": float(it.qty) if it.qty else 0,
+                    "qty": it.qty or 0,
                     "unit": it.unit or "",
-                    "unit_price": float(it.unit_price) if it.unit_price else 0,
-                    "amount": float(it.amount) if it.amount else 0
+                    "unit_price": it.unit_price or 0,
+                    "amount": it.amount or 0
                 }
                 for it in items
             ]
         return out
 
-    wages = CarenderiaWage.query.filter_by(date=parsed_date).order_by(CarenderiaWage.id.asc()).all()
+    wages = archived_rows(CarenderiaWage, parsed_date, day_after) + \
+        CarenderiaWage.query.filter_by(date=parsed_date).order_by(CarenderiaWage.id.asc()).all()
     wages_list = [
         {
             "emp_name": w.emp_name or "",
-            "emp_rate": float(w.emp_rate) if w.emp_rate else 0,
-            "amount": float(w.amount) if w.amount else 0
+            "emp_rate": w.emp_rate or 0,
+            "amount": w.amount or 0
         }
         for w in wages
     ]
 
+    if wants_columnar():
+        # Purchase items become their own table, keyed by trans_id
+        rows = [trans_to_json(t) for t in transactions]
+        return jsonify({
+            "success": True,
+            "format": "columnar",
+            "transactions": columnar_table(rows, [
+                ("id", "integer"), ("date", "date"), ("trans_type", "string"),
+                ("amount", "number"), ("reference_number", "string"),
+            ]),
+            "items": columnar_table(
+                ({"trans_id": row["id"], **item} for row in rows for item in row.get("items", [])),
+                [("trans_id", "integer"), ("description", "string"), ("qty", "number"),
+                 ("unit", "string"), ("unit_price", "number"), ("amount", "number")],
+            ),
+            "wages": columnar_table(wages_list, [("emp_name", "string"), ("emp_rate", "number"), ("amount", "number")]),
+        })
+
     return jsonify({
         "success": True,
         "transactions": [trans_to_json(t) for t in transactions],
@@ -517,6 +571,9 @@ def update_transaction(trans_id):
                 "amount": float(transaction.amount) if transaction.amount else 0
             }
         })
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -538,6 +595,9 @@ def delete_transaction(trans_id):
         db.session.delete(transaction)
         db.session.commit()
         return jsonify({"success": True})
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -559,6 +619,7 @@ def monthly_trial_balance():
 
 @carenderia_bp.route("/get-transactions-by-month")
 @login_required
+@read_only_report
 def get_transactions_by_month():
     """Get transactions grouped by date for a specific month. Accessible to Admin role or Corporate department."""
     user_role = (session.get("role") or "").lower()
@@ -572,15 +633,15 @@ def get_transactions_by_month():
         return jsonify({"success": False, "error": "Month parameter is required."}), 400
     
     try:
-        # Parse month string (format: YYYY-MM)
-        year, month = map(int, month_str.split("-"))
+        # Parse month string (format: YYYY-MM) into a date range (prunes year partitions)
+        start_date, next_month = month_bounds(month_str)
     except ValueError:
         return jsonify({"success": False, "error": "Invalid month format. Use YYYY-MM."}), 400
     
-    # Get all transactions for the month
-    transactions = CarenderiaTransaction.query.filter(
-        extract('year', CarenderiaTransaction.date) == year,
-        extract('month', CarenderiaTransaction.date) == month
+    # Get all transactions for the month (archived months come from the cold archive)
+    transactions = archived_rows(CarenderiaTransaction, start_date, next_month) + CarenderiaTransaction.query.filter(
+        CarenderiaTransaction.date >= start_date,
+        CarenderiaTransaction.date < next_month
     ).order_by(CarenderiaTransaction.date.asc(), CarenderiaTransaction.id.asc()).all()
     
     # Group transactions by date and calculate daily totals
@@ -611,7 +672,7 @@ def get_transactions_by_month():
                 "transactions": []
             }
         
-        amount = float(trans.amount) if trans.amount else 0
+        amount = trans.amount or 0  # Decimal: daily totals stay exact, the JSON provider writes numbers
         trans_type = trans.trans_type or ""
         
         # Add transaction to list
@@ -665,6 +726,25 @@ def get_transactions_by_month():
         )
         day_data["net_amount"] = day_data["daily_collection"] - day_data["total_deductions"]
     
+    if wants_columnar():
+        # One row per day (totals) plus a flat transactions table keyed by date
+        days = list(monthly_data.values())
+        return jsonify({
+            "success": True,
+            "format": "columnar",
+            "days": columnar_table(days, [("date", "date")] + [
+                (key, "number") for key in (
+                    "daily_collection", "wages", "daily_expense", "electric_bill", "water_bill",
+                    "maintenance", "mayors_permit", "rental", "bir", "sss", "pag_ibig", "purchases",
+                    "total_deductions", "net_amount",
+                )
+            ]),
+            "transactions": columnar_table(
+                ({"date": day["date"], **t} for day in days for t in day["transactions"]),
+                [("date", "date"), ("id", "integer"), ("trans_type", "string"), ("amount", "number")],
+            ),
+        })
+
     return jsonify({
         "success": True,
         "monthly_data": monthly_data
@@ -687,6 +767,7 @@ def view_wages_report():
 
 @carenderia_bp.route("/get-wages-by-month")
 @login_required
+@read_only_report
 def get_wages_by_month():
     """Get wages grouped by date for a specific month. Accessible to Admin role or Corporate department."""
     user_role = (session.get("role") or "").lower()
@@ -700,15 +781,15 @@ def get_wages_by_month():
         return jsonify({"success": False, "error": "Month parameter is required."}), 400
     
     try:
-        # Parse month string (format: YYYY-MM)
-        year, month = map(int, month_str.split("-"))
+        # Parse month string (format: YYYY-MM) into a date range (prunes year partitions)
+        start_date, next_month = month_bounds(month_str)
     except ValueError:
         return jsonify({"success": False, "error": "Invalid month format. Use YYYY-MM."}), 400
     
-    # Get all wages for the month
-    wages = CarenderiaWage.query.filter(
-        extract('year', CarenderiaWage.date) == year,
-        extract('month', CarenderiaWage.date) == month
+    # Get all wages for the month (archived months come from the cold archive)
+    wages = archived_rows(CarenderiaWage, start_date, next_month) + CarenderiaWage.query.filter(
+        CarenderiaWage.date >= start_date,
+        CarenderiaWage.date < next_month
     ).order_by(CarenderiaWage.date.asc(), CarenderiaWage.id.asc()).all()
     
     # Group wages by date
@@ -726,7 +807,7 @@ def get_wages_by_month():
                 "wages": []
             }
         
-        amount = float(wage.amount) if wage.amount else 0
+        amount = wage.amount or 0
         
         # Add wage entry to list
         monthly_data[date_str]["wages"].append({
@@ -734,13 +815,26 @@ def get_wages_by_month():
             "emp_id": wage.emp_id,
             "emp_name": wage.emp_name or "N/A",
             "emp_role": wage.emp_role or "N/A",
-            "emp_rate": float(wage.emp_rate) if wage.emp_rate else 0,
+            "emp_rate": wage.emp_rate or 0,
             "amount": amount
         })
         
         # Add to total wages for the date
         monthly_data[date_str]["total_wages"] += amount
     
+    if wants_columnar():
+        days = list(monthly_data.values())
+        return jsonify({
+            "success": True,
+            "format": "columnar",
+            "days": columnar_table(days, [("date", "date"), ("total_wages", "number")]),
+            "wages": columnar_table(
+                ({"date": day["date"], **w} for day in days for w in day["wages"]),
+                [("date", "date"), ("id", "integer"), ("emp_id", "integer"), ("emp_name", "string"),
+                 ("emp_role", "string"), ("emp_rate", "number"), ("amount", "number")],
+            ),
+        })
+
     return jsonify({
         "success": True,
         "monthly_data": monthly_data
@@ -763,15 +857,114 @@ def export_trial_balance():
 
 @carenderia_bp.route("/export-trial-balance/pdf")
 @login_required
+@read_only_report
 def export_trial_balance_pdf():
     """Generate a Trial Balance PDF for selected month (start-of-month up to today)."""
-    # Local import to avoid hard dependency at app import-time
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, KeepTogether
-    from reportlab.lib.units import inch
-    import os
+    user_role = (session.get("role") or "").lower()
+    user_dept = (session.get("department") or "").lower()
+
+    if user_role != "admin" and user_dept != "corporate":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+
+    month_str = request.args.get("month")
+    error = _validate_trial_balance_month(month_str)
+    if error:
+        return jsonify({"success": False, "error": error}), 400
+
+    data, filename, mimetype = build_trial_balance_pdf(month=month_str)
+    return send_file(
+        io.BytesIO(data),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=filename
+    )
+
+
+@carenderia_bp.route("/export-trial-balance/pdf/jobs", methods=["POST"])
+@login_required
+def enqueue_trial_balance_pdf():
+    """Queue the Trial Balance PDF as a background job; poll the returned status_url."""
+    user_role = (session.get("role") or "").lower()
+    user_dept = (session.get("department") or "").lower()
+
+    if user_role != "admin" and user_dept != "corporate":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+
+    month_str = request.args.get("month")
+    error = _validate_trial_balance_month(month_str)
+    if error:
+        return jsonify({"success": False, "error": error}), 400
+
+    return enqueue_export("carenderia.trial_balance_pdf", {"month": month_str})
+
+
+# (column header, trans_type) pairs for the trial balance spreadsheet; all but Daily Sales are deductions
+TRIAL_BALANCE_COLUMNS = [
+    ("Daily Collection", "Daily Sales"),
+    ("Wages", "Wages"),
+    ("Daily Expense", "Daily Expense"),
+    ("Electric Bill", "Electric Bill"),
+    ("Water Bill", "Water Bill"),
+    ("Maintenance", "Maintenance"),
+    ("Mayor's Permit", "Mayor's Permit"),
+    ("Rental", "Rental"),
+    ("BIR", "BIR"),
+    ("SSS", "SSS"),
+    ("PAG-IBIG", "PAG-IBIG"),
+    ("Purchases", "Purchases"),
+]
+
+
+@carenderia_bp.route("/export-trial-balance/<any(csv, xlsx):fmt>")
+@login_required
+@read_only_report
+def export_trial_balance_rows(fmt):
+    """Export the trial balance (one row per day, one column per type) as CSV or XLSX."""
+    user_role = (session.get("role") or "").lower()
+    user_dept = (session.get("department") or "").lower()
+
+    if user_role != "admin" and user_dept != "corporate":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+
+    month_str = request.args.get("month")
+    error = _validate_trial_balance_month(month_str)
+    if error:
+        return jsonify({"success": False, "error": error}), 400
+
+    # Same range as the PDF: start of month up to today (or month-end for past months)
+    start_date, next_month = month_bounds(month_str)
+    end_date = min(date.today(), next_month - timedelta(days=1))
+
+    # Closed months read the period snapshot (one row per day and type) instead of raw transactions
+    if is_closed("carenderia", start_date):
+        day_col, type_col, amount_col = PeriodSnapshot.day, PeriodSnapshot.category, PeriodSnapshot.amount
+        where = [PeriodSnapshot.venture == "carenderia", PeriodSnapshot.period == start_date]
+    else:
+        day_col, type_col, amount_col = CarenderiaTransaction.date, CarenderiaTransaction.trans_type, CarenderiaTransaction.amount
+        where = [CarenderiaTransaction.date >= start_date, CarenderiaTransaction.date <= end_date]
+
+    sums = [
+        func.coalesce(func.sum(case((type_col == t, amount_col), else_=0)), 0)
+        for _, t in TRIAL_BALANCE_COLUMNS
+    ]
+    collection = sums[0]
+    deductions = sum(sums[2:], sums[1])
+    stmt = (
+        select(day_col, *sums, deductions, collection - deductions)
+        .where(*where)
+        .group_by(day_col)
+        .order_by(day_col.asc())
+    )
+
+    header = ["Date"] + [label for label, _ in TRIAL_BALANCE_COLUMNS] + ["Total Deductions", "Net Amount"]
+    return export_response(fmt, f"trial_balance_{month_str}", header, stream_rows(stmt), sheet_title="Trial Balance")
+
+
+@carenderia_bp.route("/export-wages/<any(csv, xlsx):fmt>")
+@login_required
+@read_only_report
+def export_wages(fmt):
+    """Export wage entries for a month as CSV or XLSX. Accessible to Admin role or Corporate department."""
     user_role = (session.get("role") or "").lower()
     user_dept = (session.get("department") or "").lower()
 
@@ -781,75 +974,134 @@ def export_trial_balance_pdf():
     month_str = request.args.get("month")
     if not month_str:
         return jsonify({"success": False, "error": "Month parameter is required."}), 400
+    try:
+        start_date, next_month = month_bounds(month_str)
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid month format. Use YYYY-MM."}), 400
+
+    stmt = (
+        select(
+            CarenderiaWage.date,
+            CarenderiaWage.emp_id,
+            CarenderiaWage.emp_name,
+            CarenderiaWage.emp_role,
+            CarenderiaWage.emp_rate,
+            CarenderiaWage.amount,
+        )
+        .where(CarenderiaWage.date >= start_date, CarenderiaWage.date < next_month)
+        .order_by(CarenderiaWage.date.asc(), CarenderiaWage.id.asc())
+    )
+    archived = (
+        (w.date, w.emp_id, w.emp_name, w.emp_role, w.emp_rate, w.amount)
+        for w in archived_rows(CarenderiaWage, start_date, next_month)
+    )
+    header = ["Date", "Employee ID", "Employee", "Role", "Rate", "Amount"]
+    rows = chain(archived, stream_rows(stmt))
+    return export_response(fmt, f"carenderia_wages_{month_str}", header, rows, sheet_title="Wages")
 
+
+def _validate_trial_balance_month(month_str):
+    """Return an error message for an unusable YYYY-MM month, or None."""
+    if not month_str:
+        return "Month parameter is required."
     try:
         year, month = map(int, month_str.split("-"))
+        start_date = date(year, month, 1)
     except ValueError:
-        return jsonify({"success": False, "error": "Invalid month format. Use YYYY-MM."}), 400
+        return "Invalid month format. Use YYYY-MM."
+    if start_date > date.today():
+        return "Selected month is in the future."
+    return None
+
+
+@job_handler("carenderia.trial_balance_pdf")
+@export_timed("carenderia.trial_balance_pdf")
+@memory_profiled("carenderia.trial_balance_pdf")
+@traced("pdf.build", phase="query", report="carenderia.trial_balance_pdf")
+def build_trial_balance_pdf(month):
+    """Build the Trial Balance PDF for a YYYY-MM month. Returns (data, filename, mimetype)."""
+    # Local import to avoid hard dependency at app import-time
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, KeepTogether
+    from reportlab.lib.units import inch
+    import os
 
+    error = _validate_trial_balance_month(month)
+    if error:
+        raise ValueError(error)
+
+    month_str = month
+    year, month = map(int, month_str.split("-"))
     start_date = date(year, month, 1)
     today = date.today()
 
-    if start_date > today:
-        return jsonify({"success": False, "error": "Selected month is in the future."}), 400
-
     last_day = calendar.monthrange(year, month)[1]
     month_end = date(year, month, last_day)
     end_date = min(today, month_end)
 
-    # Fetch transactions within date range
+    # Closed months total from the period snapshot, like the CSV/XLSX trial balance; only closed
+    # months can be archived, so open ones skip the archive lookup
+    closed = is_closed("carenderia", start_date)
+
+    # Fetch transactions within date range (listed in the details section; archived months come from the cold archive)
     txns = CarenderiaTransaction.query.filter(
         CarenderiaTransaction.date >= start_date,
         CarenderiaTransaction.date <= end_date
     ).order_by(CarenderiaTransaction.date.asc(), CarenderiaTransaction.id.asc()).all()
-
-    # Group and compute daily totals
+    if closed:
+        txns = archived_rows(CarenderiaTransaction, start_date, end_date + timedelta(days=1)) + txns
+
+    # Daily total each transaction type adds to (Daily Expense is not a trial balance column)
+    total_keys = {
+        "Daily Sales": "daily_collection",
+        "Wages": "wages",
+        "Electric Bill": "electric_bill",
+        "Water Bill": "water_bill",
+        "Maintenance": "maintenance",
+        "Mayor's Permit": "mayors_permit",
+        "Rental": "rental",
+        "BIR": "bir",
+        "SSS": "sss",
+        "PAG-IBIG": "pag_ibig",
+        "Purchases": "purchases",
+    }
     daily = {}
-    for t in txns:
-        d = t.date.isoformat()
+
+    def day_entry(d):
         if d not in daily:
-            daily[d] = {
-                "daily_collection": 0.0,
-                "wages": 0.0,
-                "electric_bill": 0.0,
-                "water_bill": 0.0,
-                "maintenance": 0.0,
-                "mayors_permit": 0.0,
-                "rental": 0.0,
-                "bir": 0.0,
-                "sss": 0.0,
-                "pag_ibig": 0.0,
-                "purchases": 0.0,
-                "transactions": []
-            }
+            daily[d] = {key: 0.0 for key in total_keys.values()}
+            daily[d]["transactions"] = []
+        return daily[d]
+
+    def add_total(entry, typ, amt):
+        key = total_keys.get(typ)
+        if key:
+            entry[key] += amt
+
+    if closed:
+        snapshot = db.session.execute(
+            select(PeriodSnapshot.day, PeriodSnapshot.category, PeriodSnapshot.amount).where(
+                PeriodSnapshot.venture == "carenderia",
+                PeriodSnapshot.period == start_date,
+                PeriodSnapshot.day <= end_date,
+            )
+        ).all()
+        for day, category, amount in snapshot:
+            add_total(day_entry(day.isoformat()), category or "", float(amount) if amount else 0.0)
 
+    # Group and compute daily totals
+    for t in txns:
+        entry = day_entry(t.date.isoformat())
         amt = float(t.amount) if t.amount else 0.0
         typ = t.trans_type or ""
+        entry["transactions"].append({"type": typ, "amount": amt})
+        if not closed:
+            add_total(entry, typ, amt)
 
-        daily[d]["transactions"].append({"type": typ, "amount": amt})
-
-        if typ == "Daily Sales":
-            daily[d]["daily_collection"] += amt
-        elif typ == "Wages":
-            daily[d]["wages"] += amt
-        elif typ == "Electric Bill":
-            daily[d]["electric_bill"] += amt
-        elif typ == "Water Bill":
-            daily[d]["water_bill"] += amt
-        elif typ == "Maintenance":
-            daily[d]["maintenance"] += amt
-        elif typ == "Mayor's Permit":
-            daily[d]["mayors_permit"] += amt
-        elif typ == "Rental":
-            daily[d]["rental"] += amt
-        elif typ == "BIR":
-            daily[d]["bir"] += amt
-        elif typ == "SSS":
-            daily[d]["sss"] += amt
-        elif typ == "PAG-IBIG":
-            daily[d]["pag_ibig"] += amt
-        elif typ == "Purchases":
-            daily[d]["purchases"] += amt
+    report_progress(40)
+    trace_phase("layout")
 
     def fmt_money(x: float) -> str:
         return f"{x:,.2f}"
@@ -1024,16 +1276,12 @@ def export_trial_balance_pdf():
         story.append(tx_table)
         story.append(Spacer(1, 10))
 
+    report_progress(70)
+    trace_phase("write")
     doc.build(story)
-    buf.seek(0)
 
     filename = f"trial_balance_{month_str}_{start_date.isoformat()}_{end_date.isoformat()}.pdf"
-    return send_file(
-        buf,
-        mimetype="application/pdf",
-        as_attachment=True,
-        download_name=filename
-    )
+    return buf.getvalue(), filename, "application/pdf"
 
 
 @carenderia_bp.route("/get-daily-expenses")
@@ -40,6 +40,11 @@ class CateringEquipment(db.Model):
 class CateringTransaction(db.Model):
     __tablename__ = "catering_transaction"
 
+    __table_args__ = (
+        db.Index("ix_catering_transaction_date", "date"),
+        db.Index("ix_catering_transaction_booking_id", "booking_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
     booking_id = db.Column(db.Integer, db.ForeignKey('catering_requests.id'), nullable=True)  # Nullable for expenses
@@ -56,6 +61,11 @@ class CateringTransaction(db.Model):
 class CateringExpense(db.Model):
     __tablename__ = "catering_expense"
 
+    __table_args__ = (
+        db.Index("ix_catering_expense_date", "date"),
+        db.Index("ix_catering_expense_booking_id", "booking_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
     expense_type = db.Column(db.String(50), nullable=False)  # Wages, Expenses, Miscellaneous, Purchases
@@ -82,6 +92,8 @@ class CateringExpense(db.Model):
 class CateringPurchaseItem(db.Model):
     __tablename__ = "catering_purchase_items"
 
+    __table_args__ = (db.Index("ix_catering_purchase_items_expense_id", "expense_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     expense_id = db.Column(db.Integer, db.ForeignKey('catering_expense.id'), nullable=False)
     description = db.Column(db.String(255), nullable=False)
@@ -95,6 +107,8 @@ class CateringPurchaseItem(db.Model):
 class CateringWage(db.Model):
     __tablename__ = "catering_wages"
 
+    __table_args__ = (db.Index("ix_catering_wages_expense_id", "expense_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
     employee_id = db.Column(db.Integer, db.ForeignKey('employees.id'), nullable=False)
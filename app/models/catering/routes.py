@@ -2,12 +2,27 @@ from flask import Blueprint, request, jsonify, render_template, redirect, url_fo
 from ...extensions import db
 from .models import CateringRequest, CateringMenu, CateringEquipment, CateringTransaction, CateringExpense, CateringWage, CateringPurchaseItem
 from app.decorators.auth_decorators import login_required, role_required, department_required
+from app.decorators.db_decorators import read_only_report
 from app.models.core import Employee, Department
 from sqlalchemy.orm import joinedload
 from sqlalchemy import func, extract
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 from collections import defaultdict
+from app.jobs.queue import job_handler, report_progress
+from app.perf.memory import memory_profiled
+from app.perf.metrics import export_timed
+from app.perf.tracing import traced, trace_phase
+from app.jobs.routes import enqueue_export
+from app.exports import export_response, stream_rows
+from app.periods.closing import PeriodClosedError, split_range, snapshot_query
+from app.periods.models import PeriodSnapshot
+from app.utils.dates import month_bounds
+from app.archive.reader import archived_rows, archived_rows_by_ref, archived_months, archived_ref_totals
+from app.database.sequences import next_value, peek_value
+from itertools import chain
+from sqlalchemy import select, literal, union_all
+import io
 
 # Import Employee for CateringExpense relationship
 from app.models.core import Employee, Department
@@ -458,6 +473,7 @@ def add_transaction():
             .scalar()
         if not isinstance(existing_total, Decimal):
             existing_total = Decimal(str(existing_total or 0))
+        existing_total += _archived_paid_total(int(booking_id))
         
         # Calculate running balance after adding this transaction
         total_after_transaction = existing_total + trans_amount_value
@@ -487,6 +503,9 @@ def add_transaction():
             "booking_status_updated": booking_status_updated,
             "running_balance": float(running_balance)
         })
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -502,7 +521,14 @@ def booking_transaction_total(booking_id):
         .filter(CateringTransaction.booking_id == booking_id)
         .scalar()
     )
-    return jsonify({"success": True, "total": float(total or 0)})
+    total = Decimal(str(total or 0)) + _archived_paid_total(booking_id)
+    return jsonify({"success": True, "total": float(total)})
+
+
+def _archived_paid_total(booking_id):
+    """Sum of trans_amount of the booking's archived transactions (0 when none are archived)."""
+    paid, _due = archived_ref_totals(CateringTransaction, [booking_id]).get(booking_id, (None, None))
+    return Decimal(str(paid or 0))
 
 
 def _manage_bookings_allowed():
@@ -534,6 +560,7 @@ def manage_bookings():
 
 @catering_bp.route("/view-collectibles")
 @login_required
+@read_only_report
 def view_collectibles():
     """View all bookings that have a balance (not fully paid). Accessible to Admin, Corporate, or Staff in Catering."""
     user_role = (session.get("role") or "").lower()
@@ -555,11 +582,24 @@ def view_collectibles():
         .group_by(CateringTransaction.booking_id)
     ).all()
 
+    # Archived transactions (closed, older months) count towards the same totals, from the per-booking
+    # totals recorded at archive time
+    archived_totals = archived_ref_totals(CateringTransaction)
+
+    totals = {}  # booking_id -> [total_due, total_paid]
+    for r in rows:
+        totals[r.booking_id] = [Decimal(str(r.total_due or 0)), Decimal(str(r.total_paid or 0))]
+    for bid, (archived_paid, archived_due) in archived_totals.items():
+        if archived_due is None and bid not in totals:
+            continue
+        due_paid = totals.setdefault(bid, [Decimal("0"), Decimal("0")])
+        due_paid[0] = max(due_paid[0], Decimal(str(archived_due or 0)))
+        due_paid[1] += Decimal(str(archived_paid or 0))
+
     # Collect booking IDs that have balance (total_paid < total_due)
     booking_ids_with_balance = []
     collectibles_data = {}  # booking_id -> { total_due, total_paid, balance }
-    for r in rows:
-        bid, total_due, total_paid = r.booking_id, (r.total_due or Decimal("0")), (r.total_paid or Decimal("0"))
+    for bid, (total_due, total_paid) in totals.items():
         if total_paid < total_due:
             booking_ids_with_balance.append(bid)
             collectibles_data[bid] = {
@@ -568,7 +608,7 @@ def view_collectibles():
                 "balance": total_due - total_paid,
             }
 
-    # Bookings with no transactions at all (unpaid)
+    # Bookings with no transactions at all (unpaid), hot or archived
     subq = db.session.query(CateringTransaction.booking_id).filter(CateringTransaction.booking_id.isnot(None)).distinct()
     unpaid_booking_ids = [
         x[0] for x in
@@ -576,6 +616,7 @@ def view_collectibles():
         .filter(CateringRequest.status != "Cancelled")
         .filter(~CateringRequest.id.in_(subq))
         .all()
+        if x[0] not in archived_totals
     ]
 
     # Load full booking objects: those with balance or unpaid
@@ -596,6 +637,10 @@ def view_collectibles():
             .order_by(CateringTransaction.date.asc(), CateringTransaction.id.asc())
             .all()
         )
+        # Older payments of the listed bookings, reading each archived segment once
+        transactions_by_booking = archived_rows_by_ref(
+            CateringTransaction, [bid for bid in all_bids if bid in archived_totals]
+        )
         for t in pay_rows:
             transactions_by_booking.setdefault(t.booking_id, []).append(t)
 
@@ -690,6 +735,9 @@ def edit_expense(expense_id):
     except (ValueError, InvalidOperation) as e:
         db.session.rollback()
         return jsonify({"success": False, "error": "Invalid date or amount format."}), 400
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -813,6 +861,9 @@ def edit_booking(booking_id):
         
         flash("Booking updated successfully!", "success")
         return redirect(url_for("catering.manage_bookings"))
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -839,16 +890,28 @@ def delete_booking(booking_id):
     return redirect(url_for("catering.manage_bookings"))
 
 
-def _next_catering_purchase_reference_for_date(parsed_date, same_date_count=0):
-    """Return next PUR-(date)-### for catering Purchases on the given date."""
-    existing = CateringExpense.query.filter(
+PURCHASE_SEQUENCE = "catering.purchase"
+
+
+def _first_catering_purchase_seq(parsed_date):
+    """Start of a date's counter: one past the purchases already saved (dates from before the counter)."""
+    return select(func.count() + 1).where(
         CateringExpense.date == parsed_date,
         CateringExpense.expense_type == "Purchases"
-    ).count()
-    seq = existing + same_date_count + 1
+    ).scalar_subquery()
+
+
+def _catering_purchase_reference(parsed_date, seq):
     return f"PUR-{parsed_date.strftime('%Y-%m-%d')}-{seq:03d}"
 
 
+@traced("reference.allocate")
+def _next_catering_purchase_reference_for_date(parsed_date):
+    """Allocate the next PUR-(date)-### for catering Purchases; released if the transaction rolls back."""
+    seq = next_value(PURCHASE_SEQUENCE, parsed_date.isoformat(), start=_first_catering_purchase_seq(parsed_date))
+    return _catering_purchase_reference(parsed_date, seq)
+
+
 @catering_bp.route("/next-purchase-reference")
 @login_required
 @department_required("Catering", "Corporate")
@@ -862,7 +925,8 @@ def next_purchase_reference():
             parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
         except ValueError:
             parsed_date = date.today()
-    ref = _next_catering_purchase_reference_for_date(parsed_date, same_date_count=0)
+    seq = peek_value(PURCHASE_SEQUENCE, parsed_date.isoformat(), start=_first_catering_purchase_seq(parsed_date))
+    ref = _catering_purchase_reference(parsed_date, seq)
     return jsonify({"success": True, "referenceNumber": ref})
 
 
@@ -916,6 +980,9 @@ def add_expense():
                 "remarks": new_expense.remarks
             }
         })
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -988,6 +1055,9 @@ def add_purchases():
             "message": "Purchases saved.",
             "expense": {"id": expense.id, "reference_number": reference_number, "amount": str(total)}
         })
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -1098,6 +1168,9 @@ def add_wages():
             "expense_id": wages_expense.id,
             "total_amount": str(total_wages_amount)
         })
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -1106,6 +1179,7 @@ def add_wages():
 @catering_bp.route("/view-wages")
 @login_required
 @department_required("Catering", "Corporate")
+@read_only_report
 def view_wages():
     """View wages report categorized by month with per day details."""
     # Get selected month from query parameter (format: YYYY-MM)
@@ -1115,18 +1189,21 @@ def view_wages():
     query = CateringWage.query
     
     # Filter by month if provided
+    start_date = next_month = None
     if selected_month:
         try:
-            year, month = map(int, selected_month.split("-"))
+            start_date, next_month = month_bounds(selected_month)
             query = query.filter(
-                extract('year', CateringWage.date) == year,
-                extract('month', CateringWage.date) == month
+                CateringWage.date >= start_date,
+                CateringWage.date < next_month
             )
         except (ValueError, AttributeError):
             # Invalid month format, ignore filter
             pass
     
     all_wages = query.order_by(CateringWage.date.desc()).all()
+    # Archived wages are older than every hot one; append them newest first
+    all_wages += archived_rows(CateringWage, start_date, next_month)[::-1]
     
     # Get all available months for the dropdown
     all_months_query = db.session.query(
@@ -1137,8 +1214,11 @@ def view_wages():
         extract('month', CateringWage.date).desc()
     ).all()
     
+    month_keys = {(int(year), int(month)) for year, month in all_months_query}
+    month_keys.update((p.year, p.month) for p in archived_months(CateringWage))
+
     available_months = []
-    for year, month in all_months_query:
+    for year, month in sorted(month_keys, reverse=True):
         month_str = f"{int(year)}-{int(month):02d}"
         month_name = datetime(int(year), int(month), 1).strftime("%B %Y")
         available_months.append({
@@ -1196,11 +1276,58 @@ def view_wages():
                           selected_month=selected_month)
 
 
+def _balance_sheet_totals(start=None, end=None):
+    """
+    (income, wages, other expenses) for dates in [start, end) (None = unbounded).
+    Closed months are read from period snapshots; only the open months scan raw rows.
+    """
+    income = wages = other = Decimal("0")
+    closed_range, open_range = split_range("catering", start, end)
+
+    if closed_range:
+        snap = snapshot_query(
+            "catering", PeriodSnapshot.category, func.sum(PeriodSnapshot.amount), period_range=closed_range
+        ).group_by(PeriodSnapshot.category)
+        for category, amount in db.session.execute(snap).all():
+            amount = Decimal(str(amount or 0))
+            if category == "Income":
+                income += amount
+            elif category == "Wages":
+                wages += amount
+            else:
+                other += amount
+
+    if open_range:
+        open_start, open_end = open_range
+        income_q = db.session.query(func.coalesce(func.sum(CateringTransaction.trans_amount), 0)).filter(
+            CateringTransaction.booking_id.isnot(None)
+        )
+        expense_q = db.session.query(
+            CateringExpense.expense_type == "Wages", func.coalesce(func.sum(CateringExpense.amount), 0)
+        )
+        if open_start is not None:
+            income_q = income_q.filter(CateringTransaction.date >= open_start)
+            expense_q = expense_q.filter(CateringExpense.date >= open_start)
+        if open_end is not None:
+            income_q = income_q.filter(CateringTransaction.date < open_end)
+            expense_q = expense_q.filter(CateringExpense.date < open_end)
+
+        income += Decimal(str(income_q.scalar() or 0))
+        for is_wages, amount in expense_q.group_by(CateringExpense.expense_type == "Wages").all():
+            if is_wages:
+                wages += Decimal(str(amount or 0))
+            else:
+                other += Decimal(str(amount or 0))
+
+    return income, wages, other
+
+
 @catering_bp.route("/view-balance-sheet")
 @login_required
 @department_required("Catering", "Corporate")
+@read_only_report
 def view_balance_sheet():
-    """View balance sheet (income vs expenses) with month selection and daily details."""
+    """View balance sheet (income vs expenses) with month selection and per-booking statements."""
     selected_month = request.args.get("month", "")
 
     # --- month filter ---
@@ -1223,6 +1350,8 @@ def view_balance_sheet():
     ).distinct()
 
     month_set = {(int(y), int(m)) for (y, m) in income_months.union(expense_months).all()}
+    for model in (CateringTransaction, CateringExpense):
+        month_set.update((p.year, p.month) for p in archived_months(model))
     available_months = []
     for y, m in sorted(month_set, reverse=True):
         available_months.append({
@@ -1230,59 +1359,14 @@ def view_balance_sheet():
             "label": datetime(y, m, 1).strftime("%B %Y")
         })
 
-    # --- fetch rows ---
-    income_q = CateringTransaction.query.filter(CateringTransaction.booking_id.isnot(None))
-    expense_q = CateringExpense.query
-
+    # --- totals: closed months from period snapshots, open months live ---
+    bounds = None
     if year and month:
-        income_q = income_q.filter(
-            extract("year", CateringTransaction.date) == year,
-            extract("month", CateringTransaction.date) == month,
-        )
-        expense_q = expense_q.filter(
-            extract("year", CateringExpense.date) == year,
-            extract("month", CateringExpense.date) == month,
-        )
-
-    incomes = income_q.order_by(CateringTransaction.date.desc(), CateringTransaction.id.desc()).all()
-    expenses = expense_q.order_by(CateringExpense.date.desc(), CateringExpense.id.desc()).all()
-
-    # --- group by day ---
-    by_day = defaultdict(lambda: {"income": [], "expenses": []})
-    for t in incomes:
-        by_day[t.date]["income"].append(t)
-    for e in expenses:
-        by_day[e.date]["expenses"].append(e)
-
-    daily_rows = []
-    total_income = Decimal("0")
-    total_wages = Decimal("0")
-    total_expenses_other = Decimal("0")
-
-    for day in sorted(by_day.keys(), reverse=True):
-        day_incomes = by_day[day]["income"]
-        day_expenses = by_day[day]["expenses"]
-
-        day_income_total = sum((Decimal(str(x.trans_amount or 0)) for x in day_incomes), Decimal("0"))
-        day_wages_total = sum((Decimal(str(x.amount or 0)) for x in day_expenses if (x.expense_type or "") == "Wages"), Decimal("0"))
-        day_other_total = sum((Decimal(str(x.amount or 0)) for x in day_expenses if (x.expense_type or "") != "Wages"), Decimal("0"))
-        day_expense_total = day_wages_total + day_other_total
-        day_net = day_income_total - day_expense_total
-
-        total_income += day_income_total
-        total_wages += day_wages_total
-        total_expenses_other += day_other_total
-
-        daily_rows.append({
-            "date": day,
-            "income_total": day_income_total,
-            "wages_total": day_wages_total,
-            "other_expenses_total": day_other_total,
-            "expense_total": day_expense_total,
-            "net": day_net,
-            "income_items": day_incomes,
-            "expense_items": day_expenses,
-        })
+        try:
+            bounds = month_bounds(f"{year}-{month:02d}")
+        except ValueError:
+            bounds = None
+    total_income, total_wages, total_expenses_other = _balance_sheet_totals(*(bounds or (None, None)))
 
     summary = {
         "total_income": total_income,
@@ -1297,6 +1381,11 @@ def view_balance_sheet():
         CateringRequest.status.in_(["Confirmed", "Completed"])
     ).order_by(CateringRequest.event_date.desc(), CateringRequest.event_time.desc()).all()
 
+    # Older lines of these bookings come from the cold archive, reading each segment once for all bookings
+    booking_ids = [b.id for b in bookings_for_sheet]
+    archived_income = archived_rows_by_ref(CateringTransaction, booking_ids)
+    archived_expenses = archived_rows_by_ref(CateringExpense, booking_ids)
+
     booking_financials = []
     for b in bookings_for_sheet:
         income_items = CateringTransaction.query.filter(
@@ -1305,6 +1394,8 @@ def view_balance_sheet():
         expense_items = CateringExpense.query.filter(
             CateringExpense.booking_id == b.id
         ).order_by(CateringExpense.date.asc(), CateringExpense.id.asc()).all()
+        income_items = archived_income.get(b.id, []) + income_items
+        expense_items = archived_expenses.get(b.id, []) + expense_items
         income_total = sum((Decimal(str(t.trans_amount or 0)) for t in income_items), Decimal("0"))
         expense_total = sum((Decimal(str(e.amount or 0)) for e in expense_items), Decimal("0"))
         # Booking total amount (contract total): max booking_amount from transactions
@@ -1326,7 +1417,6 @@ def view_balance_sheet():
         "catering/view_balance_sheet.html",
         available_months=available_months,
         selected_month=selected_month,
-        daily_rows=daily_rows,
         summary=summary,
         booking_financials=booking_financials,
     )
@@ -1335,39 +1425,173 @@ def view_balance_sheet():
 @catering_bp.route("/export-balance-sheet/pdf")
 @login_required
 @department_required("Catering", "Corporate")
+@read_only_report
 def export_balance_sheet_pdf():
     """Generate a Balance Sheet PDF for selected month."""
+    month_str = request.args.get("month")
+    error = _validate_balance_sheet_month(month_str)
+    if error:
+        return jsonify({"success": False, "error": error}), 400
+    
+    try:
+        data, filename, mimetype = build_balance_sheet_pdf(month=month_str)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    
+    return send_file(
+        io.BytesIO(data),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=filename
+    )
+
+
+@catering_bp.route("/export-balance-sheet/pdf/jobs", methods=["POST"])
+@login_required
+@department_required("Catering", "Corporate")
+def enqueue_balance_sheet_pdf():
+    """Queue the Balance Sheet PDF as a background job; poll the returned status_url."""
+    month_str = request.args.get("month")
+    error = _validate_balance_sheet_month(month_str)
+    if error:
+        return jsonify({"success": False, "error": error}), 400
+    return enqueue_export("catering.balance_sheet_pdf", {"month": month_str})
+
+
+@catering_bp.route("/export-balance-sheet/<any(csv, xlsx):fmt>")
+@login_required
+@department_required("Catering", "Corporate")
+@read_only_report
+def export_balance_sheet_rows(fmt):
+    """Export balance sheet lines (booking payments and expenses) as CSV or XLSX. Month is optional."""
+    month_str = request.args.get("month", "")
+    try:
+        bounds = month_bounds(month_str) if month_str else None
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid month format. Use YYYY-MM."}), 400
+
+    income = select(
+        CateringTransaction.date.label("date"),
+        literal("Income").label("kind"),
+        CateringTransaction.trans_description.label("category"),
+        CateringTransaction.remarks.label("description"),
+        literal(None).label("reference_number"),
+        CateringTransaction.booking_id.label("booking_id"),
+        CateringTransaction.trans_amount.label("amount"),
+    ).where(CateringTransaction.booking_id.isnot(None))
+    expense = select(
+        CateringExpense.date,
+        literal("Expense"),
+        CateringExpense.expense_type,
+        CateringExpense.description,
+        CateringExpense.reference_number,
+        CateringExpense.booking_id,
+        CateringExpense.amount,
+    )
+    if bounds:
+        income = income.where(CateringTransaction.date >= bounds[0], CateringTransaction.date < bounds[1])
+        expense = expense.where(CateringExpense.date >= bounds[0], CateringExpense.date < bounds[1])
+
+    lines = union_all(income, expense).subquery()
+    stmt = select(lines).order_by(lines.c.date.asc(), lines.c.kind.desc())
+
+    start, end = bounds or (None, None)
+    archived = [
+        (t.date, "Income", t.trans_description, t.remarks, None, t.booking_id, t.trans_amount)
+        for t in archived_rows(CateringTransaction, start, end) if t.booking_id is not None
+    ] + [
+        (e.date, "Expense", e.expense_type, e.description, e.reference_number, e.booking_id, e.amount)
+        for e in archived_rows(CateringExpense, start, end)
+    ]
+    archived.sort(key=lambda r: (r[0], r[1] != "Income"))
+
+    header = ["Date", "Type", "Category", "Description", "Reference #", "Booking ID", "Amount"]
+    basename = f"balance_sheet_{month_str}" if month_str else "balance_sheet_all"
+    rows = chain(archived, stream_rows(stmt))
+    return export_response(fmt, basename, header, rows, sheet_title="Balance Sheet")
+
+
+@catering_bp.route("/export-wages/<any(csv, xlsx):fmt>")
+@login_required
+@department_required("Catering", "Corporate")
+@read_only_report
+def export_wages(fmt):
+    """Export wage entries as CSV or XLSX. Month is optional."""
+    month_str = request.args.get("month", "")
+    start = end = None
+    stmt = select(
+        CateringWage.date,
+        CateringWage.employee_id,
+        CateringWage.employee_name,
+        CateringWage.rate_per_day,
+        CateringWage.number_of_days,
+        CateringWage.amount,
+        CateringWage.description,
+    )
+    if month_str:
+        try:
+            start, end = month_bounds(month_str)
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid month format. Use YYYY-MM."}), 400
+        stmt = stmt.where(CateringWage.date >= start, CateringWage.date < end)
+    stmt = stmt.order_by(CateringWage.date.asc(), CateringWage.id.asc())
+    archived = (
+        (w.date, w.employee_id, w.employee_name, w.rate_per_day, w.number_of_days, w.amount, w.description)
+        for w in archived_rows(CateringWage, start, end)
+    )
+
+    header = ["Date", "Employee ID", "Employee", "Rate/Day", "Days", "Amount", "Description"]
+    basename = f"catering_wages_{month_str}" if month_str else "catering_wages_all"
+    rows = chain(archived, stream_rows(stmt))
+    return export_response(fmt, basename, header, rows, sheet_title="Wages")
+
+
+@job_handler("catering.balance_sheet_pdf")
+@export_timed("catering.balance_sheet_pdf")
+@memory_profiled("catering.balance_sheet_pdf")
+@traced("pdf.build", phase="query", report="catering.balance_sheet_pdf")
+def _validate_balance_sheet_month(month_str):
+    """Return an error message for an unusable YYYY-MM month, or None."""
+    if not month_str:
+        return "Month parameter is required."
+    try:
+        year, month = map(int, month_str.split("-"))
+        date(year, month, 1)
+    except ValueError:
+        return "Invalid month format. Use YYYY-MM."
+    return None
+
+
+def build_balance_sheet_pdf(month):
+    """Build the Balance Sheet PDF for a YYYY-MM month. Returns (data, filename, mimetype)."""
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import letter
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, KeepTogether, PageBreak
     from reportlab.lib.units import inch
-    import io
     import os
-    from datetime import date, datetime
-    
-    month_str = request.args.get("month")
-    if not month_str:
-        return jsonify({"success": False, "error": "Month parameter is required."}), 400
     
-    try:
-        year, month = map(int, month_str.split("-"))
-    except ValueError:
-        return jsonify({"success": False, "error": "Invalid month format. Use YYYY-MM."}), 400
+    month_str = month
+    year, month = map(int, month_str.split("-"))
+    start_date, next_month = month_bounds(month_str)
     
     # Fetch data (same logic as view_balance_sheet)
     income_q = CateringTransaction.query.filter(
         CateringTransaction.booking_id.isnot(None),
-        extract("year", CateringTransaction.date) == year,
-        extract("month", CateringTransaction.date) == month,
+        CateringTransaction.date >= start_date,
+        CateringTransaction.date < next_month,
     )
     expense_q = CateringExpense.query.filter(
-        extract("year", CateringExpense.date) == year,
-        extract("month", CateringExpense.date) == month,
+        CateringExpense.date >= start_date,
+        CateringExpense.date < next_month,
     )
     
     income_rows = income_q.order_by(CateringTransaction.date.asc()).all()
     expense_rows = expense_q.order_by(CateringExpense.date.asc()).all()
+    income_rows = [
+        t for t in archived_rows(CateringTransaction, start_date, next_month) if t.booking_id is not None
+    ] + income_rows
+    expense_rows = archived_rows(CateringExpense, start_date, next_month) + expense_rows
     
     # Group by date
     by_day = defaultdict(lambda: {"income": [], "expenses": []})
@@ -1382,6 +1606,8 @@ def export_balance_sheet_pdf():
     total_other_expenses = sum(Decimal(str(e.amount or 0)) for e in expense_rows if (e.expense_type or "") != "Wages")
     total_expenses = total_wages + total_other_expenses
     net = total_income - total_expenses
+    report_progress(40)
+    trace_phase("layout")
     
     # Build PDF
     buf = io.BytesIO()
@@ -1550,16 +1776,12 @@ def export_balance_sheet_pdf():
     story.append(daily_table)
     
     # Build PDF
+    report_progress(70)
+    trace_phase("write")
     doc.build(story)
-    buf.seek(0)
     
     # Generate filename
     month_name = datetime(year, month, 1).strftime("%B_%Y")
     filename = f"balance_sheet_{month_name}.pdf"
     
-    return send_file(
-        buf,
-        mimetype="application/pdf",
-        as_attachment=True,
-        download_name=filename
-    )
+    return buf.getvalue(), filename, "application/pdf"
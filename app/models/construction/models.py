@@ -1,6 +1,7 @@
 from ...extensions import db
+from ...database.dialect import BigIntegerPK
 from datetime import datetime
-from sqlalchemy import event, text
+from sqlalchemy import event, text, case
 
 class ConstructionRequest(db.Model):
     __tablename__ = "construction_requests"
@@ -15,7 +16,7 @@ class ConstructionRequest(db.Model):
 
 class ConstructionContract(db.Model):
     __tablename__ = "construction_contracts"
-    id = db.Column(db.BigInteger, primary_key=True)
+    id = db.Column(BigIntegerPK, primary_key=True)
     contractor_name = db.Column(db.String(255), nullable=False)
     contractor_address = db.Column(db.Text)
     project_name = db.Column(db.String(255), nullable=False)
@@ -34,7 +35,12 @@ from app.extensions import db
 class ProjectExpense(db.Model):
     __tablename__ = "project_expenses"
 
-    id = db.Column(db.BigInteger, primary_key=True)
+    __table_args__ = (
+        db.Index("ix_project_expenses_expense_date", "expense_date"),
+        db.Index("ix_project_expenses_contract_id_expense_date", "contract_id", "expense_date"),
+    )
+
+    id = db.Column(BigIntegerPK, primary_key=True)
 
     contract_id = db.Column(
         db.BigInteger,
@@ -111,3 +117,21 @@ class DailyInvoiceCounter(db.Model):
     __tablename__ = "daily_invoice_counter"
     invoice_date = db.Column(db.Date, primary_key=True)
     last_seq = db.Column(db.Integer, default=0)
+
+
+# Amount column that holds the value of each expense type (Activity rows carry no amount)
+EXPENSE_AMOUNT_COLUMNS = {
+    "Materials": "material_amount",
+    "Labor": "labor_charge",
+    "Gasoline": "gasoline_amount",
+    "Documents": "document_amount",
+    "Obligation": "obligation_amount",
+}
+
+
+def expense_amount_expr():
+    """SQL expression for a ProjectExpense row's amount, picked by expense_type."""
+    return case(
+        *[(ProjectExpense.expense_type == t, getattr(ProjectExpense, col)) for t, col in EXPENSE_AMOUNT_COLUMNS.items()],
+        else_=None,
+    )
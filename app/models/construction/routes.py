@@ -2,17 +2,30 @@ from flask import request, jsonify, render_template, redirect, url_for, flash, s
 from .models import ConstructionContract
 from ...extensions import db
 from app.decorators.auth_decorators import login_required, role_required, department_required
+from app.decorators.db_decorators import read_only_report
 from . import construction_bp  # existing blueprint
 from app.decorators.decorators import corporate_only
 from datetime import datetime
-from .models import ProjectExpense, DailyInvoiceCounter
+from .models import ProjectExpense, DailyInvoiceCounter, expense_amount_expr, EXPENSE_AMOUNT_COLUMNS
 from sqlalchemy import select, func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.database.dialect import increment_counter
 from sqlalchemy import distinct
 from decimal import Decimal
 from collections import defaultdict
+from app.jobs.queue import job_handler, report_progress
+from app.perf.memory import memory_profiled
+from app.perf.metrics import export_timed
+from app.perf.tracing import traced, trace_phase
+from app.jobs.routes import enqueue_export
+from app.exports import export_response, stream_rows
+from app.periods.closing import PeriodClosedError, split_range, snapshot_query
+from app.periods.models import PeriodSnapshot
+from app.archive.reader import archived_rows, archived_ref_totals
+from sqlalchemy import case, or_
+from itertools import chain
+import io
 
 
 
@@ -54,6 +67,7 @@ def reports():
 @construction_bp.route("/project/<int:project_id>/overview")
 @login_required
 @department_required("Construction", "Corporate")
+@read_only_report
 def project_overview(project_id):
     """Display financial summary/balance sheet for a project."""
     project = ConstructionContract.query.get_or_404(project_id)
@@ -61,6 +75,8 @@ def project_overview(project_id):
     # Calculate expense totals by type
     from app.models.core import Employee
     expenses = ProjectExpense.query.filter_by(contract_id=project_id).order_by(ProjectExpense.expense_date.desc(), ProjectExpense.created_at.desc()).all()
+    # Archived entries are older than every hot one, so they follow in newest-first order
+    expenses += archived_rows(ProjectExpense, ref_id=project_id)[::-1]
     
     # Add employee names to labor expenses
     for expense in expenses:
@@ -147,9 +163,114 @@ def project_overview(project_id):
     return render_template("construction/project_overview.html", project=project, summary=summary, expenses=expenses, invoices=invoices)
 
 
+@construction_bp.route("/project/<int:project_id>/ledger/<any(csv, xlsx):fmt>")
+@login_required
+@department_required("Construction", "Corporate")
+@read_only_report
+def export_project_ledger(project_id, fmt):
+    """Export a project's expense ledger (all entries except activities) as CSV or XLSX."""
+    from app.models.core import Employee
+    project = ConstructionContract.query.get_or_404(project_id)
+
+    expense_type = ProjectExpense.expense_type
+    amount = expense_amount_expr()
+    description = case(
+        (expense_type == "Materials", ProjectExpense.item),
+        (expense_type == "Labor", Employee.name),
+        (expense_type == "Documents", ProjectExpense.document_ref),
+        (expense_type == "Obligation", ProjectExpense.obligation_ref),
+        else_=None,
+    )
+    stmt = (
+        select(
+            ProjectExpense.expense_date,
+            expense_type,
+            ProjectExpense.invoice_number,
+            description,
+            ProjectExpense.qty,
+            ProjectExpense.unit,
+            ProjectExpense.unit_price,
+            ProjectExpense.rate_per_day,
+            ProjectExpense.days,
+            ProjectExpense.overtime_hours,
+            amount,
+        )
+        .outerjoin(Employee, Employee.id == ProjectExpense.labor_id)
+        .where(ProjectExpense.contract_id == project_id, expense_type != "Activity")
+        .order_by(ProjectExpense.expense_date.asc(), ProjectExpense.id.asc())
+    )
+    header = ["Date", "Type", "Invoice #", "Description", "Qty", "Unit", "Unit Price",
+              "Rate/Day", "Days", "OT Hours", "Amount"]
+    rows = chain(_archived_ledger_rows(project_id), stream_rows(stmt))
+    return export_response(fmt, f"project_{project.id}_ledger", header, rows, sheet_title="Ledger")
+
+
+def _archived_ledger_rows(project_id):
+    """Ledger export rows for the project's archived expenses, in the same column order as the live query."""
+    from app.models.core import Employee
+    archived = archived_rows(ProjectExpense, ref_id=project_id)
+    labor_ids = {e.labor_id for e in archived if e.expense_type == "Labor" and e.labor_id}
+    names = dict(db.session.query(Employee.id, Employee.name).filter(Employee.id.in_(labor_ids)).all()) if labor_ids else {}
+    descriptions = {
+        "Materials": lambda e: e.item,
+        "Labor": lambda e: names.get(e.labor_id),
+        "Documents": lambda e: e.document_ref,
+        "Obligation": lambda e: e.obligation_ref,
+    }
+    for e in archived:
+        describe = descriptions.get(e.expense_type)
+        amount_column = EXPENSE_AMOUNT_COLUMNS.get(e.expense_type)
+        yield (
+            e.expense_date, e.expense_type, e.invoice_number, describe(e) if describe else None,
+            e.qty, e.unit, e.unit_price, e.rate_per_day, e.days, e.overtime_hours,
+            getattr(e, amount_column) if amount_column else None,
+        )
+
+
+def _project_expense_totals(project_ids):
+    """
+    {project_id: {expense_type: Decimal}} for the balance sheet.
+    Closed months are read from period snapshots; open months (and undated rows) are summed live.
+    """
+    totals = {pid: {t: Decimal("0") for t in EXPENSE_AMOUNT_COLUMNS} for pid in project_ids}
+    if not project_ids:
+        return totals
+
+    rows = []
+    closed_range, open_range = split_range("construction")
+    if closed_range:
+        snap = snapshot_query(
+            "construction",
+            PeriodSnapshot.ref_id,
+            PeriodSnapshot.category,
+            func.sum(PeriodSnapshot.amount),
+            period_range=closed_range,
+        ).where(PeriodSnapshot.ref_id.in_(project_ids)).group_by(PeriodSnapshot.ref_id, PeriodSnapshot.category)
+        rows.extend(db.session.execute(snap).all())
+
+    live = select(
+        ProjectExpense.contract_id,
+        ProjectExpense.expense_type,
+        func.sum(expense_amount_expr()),
+    ).where(
+        ProjectExpense.contract_id.in_(project_ids),
+        ProjectExpense.expense_type.in_(list(EXPENSE_AMOUNT_COLUMNS)),
+    )
+    if closed_range:
+        live = live.where(or_(ProjectExpense.expense_date >= open_range[0], ProjectExpense.expense_date.is_(None)))
+    live = live.group_by(ProjectExpense.contract_id, ProjectExpense.expense_type)
+    rows.extend(db.session.execute(live).all())
+
+    for pid, expense_type, amount in rows:
+        if amount is not None and expense_type in totals.get(pid, {}):
+            totals[pid][expense_type] += Decimal(str(amount))
+    return totals
+
+
 @construction_bp.route("/balance-sheet")
 @login_required
 @department_required("Construction", "Corporate")
+@read_only_report
 def view_balance_sheet():
     """Construction balance sheet with per-project option and overall summary."""
     project_id = request.args.get("project_id", "").strip()
@@ -172,31 +293,12 @@ def view_balance_sheet():
     overall_contract_total = Decimal("0")
     overall_expense_total = Decimal("0")
 
+    expense_totals = _project_expense_totals([p.id for p in included_projects])
     for p in included_projects:
         contract_price = Decimal(str(p.contract_price or 0))
         overall_contract_total += contract_price
 
-        # Sum expense amounts by type using ProjectExpense fields
-        expenses = ProjectExpense.query.filter_by(contract_id=p.id).all()
-        totals = {
-            "Materials": Decimal("0"),
-            "Labor": Decimal("0"),
-            "Gasoline": Decimal("0"),
-            "Documents": Decimal("0"),
-            "Obligation": Decimal("0"),
-        }
-        for e in expenses:
-            if (e.expense_type or "") == "Materials" and e.material_amount is not None:
-                totals["Materials"] += Decimal(str(e.material_amount))
-            elif (e.expense_type or "") == "Labor" and e.labor_charge is not None:
-                totals["Labor"] += Decimal(str(e.labor_charge))
-            elif (e.expense_type or "") == "Gasoline" and e.gasoline_amount is not None:
-                totals["Gasoline"] += Decimal(str(e.gasoline_amount))
-            elif (e.expense_type or "") == "Documents" and e.document_amount is not None:
-                totals["Documents"] += Decimal(str(e.document_amount))
-            elif (e.expense_type or "") == "Obligation" and e.obligation_amount is not None:
-                totals["Obligation"] += Decimal(str(e.obligation_amount))
-
+        totals = expense_totals[p.id]
         total_expenses = sum(totals.values(), Decimal("0"))
         overall_expense_total += total_expenses
         balance = contract_price - total_expenses
@@ -227,19 +329,35 @@ def view_balance_sheet():
 @construction_bp.route("/balance-sheet/pdf")
 @login_required
 @department_required("Construction", "Corporate")
+@read_only_report
 def export_balance_sheet_pdf():
     """Export Construction balance sheet as PDF (header matches catering balance sheet export)."""
+    data, filename, mimetype = build_balance_sheet_pdf(project_id=request.args.get("project_id", "").strip())
+    return send_file(io.BytesIO(data), mimetype=mimetype, as_attachment=True, download_name=filename)
+
+
+@construction_bp.post("/balance-sheet/pdf/jobs")
+@login_required
+@department_required("Construction", "Corporate")
+def enqueue_balance_sheet_pdf():
+    """Queue the balance sheet PDF as a background job; poll the returned status_url."""
+    return enqueue_export("construction.balance_sheet_pdf", {"project_id": request.args.get("project_id", "").strip()})
+
+
+@job_handler("construction.balance_sheet_pdf")
+@export_timed("construction.balance_sheet_pdf")
+@memory_profiled("construction.balance_sheet_pdf")
+@traced("pdf.build", phase="query", report="construction.balance_sheet_pdf")
+def build_balance_sheet_pdf(project_id=""):
+    """Build the Construction balance sheet PDF. Returns (data, filename, mimetype)."""
     # Local import to avoid hard dependency at app import-time
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import letter
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
     from reportlab.lib.units import inch
-    import io
     import os
 
-    project_id = request.args.get("project_id", "").strip()
-
     projects = ConstructionContract.query.order_by(ConstructionContract.project_name.asc()).all()
     selected_project = None
     if project_id:
@@ -256,30 +374,12 @@ def export_balance_sheet_pdf():
     overall_contract_total = Decimal("0")
     overall_expense_total = Decimal("0")
 
+    expense_totals = _project_expense_totals([p.id for p in included_projects])
     for p in included_projects:
         contract_price = Decimal(str(p.contract_price or 0))
         overall_contract_total += contract_price
 
-        expenses = ProjectExpense.query.filter_by(contract_id=p.id).all()
-        totals = {
-            "Materials": Decimal("0"),
-            "Labor": Decimal("0"),
-            "Gasoline": Decimal("0"),
-            "Documents": Decimal("0"),
-            "Obligation": Decimal("0"),
-        }
-        for e in expenses:
-            if (e.expense_type or "") == "Materials" and e.material_amount is not None:
-                totals["Materials"] += Decimal(str(e.material_amount))
-            elif (e.expense_type or "") == "Labor" and e.labor_charge is not None:
-                totals["Labor"] += Decimal(str(e.labor_charge))
-            elif (e.expense_type or "") == "Gasoline" and e.gasoline_amount is not None:
-                totals["Gasoline"] += Decimal(str(e.gasoline_amount))
-            elif (e.expense_type or "") == "Documents" and e.document_amount is not None:
-                totals["Documents"] += Decimal(str(e.document_amount))
-            elif (e.expense_type or "") == "Obligation" and e.obligation_amount is not None:
-                totals["Obligation"] += Decimal(str(e.obligation_amount))
-
+        totals = expense_totals[p.id]
         total_expenses = sum(totals.values(), Decimal("0"))
         overall_expense_total += total_expenses
         balance = contract_price - total_expenses
@@ -287,6 +387,8 @@ def export_balance_sheet_pdf():
         per_project_rows.append((p, contract_price, totals, total_expenses, balance))
 
     overall_balance = overall_contract_total - overall_expense_total
+    report_progress(40)
+    trace_phase("layout")
 
     buf = io.BytesIO()
     doc = SimpleDocTemplate(buf, pagesize=letter, title="Construction Balance Sheet", topMargin=0.75 * inch)
@@ -428,11 +530,12 @@ def export_balance_sheet_pdf():
     story.append(Spacer(1, 0.1 * inch))
     story.append(details_table)
 
+    report_progress(70)
+    trace_phase("write")
     doc.build(story)
-    buf.seek(0)
 
     filename = "construction_balance_sheet.pdf" if not selected_project else f"construction_balance_sheet_project_{selected_project.id}.pdf"
-    return send_file(buf, mimetype="application/pdf", as_attachment=True, download_name=filename)
+    return buf.getvalue(), filename, "application/pdf"
 
 
 @construction_bp.route("/admin/manage-users")
@@ -514,10 +617,23 @@ def update_project_submit(project_id):
 @corporate_only
 def delete_project(project_id):
     p = ConstructionContract.query.get_or_404(project_id)
-    # Delete related project_expenses first (foreign key constraint)
-    ProjectExpense.query.filter_by(contract_id=project_id).delete()
-    db.session.delete(p)
-    db.session.commit()
+    # Archived expenses are in closed months and live only in the archive and the period snapshots
+    if project_id in archived_ref_totals(ProjectExpense, [project_id]):
+        flash("This project has expenses in archived (closed) periods and cannot be deleted.", "danger")
+        return redirect(url_for("construction.update_project"))
+
+    # Delete related project_expenses first (foreign key constraint), through the session so the
+    # closed-period guard rejects expenses dated in a closed month
+    try:
+        for expense in ProjectExpense.query.filter_by(contract_id=project_id).all():
+            db.session.delete(expense)
+        db.session.flush()
+        db.session.delete(p)
+        db.session.commit()
+    except PeriodClosedError as e:
+        db.session.rollback()
+        flash(str(e), "danger")
+        return redirect(url_for("construction.update_project"))
 
     flash("Project deleted successfully!", "danger")
     return redirect(url_for("construction.update_project"))
@@ -774,16 +890,7 @@ def add_materials(project_id):
 
     try:
         # --- UPSERT DailyInvoiceCounter ---
-        insert_stmt = pg_insert(DailyInvoiceCounter).values(
-            invoice_date=today, last_seq=1
-        ).on_conflict_do_update(
-            index_elements=[DailyInvoiceCounter.invoice_date],
-            set_=dict(last_seq=DailyInvoiceCounter.last_seq + 1),
-        ).returning(DailyInvoiceCounter.last_seq)
-
-        result = db.session.execute(insert_stmt)
-        row = result.fetchone()
-        last_seq = int(row[0]) if row else 1
+        last_seq = increment_counter(DailyInvoiceCounter, {"invoice_date": today}, "last_seq")
 
         invoice_number = f"INV-{today.strftime('%Y%m%d')}-{last_seq:04d}"
 
@@ -805,6 +912,9 @@ def add_materials(project_id):
         db.session.add_all(expenses)
         db.session.commit()
         return jsonify({"message": "Materials saved successfully!", "invoice_number": invoice_number})
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": "Error saving materials.", "error": str(e)}), 500
@@ -845,7 +955,7 @@ def add_labor(project_id):
     from decimal import Decimal
 
     data = request.get_json()
-    expense_date = data.get("expense_date")
+    expense_date = _parse_expense_date(data.get("expense_date"))
     expense_type = data.get("expense_type")
     labor_entries = data.get("labor_entries", [])
 
@@ -890,15 +1000,7 @@ def add_labor(project_id):
     try:
         with db.session.begin():  # atomic transaction
             # --- UPSERT DailyInvoiceCounter ---
-            insert_stmt = pg_insert(DailyInvoiceCounter).values(
-                invoice_date=today, last_seq=1
-            ).on_conflict_do_update(
-                index_elements=[DailyInvoiceCounter.invoice_date],
-                set_=dict(last_seq=DailyInvoiceCounter.last_seq + 1)
-            ).returning(DailyInvoiceCounter.last_seq)
-
-            result = db.session.execute(insert_stmt)
-            last_seq = result.scalar()  # safely get sequence
+            last_seq = increment_counter(DailyInvoiceCounter, {"invoice_date": today}, "last_seq")
 
             invoice_number = f"INV-{today.strftime('%Y%m%d')}-{last_seq:04d}"
 
@@ -924,6 +1026,9 @@ def add_labor(project_id):
         db.session.commit()
         return jsonify({"message": "Labor expenses saved successfully!", "invoice_number": invoice_number})
 
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": "Error saving labor expenses.", "error": str(e)}), 500
@@ -933,7 +1038,7 @@ def add_labor(project_id):
 @department_required("Construction", "Corporate")
 def add_gasoline(project_id):
     data = request.get_json()
-    expense_date = data.get("expense_date")
+    expense_date = _parse_expense_date(data.get("expense_date"))
     expense_type = data.get("expense_type")
     gasoline_entries = data.get("gasoline_entries", [])
 
@@ -964,15 +1069,7 @@ def add_gasoline(project_id):
     try:
         with db.session.begin():  # atomic transaction
             # --- UPSERT DailyInvoiceCounter ---
-            insert_stmt = pg_insert(DailyInvoiceCounter).values(
-                invoice_date=today, last_seq=1
-            ).on_conflict_do_update(
-                index_elements=[DailyInvoiceCounter.invoice_date],
-                set_=dict(last_seq=DailyInvoiceCounter.last_seq + 1)
-            ).returning(DailyInvoiceCounter.last_seq)
-
-            result = db.session.execute(insert_stmt)
-            last_seq = result.scalar()  # safely get sequence
+            last_seq = increment_counter(DailyInvoiceCounter, {"invoice_date": today}, "last_seq")
 
             invoice_number = f"INV-{today.strftime('%Y%m%d')}-{last_seq:04d}"
 
@@ -993,6 +1090,9 @@ def add_gasoline(project_id):
         db.session.commit()
         return jsonify({"message": "Gasoline expenses saved successfully!", "invoice_number": invoice_number})
 
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": "Error saving gasoline expenses.", "error": str(e)}), 500
@@ -1002,7 +1102,7 @@ def add_gasoline(project_id):
 @department_required("Construction", "Corporate")
 def add_documents(project_id):
     data = request.get_json()
-    expense_date = data.get("expense_date")
+    expense_date = _parse_expense_date(data.get("expense_date"))
     expense_type = data.get("expense_type")
     document_entries = data.get("document_entries", [])
 
@@ -1035,15 +1135,7 @@ def add_documents(project_id):
     try:
         with db.session.begin():  # atomic transaction
             # --- UPSERT DailyInvoiceCounter ---
-            insert_stmt = pg_insert(DailyInvoiceCounter).values(
-                invoice_date=today, last_seq=1
-            ).on_conflict_do_update(
-                index_elements=[DailyInvoiceCounter.invoice_date],
-                set_=dict(last_seq=DailyInvoiceCounter.last_seq + 1)
-            ).returning(DailyInvoiceCounter.last_seq)
-
-            result = db.session.execute(insert_stmt)
-            last_seq = result.scalar()  # safely get sequence
+            last_seq = increment_counter(DailyInvoiceCounter, {"invoice_date": today}, "last_seq")
 
             invoice_number = f"INV-{today.strftime('%Y%m%d')}-{last_seq:04d}"
 
@@ -1065,6 +1157,9 @@ def add_documents(project_id):
         db.session.commit()
         return jsonify({"message": "Document expenses saved successfully!", "invoice_number": invoice_number})
 
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": "Error saving document expenses.", "error": str(e)}), 500
@@ -1074,7 +1169,7 @@ def add_documents(project_id):
 @department_required("Construction", "Corporate")
 def add_obligation(project_id):
     data = request.get_json()
-    expense_date = data.get("expense_date")
+    expense_date = _parse_expense_date(data.get("expense_date"))
     expense_type = data.get("expense_type")
     obligation_entries = data.get("obligation_entries", [])
 
@@ -1107,15 +1202,7 @@ def add_obligation(project_id):
     try:
         with db.session.begin():  # atomic transaction
             # --- UPSERT DailyInvoiceCounter ---
-            insert_stmt = pg_insert(DailyInvoiceCounter).values(
-                invoice_date=today, last_seq=1
-            ).on_conflict_do_update(
-                index_elements=[DailyInvoiceCounter.invoice_date],
-                set_=dict(last_seq=DailyInvoiceCounter.last_seq + 1)
-            ).returning(DailyInvoiceCounter.last_seq)
-
-            result = db.session.execute(insert_stmt)
-            last_seq = result.scalar()  # safely get sequence
+            last_seq = increment_counter(DailyInvoiceCounter, {"invoice_date": today}, "last_seq")
 
             invoice_number = f"INV-{today.strftime('%Y%m%d')}-{last_seq:04d}"
 
@@ -1137,6 +1224,9 @@ def add_obligation(project_id):
         db.session.commit()
         return jsonify({"message": "Obligation expenses saved successfully!", "invoice_number": invoice_number})
 
+    except PeriodClosedError as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": "Error saving obligation expenses.", "error": str(e)}), 500
@@ -1146,7 +1236,7 @@ def add_obligation(project_id):
 @department_required("Construction", "Corporate")
 def add_activity(project_id):
     data = request.get_json()
-    expense_date = data.get("expense_date")
+    expense_date = _parse_expense_date(data.get("expense_date"))
     expense_type = data.get("expense_type")
     activity_entries = data.get("activity_entries", [])
 
@@ -1273,7 +1363,7 @@ def get_activities(project_id):
                 "activity_date": activity_date_str,
                 "activity_time": activity_time_str,
                 "activity_status": act.activity_status or "Pending",
-                "expense_date": act.expense_date.strftime("%Y-%m-%d") if act.expense_date else "",
+                "expense_date": act.expense_date or "",
                 "created_at": act.created_at.strftime("%Y-%m-%d %H:%M:%S") if act.created_at else ""
             })
         
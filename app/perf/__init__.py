@@ -0,0 +1,2 @@
+# app/perf/__init__.py
+"""Request performance instrumentation (SQL / template timing, Server-Timing, /admin/perf)."""
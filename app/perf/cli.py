@@ -0,0 +1,99 @@
+# app/perf/cli.py
+"""`flask slow-queries top|show` and `flask traces recent|show`."""
+import json
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from .slow_queries import read_entries, top_offenders, plan_summary
+from .tracing import read_spans, recent_roots, waterfall
+
+
+@click.group("slow-queries")
+def slow_queries_cli():
+    """Read the slow query log (SLOW_QUERY_LOG)."""
+
+
+@slow_queries_cli.command("top")
+@click.option("--limit", type=int, default=15, show_default=True)
+@click.option("--hours", type=float, default=None, help="Only entries from the last N hours.")
+@click.option("--sort", type=click.Choice(["total", "count", "max", "p95"]), default="total", show_default=True)
+@click.option("--file", "path", default=None, help="Log file (default: SLOW_QUERY_LOG).")
+@with_appcontext
+def top_slow_queries_command(limit, hours, sort, path):
+    """Top offenders by fingerprint."""
+    path = path or current_app.config["SLOW_QUERY_LOG"]
+    since = time.time() - hours * 3600 if hours else None
+    groups = top_offenders(read_entries(path, since=since), sort=sort)
+    if not groups:
+        click.echo(f"No slow queries in {path}.")
+        return
+    for g in groups[:limit]:
+        routes = ", ".join(f"{route} ({n})" for route, n in sorted(g["routes"].items(), key=lambda r: -r[1])[:3])
+        click.echo(
+            f"{g['fingerprint']}  count={g['count']} total={g['total_ms']}ms avg={g['avg_ms']}ms "
+            f"p95={g['p95_ms']}ms max={g['max_ms']}ms  last={g['last_seen']}"
+        )
+        click.echo(f"    {g['sql'][:300]}")
+        click.echo(f"    routes: {routes}")
+        summary = plan_summary(g["plan"])
+        if summary:
+            click.echo(f"    plan: {summary}")
+
+
+@slow_queries_cli.command("show")
+@click.argument("fingerprint")
+@click.option("--file", "path", default=None, help="Log file (default: SLOW_QUERY_LOG).")
+@with_appcontext
+def show_slow_query_command(fingerprint, path):
+    """The latest entry (with its full plan) for FINGERPRINT."""
+    path = path or current_app.config["SLOW_QUERY_LOG"]
+    latest = None
+    for entry in read_entries(path):
+        if entry["fingerprint"].startswith(fingerprint) and (entry.get("plan") or latest is None):
+            latest = entry
+    if latest is None:
+        raise click.ClickException(f"No entry for {fingerprint}.")
+    click.echo(json.dumps(latest, indent=2))
+
+
+@click.group("traces")
+def traces_cli():
+    """Read exported request/job traces (TRACE_LOG)."""
+
+
+@traces_cli.command("recent")
+@click.option("--limit", type=int, default=20, show_default=True)
+@click.option("--file", "path", default=None, help="Trace log (default: TRACE_LOG).")
+@with_appcontext
+def recent_traces_command(limit, path):
+    """The latest traced requests and jobs."""
+    path = path or current_app.config["TRACE_LOG"]
+    roots = recent_roots(path, limit=limit)
+    if not roots:
+        click.echo(f"No traces in {path}.")
+        return
+    for root in roots:
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(root["start"]))
+        attrs = root["attrs"]
+        what = f"{attrs.get('method', '')} {attrs.get('route', '')}".strip() or root["name"]
+        click.echo(f"{root['trace_id']}  {when}  {root['duration_ms']:>9.1f}ms  {attrs.get('status', root['status'])}  {what}")
+
+
+@traces_cli.command("show")
+@click.argument("trace_id")
+@click.option("--width", type=int, default=50, show_default=True)
+@click.option("--file", "path", default=None, help="Trace log (default: TRACE_LOG).")
+@with_appcontext
+def show_trace_command(trace_id, width, path):
+    """Waterfall of the spans of TRACE_ID (a prefix is enough)."""
+    path = path or current_app.config["TRACE_LOG"]
+    spans = read_spans(path, trace_id)
+    if not spans:
+        raise click.ClickException(f"No spans for {trace_id} (unsampled, rotated out, or still queued).")
+    click.echo(f"trace {spans[0]['trace_id']}  spans: {len(spans)}")
+    click.echo(f"{'start ms':>9} {'duration':>11} |{'':<{width}}|")
+    for line in waterfall(spans, width=width):
+        click.echo(line)
@@ -0,0 +1,232 @@
+# app/perf/instrumentation.py
+"""
+Per-request SQL and template timing.
+
+`init_perf(app, db)` hooks every engine's before/after_cursor_execute and Flask's template
+render signals. While a request runs, a `RequestPerf` on `g` counts statements, SQL time,
+the slowest statement, how often each statement text repeats and the template render time.
+When the request finishes:
+- the numbers go out in a `Server-Timing` header (visible in the browser's network panel);
+- a `PerfRecord` is appended to a fixed-size ring buffer that /admin/perf summarises
+  (slowest requests, per-route p50/p95, statements repeated within one request, i.e. N+1).
+
+Cost per statement is two perf_counter() calls and a dict update keyed by the statement
+string SQLAlchemy already caches, so it is left on in production (PERF_INSTRUMENTATION).
+The buffer is per process, like /admin/db-pool.
+"""
+import time
+from collections import deque, namedtuple
+
+from flask import g, request, has_app_context, before_render_template, template_rendered
+from sqlalchemy import event
+
+PerfRecord = namedtuple(
+    "PerfRecord",
+    "at method route status total_ms sql_ms sql_count render_ms slowest_ms slowest_sql repeated",
+)
+
+_ring = deque(maxlen=2000)
+
+
+class RequestPerf:
+    """Counters for the request in progress."""
+
+    __slots__ = ("started", "sql_count", "sql_time", "slowest_time", "slowest_sql", "statements",
+                 "render_time", "render_started")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = None
+        self.statements = {}  # statement text -> [executions, seconds]
+        self.render_time = 0.0
+        self.render_started = []
+
+    def add_statement(self, statement, seconds):
+        self.sql_count += 1
+        self.sql_time += seconds
+        if seconds > self.slowest_time:
+            self.slowest_time = seconds
+            self.slowest_sql = statement
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.statements[statement] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def repeated(self, threshold):
+        """(statement, executions, ms) for statements run at least `threshold` times, most frequent first."""
+        rows = [(s, n, round(t * 1000, 3)) for s, (n, t) in self.statements.items() if n >= threshold]
+        return tuple(sorted(rows, key=lambda r: -r[1]))
+
+
+def current_perf():
+    """The RequestPerf of the request in progress, or None (CLI, worker, instrumentation off)."""
+    if has_app_context():
+        return g.get("_perf")
+    return None
+
+
+# ----------------------------
+# HOOKS
+# ----------------------------
+def _attach_sql_timing(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if current_perf() is not None:
+            conn.info.setdefault("perf_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        perf = current_perf()
+        started = conn.info.get("perf_started")
+        if perf is None or not started:
+            return
+        perf.add_statement(statement, time.perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        started = conn.info.get("perf_started") if conn is not None else None
+        if started:
+            started.pop()
+
+
+def _template_started(sender, template, context, **extra):
+    perf = current_perf()
+    if perf is not None:
+        perf.render_started.append(time.perf_counter())
+
+
+def _template_finished(sender, template, context, **extra):
+    perf = current_perf()
+    if perf is not None and perf.render_started:
+        started = perf.render_started.pop()
+        if not perf.render_started:  # nested renders are already inside the outer one
+            perf.render_time += time.perf_counter() - started
+
+
+def _server_timing(perf, total):
+    return (
+        f'sql;dur={perf.sql_time * 1000:.1f};desc="{perf.sql_count} queries", '
+        f"tpl;dur={perf.render_time * 1000:.1f}, "
+        f"app;dur={total * 1000:.1f}"
+    )
+
+
+def _route():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "<unmatched>"
+
+
+def init_perf(app, db):
+    """Install the hooks (no-op when PERF_INSTRUMENTATION is off)."""
+    if not app.config.get("PERF_INSTRUMENTATION", True):
+        return
+    global _ring
+    _ring = deque(_ring, maxlen=app.config.get("PERF_RING_SIZE", 2000))
+    threshold = app.config.get("PERF_REPEAT_THRESHOLD", 5)
+    send_header = app.config.get("PERF_SERVER_TIMING", True)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _attach_sql_timing(engine)
+    before_render_template.connect(_template_started, app, weak=False)
+    template_rendered.connect(_template_finished, app, weak=False)
+
+    @app.before_request
+    def _start_perf():
+        if request.endpoint not in ("static", "assets"):
+            g._perf = RequestPerf()
+
+    @app.after_request
+    def _finish_perf(response):
+        perf = g.pop("_perf", None)
+        if perf is None:
+            return response
+        total = time.perf_counter() - perf.started
+        if send_header:
+            response.headers.add("Server-Timing", _server_timing(perf, total))
+        _ring.append(PerfRecord(
+            at=time.time(),
+            method=request.method,
+            route=_route(),
+            status=response.status_code,
+            total_ms=round(total * 1000, 3),
+            sql_ms=round(perf.sql_time * 1000, 3),
+            sql_count=perf.sql_count,
+            render_ms=round(perf.render_time * 1000, 3),
+            slowest_ms=round(perf.slowest_time * 1000, 3),
+            slowest_sql=perf.slowest_sql,
+            repeated=perf.repeated(threshold),
+        ))
+        return response
+
+
+# ----------------------------
+# READOUT
+# ----------------------------
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def recent_records():
+    return list(_ring)
+
+
+def reset_records():
+    _ring.clear()
+
+
+def perf_summary(limit=20):
+    """Per-route latency, the slowest requests and the statements most repeated within a request."""
+    records = recent_records()
+
+    by_route = {}
+    for r in records:
+        by_route.setdefault((r.method, r.route), []).append(r)
+    routes = []
+    for (method, route), rows in by_route.items():
+        totals = sorted(r.total_ms for r in rows)
+        routes.append({
+            "method": method,
+            "route": route,
+            "requests": len(rows),
+            "p50_ms": _quantile(totals, 0.50),
+            "p95_ms": _quantile(totals, 0.95),
+            "max_ms": totals[-1],
+            "avg_sql_count": round(sum(r.sql_count for r in rows) / len(rows), 1),
+            "avg_sql_ms": round(sum(r.sql_ms for r in rows) / len(rows), 3),
+            "avg_render_ms": round(sum(r.render_ms for r in rows) / len(rows), 3),
+        })
+    routes.sort(key=lambda x: -x["p95_ms"])
+
+    repeated = {}
+    for r in records:
+        for statement, executions, ms in r.repeated:
+            entry = repeated.setdefault(statement, {
+                "statement": statement, "requests": 0, "executions": 0, "max_per_request": 0,
+                "total_ms": 0.0, "routes": set(),
+            })
+            entry["requests"] += 1
+            entry["executions"] += executions
+            entry["max_per_request"] = max(entry["max_per_request"], executions)
+            entry["total_ms"] = round(entry["total_ms"] + ms, 3)
+            entry["routes"].add(f"{r.method} {r.route}")
+    top_repeated = sorted(repeated.values(), key=lambda x: -x["executions"])[:limit]
+    for entry in top_repeated:
+        entry["routes"] = sorted(entry["routes"])
+
+    slowest = sorted(records, key=lambda r: -r.total_ms)[:limit]
+    return {
+        "requests": len(records),
+        "since": min((r.at for r in records), default=None),
+        "routes": routes[:limit],
+        "slowest": [r._asdict() for r in slowest],
+        "repeated": top_repeated,
+    }
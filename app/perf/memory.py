@@ -0,0 +1,263 @@
+# app/perf/memory.py
+"""
+Memory profiling for report builders and exports (MEMORY_PROFILING, off by default).
+
+`track_memory(name)` (or the `@memory_profiled(name)` decorator) runs a block under
+tracemalloc and records:
+- peak and retained bytes allocated during the block;
+- the top allocation sites, from a snapshot taken while memory was near its peak;
+- ORM objects loaded during the block, per model, and the session's identity-map size.
+
+Records go to MEMORY_PROFILE_LOG, a small rotating JSONL file shared by the web and worker
+processes. A "start" line is written before the block runs, so an export that gets the process
+killed (e.g. by the host's memory limit) still shows up, as a run without a result.
+Admins see the last MEMORY_HISTORY_SIZE runs at /admin/memory. Runs above MEMORY_BUDGET_MB
+are flagged and logged as warnings.
+
+tracemalloc is process-wide: one block is tracked at a time (others run untracked), and
+allocations by other threads during that block are included in its numbers.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+TOP_SITES = 10
+WATCH_INTERVAL = 0.05
+SNAPSHOT_GROWTH = 1.10  # re-snapshot when traced memory grows 10% past the last snapshot
+SNAPSHOT_MIN_BYTES = 1024 * 1024
+
+_config = {"enabled": False}
+_busy = threading.Lock()
+_log = logging.getLogger("wvc.memory_profiles")
+_log.propagate = False
+_log.setLevel(logging.INFO)
+
+
+class _Run:
+    """State of the block being tracked."""
+
+    def __init__(self, name, info):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.info = info
+        self.thread_id = threading.get_ident()
+        self.loaded = Counter()
+        self.peak_snapshot = None
+        self.peak_snapshot_size = 0
+        self._stop_event = threading.Event()
+        self._watcher = threading.Thread(target=self._watch, name="memory-profile", daemon=True)
+
+    def _watch(self):
+        while not self._stop_event.wait(WATCH_INTERVAL):
+            self.maybe_snapshot()
+
+    def maybe_snapshot(self):
+        current, _peak = tracemalloc.get_traced_memory()
+        if current >= SNAPSHOT_MIN_BYTES and current > self.peak_snapshot_size * SNAPSHOT_GROWTH:
+            self.peak_snapshot = tracemalloc.take_snapshot()
+            self.peak_snapshot_size = current
+
+    def start(self):
+        self._watcher.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._watcher.join()
+
+
+_run = None
+
+
+def _on_load(target, context):
+    run = _run
+    if run is not None and threading.get_ident() == run.thread_id:
+        run.loaded[type(target).__name__] += 1
+
+
+def _short_path(filename):
+    head, sep, tail = filename.rpartition("site-packages" + os.sep)
+    if sep:
+        return tail
+    head, sep, tail = filename.rpartition(os.sep + "app" + os.sep)
+    return "app" + os.sep + tail if sep else filename
+
+
+def _top_sites(snapshot):
+    if snapshot is None:
+        return []
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    return [
+        {
+            "site": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+            "kb": round(stat.size / 1024, 1),
+            "blocks": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:TOP_SITES]
+    ]
+
+
+def _identity_map_size():
+    try:
+        from ..extensions import db
+        return len(db.session.identity_map)
+    except Exception:
+        return None
+
+
+def _write(record):
+    try:
+        _log.info(json.dumps(record, default=str))
+    except Exception as e:
+        logger.warning("Memory profile log: %s", e)
+
+
+@contextmanager
+def track_memory(name, **info):
+    """Track allocations of the enclosed block as run `name` (no-op unless MEMORY_PROFILING is on)."""
+    global _run
+    if not _config["enabled"] or not _busy.acquire(blocking=False):
+        yield None
+        return
+
+    run = _Run(name, info)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(_config["frames"])
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    _write({"event": "start", "id": run.id, "name": name, "pid": os.getpid(), "at": time.time(), "info": info})
+    _run = run
+    run.start()
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield run
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        run.stop()
+        _run = None
+        current, peak = tracemalloc.get_traced_memory()
+        if peak >= run.peak_snapshot_size * SNAPSHOT_GROWTH:
+            run.maybe_snapshot()  # a short block may finish before the watcher's first look
+        sites = _top_sites(run.peak_snapshot or tracemalloc.take_snapshot())
+        if started_tracing:
+            tracemalloc.stop()
+        _busy.release()
+
+        peak_bytes = peak - baseline
+        budget = _config["budget_bytes"]
+        record = {
+            "event": "end",
+            "id": run.id,
+            "name": name,
+            "pid": os.getpid(),
+            "at": time.time(),
+            "info": info,
+            "status": status,
+            "duration_ms": round(duration * 1000, 1),
+            "peak_bytes": peak_bytes,
+            "retained_bytes": current - baseline,
+            "budget_bytes": budget,
+            "over_budget": bool(budget and peak_bytes > budget),
+            "top_sites": sites,
+            "orm_loaded": dict(run.loaded.most_common()),
+            "identity_map": _identity_map_size(),
+        }
+        _write(record)
+        if record["over_budget"]:
+            logger.warning("%s peaked at %.1f MB (budget %.1f MB)", name, peak_bytes / 2**20, budget / 2**20)
+        _config["last_record"] = record
+
+
+def memory_profiled(name):
+    """Decorator form of `track_memory(name)`; the call's keyword arguments are recorded with the run."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _config["enabled"]:
+                return fn(*args, **kwargs)
+            with track_memory(name, **{k: v for k, v in kwargs.items() if isinstance(v, (str, int, float))}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def tracked_chunks(name, chunks, **info):
+    """Wrap a response generator so its whole iteration (where streamed exports do their work) is tracked."""
+    if not _config["enabled"]:
+        return chunks
+
+    def generate():
+        with track_memory(name, **info):
+            yield from chunks
+    return generate()
+
+
+def last_record():
+    """The most recent completed run in this process (used by the budget check)."""
+    return _config.get("last_record")
+
+
+# ----------------------------
+# SETUP / HISTORY
+# ----------------------------
+def init_memory_profiling(app, db):
+    _config.update(
+        enabled=app.config.get("MEMORY_PROFILING", False),
+        frames=app.config.get("MEMORY_PROFILE_FRAMES", 1),
+        budget_bytes=int(app.config.get("MEMORY_BUDGET_MB", 0) * 1024 * 1024),
+        path=app.config["MEMORY_PROFILE_LOG"],
+    )
+    if not _config["enabled"]:
+        return
+    path = os.path.abspath(app.config["MEMORY_PROFILE_LOG"])
+    if not any(getattr(h, "baseFilename", None) == path for h in _log.handlers):
+        for handler in list(_log.handlers):
+            _log.removeHandler(handler)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=app.config.get("MEMORY_PROFILE_LOG_MAX_BYTES", 1024 * 1024), backupCount=1, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _log.addHandler(handler)
+
+    from sqlalchemy import event
+    if not event.contains(db.Model, "load", _on_load):
+        event.listen(db.Model, "load", _on_load, propagate=True)
+
+
+def memory_history(path, limit=50):
+    """The last `limit` runs, newest first. Runs that started but never finished have status "no result"."""
+    lines = []
+    for file_path in (f"{path}.1", path):
+        if os.path.exists(file_path):
+            with open(file_path, encoding="utf-8") as f:
+                lines.extend(f.readlines())
+    runs = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if entry.get("event") == "start":
+            runs.setdefault(entry["id"], {**entry, "status": "no result"})
+        elif entry.get("event") == "end":
+            runs[entry["id"]] = entry
+    history = sorted(runs.values(), key=lambda r: r["at"], reverse=True)
+    return history[:limit]
@@ -0,0 +1,423 @@
+# app/perf/metrics.py
+"""
+`/metrics` in the Prometheus text format (METRICS_TOKEN, off when unset).
+
+Exposed:
+- wvc_http_requests_total / wvc_http_request_duration_seconds, per blueprint and endpoint
+  (the endpoint name, never the raw path, so the label set stays small);
+- wvc_db_pool_*: pool size, connections in use, overflow, checkouts, timeouts and the
+  checkout wait histogram (app/database/pool.py);
+- wvc_cache_requests_total{cache,result} and the derived wvc_cache_hit_ratio. The only cache
+  today is SQLAlchemy's compiled-statement cache ("sql_compiled"); others report through
+  `record_cache(name, hit)`;
+- wvc_jobs{status} and wvc_jobs_oldest_queued_seconds, read from the jobs table at scrape time;
+- wvc_export_duration_seconds{export,format,status} for PDF builders and streamed CSV/XLSX.
+
+Multi-process servers: with METRICS_DIR set (gunicorn.conf.py sets one), every process writes
+its counters to `<dir>/<host>-<pid>.json` every METRICS_FLUSH_SECONDS and at exit, and a scrape
+sums the files of all processes, whichever worker answers it. Counters of exited workers stay in
+the sum; gauges only count from files refreshed in the last few flush intervals. Without
+METRICS_DIR the numbers are this process's only.
+
+No Prometheus client library or server is needed: `curl -H "Authorization: Bearer $METRICS_TOKEN"`.
+"""
+import atexit
+import glob
+import hmac
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from functools import wraps
+
+from flask import Response, abort, g, request
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+EXPORT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+STALE_FLUSHES = 3  # gauges from a file older than this many flush intervals are dropped
+
+METRICS = {
+    "wvc_http_requests_total": ("counter", "HTTP requests by blueprint, endpoint, method and status."),
+    "wvc_http_request_duration_seconds": (
+        "histogram", "Time to build the response (streamed bodies excluded), by blueprint and endpoint."
+    ),
+    "wvc_export_duration_seconds": ("histogram", "PDF builds and streamed CSV/XLSX exports, start to last byte."),
+    "wvc_cache_requests_total": ("counter", "Cache lookups by cache and result (hit / miss)."),
+    "wvc_cache_hit_ratio": ("gauge", "hits / (hits + misses) since the counters started."),
+    "wvc_db_pool_size": ("gauge", "Configured pool size, summed over live processes."),
+    "wvc_db_pool_checked_out": ("gauge", "Connections in use, summed over live processes."),
+    "wvc_db_pool_overflow": ("gauge", "Connections opened beyond pool_size, summed over live processes."),
+    "wvc_db_pool_peak_in_use": ("gauge", "Highest connections in use seen by a single process."),
+    "wvc_db_pool_checkouts_total": ("counter", "Successful pool checkouts."),
+    "wvc_db_pool_timeouts_total": ("counter", "Checkouts that gave up waiting for a connection."),
+    "wvc_db_pool_checkout_wait_seconds": ("histogram", "Time spent waiting for a pooled connection."),
+    "wvc_jobs": ("gauge", "Background jobs by status."),
+    "wvc_jobs_oldest_queued_seconds": ("gauge", "Age of the oldest queued job (0 when the queue is empty)."),
+    "wvc_metrics_processes": ("gauge", "Processes whose metrics are in this scrape."),
+}
+
+_config = {"dir": None, "flush_interval": 5.0, "engines": {}}
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> value
+_histograms = {}  # (name, labels) -> [bucket bounds, per-bucket counts (+Inf last), sum]
+_flusher = {"pid": None}
+
+
+def _labels(**labels):
+    return tuple(sorted((k, "" if v is None else str(v)) for k, v in labels.items()))
+
+
+# ----------------------------
+# RECORDING
+# ----------------------------
+def _ensure_process():
+    """Start the flush thread in this process (and forget counts inherited through fork)."""
+    pid = os.getpid()
+    if _flusher["pid"] == pid:
+        return
+    with _lock:
+        if _flusher["pid"] == pid:
+            return
+        if _flusher["pid"] is not None:
+            _counters.clear()
+            _histograms.clear()
+        _flusher["pid"] = pid
+    if _config["dir"]:
+        threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True).start()
+
+
+def inc(name, value=1, **labels):
+    _ensure_process()
+    key = (name, _labels(**labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, seconds, buckets=LATENCY_BUCKETS, **labels):
+    _ensure_process()
+    key = (name, _labels(**labels))
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [buckets, [0] * (len(buckets) + 1), 0.0]
+        for i, bound in enumerate(buckets):
+            if seconds <= bound:
+                entry[1][i] += 1
+                break
+        else:
+            entry[1][-1] += 1
+        entry[2] += seconds
+
+
+def record_cache(cache, hit):
+    """Count one lookup in `cache` (feeds wvc_cache_requests_total / wvc_cache_hit_ratio)."""
+    inc("wvc_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def export_timed(name, fmt="pdf"):
+    """Decorator: observe the call's duration as export `name` in wvc_export_duration_seconds."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            status = "error"
+            try:
+                result = fn(*args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                observe("wvc_export_duration_seconds", time.perf_counter() - started, EXPORT_BUCKETS,
+                        export=name, format=fmt, status=status)
+        return wrapper
+    return decorator
+
+
+def timed_chunks(name, fmt, chunks):
+    """Wrap a streamed export's generator so its whole iteration is observed as one export."""
+    def generate():
+        started = time.perf_counter()
+        status = "error"
+        try:
+            yield from chunks
+            status = "ok"
+        finally:
+            # A client that disconnects closes the generator early: counted as "error"
+            observe("wvc_export_duration_seconds", time.perf_counter() - started, EXPORT_BUCKETS,
+                    export=name, format=fmt, status=status)
+    return generate()
+
+
+# ----------------------------
+# PROCESS STATE / FILES
+# ----------------------------
+def _pool_state():
+    """Gauges and counters of this process's pools, read at snapshot time."""
+    from ..database.pool import WAIT_BUCKETS, stats_for, _pool_name
+
+    gauges, counters, histograms = [], [], []
+    for engine in _config["engines"].values():
+        pool = engine.pool
+        name = _pool_name(pool)
+        labels = _labels(pool=name)
+        for metric, method in (("wvc_db_pool_size", "size"), ("wvc_db_pool_checked_out", "checkedout"),
+                               ("wvc_db_pool_overflow", "overflow")):
+            if hasattr(pool, method):
+                gauges.append([metric, labels, max(0, getattr(pool, method)())])
+        stats = stats_for(name)
+        gauges.append(["wvc_db_pool_peak_in_use", labels, stats.peak_in_use])
+        checkouts, timeouts, wait_total, wait_buckets = stats.counters()
+        counters.append(["wvc_db_pool_checkouts_total", labels, checkouts])
+        counters.append(["wvc_db_pool_timeouts_total", labels, timeouts])
+        histograms.append(["wvc_db_pool_checkout_wait_seconds", labels, list(WAIT_BUCKETS), wait_buckets, wait_total])
+    return gauges, counters, histograms
+
+
+def _snapshot():
+    pool_gauges, pool_counters, pool_histograms = _pool_state()
+    with _lock:
+        counters = [[name, labels, value] for (name, labels), value in _counters.items()]
+        histograms = [
+            [name, labels, list(bounds), list(counts), total]
+            for (name, labels), (bounds, counts, total) in _histograms.items()
+        ]
+    return {
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        "at": time.time(),
+        "counters": counters + pool_counters,
+        "histograms": histograms + pool_histograms,
+        "gauges": pool_gauges,
+    }
+
+
+def _file_path():
+    return os.path.join(_config["dir"], f"{socket.gethostname()}-{os.getpid()}.json")
+
+
+def flush():
+    """Write this process's numbers to METRICS_DIR (atomic replace; no-op without a directory)."""
+    if not _config["dir"] or _flusher["pid"] != os.getpid():
+        return
+    path = _file_path()
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_snapshot(), f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning("Metrics flush to %s failed: %s", path, e)
+
+
+def _flush_loop():
+    pid = os.getpid()
+    while _flusher["pid"] == pid:
+        time.sleep(_config["flush_interval"])
+        flush()
+
+
+def clear_directory(directory):
+    """Remove the per-process files (gunicorn.conf.py calls this when the server starts)."""
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _process_states():
+    own = _snapshot()
+    if not _config["dir"]:
+        return [own]
+    own_path = _file_path()
+    stale_before = time.time() - STALE_FLUSHES * _config["flush_interval"]
+    states = [own]
+    for path in glob.glob(os.path.join(_config["dir"], "*.json")):
+        if path == own_path:
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            continue  # being replaced right now, or not ours
+        if state.get("at", 0) < stale_before:
+            state["gauges"] = []  # process gone (or stuck): keep its counters, not its gauges
+        states.append(state)
+    return states
+
+
+# ----------------------------
+# EXPOSITION
+# ----------------------------
+def _merge(states):
+    counters, gauges, histograms = {}, {}, {}
+    processes = 0
+    for state in states:
+        if state["gauges"] or state is states[0]:
+            processes += 1
+        for name, labels, value in state["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, value in state["gauges"]:
+            key = (name, tuple(map(tuple, labels)))
+            if name == "wvc_db_pool_peak_in_use":
+                gauges[key] = max(gauges.get(key, 0), value)
+            else:
+                gauges[key] = gauges.get(key, 0) + value
+        for name, labels, bounds, counts, total in state["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.get(key)
+            if merged is None or merged[0] != list(bounds):
+                histograms[key] = [list(bounds), list(counts), total]
+            else:
+                merged[1] = [a + b for a, b in zip(merged[1], counts)]
+                merged[2] += total
+    gauges[("wvc_metrics_processes", ())] = processes
+    return counters, gauges, histograms
+
+
+def _cache_ratios(counters):
+    totals = {}
+    for (name, labels), value in counters.items():
+        if name == "wvc_cache_requests_total":
+            label_map = dict(labels)
+            hits, lookups = totals.get(label_map["cache"], (0, 0))
+            totals[label_map["cache"]] = (hits + (value if label_map["result"] == "hit" else 0), lookups + value)
+    return {
+        ("wvc_cache_hit_ratio", (("cache", cache),)): hits / lookups
+        for cache, (hits, lookups) in totals.items() if lookups
+    }
+
+
+def _job_gauges():
+    from datetime import datetime
+    from sqlalchemy import func
+    from ..extensions import db
+    from ..jobs.models import Job
+
+    gauges = {("wvc_jobs", (("status", status),)): 0 for status in ("queued", "running", "done", "failed")}
+    try:
+        for status, count in db.session.query(Job.status, func.count(Job.id)).group_by(Job.status):
+            gauges[("wvc_jobs", (("status", status),))] = count
+        oldest = db.session.query(func.min(Job.created_at)).filter(Job.status == "queued").scalar()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning("Metrics: job queue depth unavailable: %s", e)
+        return {}
+    gauges[("wvc_jobs_oldest_queued_seconds", ())] = (
+        max(0.0, (datetime.utcnow() - oldest).total_seconds()) if oldest else 0
+    )
+    return gauges
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+def render(states=None):
+    """The exposition text for every process in `states` (default: all of them)."""
+    counters, gauges, histograms = _merge(states if states is not None else _process_states())
+    gauges.update(_cache_ratios(counters))
+    gauges.update(_job_gauges())
+
+    by_name = {}
+    for (name, labels), value in counters.items():
+        by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_number(value)}")
+    for (name, labels), value in gauges.items():
+        by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_number(value)}")
+    for (name, labels), (bounds, counts, total) in histograms.items():
+        lines = by_name.setdefault(name, [])
+        cumulative = 0
+        for bound, count in zip(list(bounds) + ["+Inf"], counts):
+            cumulative += count
+            le = bound if bound == "+Inf" else _number(float(bound))
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_number(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+    out = []
+    for name in sorted(by_name):
+        kind, help_text = METRICS.get(name, ("untyped", ""))
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(sorted(by_name[name]) if kind != "histogram" else by_name[name])
+    return "\n".join(out) + "\n"
+
+
+# ----------------------------
+# SETUP
+# ----------------------------
+def _attach_cache_stats(engine):
+    from sqlalchemy import event
+    from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CACHE_HIT:
+            record_cache("sql_compiled", True)
+        elif cache_hit is CACHE_MISS:
+            record_cache("sql_compiled", False)
+
+
+def _authorized(token):
+    header = request.headers.get("Authorization", "")
+    supplied = header[7:].strip() if header.lower().startswith("bearer ") else request.args.get("token", "")
+    return hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def init_metrics(app, db):
+    """Count requests, hook the SQL cache stats and serve `/metrics` (404 until METRICS_TOKEN is set)."""
+    directory = app.config.get("METRICS_DIR") or None
+    _config.update(dir=directory, flush_interval=max(0.5, float(app.config.get("METRICS_FLUSH_SECONDS", 5))))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        atexit.register(flush)
+    with app.app_context():
+        _config["engines"] = dict(db.engines)
+        for engine in db.engines.values():
+            _attach_cache_stats(engine)
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _metrics_count(response):
+        started = g.pop("_metrics_started", None)
+        if started is None:
+            return response
+        blueprint = request.blueprint or ""
+        endpoint = request.endpoint or "unmatched"
+        inc("wvc_http_requests_total", blueprint=blueprint, endpoint=endpoint,
+            method=request.method, status=response.status_code)
+        observe("wvc_http_request_duration_seconds", time.perf_counter() - started,
+                blueprint=blueprint, endpoint=endpoint)
+        return response
+
+    def metrics():
+        token = app.config.get("METRICS_TOKEN")
+        if not token:
+            abort(404)
+        if not _authorized(token):
+            return Response("Unauthorized\n", 401, {"WWW-Authenticate": 'Bearer realm="metrics"'})
+        return Response(render(), mimetype=None, content_type=CONTENT_TYPE, headers={"Cache-Control": "no-store"})
+
+    app.add_url_rule("/metrics", "metrics", metrics)
@@ -0,0 +1,160 @@
+# app/perf/profiler.py
+"""
+On-demand request profiler for admins.
+
+An admin session adding `?__profile=1` to any URL gets, instead of the page, a zip with:
+- `profile.pstats`: cProfile data (`python -m pstats`, snakeviz, ...);
+- `profile.collapsed`: stacks sampled every PROFILER_SAMPLE_INTERVAL_MS in the
+  "frame;frame;frame count" format that flamegraph.pl / speedscope read;
+- `summary.txt`: the top functions by cumulative time;
+- `meta.json`: route, status, wall time, and the request's SQL count and time.
+
+Streamed responses (CSV/XLSX exports) are read to the end inside the profile so the
+generator's work is included. Only one request per process is profiled at a time; for
+everyone else (or with PROFILER_ENABLED off) the parameter is ignored and nothing runs.
+"""
+import cProfile
+import io
+import json
+import marshal
+import pstats
+import sys
+import threading
+import time
+import zipfile
+from collections import Counter
+
+from flask import g, request, session, send_file
+
+from .instrumentation import current_perf
+
+_busy = threading.Lock()
+
+
+def _is_admin():
+    return "user_id" in session and (session.get("role") or "").lower() == "admin"
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfile:
+    def __init__(self, interval):
+        self.started = time.perf_counter()
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), interval)
+        self.sampler.start()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.sampler.stop()
+        return time.perf_counter() - self.started
+
+
+def _route():
+    rule = request.url_rule
+    return rule.rule if rule is not None else request.path
+
+
+def _bundle(profile, response, wall):
+    stats_buffer = io.StringIO()
+    stats = pstats.Stats(profile.profiler, stream=stats_buffer)
+    stats.sort_stats("cumulative").print_stats(40)
+    perf = current_perf()
+    meta = {
+        "route": _route(),
+        "endpoint": request.endpoint,
+        "url": request.full_path,
+        "method": request.method,
+        "status": response.status_code,
+        "wall_ms": round(wall * 1000, 3),
+        "sql_count": perf.sql_count if perf else None,
+        "sql_ms": round(perf.sql_time * 1000, 3) if perf else None,
+        "render_ms": round(perf.render_time * 1000, 3) if perf else None,
+        "samples": sum(profile.sampler.stacks.values()),
+        "sample_interval_ms": profile.sampler.interval * 1000,
+    }
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("profile.pstats", marshal.dumps(stats.stats))  # what Stats.dump_stats() writes
+        zf.writestr("profile.collapsed", profile.sampler.collapsed())
+        zf.writestr("summary.txt", stats_buffer.getvalue())
+        zf.writestr("meta.json", json.dumps(meta, indent=2))
+    out.seek(0)
+    return out, meta
+
+
+def init_profiler(app):
+    """Register the `?__profile=1` hooks (skipped when PROFILER_ENABLED is off)."""
+    if not app.config.get("PROFILER_ENABLED", True):
+        return
+    interval = app.config.get("PROFILER_SAMPLE_INTERVAL_MS", 5) / 1000
+
+    @app.before_request
+    def _start_profile():
+        if not request.args.get("__profile") or not _is_admin():
+            return
+        if not _busy.acquire(blocking=False):
+            return  # another request is being profiled; serve this one normally
+        g._profile = RequestProfile(interval)
+
+    @app.after_request
+    def _finish_profile(response):
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return response
+        try:
+            if response.is_streamed:
+                response.get_data()  # run the generator inside the profile
+        finally:
+            wall = profile.stop()
+            _busy.release()
+        response.close()
+        bundle, meta = _bundle(profile, response, wall)
+        name = (request.endpoint or "request").replace(".", "-")
+        download = send_file(
+            bundle,
+            mimetype="application/zip",
+            as_attachment=True,
+            download_name=f"profile-{name}-{time.strftime('%Y%m%d-%H%M%S')}.zip",
+        )
+        download.headers["X-Profile-Route"] = meta["route"]
+        download.headers["X-Profile-Status"] = str(meta["status"])
+        download.headers["X-Profile-SQL-Count"] = str(meta["sql_count"])
+        download.headers["Cache-Control"] = "no-store"
+        return download
+
+    @app.teardown_request
+    def _abandon_profile(exc):
+        profile = g.pop("_profile", None)  # only left over when after_request did not run
+        if profile is not None:
+            profile.stop()
+            _busy.release()
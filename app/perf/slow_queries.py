@@ -0,0 +1,316 @@
+# app/perf/slow_queries.py
+"""
+Slow query log.
+
+Every statement slower than SLOW_QUERY_MS is written as one JSON line to SLOW_QUERY_LOG
+(rotated at SLOW_QUERY_LOG_MAX_BYTES, SLOW_QUERY_LOG_BACKUPS files kept) with:
+- `fingerprint` / `sql`: the statement with literals and placeholders replaced by `?` and
+  IN-lists collapsed, so the same query with different values aggregates together;
+- `params`: the type of each bound parameter (never the values);
+- `route` (or the process role outside requests), duration, dialect;
+- `plan`: `EXPLAIN (ANALYZE off, FORMAT JSON)` on Postgres, `EXPLAIN QUERY PLAN` rows on SQLite.
+
+The EXPLAIN and the file write happen on a background thread, on a connection of its own,
+so the request neither waits for them nor has its transaction held open. Each fingerprint is
+explained at most once per SLOW_QUERY_EXPLAIN_INTERVAL seconds; if the queue is full the
+entry is dropped rather than slowing the request down.
+
+`flask slow-queries top` aggregates the log (including rotated files) by fingerprint.
+"""
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+from ..database.pool import current_db_role
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+_QUEUE_SIZE = 200
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:''|[^'])*'")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+|\?")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(statement):
+    """Statement text with values and placeholders replaced by `?` and IN-lists collapsed."""
+    sql = _COMMENTS.sub(" ", statement)
+    sql = _STRINGS.sub("?", sql)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("(?...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _shape(value):
+    if value is None:
+        return "null"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def param_shapes(parameters, executemany=False):
+    """The type (and length for strings/sequences) of each bound parameter."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "row": param_shapes(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: _shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_shape(value) for value in parameters]
+    return None
+
+
+def _origin():
+    if has_request_context():
+        rule = request.url_rule
+        return f"{request.method} {rule.rule if rule is not None else request.path}"
+    return current_db_role()
+
+
+# ----------------------------
+# BACKGROUND WRITER
+# ----------------------------
+class _SlowQueryWriter:
+    """Runs EXPLAIN and writes log lines off the request thread (one thread per process)."""
+
+    def __init__(self, explain_interval):
+        self.explain_interval = explain_interval
+        self.queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        self.dropped = 0
+        self._explained_at = {}
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, item):
+        self._ensure_thread()
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()  # a forked worker has to start its own thread
+            self._thread = threading.Thread(target=self._run, name="slow-query-log", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            engine, entry, statement, parameters = self.queue.get()
+            try:
+                if parameters is not None and self._due(entry["fingerprint"]):
+                    entry["plan"] = explain_statement(engine, statement, parameters)
+                _log.info(json.dumps(entry, default=str))
+            except Exception as e:  # never let one bad entry stop the thread
+                logger.warning("Slow query log: %s", e)
+
+    def _due(self, fp):
+        now = time.monotonic()
+        last = self._explained_at.get(fp)
+        if last is not None and now - last < self.explain_interval:
+            return False
+        self._explained_at[fp] = now
+        return True
+
+
+def explain_statement(engine, statement, parameters):
+    """The plan of `statement` from a separate pooled connection; nothing is executed (no ANALYZE)."""
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        prefix = "EXPLAIN (ANALYZE off, FORMAT JSON) "
+    elif dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return None
+    try:
+        with engine.connect() as conn:
+            conn = conn.execution_options(slow_query_log=False)
+            rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+            conn.rollback()
+    except Exception as e:
+        return {"error": str(e).splitlines()[0]}
+    if dialect == "postgresql":
+        plan = rows[0][0]
+        return json.loads(plan) if isinstance(plan, str) else plan
+    return [list(row) for row in rows]
+
+
+_log = logging.getLogger("wvc.slow_queries")
+_log.propagate = False
+_log.setLevel(logging.INFO)
+_writer = None
+
+
+def _configure_file(path, max_bytes, backups):
+    for handler in list(_log.handlers):
+        if getattr(handler, "baseFilename", None) == os.path.abspath(path):
+            return
+        _log.removeHandler(handler)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _log.addHandler(handler)
+
+
+# ----------------------------
+# HOOKS
+# ----------------------------
+def _attach(engine, threshold, explain):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < threshold or not context.execution_options.get("slow_query_log", True):
+            return
+        normalized = normalize_sql(statement)
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "fingerprint": fingerprint(normalized),
+            "duration_ms": round(elapsed * 1000, 3),
+            "route": _origin(),
+            "role": current_db_role(),
+            "dialect": engine.dialect.name,
+            "sql": normalized,
+            "params": param_shapes(parameters, executemany),
+            "plan": None,
+        }
+        explain_params = None
+        if explain and not executemany and statement.lstrip().lower().startswith(_EXPLAINABLE):
+            explain_params = dict(parameters) if isinstance(parameters, dict) else tuple(parameters or ())
+        _writer.submit((engine, entry, statement, explain_params))
+
+
+def init_slow_query_log(app, db):
+    """Log statements slower than SLOW_QUERY_MS (0 turns the log off)."""
+    threshold_ms = app.config.get("SLOW_QUERY_MS", 0)
+    if not threshold_ms:
+        return
+    global _writer
+    _configure_file(
+        app.config["SLOW_QUERY_LOG"],
+        app.config.get("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024),
+        app.config.get("SLOW_QUERY_LOG_BACKUPS", 5),
+    )
+    if _writer is None:
+        _writer = _SlowQueryWriter(app.config.get("SLOW_QUERY_EXPLAIN_INTERVAL", 300))
+    with app.app_context():
+        for engine in db.engines.values():
+            _attach(engine, threshold_ms / 1000, app.config.get("SLOW_QUERY_EXPLAIN", True))
+
+
+# ----------------------------
+# READING THE LOG
+# ----------------------------
+def log_files(path):
+    """The log and its rotated backups, oldest first."""
+    backups = []
+    i = 1
+    while os.path.exists(f"{path}.{i}"):
+        backups.append(f"{path}.{i}")
+        i += 1
+    files = list(reversed(backups))
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def read_entries(path, since=None):
+    """Yield log entries (dicts), oldest first; `since` is an epoch cutoff on the entry timestamp."""
+    for file_path in log_files(path):
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by rotation
+                if since is not None:
+                    try:
+                        if time.mktime(time.strptime(entry["ts"][:19], "%Y-%m-%dT%H:%M:%S")) < since:
+                            continue
+                    except (KeyError, ValueError):
+                        continue
+                yield entry
+
+
+def plan_summary(plan):
+    """One line for a captured plan: root node, cost and any sequentially scanned tables."""
+    if not plan:
+        return ""
+    if isinstance(plan, dict):
+        return plan.get("error", "")
+    if plan and isinstance(plan[0], dict) and "Plan" in plan[0]:
+        root = plan[0]["Plan"]
+        seq = []
+
+        def walk(node):
+            if node.get("Node Type") == "Seq Scan":
+                seq.append(node.get("Relation Name", "?"))
+            for child in node.get("Plans", ()):
+                walk(child)
+
+        walk(root)
+        line = f"{root.get('Node Type')} cost={root.get('Total Cost')} rows={root.get('Plan Rows')}"
+        return line + (f" seq scan: {', '.join(sorted(set(seq)))}" if seq else "")
+    return "; ".join(str(row[-1]) for row in plan)  # SQLite: the detail column
+
+
+def top_offenders(entries, sort="total"):
+    """Aggregate entries by fingerprint: count, total/avg/p95/max ms, routes and the latest plan."""
+    groups = {}
+    for entry in entries:
+        g = groups.setdefault(entry["fingerprint"], {
+            "fingerprint": entry["fingerprint"], "sql": entry["sql"], "durations": [], "routes": {}, "plan": None,
+            "last_seen": None,
+        })
+        g["durations"].append(entry["duration_ms"])
+        g["routes"][entry.get("route")] = g["routes"].get(entry.get("route"), 0) + 1
+        g["last_seen"] = entry.get("ts")
+        if entry.get("plan"):
+            g["plan"] = entry["plan"]
+    out = []
+    for g in groups.values():
+        durations = sorted(g.pop("durations"))
+        g.update(
+            count=len(durations),
+            total_ms=round(sum(durations), 1),
+            avg_ms=round(sum(durations) / len(durations), 1),
+            p95_ms=durations[min(len(durations) - 1, int(0.95 * len(durations)))],
+            max_ms=durations[-1],
+        )
+        out.append(g)
+    key = {"total": "total_ms", "count": "count", "max": "max_ms", "p95": "p95_ms"}[sort]
+    out.sort(key=lambda g: -g[key])
+    return out
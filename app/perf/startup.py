@@ -0,0 +1,237 @@
+# app/perf/startup.py
+"""
+Cold start: template bytecode cache, warm-up and import-time profiling.
+
+Compiled templates are kept in TEMPLATE_CACHE_DIR (a Jinja FileSystemBytecodeCache) and filled
+at build/deploy time by `flask startup compile-templates`; a new worker then loads the large
+module templates' bytecode instead of recompiling thousands of lines on the first hit. Entries
+are keyed by template name and checked against the source's checksum, so an edited template is
+recompiled (and re-cached) rather than served stale. Set TEMPLATE_CACHE_DIR to "" to turn it off.
+
+`create_app()` only builds the app. The expensive one-off setup that would otherwise land on
+the first requests runs in an explicit warm-up step instead:
+- `warm_up(app)`: mapper configuration, the URL map's matcher and the Jinja environment
+  with the entry pages' templates compiled (WARM_UP_TEMPLATES; "all" compiles every one,
+  which costs more start-up time than the first hits it saves on a single worker). wsgi.py
+  runs it once per process, so with gunicorn's preload_app it happens in the master and
+  every forked worker inherits the result;
+- `warm_up_pool(app, db)`: opens WARM_UP_DB_CONNECTIONS connections per engine. It runs in
+  each gunicorn worker (post_worker_init) or in the waitress process, never in the master,
+  whose connections would only be discarded after the fork.
+
+`flask startup imports` runs `python -X importtime` on create_app() in a child process and
+shows where import time goes (per top-level package and per module); `flask startup warm-up`
+times each warm-up step. benchmarks/cold_start.py tracks time-to-first-response.
+"""
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from jinja2 import FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+_IMPORT_PROBE = "from app import create_app; create_app()"
+
+
+# ----------------------------
+# TEMPLATE BYTECODE CACHE
+# ----------------------------
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """FileSystemBytecodeCache that keeps serving when the directory is read-only (cache filled at build time)."""
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            logger.debug("template cache: could not write %s", bucket.key, exc_info=True)
+
+
+def init_template_cache(app):
+    """Give the app's Jinja environment an on-disk bytecode cache (TEMPLATE_CACHE_DIR)."""
+    directory = app.config.get("TEMPLATE_CACHE_DIR")
+    if not directory:
+        return None
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        logger.warning("template cache: %s is not available; templates compile per process", directory)
+        return None
+    cache = TemplateBytecodeCache(directory, pattern="wvc_%s.jinja")
+    # jinja_options is read when app.jinja_env is first built, so this must run before any template access
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": cache}
+    return cache
+
+
+def compile_templates(app, clear=False):
+    """Compile every .html template into the bytecode cache; returns (templates, milliseconds)."""
+    cache = app.jinja_options.get("bytecode_cache")
+    if cache is None:
+        raise click.ClickException("TEMPLATE_CACHE_DIR is not set; there is no cache to fill.")
+    if clear:
+        cache.clear()
+    env = app.create_jinja_environment()  # fresh in-memory cache: every template goes through the bytecode cache
+    names = env.list_templates(extensions=("html",))
+    started = time.perf_counter()
+    for name in names:
+        env.get_template(name)
+    return len(names), round((time.perf_counter() - started) * 1000, 1)
+
+
+# ----------------------------
+# WARM-UP
+# ----------------------------
+def warm_up(app):
+    """Run the process-wide warm-up steps; returns {step: milliseconds}."""
+    timings = {}
+
+    def step(name, fn):
+        started = time.perf_counter()
+        fn()
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def mappers():
+        from sqlalchemy.orm import configure_mappers
+
+        configure_mappers()
+
+    def url_map():
+        from werkzeug.exceptions import HTTPException
+
+        try:
+            app.url_map.bind("localhost").match("/")  # builds the rule matcher
+        except HTTPException:
+            pass
+
+    def templates():
+        env = app.jinja_env
+        for name in warm_up_templates(app):
+            env.get_template(name)  # compiles it, and its layout / includes, into the env's cache
+
+    step("mappers", mappers)
+    step("url_map", url_map)
+    step("templates", templates)
+    logger.info("warm-up: %s", ", ".join(f"{name} {ms}ms" for name, ms in timings.items()))
+    app.extensions["wvc_warm_up"] = timings
+    return timings
+
+
+def warm_up_templates(app):
+    """Template names from WARM_UP_TEMPLATES ("all": every .html template; "": none)."""
+    setting = (app.config.get("WARM_UP_TEMPLATES") or "").strip()
+    if setting == "all":
+        return app.jinja_env.list_templates(extensions=("html",))
+    return [name.strip() for name in setting.split(",") if name.strip()]
+
+
+def warm_up_pool(app, db):
+    """Open (and return to the pool) WARM_UP_DB_CONNECTIONS connections per engine."""
+    wanted = app.config.get("WARM_UP_DB_CONNECTIONS", 1)
+    if wanted <= 0:
+        return 0
+    opened = 0
+    with app.app_context():
+        for engine in db.engines.values():
+            connections = []
+            try:
+                for _ in range(min(wanted, engine.pool.size() if hasattr(engine.pool, "size") else wanted)):
+                    connections.append(engine.connect())
+                    opened += 1
+            except Exception:
+                logger.warning("warm-up: could not open a connection to %s", engine.url.render_as_string(), exc_info=True)
+            finally:
+                for conn in connections:
+                    conn.close()
+    return opened
+
+
+# ----------------------------
+# IMPORT TIME
+# ----------------------------
+def profile_imports(code=_IMPORT_PROBE, cwd=None):
+    """[(module, self_us, cumulative_us, depth)] from `python -X importtime -c code`, in import order."""
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [cwd, os.environ.get("PYTHONPATH")]))},
+    )
+    if result.returncode:
+        raise click.ClickException(f"Import probe failed:\n{result.stderr[-2000:]}")
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip()) - 1) // 2))
+    return modules
+
+
+def summarize_imports(modules):
+    """Total import time and self time per top-level package, both in microseconds."""
+    total = sum(cumulative for _name, _self, cumulative, depth in modules if depth == 0)
+    packages = {}
+    for name, self_us, _cumulative, _depth in modules:
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return total, packages
+
+
+@click.group("startup")
+def startup_cli():
+    """Cold-start profiling, template cache and warm-up."""
+
+
+@startup_cli.command("imports")
+@click.option("--top", type=int, default=20, show_default=True, help="Rows per table.")
+@click.option("--prefix", default="app", show_default=True, help="Also list these modules by cumulative time.")
+@click.option("--budget-ms", type=float, default=None, help="Exit 1 when total import time exceeds this.")
+def imports_command(top, prefix, budget_ms):
+    """Import-time breakdown of create_app() (`python -X importtime`)."""
+    modules = profile_imports()
+    total, packages = summarize_imports(modules)
+    click.echo(f"Total import time: {total / 1000:.0f} ms ({len(modules)} modules)\n")
+
+    click.echo(f"{'package (self time)':<48}{'ms':>8}")
+    for package, self_us in sorted(packages.items(), key=lambda p: -p[1])[:top]:
+        click.echo(f"{package:<48}{self_us / 1000:>8.1f}")
+
+    click.echo(f"\n{'module (self time)':<48}{'ms':>8}")
+    for name, self_us, _cumulative, _depth in sorted(modules, key=lambda m: -m[1])[:top]:
+        click.echo(f"{name:<48}{self_us / 1000:>8.1f}")
+
+    if prefix:
+        click.echo(f"\n{prefix + '.* (cumulative)':<48}{'ms':>8}")
+        own = [m for m in modules if m[0] == prefix or m[0].startswith(prefix + ".")]
+        for name, _self, cumulative_us, _depth in sorted(own, key=lambda m: -m[2])[:top]:
+            click.echo(f"{name:<48}{cumulative_us / 1000:>8.1f}")
+
+    if budget_ms is not None and total / 1000 > budget_ms:
+        raise click.ClickException(f"Import time {total / 1000:.0f} ms is over the {budget_ms:.0f} ms budget.")
+
+
+@startup_cli.command("compile-templates")
+@click.option("--clear", is_flag=True, help="Empty the cache first, so every template is recompiled.")
+@with_appcontext
+def compile_templates_command(clear):
+    """Fill the template bytecode cache (build / deploy step)."""
+    count, ms = compile_templates(current_app, clear=clear)
+    click.echo(f"{count} templates cached in {current_app.config['TEMPLATE_CACHE_DIR']} ({ms:.0f} ms)")
+
+
+@startup_cli.command("warm-up")
+@with_appcontext
+def warm_up_command():
+    """Run the warm-up steps and time each of them."""
+    from ..extensions import db
+
+    for name, ms in warm_up(current_app).items():
+        click.echo(f"{name:<12}{ms:>10.1f} ms")
+    started = time.perf_counter()
+    opened = warm_up_pool(current_app, db)
+    click.echo(f"{'pool':<12}{(time.perf_counter() - started) * 1000:>10.1f} ms ({opened} connections)")
@@ -0,0 +1,448 @@
+# app/perf/tracing.py
+"""
+Lightweight request tracing.
+
+Every request (and every background job) gets a trace ID and a root span. Inside it:
+- each SQL statement is a child span (`sql`);
+- `span(name, **attrs)` / `@traced(name)` add spans around any block (PDF builds use
+  `@traced("pdf.build", phase="query")` and `trace_phase("layout")` / `trace_phase("write")`
+  to split the build into phases; purchase reference numbers are `reference.allocate`);
+- `trace_event(name, **attrs)` records a zero-length span, e.g. `cache.hit` / `cache.miss`.
+
+The trace ID is adopted from an incoming W3C `traceparent` header when there is one, sent
+back as `X-Trace-Id`, and added to every log record (`%(trace_id)s`), so log lines can be
+matched to a trace. Only TRACE_SAMPLE_RATE of traces record spans (log lines always carry the
+ID). Finished spans go on a bounded queue; a background thread writes them to TRACE_LOG
+(rotating JSONL), so request threads never wait on disk and spans are dropped, not queued
+without limit, if the writer falls behind. `flask traces show <id>` prints a waterfall.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import g, request, has_request_context
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_QUEUE_SIZE = 10000
+
+_current = ContextVar("current_span", default=None)
+_config = {"enabled": False, "sample_rate": 0.01, "max_spans": 500, "sql_chars": 500}
+
+
+def _new_id(nbytes):
+    return os.urandom(nbytes).hex()
+
+
+class Trace:
+    """Per-trace bookkeeping shared by its spans."""
+
+    __slots__ = ("trace_id", "sampled", "spans", "dropped")
+
+    def __init__(self, trace_id=None, sampled=True):
+        self.trace_id = trace_id or _new_id(16)
+        self.sampled = sampled
+        self.spans = 0
+        self.dropped = 0
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent", "name", "attrs", "start", "_t0", "duration", "status", "phase")
+
+    def __init__(self, trace, name, parent=None, attrs=None, span_id=None):
+        self.trace = trace
+        self.span_id = span_id or _new_id(8)
+        self.parent = parent
+        self.name = name
+        self.attrs = attrs or {}
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self.duration = None
+        self.status = "ok"
+        self.phase = None
+
+    @property
+    def trace_id(self):
+        return self.trace.trace_id
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def end(self, status=None):
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._t0
+        if status:
+            self.status = status
+        if self.trace.sampled:
+            _export(self)
+
+
+def current_span():
+    span = _current.get()
+    if span is None and has_request_context():
+        span = g.get("_trace_root")  # streamed responses run outside the context the span was set in
+    return span
+
+
+def current_trace_id():
+    span = current_span()
+    return span.trace_id if span is not None else None
+
+
+def _child(name, attrs):
+    parent = current_span()
+    if parent is None or not parent.trace.sampled:
+        return None
+    trace = parent.trace
+    if trace.spans >= _config["max_spans"]:
+        trace.dropped += 1
+        return None
+    trace.spans += 1
+    return Span(trace, name, parent=parent, attrs=attrs)
+
+
+@contextmanager
+def span(name, **attrs):
+    """Child span of the current span around the block; a no-op outside a sampled trace."""
+    s = _child(name, attrs)
+    if s is None:
+        yield None
+        return
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException:
+        s.status = "error"
+        raise
+    finally:
+        if s.phase is not None:
+            s.phase.end()
+        _current.reset(token)
+        s.end()
+
+
+def traced(name, phase=None, **attrs):
+    """Decorator: run the function inside `span(name)`; `phase` opens a first phase span (see trace_phase)."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, function=fn.__qualname__, **attrs) as s:
+                if s is not None and phase:
+                    _start_phase(s, phase)
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _start_phase(owner, phase):
+    prefix = owner.name.split(".", 1)[0]
+    phase_span = Span(owner.trace, f"{prefix}.{phase}", parent=owner)
+    owner.trace.spans += 1
+    owner.phase = phase_span
+    _current.set(phase_span)
+
+
+def trace_phase(phase):
+    """End the current phase of the enclosing @traced(..., phase=...) span and start the next one."""
+    s = _current.get()
+    owner = s
+    while owner is not None and owner.phase is None:
+        owner = owner.parent
+    if owner is None:
+        return
+    owner.phase.end()
+    _start_phase(owner, phase)
+
+
+def trace_event(name, **attrs):
+    """A zero-length span (cache hit/miss and similar point events)."""
+    s = _child(name, attrs)
+    if s is not None:
+        s.end()
+
+
+@contextmanager
+def trace_root(name, trace_id=None, parent_span_id=None, sampled=None, **attrs):
+    """Start a new trace (used for requests and background jobs)."""
+    if sampled is None:
+        sampled = random.random() < _config["sample_rate"]
+    root = Span(Trace(trace_id, sampled=_config["enabled"] and sampled), name, attrs=attrs)
+    if parent_span_id:
+        root.attrs["remote_parent"] = parent_span_id
+    token = _current.set(root)
+    try:
+        yield root
+    except BaseException:
+        root.status = "error"
+        raise
+    finally:
+        _current.reset(token)
+        _finish_root(root)
+
+
+def _finish_root(root):
+    if root.trace.dropped:
+        root.attrs["dropped_spans"] = root.trace.dropped
+    root.end()
+
+
+# ----------------------------
+# EXPORT
+# ----------------------------
+_log = logging.getLogger("wvc.traces")
+_log.propagate = False
+_log.setLevel(logging.INFO)
+
+
+class _SpanWriter:
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        self.dropped = 0
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, record):
+        if self._thread is None or self._pid != os.getpid():
+            self._start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            try:
+                _log.info(json.dumps(record, default=str))
+            except Exception as e:
+                logger.warning("Trace export: %s", e)
+
+
+_writer = _SpanWriter()
+
+
+def _export(s):
+    _writer.submit({
+        "trace_id": s.trace.trace_id,
+        "span_id": s.span_id,
+        "parent_id": s.parent.span_id if s.parent is not None else s.attrs.get("remote_parent"),
+        "name": s.name,
+        "start": round(s.start, 6),
+        "duration_ms": round(s.duration * 1000, 3),
+        "status": s.status,
+        "attrs": s.attrs,
+        "pid": os.getpid(),
+    })
+
+
+# ----------------------------
+# HOOKS
+# ----------------------------
+_record_factory = logging.getLogRecordFactory()
+
+
+def _trace_record_factory(*args, **kwargs):
+    record = _record_factory(*args, **kwargs)
+    s = _current.get()
+    record.trace_id = s.trace.trace_id if s is not None else "-"
+    record.span_id = s.span_id if s is not None else "-"
+    return record
+
+
+def _attach_sql_spans(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        s = _child("sql", {"statement": statement[:_config["sql_chars"]]})
+        if s is not None and context is not None:
+            context._trace_span = s
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        s = getattr(context, "_trace_span", None)
+        if s is not None:
+            s.attrs["rows"] = cursor.rowcount
+            s.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        s = getattr(exception_context.execution_context, "_trace_span", None)
+        if s is not None:
+            s.attrs["error"] = str(exception_context.original_exception).splitlines()[0][:200]
+            s.end(status="error")
+
+
+def init_tracing(app, db):
+    """Trace IDs for every request and log record; spans exported when TRACING is on."""
+    _config.update(
+        enabled=app.config.get("TRACING", True),
+        sample_rate=app.config.get("TRACE_SAMPLE_RATE", 0.01),
+        max_spans=app.config.get("TRACE_MAX_SPANS", 500),
+        sql_chars=app.config.get("TRACE_SQL_MAX_CHARS", 500),
+    )
+    if logging.getLogRecordFactory() is not _trace_record_factory:
+        logging.setLogRecordFactory(_trace_record_factory)
+    from flask.logging import default_handler
+    default_handler.setFormatter(logging.Formatter(
+        "[%(asctime)s] %(levelname)s trace=%(trace_id)s in %(module)s: %(message)s"
+    ))
+
+    if _config["enabled"]:
+        path = os.path.abspath(app.config["TRACE_LOG"])
+        if not any(getattr(h, "baseFilename", None) == path for h in _log.handlers):
+            for handler in list(_log.handlers):
+                _log.removeHandler(handler)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                path,
+                maxBytes=app.config.get("TRACE_LOG_MAX_BYTES", 20 * 1024 * 1024),
+                backupCount=app.config.get("TRACE_LOG_BACKUPS", 3),
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _log.addHandler(handler)
+        with app.app_context():
+            for engine in db.engines.values():
+                _attach_sql_spans(engine)
+
+    @app.before_request
+    def _start_trace():
+        trace_id = parent_id = sampled = None
+        match = _TRACEPARENT.match(request.headers.get("traceparent", ""))
+        if match:
+            trace_id, parent_id = match.group(1), match.group(2)
+            sampled = int(match.group(3), 16) & 1 == 1 or None
+        rule = request.url_rule
+        root = Span(
+            Trace(trace_id, sampled=_config["enabled"] and (sampled or random.random() < _config["sample_rate"])),
+            "http.request",
+            attrs={"method": request.method, "route": rule.rule if rule is not None else request.path},
+        )
+        if parent_id:
+            root.attrs["remote_parent"] = parent_id
+        g._trace_root = root
+        g._trace_token = _current.set(root)
+
+    @app.after_request
+    def _finish_trace(response):
+        root = g.get("_trace_root")
+        if root is None:
+            return response
+        response.headers["X-Trace-Id"] = root.trace_id
+        root.attrs["status"] = response.status_code
+        if response.is_streamed:
+            response.call_on_close(lambda: _finish_root(root))
+        else:
+            _finish_root(root)
+        return response
+
+    @app.teardown_request
+    def _reset_trace(exc):
+        token = g.pop("_trace_token", None)
+        root = g.get("_trace_root")
+        if root is not None and root.duration is None and exc is not None:
+            root.status = "error"
+            _finish_root(root)  # after_request did not run
+        if token is not None:
+            try:
+                _current.reset(token)
+            except (ValueError, RuntimeError):
+                _current.set(None)  # reset from a different context (streamed response)
+
+
+# ----------------------------
+# READING THE LOG
+# ----------------------------
+def read_spans(path, trace_id):
+    """All spans whose trace ID starts with `trace_id`, from the log and its rotated backups."""
+    files = []
+    i = 1
+    while os.path.exists(f"{path}.{i}"):
+        files.append(f"{path}.{i}")
+        i += 1
+    files = list(reversed(files)) + ([path] if os.path.exists(path) else [])
+    spans = []
+    for file_path in files:
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                if trace_id not in line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record["trace_id"].startswith(trace_id):
+                    spans.append(record)
+    return spans
+
+
+def recent_roots(path, limit=20):
+    """The latest root spans (no local parent) in the current log file, newest first."""
+    roots = []
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if '"name": "http.request"' not in line and '"name": "job ' not in line:
+                    continue
+                try:
+                    roots.append(json.loads(line))
+                except ValueError:
+                    continue
+    return list(reversed(roots))[:limit]
+
+
+def waterfall(spans, width=50):
+    """Lines of an indented waterfall: offset, duration, a bar positioned on the trace's timeline."""
+    if not spans:
+        return []
+    by_id = {s["span_id"]: s for s in spans}
+    children = {}
+    roots = []
+    for s in sorted(spans, key=lambda s: s["start"]):
+        if s.get("parent_id") in by_id:
+            children.setdefault(s["parent_id"], []).append(s)
+        else:
+            roots.append(s)
+    t0 = min(s["start"] for s in spans)
+    t1 = max(s["start"] + s["duration_ms"] / 1000 for s in spans)
+    total = max(t1 - t0, 1e-9)
+
+    lines = []
+
+    def walk(s, depth):
+        offset = s["start"] - t0
+        left = int(offset / total * width)
+        length = max(1, int(s["duration_ms"] / 1000 / total * width))
+        bar = " " * left + "█" * min(length, width - left)
+        label = s["name"]
+        detail = s["attrs"].get("statement") or s["attrs"].get("route") or ""
+        if detail:
+            label += "  " + " ".join(detail.split())[:80]
+        flag = " !" if s["status"] != "ok" else ""
+        lines.append(f"{offset * 1000:>9.1f} {s['duration_ms']:>9.1f}ms |{bar:<{width}}| {'  ' * depth}{label}{flag}")
+        for child in children.get(s["span_id"], ()):
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+    return lines
@@ -0,0 +1,2 @@
+# app/periods/__init__.py
+"""Period close: per-venture monthly snapshots and the guard that freezes closed months."""
@@ -0,0 +1,242 @@
+# app/periods/closing.py
+"""
+Closing months and reading their snapshots.
+
+Months are closed in order per venture, so everything before `closed_through(venture)`
+is frozen: reports read those months from `period_snapshots` and only compute the
+open months live, and the flush guard (guard.py) rejects edits dated before it.
+"""
+from datetime import date
+
+from sqlalchemy import select, func, literal
+
+from ..extensions import db
+from ..utils.dates import month_bounds
+from .models import ClosedPeriod, PeriodSnapshot
+
+VENTURES = ("construction", "carenderia", "catering")
+
+
+class PeriodClosedError(Exception):
+    """Raised when a change touches a row dated inside a closed period."""
+
+
+def _next_month(d):
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+def _check_venture(venture):
+    if venture not in VENTURES:
+        raise ValueError(f"Unknown venture: {venture}")
+
+
+# ----------------------------
+# STATE
+# ----------------------------
+def closed_through(venture):
+    """First day of the first open month (everything before it is closed), or None if nothing is closed."""
+    last = db.session.query(func.max(ClosedPeriod.period)).filter(ClosedPeriod.venture == venture).scalar()
+    return _next_month(last) if last else None
+
+
+def is_closed(venture, day):
+    watermark = closed_through(venture)
+    return watermark is not None and day is not None and day < watermark
+
+
+def split_range(venture, start=None, end=None):
+    """
+    Split [start, end) (None = unbounded) at the venture's watermark.
+    Returns (closed_range, open_range); either may be None when empty.
+    """
+    watermark = closed_through(venture)
+    if watermark is None or (start is not None and start >= watermark):
+        return None, (start, end)
+    if end is not None and end <= watermark:
+        return (start, end), None
+    return (start, watermark), (watermark, end)
+
+
+def snapshot_query(venture, *columns, period_range=None):
+    """Select `columns` from the venture's snapshots, limited to [start, end) periods if given."""
+    stmt = select(*columns).where(PeriodSnapshot.venture == venture)
+    if period_range:
+        start, end = period_range
+        if start is not None:
+            stmt = stmt.where(PeriodSnapshot.period >= start)
+        if end is not None:
+            stmt = stmt.where(PeriodSnapshot.period < end)
+    return stmt
+
+
+def monthly_totals(venture):
+    """(period, category, amount, entries) per closed month — a few rows per month regardless of volume."""
+    stmt = snapshot_query(
+        venture,
+        PeriodSnapshot.period,
+        PeriodSnapshot.category,
+        func.sum(PeriodSnapshot.amount),
+        func.sum(PeriodSnapshot.entries),
+    ).group_by(PeriodSnapshot.period, PeriodSnapshot.category).order_by(
+        PeriodSnapshot.period.desc(), PeriodSnapshot.category.asc()
+    )
+    return db.session.execute(stmt).all()
+
+
+# ----------------------------
+# SNAPSHOT BUILDERS
+# ----------------------------
+def _construction_rows(start, end):
+    from app.models.construction.models import ProjectExpense, expense_amount_expr
+    stmt = (
+        select(
+            ProjectExpense.expense_type,
+            ProjectExpense.contract_id,
+            literal(None),
+            func.coalesce(func.sum(expense_amount_expr()), 0),
+            func.count(),
+        )
+        .where(
+            ProjectExpense.expense_date >= start,
+            ProjectExpense.expense_date < end,
+            ProjectExpense.expense_type != "Activity",
+        )
+        .group_by(ProjectExpense.expense_type, ProjectExpense.contract_id)
+    )
+    return db.session.execute(stmt).all()
+
+
+def _carenderia_rows(start, end):
+    from app.models.carenderia.models import CarenderiaTransaction
+    stmt = (
+        select(
+            CarenderiaTransaction.trans_type,
+            literal(None),
+            CarenderiaTransaction.date,
+            func.coalesce(func.sum(CarenderiaTransaction.amount), 0),
+            func.count(),
+        )
+        .where(CarenderiaTransaction.date >= start, CarenderiaTransaction.date < end)
+        .group_by(CarenderiaTransaction.trans_type, CarenderiaTransaction.date)
+    )
+    return db.session.execute(stmt).all()
+
+
+def _catering_rows(start, end):
+    from app.models.catering.models import CateringTransaction, CateringExpense
+    income = (
+        select(
+            literal("Income"),
+            CateringTransaction.booking_id,
+            literal(None),
+            func.coalesce(func.sum(CateringTransaction.trans_amount), 0),
+            func.count(),
+        )
+        .where(
+            CateringTransaction.booking_id.isnot(None),
+            CateringTransaction.date >= start,
+            CateringTransaction.date < end,
+        )
+        .group_by(CateringTransaction.booking_id)
+    )
+    expenses = (
+        select(
+            CateringExpense.expense_type,
+            CateringExpense.booking_id,
+            literal(None),
+            func.coalesce(func.sum(CateringExpense.amount), 0),
+            func.count(),
+        )
+        .where(CateringExpense.date >= start, CateringExpense.date < end)
+        .group_by(CateringExpense.expense_type, CateringExpense.booking_id)
+    )
+    return db.session.execute(income).all() + db.session.execute(expenses).all()
+
+
+def earliest_data_month(venture):
+    """First day of the month holding the venture's oldest dated row, or None."""
+    if venture == "construction":
+        from app.models.construction.models import ProjectExpense
+        dates = [db.session.query(func.min(ProjectExpense.expense_date)).scalar()]
+    elif venture == "carenderia":
+        from app.models.carenderia.models import CarenderiaTransaction, CarenderiaWage
+        dates = [
+            db.session.query(func.min(CarenderiaTransaction.date)).scalar(),
+            db.session.query(func.min(CarenderiaWage.date)).scalar(),
+        ]
+    else:
+        from app.models.catering.models import CateringTransaction, CateringExpense, CateringWage
+        dates = [
+            db.session.query(func.min(CateringTransaction.date)).scalar(),
+            db.session.query(func.min(CateringExpense.date)).scalar(),
+            db.session.query(func.min(CateringWage.date)).scalar(),
+        ]
+    dates = [d for d in dates if d is not None]
+    return min(dates).replace(day=1) if dates else None
+
+
+_BUILDERS = {
+    "construction": _construction_rows,
+    "carenderia": _carenderia_rows,
+    "catering": _catering_rows,
+}
+
+
+# ----------------------------
+# CLOSE / REOPEN
+# ----------------------------
+def close_through(venture, month_str, closed_by=None):
+    """
+    Close every open month of `venture` up to and including `month_str` (YYYY-MM),
+    storing a snapshot per month. Returns the list of months closed.
+    Raises ValueError if the month is malformed, not over yet, or already closed.
+    """
+    _check_venture(venture)
+    target, target_end = month_bounds(month_str)
+    if target_end > date.today():
+        raise ValueError("Only months that have ended can be closed.")
+
+    watermark = closed_through(venture)
+    if watermark is not None and target < watermark:
+        raise ValueError(f"{target.strftime('%B %Y')} is already closed.")
+
+    first = watermark or earliest_data_month(venture) or target
+    first = min(first, target)
+
+    closed = []
+    month = first
+    while month <= target:
+        month_end = _next_month(month)
+        for category, ref_id, day, amount, entries in _BUILDERS[venture](month, month_end):
+            db.session.add(PeriodSnapshot(
+                venture=venture,
+                period=month,
+                category=category or "",
+                ref_id=ref_id,
+                day=day,
+                amount=amount or 0,
+                entries=entries or 0,
+            ))
+        db.session.add(ClosedPeriod(venture=venture, period=month, closed_by=closed_by))
+        closed.append(month)
+        month = month_end
+
+    db.session.commit()
+    return closed
+
+
+def reopen_last(venture):
+    """Reopen the most recently closed month of `venture`, dropping its snapshot. Returns the month or None."""
+    _check_venture(venture)
+    last = ClosedPeriod.query.filter_by(venture=venture).order_by(ClosedPeriod.period.desc()).first()
+    if last is None:
+        return None
+    from app.archive.models import ArchiveSegment
+    if ArchiveSegment.query.filter_by(venture=venture, period=last.period).first() is not None:
+        raise ValueError(
+            f"{last.period.strftime('%B %Y')} is archived; restore it first (flask archive restore {venture})."
+        )
+    PeriodSnapshot.query.filter_by(venture=venture, period=last.period).delete(synchronize_session=False)
+    db.session.delete(last)
+    db.session.commit()
+    return last.period
@@ -0,0 +1,63 @@
+# app/periods/guard.py
+"""Session hook that rejects inserts/updates/deletes of rows dated inside a closed period."""
+from sqlalchemy import event, inspect
+
+from .closing import closed_through, PeriodClosedError
+
+
+def _tracked_models():
+    """Model -> (venture, date attribute) for every row that feeds a period snapshot."""
+    from app.models.construction.models import ProjectExpense
+    from app.models.carenderia.models import CarenderiaTransaction, CarenderiaWage
+    from app.models.catering.models import CateringTransaction, CateringExpense, CateringWage
+    return {
+        ProjectExpense: ("construction", "expense_date"),
+        CarenderiaTransaction: ("carenderia", "date"),
+        CarenderiaWage: ("carenderia", "date"),
+        CateringTransaction: ("catering", "date"),
+        CateringExpense: ("catering", "date"),
+        CateringWage: ("catering", "date"),
+    }
+
+
+def _touched_dates(obj, attr, is_new):
+    """The row's current date plus, for updates, the date it had before."""
+    dates = [getattr(obj, attr)]
+    if not is_new:
+        history = inspect(obj).attrs[attr].history
+        dates.extend(history.deleted or ())
+    return [d for d in dates if d is not None]
+
+
+def _check_flush(session, flush_context, instances):
+    tracked = _tracked_models()
+    watermarks = {}
+
+    def watermark(venture):
+        if venture not in watermarks:
+            with session.no_autoflush:
+                watermarks[venture] = closed_through(venture)
+        return watermarks[venture]
+
+    for objects, is_new in ((session.new, True), (session.dirty, False), (session.deleted, False)):
+        for obj in objects:
+            spec = tracked.get(type(obj))
+            if spec is None:
+                continue
+            venture, attr = spec
+            if venture == "construction" and obj.expense_type == "Activity":
+                continue  # Activities carry no amounts and stay editable
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+            for d in _touched_dates(obj, attr, is_new):
+                limit = watermark(venture)
+                if limit is not None and d < limit:
+                    raise PeriodClosedError(
+                        f"{d.strftime('%B %Y')} is closed for {venture.capitalize()}; "
+                        "entries in closed periods cannot be added, changed or deleted."
+                    )
+
+
+def init_period_guard(session):
+    """Attach the closed-period check to a (scoped) session."""
+    event.listen(session, "before_flush", _check_flush)
@@ -0,0 +1,38 @@
+# app/periods/models.py
+from datetime import datetime
+
+from ..extensions import db
+
+
+class ClosedPeriod(db.Model):
+    """One closed month for a venture. Months are closed in order, so the closed set is always a prefix."""
+    __tablename__ = "closed_periods"
+
+    id = db.Column(db.Integer, primary_key=True)
+    venture = db.Column(db.String(20), nullable=False)  # construction | carenderia | catering
+    period = db.Column(db.Date, nullable=False)  # first day of the month
+    closed_by = db.Column(db.BigInteger, db.ForeignKey("users.id"), nullable=True)
+    closed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (db.UniqueConstraint("venture", "period", name="uix_closed_period_venture_period"),)
+
+
+class PeriodSnapshot(db.Model):
+    """
+    Closing total for one (venture, month, category[, ref_id][, day]).
+    - construction: category = expense type, ref_id = project (contract) id
+    - carenderia:   category = transaction type, day = transaction date
+    - catering:     category = "Income" or expense type, ref_id = booking id (nullable)
+    """
+    __tablename__ = "period_snapshots"
+
+    id = db.Column(db.Integer, primary_key=True)
+    venture = db.Column(db.String(20), nullable=False)
+    period = db.Column(db.Date, nullable=False)
+    category = db.Column(db.String(100), nullable=False)
+    ref_id = db.Column(db.BigInteger, nullable=True)
+    day = db.Column(db.Date, nullable=True)
+    amount = db.Column(db.Numeric(16, 2), nullable=False, default=0)
+    entries = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.Index("ix_period_snapshots_venture_period", "venture", "period"),)
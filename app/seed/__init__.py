@@ -0,0 +1,2 @@
+# app/seed/__init__.py
+"""Synthetic, seed-deterministic data for all three ventures (`flask seed --scale N`)."""
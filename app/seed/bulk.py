@@ -0,0 +1,94 @@
+# app/seed/bulk.py
+"""
+Bulk loading for the seed generator.
+
+Rows are buffered per table and written in table-registration order (parents before
+children), so a flush never inserts a row whose foreign key is still in a buffer:
+- Postgres: `COPY ... FROM STDIN (FORMAT csv)` through the raw driver connection
+  (psycopg2's copy_expert or psycopg 3's cursor.copy);
+- anything else: one executemany INSERT per table and flush.
+
+Ids are assigned by the generator (so children can reference parents without a round
+trip); `finish()` moves the Postgres sequences past them.
+"""
+import csv
+import io
+import time
+
+from sqlalchemy import func, select, text
+
+NULL = r"\N"
+FLUSH_ROWS = 20000
+
+
+class BulkLoader:
+    def __init__(self, connection, flush_rows=FLUSH_ROWS):
+        self.connection = connection
+        self.flush_rows = flush_rows
+        self.is_postgres = connection.dialect.name == "postgresql"
+        self.tables = {}   # name -> (Table, columns); insertion order = load order
+        self.buffers = {}  # name -> [row tuples]
+        self.counts = {}
+        self.seconds = 0.0
+
+    def register(self, table, columns):
+        """Declare a table (parents first) and the column order of the tuples passed to `add()`."""
+        self.tables[table.name] = (table, tuple(columns))
+        self.buffers[table.name] = []
+        self.counts[table.name] = 0
+
+    def next_id(self, table):
+        """First free id of `table` (max + 1)."""
+        return (self.connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+    def add(self, table_name, row):
+        buffer = self.buffers[table_name]
+        buffer.append(row)
+        if len(buffer) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        started = time.perf_counter()
+        for name, (table, columns) in self.tables.items():
+            rows = self.buffers[name]
+            if not rows:
+                continue
+            if self.is_postgres:
+                self._copy(table, columns, rows)
+            else:
+                self.connection.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+            self.counts[name] += len(rows)
+            self.buffers[name] = []
+        self.seconds += time.perf_counter() - started
+
+    def _copy(self, table, columns, rows):
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow([NULL if value is None else value for value in row])
+        sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{NULL}')"
+        cursor = self.connection.connection.dbapi_connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                buf.seek(0)
+                cursor.copy_expert(sql, buf)
+            else:  # psycopg 3
+                with cursor.copy(sql) as copy:
+                    copy.write(buf.getvalue())
+        finally:
+            cursor.close()
+
+    def finish(self):
+        """Flush what is left, then (Postgres) advance the id sequences and refresh planner statistics."""
+        self.flush()
+        if not self.is_postgres:
+            return
+        for name, (table, columns) in self.tables.items():
+            if "id" not in columns or not self.counts[name]:
+                continue
+            self.connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), (SELECT MAX(id) FROM {name}))"
+            ))
+        for name in self.tables:
+            if self.counts[name]:
+                self.connection.execute(text(f"ANALYZE {name}"))
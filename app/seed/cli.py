@@ -0,0 +1,85 @@
+# app/seed/cli.py
+"""`flask seed --scale N`."""
+import time
+from datetime import date, timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from ..database.partitions import create_year_partitions
+from ..database.pool import set_db_role
+from ..extensions import db
+from ..periods.closing import VENTURES, closed_through
+from ..utils.dates import month_bounds
+from .bulk import BulkLoader
+from .generator import SeedGenerator
+
+# Parents first (the generator's load order)
+SEEDED_TABLES = (
+    "departments", "employees", "construction_contracts", "project_expenses", "daily_invoice_counter",
+    "catering_requests", "catering_transaction", "catering_expense", "catering_purchase_items", "catering_wages",
+    "carenderia_transaction", "carenderia_purchase_items", "carenderia_wages",
+)
+
+
+def _default_through():
+    """December of last year: fixed for a whole year, so repeated runs without --through agree."""
+    return f"{date.today().year - 1}-12"
+
+
+@click.command("seed")
+@click.option("--scale", type=click.IntRange(1, 1000), default=1, show_default=True,
+              help="Multiplies contracts, bookings, staff and daily purchases.")
+@click.option("--seed", "seed", type=int, default=42, show_default=True, help="Random seed; same seed, same data.")
+@click.option("--years", type=click.IntRange(1, 20), default=3, show_default=True, help="Years of history.")
+@click.option("--through", "through_month", default=None, help="Last month to generate (YYYY-MM). Default: December of last year.")
+@click.option("--reset", is_flag=True, help="Empty the seeded tables first (asks for confirmation).")
+@click.option("--yes", is_flag=True, help="Do not ask before --reset.")
+@with_appcontext
+def seed_command(scale, seed, years, through_month, reset, yes):
+    """Generate synthetic departments, employees and ledgers for all three ventures."""
+    set_db_role("cli")  # a large scale runs well past the web statement_timeout
+    try:
+        last_month, following = month_bounds(through_month or _default_through())
+    except ValueError:
+        raise click.BadParameter("Use YYYY-MM.", param_hint="--through")
+    end = following - timedelta(days=1)
+    start = date(last_month.year - years + (1 if last_month.month == 12 else 0),
+                 last_month.month % 12 + 1, 1)
+
+    for venture in VENTURES:
+        watermark = closed_through(venture)
+        if watermark is not None and start < watermark:
+            raise click.ClickException(
+                f"{venture} is closed through {watermark:%Y-%m}; seeding would change closed months. Reopen them first."
+            )
+
+    if reset:
+        if not yes:
+            click.confirm(f"Delete every row of the seeded tables in {db.engine.url.render_as_string()}?", abort=True)
+        _reset_tables()
+
+    click.echo(f"Seeding {start:%Y-%m} .. {end:%Y-%m} at scale {scale} (seed {seed}) on {db.engine.dialect.name}...")
+    # Past years get their own ledger partitions, as in a database migrated with its history
+    create_year_partitions(start.year, end.year)
+    started = time.perf_counter()
+    with db.engine.begin() as conn:
+        loader = BulkLoader(conn)
+        counts = SeedGenerator(loader, scale=scale, seed=seed, start=start, end=end).run()
+    elapsed = time.perf_counter() - started
+
+    total = sum(counts.values())
+    for table, rows in counts.items():
+        click.echo(f"  {table:<28} {rows:>10}")
+    click.echo(f"{total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s; "
+               f"{loader.seconds:.1f}s {'COPY' if loader.is_postgres else 'INSERT'}).")
+
+
+def _reset_tables():
+    with db.engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"TRUNCATE {', '.join(SEEDED_TABLES)} RESTART IDENTITY"))
+        else:
+            for table in reversed(SEEDED_TABLES):
+                conn.execute(text(f"DELETE FROM {table}"))
@@ -0,0 +1,440 @@
+# app/seed/generator.py
+"""
+Deterministic synthetic data for construction, catering and carenderia.
+
+Everything comes from one `random.Random(seed)` walked in a fixed order, and no value
+depends on the clock, so the same (seed, scale, start, end) always produces the same rows.
+
+At scale 1 and three years this is roughly: 6 construction contracts with weekly
+material invoices, payroll and fuel; ~200 catering bookings a year with payments,
+purchases and wages; and a carenderia day book (sales, wages, purchases with items,
+monthly bills) for every day of the range. Scale multiplies the number of contracts,
+bookings, staff and daily purchases.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from ..models.core import Department, Employee
+from ..models.construction.models import ConstructionContract, ProjectExpense, DailyInvoiceCounter
+from ..models.catering.models import (
+    CateringRequest, CateringTransaction, CateringExpense, CateringPurchaseItem, CateringWage,
+)
+from ..models.carenderia.models import CarenderiaTransaction, CarenderiaPurchaseItem, CarenderiaWage
+
+DEPARTMENTS = ("Construction", "Carenderia", "Catering", "Corporate")
+
+FIRST_NAMES = (
+    "Juan", "Jose", "Maria", "Ana", "Pedro", "Ramon", "Rosa", "Carmen", "Antonio", "Luz", "Eduardo",
+    "Teresita", "Rogelio", "Marites", "Danilo", "Cristina", "Arnel", "Josefina", "Rodel", "Lorna",
+    "Ernesto", "Gloria", "Reynaldo", "Imelda", "Romeo", "Liza", "Noel", "Evelyn", "Jun", "Rowena",
+)
+LAST_NAMES = (
+    "Santos", "Reyes", "Cruz", "Bautista", "Ocampo", "Garcia", "Mendoza", "Torres", "Villanueva",
+    "Ramos", "Aquino", "Castillo", "Flores", "Navarro", "Dela Cruz", "Gonzales", "Lopez", "Mercado",
+    "Pascual", "Soriano", "Tolentino", "Valdez", "Salazar", "Manalo", "Domingo", "De Leon",
+)
+PLACES = (
+    "Poblacion", "San Isidro", "Sta. Cruz", "San Roque", "Bagong Silang", "Mabini", "Rizal",
+    "San Jose", "Malvar", "Del Pilar", "Sto. Nino", "Magsaysay", "Burgos", "San Vicente",
+)
+
+CONSTRUCTION_ROLES = (("Foreman", 900, 1100, 1), ("Mason", 650, 800, 3), ("Carpenter", 650, 800, 3),
+                      ("Steelman", 650, 780, 2), ("Laborer", 500, 600, 6), ("Driver", 620, 700, 1))
+CARENDERIA_ROLES = (("Cook", 520, 620, 2), ("Helper", 450, 500, 3), ("Cashier", 480, 540, 1), ("Server", 450, 500, 2))
+CATERING_ROLES = (("Head Cook", 700, 800, 1), ("Cook", 550, 650, 2), ("Waiter", 480, 550, 4),
+                  ("Helper", 450, 500, 3), ("Driver", 600, 680, 1))
+
+PROJECT_KINDS = (
+    "Two-Storey Residence", "Barangay Hall Rehabilitation", "Farm-to-Market Road", "Drainage Improvement",
+    "Multi-Purpose Building", "School Building Repair", "Warehouse", "Bridge Approach Concreting",
+    "Water System Extension", "Covered Court",
+)
+CONTRACTORS = ("WVC Construction", "WVC Builders & Supply", "WVC Construction (JV)")
+# item, unit, unit price range, quantity range
+MATERIALS = (
+    ("Portland cement", "bag", (240, 285), (20, 200)), ("Deformed bar 10mm", "pc", (180, 230), (20, 300)),
+    ("Deformed bar 12mm", "pc", (260, 330), (20, 200)), ("Washed sand", "cu.m.", (1200, 1700), (2, 20)),
+    ("Gravel 3/4", "cu.m.", (1400, 1900), (2, 20)), ("Hollow block 4\"", "pc", (14, 19), (200, 2000)),
+    ("Coco lumber 2x3x10", "pc", (110, 150), (20, 150)), ("Plywood 1/2 marine", "sheet", (850, 1050), (5, 60)),
+    ("Tie wire #16", "kg", (85, 110), (5, 40)), ("Common nails 4\"", "kg", (75, 95), (5, 40)),
+    ("GI sheet ga.26", "sheet", (480, 620), (10, 120)), ("PVC pipe 4\"", "length", (380, 520), (4, 40)),
+    ("Paint, latex white", "gal", (680, 820), (2, 30)), ("Ready-mix concrete", "cu.m.", (4800, 5600), (3, 30)),
+)
+PERMITS = ("Building permit", "Barangay clearance", "Fencing permit", "Electrical permit", "Environmental clearance")
+MILESTONES = ("Mobilization", "Excavation", "Foundation works", "Columns and beams", "Slab pouring",
+              "Roofing", "Masonry and plastering", "Finishing works", "Final inspection", "Turnover")
+
+CATERING_MENU = ("Lechon kawali", "Pancit canton", "Chicken adobo", "Beef caldereta", "Pork menudo",
+                 "Fish fillet", "Chop suey", "Lumpiang shanghai", "Buko pandan", "Leche flan",
+                 "Kare-kare", "Embutido", "Fried chicken", "Sweet and sour fish", "Fruit salad")
+CATERING_GOODS = (
+    ("Pork kasim", "kg", (280, 330), (5, 40)), ("Chicken whole", "kg", (180, 220), (5, 40)),
+    ("Beef brisket", "kg", (420, 480), (3, 20)), ("Tilapia", "kg", (130, 170), (3, 20)),
+    ("Rice, well-milled", "sack", (2300, 2700), (1, 5)), ("Cooking oil", "gal", (420, 520), (1, 4)),
+    ("Pancit canton noodles", "pack", (45, 60), (5, 40)), ("Vegetables, assorted", "kg", (60, 120), (5, 30)),
+    ("Condensed milk", "can", (55, 70), (6, 36)), ("Eggs", "tray", (210, 260), (1, 6)),
+    ("Softdrinks 1.5L", "case", (720, 820), (1, 6)), ("Ice", "block", (60, 90), (2, 12)),
+)
+CATERING_MISC = (("LPG refill", 950, 1150), ("Ice and water", 300, 800), ("Transportation", 500, 2500),
+                 ("Disposable containers", 400, 1500), ("Table linen laundry", 300, 900))
+EVENT_TIMES = (time(10, 0), time(11, 30), time(17, 0), time(18, 0))
+
+MARKET_GOODS = (
+    ("Rice, well-milled", "sack", (2300, 2700), (1, 2)), ("Pork liempo", "kg", (300, 360), (2, 10)),
+    ("Pork kasim", "kg", (280, 330), (2, 10)), ("Chicken", "kg", (180, 220), (2, 12)),
+    ("Bangus", "kg", (180, 230), (2, 8)), ("Galunggong", "kg", (160, 220), (2, 8)),
+    ("Eggs", "tray", (210, 260), (1, 3)), ("Onion", "kg", (120, 200), (1, 3)), ("Garlic", "kg", (120, 180), (1, 2)),
+    ("Tomato", "kg", (60, 120), (1, 4)), ("Kangkong", "bundle", (15, 25), (3, 12)), ("Soy sauce", "gal", (160, 200), (1, 2)),
+    ("Vinegar", "gal", (120, 150), (1, 2)), ("Cooking oil", "gal", (420, 520), (1, 2)), ("LPG", "tank", (950, 1150), (1, 1)),
+)
+# transaction type, day of month, amount range
+MONTHLY_BILLS = (("Rental", 1, (15000, 15000)), ("Electric Bill", 10, (4000, 9000)), ("Water Bill", 12, (800, 2000)),
+                 ("SSS", 15, (2000, 4500)), ("PAG-IBIG", 15, (400, 1000)), ("BIR", 20, (1500, 5000)))
+
+
+def _money(value):
+    return Decimal(str(round(value, 2)))
+
+
+def _stamp(day, hour=17):
+    return datetime.combine(day, time(hour, 0))
+
+
+def _days(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def _months(start, end):
+    month = start.replace(day=1)
+    while month <= end:
+        yield month
+        month = date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+
+def _month_end(month):
+    following = date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+    return following - timedelta(days=1)
+
+
+class SeedGenerator:
+    """Generates every venture's rows into a `BulkLoader`, parents before children."""
+
+    def __init__(self, loader, scale=1, seed=42, start=None, end=None):
+        self.loader = loader
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.start = start
+        self.end = end
+        self.ids = {}
+
+        for model, columns in (
+            (Department, ("id", "name")),
+            (Employee, ("id", "name", "role", "rate_per_day", "department_id")),
+            (ConstructionContract, ("id", "contractor_name", "contractor_address", "project_name", "project_site",
+                                    "ntp_date", "completion_date", "contract_duration", "contract_price", "status",
+                                    "created_at")),
+            (ProjectExpense, ("id", "contract_id", "expense_type", "expense_date", "item", "qty", "unit", "unit_price",
+                              "material_amount", "labor_id", "rate_per_day", "days", "labor_charge", "overtime_hours",
+                              "overtime_amount", "gasoline_amount", "document_ref", "document_amount",
+                              "obligation_ref", "obligation_amount", "activity_date", "activity", "activity_status",
+                              "invoice_number", "created_at")),
+            (DailyInvoiceCounter, ("invoice_date", "last_seq")),
+            (CateringRequest, ("id", "requestor_name", "customer_address", "contact_number", "email_address",
+                               "event_date", "event_time", "items_requested", "status", "created_at", "updated_at")),
+            (CateringTransaction, ("id", "date", "booking_id", "booking_amount", "trans_description", "trans_amount",
+                                   "remarks", "created_at")),
+            (CateringExpense, ("id", "date", "expense_type", "amount", "description", "employee_id", "employee_name",
+                               "remarks", "reference_number", "booking_id", "created_at")),
+            (CateringPurchaseItem, ("id", "expense_id", "description", "qty", "unit", "unit_price", "amount",
+                                    "created_at")),
+            (CateringWage, ("id", "date", "employee_id", "employee_name", "rate_per_day", "number_of_days", "amount",
+                            "description", "expense_id", "created_at")),
+            (CarenderiaTransaction, ("id", "date", "trans_type", "amount", "reference_number", "created_at")),
+            (CarenderiaPurchaseItem, ("id", "trans_id", "description", "qty", "unit", "unit_price", "amount")),
+            (CarenderiaWage, ("id", "emp_id", "emp_name", "dept_id", "emp_role", "emp_rate", "date", "amount",
+                              "created_at")),
+        ):
+            table = model.__table__
+            loader.register(table, columns)
+            if "id" in columns:
+                self.ids[table.name] = loader.next_id(table)
+        # Invoice numbers continue from the counters already in the table
+        counters = loader.connection.execute(select(DailyInvoiceCounter.invoice_date, DailyInvoiceCounter.last_seq))
+        self.existing_invoice_seq = {day: seq or 0 for day, seq in counters}
+        self.invoice_seq = dict(self.existing_invoice_seq)
+
+    def _id(self, table_name):
+        value = self.ids[table_name]
+        self.ids[table_name] = value + 1
+        return value
+
+    def _add(self, table_name, *row):
+        self.loader.add(table_name, row)
+
+    def run(self):
+        departments = self._departments()
+        staff = self._employees(departments)
+        self._construction(staff["Construction"])
+        self._catering(staff["Catering"])
+        self._carenderia(staff["Carenderia"], departments["Carenderia"])
+        self._invoice_counters()
+        self.loader.finish()
+        return self.loader.counts
+
+    # ----------------------------
+    # PEOPLE
+    # ----------------------------
+    def _person(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {chr(65 + self.rng.randrange(26))}. {self.rng.choice(LAST_NAMES)}"
+
+    def _departments(self):
+        existing = dict(self.loader.connection.execute(select(Department.name, Department.id)).all())
+        for name in DEPARTMENTS:
+            if name not in existing:
+                existing[name] = self._id("departments")
+                self._add("departments", existing[name], name)
+        return existing
+
+    def _employees(self, departments):
+        staff = {}
+        for department, roles, multiplier in (
+            ("Construction", CONSTRUCTION_ROLES, self.scale),
+            ("Carenderia", CARENDERIA_ROLES, 1),
+            ("Catering", CATERING_ROLES, self.scale),
+        ):
+            people = staff[department] = []
+            for role, low, high, count in roles:
+                for _ in range(count * multiplier):
+                    employee = (self._id("employees"), self._person(), role, float(self.rng.randrange(low, high + 1, 10)))
+                    people.append(employee)
+                    self._add("employees", *employee, departments[department])
+        for role in ("Accountant", "Admin Staff"):
+            self._add("employees", self._id("employees"), self._person(), role, None, departments["Corporate"])
+        return staff
+
+    # ----------------------------
+    # CONSTRUCTION
+    # ----------------------------
+    def _invoice_number(self, day):
+        seq = self.invoice_seq[day] = self.invoice_seq.get(day, 0) + 1
+        return f"INV-{day.strftime('%Y%m%d')}-{seq:04d}"
+
+    def _expense(self, contract_id, expense_type, day, **values):
+        columns = self.loader.tables["project_expenses"][1]
+        values.update(id=self._id("project_expenses"), contract_id=contract_id, expense_type=expense_type,
+                      expense_date=day, created_at=_stamp(day))
+        self._add("project_expenses", *(values.get(column) for column in columns))
+
+    def _construction(self, crew_pool):
+        rng = self.rng
+        span = (self.end - self.start).days
+        contracts = 6 * self.scale
+        for n in range(contracts + self.scale):
+            planned = n >= contracts  # a few contracts that have not started yet
+            duration = rng.randrange(60, 541, 15)
+            ntp = (self.end + timedelta(days=rng.randrange(15, 90)) if planned
+                   else self.start + timedelta(days=rng.randrange(max(1, span - 30))))
+            completion = ntp + timedelta(days=duration)
+            status = "planning" if planned else "completed" if completion <= self.end else "ongoing"
+            contract_id = self._id("construction_contracts")
+            place = rng.choice(PLACES)
+            self._add(
+                "construction_contracts", contract_id, rng.choice(CONTRACTORS), f"Brgy. {rng.choice(PLACES)}",
+                f"{rng.choice(PROJECT_KINDS)} - {place}", f"Brgy. {place}", ntp, completion, duration,
+                _money(rng.randrange(800, 25000) * 1000), status, _stamp(ntp - timedelta(days=14), 9),
+            )
+            if planned:
+                continue
+            self._contract_expenses(contract_id, ntp, min(completion, self.end), completion,
+                                    rng.sample(crew_pool, min(len(crew_pool), rng.randint(4, 10))))
+
+    def _contract_expenses(self, contract_id, ntp, last_day, completion, crew):
+        rng = self.rng
+        for permit in rng.sample(PERMITS, rng.randint(2, 4)):
+            self._expense(contract_id, "Documents", ntp, item=permit,
+                          document_ref=f"DOC-{ntp.year}-{rng.randrange(1, 9999):04d}",
+                          document_amount=_money(rng.randrange(2000, 60000, 50)))
+        duration = max(1, (completion - ntp).days)
+        for i, milestone in enumerate(MILESTONES):
+            day = ntp + timedelta(days=duration * i // (len(MILESTONES) - 1))
+            self._expense(contract_id, "Activity", day, activity_date=_stamp(day, 8), activity=milestone,
+                          activity_status="Completed" if day <= self.end else "Pending")
+
+        week = ntp
+        while week <= last_day:
+            if rng.random() < 0.8:
+                day = min(last_day, week + timedelta(days=rng.randrange(6)))
+                invoice = self._invoice_number(day)
+                for item, unit, (low, high), (qty_low, qty_high) in rng.sample(MATERIALS, rng.randint(2, 7)):
+                    qty = rng.randint(qty_low, qty_high)
+                    price = rng.randrange(low, high + 1)
+                    self._expense(contract_id, "Materials", day, item=item, qty=qty, unit=unit,
+                                  unit_price=_money(price), material_amount=_money(qty * price), invoice_number=invoice)
+
+            payday = min(last_day, week + timedelta(days=5))
+            invoice = self._invoice_number(payday)
+            for employee_id, _name, _role, rate in crew:
+                days = rng.randint(3, 6)
+                overtime = rng.randint(1, 8) if rng.random() < 0.3 else 0
+                overtime_amount = rate / 8 * overtime
+                self._expense(contract_id, "Labor", payday, labor_id=employee_id, rate_per_day=_money(rate),
+                              days=days, overtime_hours=overtime, overtime_amount=_money(overtime_amount),
+                              labor_charge=_money(rate * days + overtime_amount), invoice_number=invoice)
+
+            if rng.random() < 0.6:
+                self._expense(contract_id, "Gasoline", payday, gasoline_amount=_money(rng.randrange(800, 4500, 50)))
+            if rng.random() < 0.05:
+                self._expense(contract_id, "Obligation", payday,
+                              obligation_ref=f"OBL-{payday.year}-{rng.randrange(1, 9999):04d}",
+                              obligation_amount=_money(rng.randrange(10000, 200000, 500)))
+            week += timedelta(days=7)
+
+    def _invoice_counters(self):
+        """Move each day's invoice counter past the numbers generated for it."""
+        table = DailyInvoiceCounter.__table__
+        for day in sorted(self.invoice_seq):
+            seq = self.invoice_seq[day]
+            if day not in self.existing_invoice_seq:
+                self._add("daily_invoice_counter", day, seq)
+            elif seq != self.existing_invoice_seq[day]:
+                self.loader.connection.execute(
+                    table.update().where(table.c.invoice_date == day).values(last_seq=seq)
+                )
+
+    # ----------------------------
+    # CATERING
+    # ----------------------------
+    def _catering(self, crew_pool):
+        rng = self.rng
+        purchases_per_day = {}
+        for month in _months(self.start, self.end):
+            last = _month_end(month)
+            for _ in range(rng.randint(10, 22) * self.scale):
+                self._booking(month, last, crew_pool, purchases_per_day)
+            for _ in range(rng.randint(2, 4)):
+                label, low, high = rng.choice(CATERING_MISC)
+                day = month + timedelta(days=rng.randrange((last - month).days + 1))
+                self._add("catering_expense", self._id("catering_expense"), day, "Expenses",
+                          _money(rng.randrange(low, high + 1, 10)), label, None, None, None, None, None, _stamp(day))
+
+    def _purchase_reference(self, day, counter):
+        seq = counter[day] = counter.get(day, 0) + 1
+        return f"PUR-{day.strftime('%Y-%m-%d')}-{seq:03d}"
+
+    def _booking(self, month, last, crew_pool, purchases_per_day):
+        rng = self.rng
+        event_day = month + timedelta(days=rng.randrange((last - month).days + 1))
+        booked_on = max(self.start, event_day - timedelta(days=rng.randint(7, 60)))
+        pax = rng.randrange(50, 401, 10)
+        amount = _money(pax * rng.randrange(250, 451, 10))
+        past = event_day <= self.end
+        cancelled = past and rng.random() < 0.08
+        status = "Cancelled" if cancelled else "Completed" if past else rng.choice(("Confirmed", "Pending"))
+        booking_id = self._id("catering_requests")
+        dishes = ", ".join(rng.sample(CATERING_MENU, rng.randint(3, 6)))
+        self._add(
+            "catering_requests", booking_id, self._person(), f"Brgy. {rng.choice(PLACES)}",
+            f"09{rng.randrange(10**9):09d}",
+            f"client{booking_id}@example.com" if rng.random() < 0.5 else None,
+            event_day, rng.choice(EVENT_TIMES), f"{pax} pax: {dishes}", status, _stamp(booked_on, 10),
+            _stamp(event_day if past else booked_on, 20),
+        )
+
+        def payment(day, description, value):
+            self._add("catering_transaction", self._id("catering_transaction"), day, booking_id, amount, description,
+                      _money(value), rng.choice((None, "Cash", "GCash", "Bank transfer")), _stamp(day, 14))
+
+        down = amount * Decimal(rng.randrange(30, 51)) / 100
+        payment(booked_on, "Down Payment", down)
+        if not past or cancelled:
+            return
+        paid = down.quantize(Decimal("0.01"))
+        if rng.random() < 0.4:
+            partial = ((amount - paid) * Decimal(rng.randrange(30, 61)) / 100).quantize(Decimal("0.01"))
+            payment(booked_on + (event_day - booked_on) / 2, "Partial Payment", partial)
+            paid += partial
+        payment(event_day, "Full Payment", amount - paid)
+
+        for _ in range(rng.randint(1, 2)):
+            day = max(self.start, event_day - timedelta(days=rng.randint(1, 2)))
+            expense_id = self._id("catering_expense")
+            items = []
+            for item, unit, (low, high), (qty_low, qty_high) in rng.sample(CATERING_GOODS, rng.randint(4, 10)):
+                qty = rng.randint(qty_low, qty_high) * max(1, pax // 100)
+                price = rng.randrange(low, high + 1)
+                items.append((item, qty, unit, price))
+            total = sum(qty * price for _item, qty, _unit, price in items)
+            self._add("catering_expense", expense_id, day, "Purchases", _money(total), "Market purchases", None, None,
+                      None, self._purchase_reference(day, purchases_per_day), booking_id, _stamp(day))
+            for item, qty, unit, price in items:
+                self._add("catering_purchase_items", self._id("catering_purchase_items"), expense_id, item, qty, unit,
+                          _money(price), _money(qty * price), _stamp(day))
+
+        if rng.random() < 0.6:
+            label, low, high = rng.choice(CATERING_MISC)
+            self._add("catering_expense", self._id("catering_expense"), event_day, "Miscellaneous",
+                      _money(rng.randrange(low, high + 1, 10)), label, None, None, None, None, booking_id,
+                      _stamp(event_day))
+
+        crew = rng.sample(crew_pool, min(len(crew_pool), rng.randint(3, 8)))
+        days = rng.choice((Decimal("1"), Decimal("1"), Decimal("1.5"), Decimal("2")))
+        expense_id = self._id("catering_expense")
+        wages = [(employee_id, name, _money(rate), _money(rate) * days) for employee_id, name, _role, rate in crew]
+        self._add("catering_expense", expense_id, event_day, "Wages", sum(w[3] for w in wages), "Wages", None, None,
+                  f"Booking #{booking_id} — Wages for {len(wages)} employee(s)", None, booking_id, _stamp(event_day))
+        for employee_id, name, rate, value in wages:
+            self._add("catering_wages", self._id("catering_wages"), event_day, employee_id, name, rate, days, value,
+                      "Wages", expense_id, _stamp(event_day))
+
+    # ----------------------------
+    # CARENDERIA
+    # ----------------------------
+    def _carenderia(self, staff, department_id):
+        rng = self.rng
+        first_year = self.start.year
+
+        def transaction(day, trans_type, value, reference=None):
+            trans_id = self._id("carenderia_transaction")
+            self._add("carenderia_transaction", trans_id, day, trans_type, _money(value), reference, _stamp(day, 20))
+            return trans_id
+
+        for day in _days(self.start, self.end):
+            growth = 1 + 0.06 * (day.year - first_year)
+            season = 1.2 if day.month == 12 else 1.0
+            weekend = 0.8 if day.weekday() >= 5 else 1.0
+            transaction(day, "Daily Sales", rng.randrange(9000, 16000) * growth * season * weekend)
+            transaction(day, "Daily Expense", rng.randrange(300, 1500, 10))
+
+            total_wages = 0
+            for employee_id, name, role, rate in staff:
+                if rng.random() < 6 / 7:
+                    total_wages += rate
+                    self._add("carenderia_wages", self._id("carenderia_wages"), employee_id, name, department_id, role,
+                              _money(rate), day, _money(rate), _stamp(day, 20))
+            if total_wages:
+                transaction(day, "Wages", total_wages)
+
+            for seq in range(1, rng.randint(1, 1 + self.scale) + 1):
+                items = []
+                for item, unit, (low, high), (qty_low, qty_high) in rng.sample(MARKET_GOODS, rng.randint(2, 8)):
+                    qty = rng.randint(qty_low, qty_high)
+                    items.append((item, qty, unit, rng.randrange(low, high + 1)))
+                trans_id = transaction(day, "Purchases", sum(qty * price for _i, qty, _u, price in items),
+                                       f"PUR-{day.strftime('%Y-%m-%d')}-{seq:03d}")
+                for item, qty, unit, price in items:
+                    self._add("carenderia_purchase_items", self._id("carenderia_purchase_items"), trans_id, item, qty,
+                              unit, _money(price), _money(qty * price))
+
+            for trans_type, bill_day, (low, high) in MONTHLY_BILLS:
+                if day.day == bill_day:
+                    transaction(day, trans_type, rng.randint(low, high))
+            if day.month == 1 and day.day == 20:
+                transaction(day, "Mayor's Permit", rng.randrange(8000, 15000, 100))
+            if rng.random() < 0.03:
+                transaction(day, "Maintenance", rng.randrange(500, 5000, 50))
@@ -0,0 +1,1412 @@
+// Page script for templates/carenderia/home.html (moved out of the template so browsers can cache it).
+// Route URLs come from the page's #page-urls JSON block, rendered with url_for.
+const URLS = JSON.parse(document.getElementById('page-urls').textContent);
+
+// Store transactions in memory (will be replaced with backend later)
+let transactions = [];
+let carenderiaEmployees = [];
+let wagesEntries = []; // Store individual employee wage entries
+
+// Helper function to format numbers with commas
+function formatAmount(num) {
+    return parseFloat(num || 0).toLocaleString('en-US', {
+        minimumFractionDigits: 2,
+        maximumFractionDigits: 2
+    });
+}
+
+// Load Carenderia employees
+async function loadCarenderiaEmployees() {
+    try {
+        const response = await fetch(URLS.getCarenderiaEmployees);
+        const data = await response.json();
+        carenderiaEmployees = data.employees || [];
+
+        // Populate employee dropdown
+        const employeeSelect = document.getElementById('wagesEmployee');
+        employeeSelect.innerHTML = '<option value="">Select Employee</option>';
+        carenderiaEmployees.forEach(emp => {
+            const option = document.createElement('option');
+            option.value = emp.id;
+            option.textContent = emp.name;
+            option.setAttribute('data-rate', emp.rate_per_day || 0);
+            option.setAttribute('data-dept-id', emp.department_id || '');
+            option.setAttribute('data-role', emp.role || '');
+            employeeSelect.appendChild(option);
+        });
+    } catch (error) {
+        console.error('Error loading employees:', error);
+    }
+}
+
+// Store selected daily expenses (will be added as transactions on Save Entry)
+let selectedDailyExpenses = [];
+
+// Store purchase items
+let purchaseItems = [];
+
+// Fetch next purchase reference (PUR-YYYY-MM-DD-###) from server
+async function fetchNextPurchaseReference() {
+    const dateInput = document.getElementById('entryDate');
+    const dateStr = (dateInput && dateInput.value) || new Date().toISOString().slice(0, 10);
+    try {
+        const url = URLS.nextPurchaseReference + '?date=' + encodeURIComponent(dateStr);
+        const resp = await fetch(url);
+        const data = await resp.json();
+        if (resp.ok && data.success && data.referenceNumber) {
+            return data.referenceNumber;
+        }
+    } catch (e) { console.warn('Next purchase reference:', e); }
+    return 'PUR-' + dateStr + '-001';
+}
+
+// Show/hide fields based on transaction type
+document.getElementById('transactionType').addEventListener('change', function() {
+    const wagesFields = document.getElementById('wagesFields');
+    const dailyExpenseFields = document.getElementById('dailyExpenseFields');
+    const purchasesFields = document.getElementById('purchasesFields');
+    const amountField = document.getElementById('amount');
+
+    if (this.value === 'Wages') {
+        wagesFields.style.display = 'block';
+        dailyExpenseFields.style.display = 'none';
+        purchasesFields.style.display = 'none';
+        amountField.readOnly = true;
+        amountField.value = '';
+        loadCarenderiaEmployees();
+    } else if (this.value === 'Daily Expense') {
+        wagesFields.style.display = 'none';
+        dailyExpenseFields.style.display = 'block';
+        purchasesFields.style.display = 'none';
+        amountField.readOnly = true;
+        amountField.value = '';
+        loadDailyExpensesForEntry();
+    } else if (this.value === 'Purchases') {
+        wagesFields.style.display = 'none';
+        dailyExpenseFields.style.display = 'none';
+        purchasesFields.style.display = 'block';
+        amountField.readOnly = true;
+        amountField.value = '';
+        initializePurchasesForm();
+    } else {
+        wagesFields.style.display = 'none';
+        dailyExpenseFields.style.display = 'none';
+        purchasesFields.style.display = 'none';
+        amountField.readOnly = false;
+        // Clear wages input fields but keep entries in memory
+        document.getElementById('wagesEmployee').value = '';
+        document.getElementById('wagesRatePerDay').value = '';
+        document.getElementById('wagesDays').value = '';
+        document.getElementById('wagesOvertimeHours').value = '';
+        document.getElementById('wagesOvertimeAmount').value = '';
+        document.getElementById('wagesTotalAmount').value = '';
+        amountField.value = '';
+        // Note: wagesEntries, selectedDailyExpenses, and purchaseItems are NOT cleared here - they persist until Submit Transaction
+    }
+});
+
+// When entry date changes and Purchases is selected, refresh reference number
+document.getElementById('entryDate').addEventListener('change', async function() {
+    if (document.getElementById('transactionType').value === 'Purchases') {
+        const ref = await fetchNextPurchaseReference();
+        document.getElementById('purchasesReference').value = ref;
+    }
+});
+
+// Initialize purchases form
+async function initializePurchasesForm() {
+    // Fetch and show next reference number (PUR-YYYY-MM-DD-###)
+    const ref = await fetchNextPurchaseReference();
+    document.getElementById('purchasesReference').value = ref;
+    // Reset purchase items table to have one empty row
+    const tbody = document.getElementById('purchasesItemsTableBody');
+    tbody.innerHTML = `
+        <tr class="purchase-item-row">
+            <td><input type="text" class="form-control form-control-sm purchase-desc" placeholder="Description"></td>
+            <td><input type="number" step="0.01" class="form-control form-control-sm purchase-qty" placeholder="0" min="0"></td>
+            <td><input type="text" class="form-control form-control-sm purchase-unit" placeholder="Unit"></td>
+            <td><input type="number" step="0.01" class="form-control form-control-sm purchase-unit-price" placeholder="0.00" min="0"></td>
+            <td><input type="text" class="form-control form-control-sm purchase-amount" placeholder="0.00" readonly></td>
+            <td><button type="button" class="btn btn-sm btn-danger delete-purchase-item" style="display: none;">Delete</button></td>
+        </tr>
+    `;
+    // Attach event listeners to the new row
+    attachPurchaseRowListeners(tbody.querySelector('.purchase-item-row'));
+    purchaseItems = [];
+    updatePurchasesEntriesTable();
+    updatePurchasesTotal();
+}
+
+// Attach event listeners to a purchase row
+function attachPurchaseRowListeners(row) {
+    const qtyInput = row.querySelector('.purchase-qty');
+    const unitPriceInput = row.querySelector('.purchase-unit-price');
+    const descInput = row.querySelector('.purchase-desc');
+    const unitInput = row.querySelector('.purchase-unit');
+    const amountInput = row.querySelector('.purchase-amount');
+    const deleteBtn = row.querySelector('.delete-purchase-item');
+
+    // Calculate amount when qty or unit price changes
+    function calculateRowAmount() {
+        const qty = parseFloat(qtyInput.value) || 0;
+        const unitPrice = parseFloat(unitPriceInput.value) || 0;
+        const amount = qty * unitPrice;
+        amountInput.value = formatAmount(amount);
+        updatePurchasesTotal();
+    }
+
+    qtyInput.addEventListener('input', calculateRowAmount);
+    unitPriceInput.addEventListener('input', calculateRowAmount);
+
+    // When Enter is pressed on description, move focus to qty
+    descInput.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter') {
+            e.preventDefault();
+            qtyInput.focus();
+            qtyInput.select(); // Select the value for easy editing
+        }
+    });
+
+    // When Enter is pressed on qty, move focus to unit
+    qtyInput.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter') {
+            e.preventDefault();
+            unitInput.focus();
+            unitInput.select();
+        }
+    });
+
+    // When Enter is pressed on unit, move focus to unit_price
+    unitInput.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter') {
+            e.preventDefault();
+            unitPriceInput.focus();
+            unitPriceInput.select();
+        }
+    });
+
+    // When Enter is pressed on unit_price, add new row
+    unitPriceInput.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter') {
+            e.preventDefault();
+            // Only add new row if current row has valid data
+            const desc = descInput.value.trim();
+            const qty = parseFloat(qtyInput.value) || 0;
+            const unit = unitInput.value.trim();
+            const unitPrice = parseFloat(unitPriceInput.value) || 0;
+
+            if (desc && qty > 0 && unitPrice > 0) {
+                // Check if this row is already saved (has data-index)
+                const rowIndex = row.getAttribute('data-index');
+                if (rowIndex === null || rowIndex === '') {
+                    // Save current row to purchaseItems (but keep the row visible with its data)
+                    addPurchaseItemToArray(desc, qty, unit, unitPrice);
+                    row.setAttribute('data-index', purchaseItems.length - 1);
+                    // Make inputs readonly or disabled to show they're saved (optional - or keep editable)
+                    // For now, keep them editable but mark as saved
+                    updatePurchasesEntriesTable();
+                    updatePurchasesTotal();
+                    updatePurchaseDeleteButtons();
+                }
+                // DON'T clear current row - keep its entries visible
+                // Add new blank row below
+                addNewPurchaseRow();
+                // Focus on description of new row
+                setTimeout(() => {
+                    const newRow = document.querySelector('.purchase-item-row:last-child');
+                    if (newRow) {
+                        newRow.querySelector('.purchase-desc').focus();
+                    }
+                }, 10);
+            }
+        }
+    });
+
+    // Delete button
+    deleteBtn.addEventListener('click', function(e) {
+        e.stopPropagation();
+        const index = parseInt(row.getAttribute('data-index'));
+        if (index >= 0 && index < purchaseItems.length) {
+            purchaseItems.splice(index, 1);
+            row.remove();
+            reindexPurchaseRows();
+            updatePurchaseDeleteButtons();
+            updatePurchasesEntriesTable();
+            updatePurchasesTotal();
+        } else {
+            // If not in array, just remove the row
+            row.remove();
+            updatePurchaseDeleteButtons();
+            updatePurchasesTotal();
+        }
+    });
+}
+
+// Add purchase item to array
+function addPurchaseItemToArray(desc, qty, unit, unitPrice) {
+    purchaseItems.push({
+        description: desc,
+        qty: qty,
+        unit: unit,
+        unit_price: unitPrice,
+        amount: qty * unitPrice
+    });
+}
+
+// Add new purchase row
+function addNewPurchaseRow() {
+    const tbody = document.getElementById('purchasesItemsTableBody');
+    const newRow = document.createElement('tr');
+    newRow.className = 'purchase-item-row';
+    newRow.innerHTML = `
+        <td><input type="text" class="form-control form-control-sm purchase-desc" placeholder="Description"></td>
+        <td><input type="number" step="0.01" class="form-control form-control-sm purchase-qty" placeholder="0" min="0"></td>
+        <td><input type="text" class="form-control form-control-sm purchase-unit" placeholder="Unit"></td>
+        <td><input type="number" step="0.01" class="form-control form-control-sm purchase-unit-price" placeholder="0.00" min="0"></td>
+        <td><input type="text" class="form-control form-control-sm purchase-amount" placeholder="0.00" readonly></td>
+        <td><button type="button" class="btn btn-sm btn-danger delete-purchase-item">Delete</button></td>
+    `;
+    tbody.appendChild(newRow);
+    attachPurchaseRowListeners(newRow);
+    // Show delete buttons on all rows except the last one
+    updatePurchaseDeleteButtons();
+}
+
+// Reindex purchase rows
+function reindexPurchaseRows() {
+    const rows = document.querySelectorAll('.purchase-item-row');
+    rows.forEach((row, index) => {
+        row.setAttribute('data-index', index);
+    });
+}
+
+// Update delete buttons visibility
+function updatePurchaseDeleteButtons() {
+    const rows = document.querySelectorAll('.purchase-item-row');
+    rows.forEach((row, index) => {
+        const deleteBtn = row.querySelector('.delete-purchase-item');
+        if (rows.length > 1) {
+            deleteBtn.style.display = '';
+        } else {
+            deleteBtn.style.display = 'none';
+        }
+    });
+}
+
+// Update purchases entries table (right side card)
+function updatePurchasesEntriesTable() {
+    const tbody = document.getElementById('purchasesEntriesTableBody');
+    tbody.innerHTML = '';
+
+    if (purchaseItems.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="2" class="text-center text-muted py-2" style="font-size: 0.85rem;">No items yet</td></tr>';
+        return;
+    }
+
+    purchaseItems.forEach((item, index) => {
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td>${item.description}</td>
+            <td class="text-end">${formatAmount(item.amount)}</td>
+        `;
+        tbody.appendChild(row);
+    });
+}
+
+// Update purchases total
+function updatePurchasesTotal() {
+    // Calculate total from purchaseItems array
+    const total = purchaseItems.reduce((sum, item) => sum + (parseFloat(item.amount) || 0), 0);
+    document.getElementById('purchasesTotalAmount').value = formatAmount(total);
+    document.getElementById('purchasesGrandTotal').textContent = formatAmount(total);
+}
+
+// Load daily expenses for entry form
+async function loadDailyExpensesForEntry() {
+    try {
+        const response = await fetch(URLS.getDailyExpenses);
+        const data = await response.json();
+        if (data.success && data.expenses) {
+            // Initialize selectedDailyExpenses with all expenses that have amount > 0
+            selectedDailyExpenses = data.expenses
+                .filter(exp => parseFloat(exp.amount || 0) > 0)
+                .map(exp => ({
+                    expense_type: exp.expense_type,
+                    amount: parseFloat(exp.amount || 0)
+                }));
+            renderDailyExpenseEntriesTable();
+            updateDailyExpenseGrandTotal();
+        } else {
+            selectedDailyExpenses = [];
+            renderDailyExpenseEntriesTable();
+        }
+    } catch (error) {
+        console.error('Error loading daily expenses:', error);
+        selectedDailyExpenses = [];
+        renderDailyExpenseEntriesTable();
+    }
+}
+
+function renderDailyExpenseEntriesTable() {
+    const tbody = document.getElementById('dailyExpenseEntriesTableBody');
+    tbody.innerHTML = '';
+
+    if (selectedDailyExpenses.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="3" class="text-center text-muted py-2" style="font-size: 0.85rem;">No daily expenses with amount > 0</td></tr>';
+        return;
+    }
+
+    selectedDailyExpenses.forEach((expense, index) => {
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td>${expense.expense_type}</td>
+            <td class="text-end">${parseFloat(expense.amount || 0).toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
+            <td>
+                <button type="button" class="btn btn-sm btn-danger delete-daily-expense-btn" data-index="${index}">Delete</button>
+            </td>
+        `;
+        tbody.appendChild(row);
+    });
+}
+
+function updateDailyExpenseGrandTotal() {
+    const total = selectedDailyExpenses.reduce((sum, exp) => sum + parseFloat(exp.amount || 0), 0);
+    document.getElementById('dailyExpenseGrandTotal').textContent = formatAmount(total);
+}
+
+// Delete daily expense from selected list
+document.addEventListener('click', function(e) {
+    if (e.target.classList.contains('delete-daily-expense-btn')) {
+        const index = parseInt(e.target.getAttribute('data-index'));
+        selectedDailyExpenses.splice(index, 1);
+        renderDailyExpenseEntriesTable();
+        updateDailyExpenseGrandTotal();
+    }
+});
+
+// Auto-fill rate per day when employee is selected
+document.getElementById('wagesEmployee').addEventListener('change', function() {
+    const selectedOption = this.options[this.selectedIndex];
+    const ratePerDay = selectedOption.getAttribute('data-rate') || 0;
+    document.getElementById('wagesRatePerDay').value = formatAmount(ratePerDay);
+    calculateWagesTotal();
+});
+
+// Auto-calculate total amount when days, rate, or overtime hours changes
+document.getElementById('wagesDays').addEventListener('input', calculateWagesTotal);
+document.getElementById('wagesRatePerDay').addEventListener('input', calculateWagesTotal);
+document.getElementById('wagesOvertimeHours').addEventListener('input', calculateWagesTotal);
+
+function calculateWagesTotal() {
+    // Parse ratePerDay, removing commas from formatted string
+    const ratePerDayStr = document.getElementById('wagesRatePerDay').value.replace(/,/g, '');
+    const ratePerDay = parseFloat(ratePerDayStr) || 0;
+    const days = parseFloat(document.getElementById('wagesDays').value) || 0;
+    const overtimeHours = parseFloat(document.getElementById('wagesOvertimeHours').value) || 0;
+
+    // Calculate overtime amount: (rate_per_day / 8 hours) * overtime_hours
+    const ratePerHour = ratePerDay / 8;
+    const overtimeAmount = ratePerHour * overtimeHours;
+
+    // Calculate total amount: (rate_per_day * days) + overtime_amount
+    const regularAmount = ratePerDay * days;
+    const totalAmount = regularAmount + overtimeAmount;
+
+    // Update overtime amount field (use text input, so formatAmount with commas works)
+    document.getElementById('wagesOvertimeAmount').value = formatAmount(overtimeAmount);
+
+    // Update total amount field (use text input, so formatAmount with commas works)
+    document.getElementById('wagesTotalAmount').value = formatAmount(totalAmount);
+    updateWagesGrandTotal();
+}
+
+// Add employee to wages entries
+document.getElementById('addWagesEmployeeBtn').addEventListener('click', function() {
+    const entryDate = document.getElementById('entryDate').value;
+    const employeeSelect = document.getElementById('wagesEmployee');
+    const employeeId = employeeSelect.value;
+    const employeeName = employeeSelect.options[employeeSelect.selectedIndex].text;
+    const employeeDeptId = employeeSelect.options[employeeSelect.selectedIndex].getAttribute('data-dept-id') || null;
+    const employeeRole = employeeSelect.options[employeeSelect.selectedIndex].getAttribute('data-role') || null;
+    const ratePerDay = parseFloat(document.getElementById('wagesRatePerDay').value.replace(/,/g, '')) || 0;
+    const days = parseFloat(document.getElementById('wagesDays').value) || 0;
+    const overtimeHours = parseFloat(document.getElementById('wagesOvertimeHours').value) || 0;
+    // Parse overtime amount, removing commas from formatted string
+    const overtimeAmountStr = document.getElementById('wagesOvertimeAmount').value.replace(/,/g, '');
+    const overtimeAmount = parseFloat(overtimeAmountStr) || 0;
+
+    if (!entryDate) {
+        alert('Please select a date first.');
+        return;
+    }
+
+    if (!employeeId) {
+        alert('Please select an employee.');
+        return;
+    }
+
+    if (days <= 0 && overtimeHours <= 0) {
+        alert('Please enter a valid number of days or overtime hours.');
+        return;
+    }
+
+    // Check if employee already exists
+    const existingIndex = wagesEntries.findIndex(e => e.employeeId === parseInt(employeeId));
+    // Total amount includes overtime: (rate_per_day * days) + overtime_amount
+    const regularAmount = ratePerDay * days;
+    const totalAmount = regularAmount + overtimeAmount;
+
+    if (existingIndex >= 0) {
+        // Update existing entry
+        wagesEntries[existingIndex].ratePerDay = ratePerDay;
+        wagesEntries[existingIndex].days = days;
+        wagesEntries[existingIndex].overtimeHours = overtimeHours;
+        wagesEntries[existingIndex].overtimeAmount = overtimeAmount;
+        wagesEntries[existingIndex].totalAmount = totalAmount;
+        wagesEntries[existingIndex].departmentId = employeeDeptId ? parseInt(employeeDeptId) : null;
+        wagesEntries[existingIndex].employeeRole = employeeRole;
+        wagesEntries[existingIndex].date = entryDate;
+    } else {
+        // Add new entry
+        wagesEntries.push({
+            id: wagesEntries.length > 0 ? Math.max(...wagesEntries.map(e => e.id)) + 1 : 1,
+            employeeId: parseInt(employeeId),
+            employeeName: employeeName,
+            departmentId: employeeDeptId ? parseInt(employeeDeptId) : null,
+            employeeRole: employeeRole,
+            ratePerDay: ratePerDay,
+            days: days,
+            overtimeHours: overtimeHours,
+            overtimeAmount: overtimeAmount,
+            totalAmount: totalAmount,
+            date: entryDate
+        });
+    }
+
+    updateWagesEntriesTable();
+
+    // Clear form fields
+    employeeSelect.value = '';
+    document.getElementById('wagesRatePerDay').value = '';
+    document.getElementById('wagesDays').value = '';
+    document.getElementById('wagesOvertimeHours').value = '';
+    document.getElementById('wagesOvertimeAmount').value = '';
+    document.getElementById('wagesTotalAmount').value = '';
+});
+
+// Update wages entries table
+function updateWagesEntriesTable() {
+    const tbody = document.getElementById('wagesEntriesTableBody');
+    tbody.innerHTML = '';
+
+    if (wagesEntries.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="4" class="text-center text-muted py-2" style="font-size: 0.85rem;">No entries yet</td></tr>';
+        updateWagesGrandTotal();
+        return;
+    }
+
+    wagesEntries.forEach(entry => {
+        const row = document.createElement('tr');
+        const dateDisplay = entry.date ? new Date(entry.date).toLocaleDateString() : 'N/A';
+        row.innerHTML = `
+            <td>${dateDisplay}</td>
+            <td>${entry.employeeName}</td>
+            <td class="text-end">${formatAmount(entry.totalAmount)}</td>
+            <td class="text-center">
+                <button class="btn btn-sm btn-danger delete-wages-entry" data-id="${entry.id}">Delete</button>
+            </td>
+        `;
+        tbody.appendChild(row);
+    });
+
+    // Add delete event listeners
+    document.querySelectorAll('.delete-wages-entry').forEach(btn => {
+        btn.addEventListener('click', function() {
+            const id = parseInt(this.getAttribute('data-id'));
+            wagesEntries = wagesEntries.filter(e => e.id !== id);
+            updateWagesEntriesTable();
+        });
+    });
+
+    updateWagesGrandTotal();
+}
+
+// Update grand total for wages
+function updateWagesGrandTotal() {
+    const grandTotal = wagesEntries.reduce((sum, entry) => sum + entry.totalAmount, 0);
+    document.getElementById('wagesGrandTotal').textContent = formatAmount(grandTotal);
+    document.getElementById('amount').value = formatAmount(grandTotal);
+}
+
+// Define expense types (for calculating cash out)
+const expenseTypes = ['Daily Expense', 'Purchases', 'Wages'];
+const incomeTypes = ['Daily Sales'];
+
+// Check if transaction type is an expense
+function isExpense(type) {
+    return expenseTypes.includes(type);
+}
+
+// Check if transaction type is income
+function isIncome(type) {
+    return incomeTypes.includes(type);
+}
+
+// Calculate totals from transactions
+function calculateTotals() {
+    let totalExpenses = 0;
+    let totalIncome = 0;
+    let cashOnHand = 0;
+
+    // Sort transactions by date and id to calculate in order
+    const sortedTransactions = [...transactions].sort((a, b) => {
+        if (a.date !== b.date) {
+            return new Date(a.date) - new Date(b.date);
+        }
+        return a.id - b.id;
+    });
+
+    sortedTransactions.forEach(trans => {
+        const amount = parseFloat(trans.amount) || 0;
+        if (isExpense(trans.transactionType)) {
+            totalExpenses += amount;
+            cashOnHand -= amount;
+        } else if (isIncome(trans.transactionType)) {
+            totalIncome += amount;
+            cashOnHand += amount;
+        }
+    });
+
+    return { totalExpenses, totalIncome, cashOnHand };
+}
+
+// Update running balance
+function updateRunningBalance() {
+    // Calculate totals by transaction type
+    let dailyCollection = 0;
+    let dailyExpense = 0;
+    let purchases = 0;
+    let wages = 0;
+
+    transactions.forEach(trans => {
+        const amount = parseFloat(trans.amount) || 0;
+        const type = trans.transactionType;
+
+        if (type === 'Daily Sales') {
+            dailyCollection += amount;
+        } else if (type === 'Daily Expense') {
+            dailyExpense += amount;
+        } else if (type === 'Purchases') {
+            purchases += amount;
+        } else if (type === 'Wages') {
+            wages += amount;
+        }
+    });
+
+    const totalDeductions = dailyExpense + purchases + wages;
+    const netAmount = dailyCollection - totalDeductions;
+
+    // Update running balance display
+    document.getElementById('runningDailyCollection').textContent = formatAmount(dailyCollection);
+
+    // Update deduction amounts and show/hide rows based on amount
+    updateDeductionRow('rowDeductionDailyExpense', 'deductionDailyExpense', dailyExpense);
+    updateDeductionRow('rowDeductionPurchases', 'deductionPurchases', purchases);
+    updateDeductionRow('rowDeductionWages', 'deductionWages', wages);
+
+    document.getElementById('runningTotalDeductions').textContent = formatAmount(totalDeductions);
+    document.getElementById('runningNetAmount').textContent = formatAmount(netAmount);
+}
+
+// Helper function to update deduction row and show/hide based on amount
+function updateDeductionRow(rowId, amountId, amount) {
+    const row = document.getElementById(rowId);
+    const amountElement = document.getElementById(amountId);
+
+    if (amount > 0) {
+        row.style.display = '';
+        amountElement.textContent = formatAmount(amount);
+    } else {
+        row.style.display = 'none';
+        amountElement.textContent = formatAmount(0);
+    }
+}
+
+// Update summary panels (now only updates running balance)
+function updateSummaryPanels() {
+    // Update running balance
+    updateRunningBalance();
+}
+
+// Recalculate cash on hand for all transactions
+function recalculateCashOnHand() {
+    let runningCash = 0;
+    transactions.forEach(trans => {
+        const amount = parseFloat(trans.amount) || 0;
+        if (isExpense(trans.transactionType)) {
+            runningCash -= amount;
+        } else if (isIncome(trans.transactionType)) {
+            runningCash += amount;
+        }
+        trans.cashOnHand = runningCash;
+    });
+}
+
+// Handle form submission
+document.getElementById('entryForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const entryDate = document.getElementById('entryDate').value;
+    const transactionType = document.getElementById('transactionType').value;
+    let amount = parseFloat(document.getElementById('amount').value) || 0;
+
+    if (!entryDate) {
+        alert('Please select a date.');
+        return;
+    }
+
+    if (!transactionType) {
+        alert('Please select a transaction type.');
+        return;
+    }
+
+    // Handle Daily Expense: add each selected expense as a transaction
+    if (transactionType === 'Daily Expense') {
+        if (selectedDailyExpenses.length === 0) {
+            alert('No daily expenses selected. Please ensure there are expenses with amount > 0.');
+            return;
+        }
+
+        // Add each daily expense as a separate transaction
+        let nextId = transactions.length > 0 ? Math.max(...transactions.map(t => t.id)) + 1 : 1;
+        selectedDailyExpenses.forEach(expense => {
+            const transaction = {
+                id: nextId++,
+                date: entryDate,
+                transactionType: 'Daily Expense',
+                amount: expense.amount,
+                expenseType: expense.expense_type // Store for display
+            };
+            transactions.push(transaction);
+        });
+
+        recalculateCashOnHand();
+        updateTransactionsTable();
+        updateSummaryPanels();
+        this.reset();
+
+        // Reset daily expense fields
+        document.getElementById('dailyExpenseFields').style.display = 'none';
+        document.getElementById('amount').readOnly = false;
+        document.getElementById('transactionType').value = '';
+        // Clear selected expenses after adding to transactions
+        selectedDailyExpenses = [];
+        renderDailyExpenseEntriesTable();
+        updateDailyExpenseGrandTotal();
+        return;
+    }
+
+    // Handle Purchases: add as one transaction with items
+    if (transactionType === 'Purchases') {
+        // Collect items from current form rows (including the one being edited)
+        const rows = document.querySelectorAll('.purchase-item-row');
+        const currentItems = [];
+        rows.forEach(row => {
+            const desc = row.querySelector('.purchase-desc').value.trim();
+            const qty = parseFloat(row.querySelector('.purchase-qty').value) || 0;
+            const unit = row.querySelector('.purchase-unit').value.trim();
+            const unitPrice = parseFloat(row.querySelector('.purchase-unit-price').value) || 0;
+
+            // Only add if row has valid data
+            if (desc && qty > 0 && unitPrice > 0) {
+                // Check if this row is already in purchaseItems (has data-index)
+                const rowIndex = row.getAttribute('data-index');
+                if (rowIndex === null || rowIndex === '') {
+                    // New item, add to currentItems
+                    currentItems.push({
+                        description: desc,
+                        qty: qty,
+                        unit: unit,
+                        unit_price: unitPrice,
+                        amount: qty * unitPrice
+                    });
+                }
+                // If rowIndex exists, it's already in purchaseItems, skip
+            }
+        });
+
+        // Merge with existing purchaseItems
+        const allItems = [...purchaseItems, ...currentItems];
+
+        if (allItems.length === 0) {
+            alert('Please add at least one purchase item.');
+            return;
+        }
+
+        const referenceNumber = document.getElementById('purchasesReference').value;
+        const totalAmount = allItems.reduce((sum, item) => sum + (parseFloat(item.amount) || 0), 0);
+
+        // Add as ONE transaction with items stored
+        const transaction = {
+            id: transactions.length > 0 ? Math.max(...transactions.map(t => t.id)) + 1 : 1,
+            date: entryDate,
+            transactionType: 'Purchases',
+            amount: totalAmount,
+            referenceNumber: referenceNumber,
+            items: allItems // Store items for expansion
+        };
+
+        transactions.push(transaction);
+        recalculateCashOnHand();
+        updateTransactionsTable();
+        updateSummaryPanels();
+        this.reset();
+
+        // Reset purchases fields
+        document.getElementById('purchasesFields').style.display = 'none';
+        document.getElementById('amount').readOnly = false;
+        document.getElementById('transactionType').value = '';
+        purchaseItems = [];
+        initializePurchasesForm();
+        return;
+    }
+
+    // Validate wages fields if transaction type is Wages
+    if (transactionType === 'Wages') {
+        if (wagesEntries.length === 0) {
+            alert('Please add at least one employee wage entry.');
+            return;
+        }
+
+        // Use grand total from all wages entries
+        amount = wagesEntries.reduce((sum, entry) => sum + entry.totalAmount, 0);
+    }
+
+    if (amount <= 0) {
+        alert('Please enter a valid amount.');
+        return;
+    }
+
+    // Create transaction object
+    const transaction = {
+        id: transactions.length > 0 ? Math.max(...transactions.map(t => t.id)) + 1 : 1,
+        date: entryDate,
+        transactionType: transactionType,
+        amount: amount
+    };
+
+    // For Wages, store the wage entries with the transaction
+    if (transactionType === 'Wages') {
+        // Create a copy of wagesEntries to store with this transaction
+        transaction.wageEntries = JSON.parse(JSON.stringify(wagesEntries));
+    }
+
+    transactions.push(transaction);
+    recalculateCashOnHand();
+    updateTransactionsTable();
+    updateSummaryPanels();
+    this.reset();
+
+    // Reset wages fields visibility
+    if (transactionType === 'Wages') {
+        // For Wages, hide the fields but keep entries in memory for next transaction
+        document.getElementById('wagesFields').style.display = 'none';
+        document.getElementById('amount').readOnly = false;
+        // Clear the input fields but keep wagesEntries for potential next transaction
+        document.getElementById('wagesEmployee').value = '';
+        document.getElementById('wagesRatePerDay').value = '';
+        document.getElementById('wagesDays').value = '';
+        document.getElementById('wagesOvertimeHours').value = '';
+        document.getElementById('wagesOvertimeAmount').value = '';
+        document.getElementById('wagesTotalAmount').value = '';
+        // Reset transaction type dropdown
+        document.getElementById('transactionType').value = '';
+        // Note: wagesEntries are kept in memory for potential next Wages transaction
+    } else {
+        document.getElementById('wagesFields').style.display = 'none';
+        document.getElementById('amount').readOnly = false;
+    }
+});
+
+// Handle edit form submission
+let editingTransactionId = null;
+document.getElementById('editTransactionForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    if (!editingTransactionId) return;
+
+    const entryDate = document.getElementById('editDate').value;
+    const transactionType = document.getElementById('editTransactionType').value;
+    const amount = parseFloat(document.getElementById('editAmount').value) || 0;
+
+    if (!entryDate || !transactionType || amount <= 0) {
+        alert('Please fill in all fields correctly.');
+        return;
+    }
+
+    // Find and update transaction
+    const transaction = transactions.find(t => t.id === editingTransactionId);
+    if (transaction) {
+        transaction.date = entryDate;
+        transaction.transactionType = transactionType;
+        transaction.amount = amount;
+
+        recalculateCashOnHand();
+        updateTransactionsTable();
+        updateSummaryPanels();
+
+        bootstrap.Modal.getInstance(document.getElementById('editTransactionModal')).hide();
+        editingTransactionId = null;
+    }
+});
+
+// Update transactions table - show each transaction individually
+function updateTransactionsTable() {
+    const tbody = document.getElementById('transactionsTableBody');
+    tbody.innerHTML = '';
+
+    if (transactions.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="4" class="text-center text-muted py-4">No transactions yet. Add an entry above.</td></tr>';
+        return;
+    }
+
+    // Sort transactions by date and id
+    const sortedTransactions = [...transactions].sort((a, b) => {
+        if (a.date !== b.date) {
+            return new Date(a.date) - new Date(b.date);
+        }
+        return a.id - b.id;
+    });
+
+    sortedTransactions.forEach(trans => {
+        const amount = parseFloat(trans.amount) || 0;
+        const type = trans.transactionType;
+        // For Daily Expense, show the expense type name
+        const displayType = (type === 'Daily Expense' && trans.expenseType) 
+            ? `${type} (${trans.expenseType})` 
+            : type;
+
+        // For Purchases, show reference number
+        const displayTypeWithRef = (type === 'Purchases' && trans.referenceNumber)
+            ? `${type} (${trans.referenceNumber})`
+            : displayType;
+
+        const row = document.createElement('tr');
+        row.className = 'transaction-row';
+        row.setAttribute('data-transaction-id', trans.id);
+
+        // Make Purchases and Wages rows clickable
+        if ((type === 'Purchases' && trans.items && trans.items.length > 0) ||
+            (type === 'Wages' && trans.wageEntries && trans.wageEntries.length > 0)) {
+            row.style.cursor = 'pointer';
+            if (type === 'Purchases') {
+                row.classList.add('purchases-expandable');
+            } else if (type === 'Wages') {
+                row.classList.add('wages-expandable');
+            }
+        }
+
+        // Add chevron icon for expandable rows
+        let chevronIcon = '';
+        if (type === 'Purchases' && trans.items && trans.items.length > 0) {
+            chevronIcon = '<i class="bi bi-chevron-down ms-1"></i>';
+        } else if (type === 'Wages' && trans.wageEntries && trans.wageEntries.length > 0) {
+            chevronIcon = '<i class="bi bi-chevron-down ms-1"></i>';
+        }
+
+        row.innerHTML = `
+            <td>${new Date(trans.date).toLocaleDateString()}</td>
+            <td>${displayTypeWithRef}${chevronIcon}</td>
+            <td class="fw-bold">${formatAmount(amount)}</td>
+            <td>
+                <button class="btn btn-sm btn-warning edit-transaction me-1" data-id="${trans.id}">Edit</button>
+                <button class="btn btn-sm btn-danger delete-transaction" data-id="${trans.id}">Delete</button>
+            </td>
+        `;
+        tbody.appendChild(row);
+
+        // Add expandable items row for Purchases
+        if (type === 'Purchases' && trans.items && trans.items.length > 0) {
+            const itemsRow = document.createElement('tr');
+            itemsRow.className = 'purchases-items-row';
+            itemsRow.style.display = 'none';
+            itemsRow.setAttribute('data-transaction-id', trans.id);
+            itemsRow.innerHTML = `
+                <td colspan="4" class="p-3 bg-light">
+                    <table class="table table-sm table-bordered mb-0">
+                        <thead class="table-danger">
+                            <tr>
+                                <th>Description</th>
+                                <th>Qty</th>
+                                <th>Unit</th>
+                                <th class="text-end">Unit Price</th>
+                                <th class="text-end">Amount</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            ${trans.items.map(item => `
+                                <tr>
+                                    <td>${item.description || ''}</td>
+                                    <td>${parseFloat(item.qty || 0).toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
+                                    <td>${item.unit || ''}</td>
+                                    <td class="text-end">${formatAmount(item.unit_price || 0)}</td>
+                                    <td class="text-end fw-bold">${formatAmount(item.amount || 0)}</td>
+                                </tr>
+                            `).join('')}
+                        </tbody>
+                    </table>
+                </td>
+            `;
+            tbody.appendChild(itemsRow);
+        }
+
+        // Add expandable wage entries row for Wages
+        if (type === 'Wages' && trans.wageEntries && trans.wageEntries.length > 0) {
+            const itemsRow = document.createElement('tr');
+            itemsRow.className = 'wages-items-row';
+            itemsRow.style.display = 'none';
+            itemsRow.setAttribute('data-transaction-id', trans.id);
+            itemsRow.innerHTML = `
+                <td colspan="4" class="p-3 bg-light">
+                    <table class="table table-sm table-bordered mb-0">
+                        <thead class="table-danger">
+                            <tr>
+                                <th>Employee</th>
+                                <th class="text-end">Rate/Day</th>
+                                <th class="text-end">Days</th>
+                                <th class="text-end">Overtime Hours</th>
+                                <th class="text-end">Overtime Amount</th>
+                                <th class="text-end">Total Amount</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            ${trans.wageEntries.map(entry => `
+                                <tr>
+                                    <td>${entry.employeeName || ''}</td>
+                                    <td class="text-end">${formatAmount(entry.ratePerDay || 0)}</td>
+                                    <td class="text-end">${parseFloat(entry.days || 0).toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
+                                    <td class="text-end">${parseFloat(entry.overtimeHours || 0).toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
+                                    <td class="text-end">${formatAmount(entry.overtimeAmount || 0)}</td>
+                                    <td class="text-end fw-bold">${formatAmount(entry.totalAmount || 0)}</td>
+                                </tr>
+                            `).join('')}
+                        </tbody>
+                    </table>
+                </td>
+            `;
+            tbody.appendChild(itemsRow);
+        }
+    });
+
+    // Add click handlers for expandable Purchases rows
+    document.querySelectorAll('.purchases-expandable').forEach(row => {
+        row.addEventListener('click', function(e) {
+            // Don't expand if clicking on buttons
+            if (e.target.closest('button')) {
+                return;
+            }
+
+            const transactionId = this.getAttribute('data-transaction-id');
+            const itemsRow = document.querySelector(`.purchases-items-row[data-transaction-id="${transactionId}"]`);
+            const chevron = this.querySelector('.bi-chevron-down, .bi-chevron-up');
+
+            if (itemsRow) {
+                if (itemsRow.style.display === 'none') {
+                    itemsRow.style.display = '';
+                    if (chevron) {
+                        chevron.classList.remove('bi-chevron-down');
+                        chevron.classList.add('bi-chevron-up');
+                    }
+                } else {
+                    itemsRow.style.display = 'none';
+                    if (chevron) {
+                        chevron.classList.remove('bi-chevron-up');
+                        chevron.classList.add('bi-chevron-down');
+                    }
+                }
+            }
+        });
+    });
+
+    // Add click handlers for expandable Wages rows
+    document.querySelectorAll('.wages-expandable').forEach(row => {
+        row.addEventListener('click', function(e) {
+            // Don't expand if clicking on buttons
+            if (e.target.closest('button')) {
+                return;
+            }
+
+            const transactionId = this.getAttribute('data-transaction-id');
+            const itemsRow = document.querySelector(`.wages-items-row[data-transaction-id="${transactionId}"]`);
+            const chevron = this.querySelector('.bi-chevron-down, .bi-chevron-up');
+
+            if (itemsRow) {
+                if (itemsRow.style.display === 'none') {
+                    itemsRow.style.display = '';
+                    if (chevron) {
+                        chevron.classList.remove('bi-chevron-down');
+                        chevron.classList.add('bi-chevron-up');
+                    }
+                } else {
+                    itemsRow.style.display = 'none';
+                    if (chevron) {
+                        chevron.classList.remove('bi-chevron-up');
+                        chevron.classList.add('bi-chevron-down');
+                    }
+                }
+            }
+        });
+    });
+
+    // Add edit event listeners
+    document.querySelectorAll('.edit-transaction').forEach(btn => {
+        btn.addEventListener('click', function() {
+            const id = parseInt(this.getAttribute('data-id'));
+            const transaction = transactions.find(t => t.id === id);
+            if (transaction) {
+                editingTransactionId = id;
+                document.getElementById('editDate').value = transaction.date;
+                document.getElementById('editTransactionType').value = transaction.transactionType;
+                document.getElementById('editAmount').value = transaction.amount;
+                new bootstrap.Modal(document.getElementById('editTransactionModal')).show();
+            }
+        });
+    });
+
+    // Add delete event listeners
+    document.querySelectorAll('.delete-transaction').forEach(btn => {
+        btn.addEventListener('click', function() {
+            if (confirm('Are you sure you want to delete this transaction?')) {
+                const id = parseInt(this.getAttribute('data-id'));
+                transactions = transactions.filter(t => t.id !== id);
+                recalculateCashOnHand();
+                updateTransactionsTable();
+                updateSummaryPanels();
+            }
+        });
+    });
+}
+
+// Handle form reset
+document.getElementById('clearFormBtn').addEventListener('click', function() {
+    const transactionType = document.getElementById('transactionType').value;
+    if (transactionType === 'Wages') {
+        // For Wages, just clear input fields but keep entries
+        document.getElementById('wagesEmployee').value = '';
+        document.getElementById('wagesRatePerDay').value = '';
+        document.getElementById('wagesDays').value = '';
+        document.getElementById('wagesOvertimeHours').value = '';
+        document.getElementById('wagesOvertimeAmount').value = '';
+        document.getElementById('wagesTotalAmount').value = '';
+    } else {
+        document.getElementById('wagesFields').style.display = 'none';
+        document.getElementById('amount').readOnly = false;
+        document.getElementById('wagesEmployee').value = '';
+        document.getElementById('wagesRatePerDay').value = '';
+        document.getElementById('wagesDays').value = '';
+        document.getElementById('wagesOvertimeHours').value = '';
+        document.getElementById('wagesOvertimeAmount').value = '';
+        document.getElementById('wagesTotalAmount').value = '';
+    }
+    // Note: wagesEntries are NOT cleared on form reset - they persist until Submit Transaction
+});
+
+// Handle Submit Transaction button
+document.getElementById('submitTransactionsBtn').addEventListener('click', async function() {
+    if (transactions.length === 0) {
+        alert('No transactions to submit.');
+        return;
+    }
+
+    // Collect all wages entries from all Wages transactions
+    const allWagesEntries = [];
+    const wagesTransactions = transactions.filter(t => t.transactionType === 'Wages');
+
+    if (wagesTransactions.length > 0 && wagesEntries.length > 0) {
+        // Get the date from the first Wages transaction
+        const wagesDate = wagesTransactions[0].date;
+
+        // Save wages entries to backend
+        try {
+            const wagesResp = await fetch(URLS.saveWages, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({
+                    date: wagesDate,
+                    entries: wagesEntries
+                })
+            });
+            const wagesData = await wagesResp.json();
+            if (!wagesResp.ok || !wagesData.success) {
+                alert(wagesData.error || 'Failed to save wages.');
+                return;
+            }
+        } catch (error) {
+            console.error(error);
+            alert('Error saving wages. Please try again.');
+            return;
+        }
+    }
+
+    if (!confirm(`Are you sure you want to submit ${transactions.length} transaction(s) to the database?`)) {
+        return;
+    }
+
+    try {
+        const resp = await fetch(URLS.saveTransactions, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                transactions: transactions
+            })
+        });
+        const data = await resp.json();
+
+        if (resp.ok && data.success) {
+            alert(data.message || 'Transactions saved successfully!');
+            // Clear transactions and wages entries after successful save
+            transactions = [];
+            wagesEntries = [];
+            updateTransactionsTable();
+            updateWagesEntriesTable();
+            updateSummaryPanels();
+        } else {
+            alert(data.error || 'Failed to save transactions.');
+        }
+    } catch (error) {
+        console.error(error);
+        alert('Error saving transactions. Please try again.');
+    }
+});
+
+// Initialize
+updateSummaryPanels();
+
+// Load employees on page load
+loadCarenderiaEmployees();
+
+// Manage Daily Expense Modal - Initialize after DOM is ready
+document.addEventListener('DOMContentLoaded', function() {
+    const manageDailyExpenseModal = document.getElementById('manageDailyExpenseModal');
+    if (!manageDailyExpenseModal) {
+        console.error('manageDailyExpenseModal not found');
+        return;
+    }
+
+    let dailyExpenses = [];
+
+    async function loadDailyExpenses() {
+        try {
+            const tbody = document.getElementById('dailyExpensesTableBody');
+            if (tbody) {
+                tbody.innerHTML = '<tr><td colspan="2" class="text-center">Loading...</td></tr>';
+            }
+
+            const url = URLS.getDailyExpenses;
+            console.log('Fetching daily expenses from:', url);
+
+            const response = await fetch(url);
+            console.log('Response status:', response.status);
+
+            if (!response.ok) {
+                const errorText = await response.text();
+                console.error('Response error:', errorText);
+                throw new Error(`HTTP error! status: ${response.status}, body: ${errorText}`);
+            }
+
+            const data = await response.json();
+            console.log('Daily expenses response:', data);
+
+            if (data.success && data.expenses) {
+                dailyExpenses = data.expenses;
+                console.log('Loaded', dailyExpenses.length, 'expenses');
+                renderDailyExpensesTable();
+            } else {
+                console.error('Failed to load expenses:', data);
+                if (tbody) {
+                    tbody.innerHTML = '<tr><td colspan="2" class="text-center text-danger">Error: ' + (data.message || 'Failed to load expenses') + '</td></tr>';
+                }
+            }
+        } catch (error) {
+            console.error('Error loading daily expenses:', error);
+            const tbody = document.getElementById('dailyExpensesTableBody');
+            if (tbody) {
+                tbody.innerHTML = '<tr><td colspan="2" class="text-center text-danger">Error loading expenses: ' + error.message + '</td></tr>';
+            }
+        }
+    }
+
+    function renderDailyExpensesTable() {
+        const tbody = document.getElementById('dailyExpensesTableBody');
+        if (!tbody) return;
+
+        tbody.innerHTML = '';
+        if (dailyExpenses.length === 0) {
+            tbody.innerHTML = '<tr><td colspan="2" class="text-center text-muted">No expenses found.</td></tr>';
+            return;
+        }
+
+        dailyExpenses.forEach(expense => {
+            const row = document.createElement('tr');
+            row.style.cursor = 'pointer';
+            row.onclick = () => editDailyExpense(expense);
+            row.innerHTML = `
+                <td>${expense.expense_type}</td>
+                <td class="text-end">${parseFloat(expense.amount || 0).toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
+            `;
+            tbody.appendChild(row);
+        });
+    }
+
+    function editDailyExpense(expense) {
+        const editExpenseId = document.getElementById('editExpenseId');
+        const editExpenseType = document.getElementById('editExpenseType');
+        const editExpenseAmount = document.getElementById('editExpenseAmount');
+
+        if (editExpenseId) editExpenseId.value = expense.id;
+        if (editExpenseType) editExpenseType.value = expense.expense_type;
+        if (editExpenseAmount) editExpenseAmount.value = expense.amount || 0;
+
+        const editModalEl = document.getElementById('editDailyExpenseModal');
+        if (editModalEl) {
+            const editModal = new bootstrap.Modal(editModalEl);
+            editModal.show();
+        }
+    }
+
+    // Load expenses when modal is shown
+    manageDailyExpenseModal.addEventListener('show.bs.modal', function() {
+        loadDailyExpenses();
+    });
+
+    // Save expense button
+    const saveExpenseBtn = document.getElementById('saveExpenseBtn');
+    if (saveExpenseBtn) {
+        saveExpenseBtn.addEventListener('click', async function() {
+            const expenseId = document.getElementById('editExpenseId').value;
+            const amount = parseFloat(document.getElementById('editExpenseAmount').value) || 0;
+
+            try {
+                const response = await fetch(URLS.updateDailyExpense.replace('/0', `/${expenseId}`), {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({ amount: amount })
+                });
+
+                const data = await response.json();
+                if (data.success) {
+                    bootstrap.Modal.getInstance(document.getElementById('editDailyExpenseModal')).hide();
+                    await loadDailyExpenses();
+                    alert('Expense updated successfully!');
+                } else {
+                    alert(data.message || 'Failed to update expense.');
+                }
+            } catch (error) {
+                console.error('Error updating expense:', error);
+                alert('Error updating expense. Please try again.');
+            }
+        });
+    }
+
+    // Open Add Expense modal from Manage modal
+    const openAddExpenseBtn = document.getElementById('openAddExpenseBtn');
+    console.log('openAddExpenseBtn found:', !!openAddExpenseBtn);
+    if (openAddExpenseBtn) {
+        openAddExpenseBtn.addEventListener('click', function(e) {
+            console.log('+ Add Expense button clicked');
+            e.preventDefault();
+            e.stopPropagation();
+            bootstrap.Modal.getInstance(manageDailyExpenseModal).hide();
+            setTimeout(() => {
+                const addModalEl = document.getElementById('addDailyExpenseModal');
+                console.log('addDailyExpenseModal found:', !!addModalEl);
+                if (addModalEl) {
+                    const addModal = new bootstrap.Modal(addModalEl);
+                    addModal.show();
+                } else {
+                    alert('Add Expense modal not found. Please refresh the page.');
+                }
+            }, 300);
+        });
+    } else {
+        console.error('openAddExpenseBtn not found in DOM');
+    }
+
+    // Cancel Add Expense - return to Manage modal
+    const cancelAddExpenseBtn = document.getElementById('cancelAddExpenseBtn');
+    if (cancelAddExpenseBtn) {
+        cancelAddExpenseBtn.addEventListener('click', function() {
+            bootstrap.Modal.getInstance(document.getElementById('addDailyExpenseModal')).hide();
+            setTimeout(() => {
+                const manageModal = new bootstrap.Modal(manageDailyExpenseModal);
+                manageModal.show();
+            }, 300);
+        });
+    }
+
+    // Add new expense
+    const addExpenseBtn = document.getElementById('addExpenseBtn');
+    console.log('addExpenseBtn found:', !!addExpenseBtn);
+    if (addExpenseBtn) {
+        addExpenseBtn.addEventListener('click', async function(e) {
+            console.log('Add Expense button clicked');
+            e.preventDefault();
+            e.stopPropagation();
+            const expenseType = document.getElementById('addExpenseType');
+            const expenseAmount = document.getElementById('addExpenseAmount');
+
+            if (!expenseType || !expenseAmount) {
+                alert('Form elements not found.');
+                return;
+            }
+
+            const typeValue = expenseType.value.trim();
+            const amountValue = parseFloat(expenseAmount.value) || 0;
+
+            if (!typeValue) {
+                alert('Please enter an expense type.');
+                return;
+            }
+
+            try {
+                const response = await fetch(URLS.addDailyExpense, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({ 
+                        expense_type: typeValue,
+                        amount: amountValue 
+                    })
+                });
+
+                const data = await response.json();
+                if (data.success) {
+                    bootstrap.Modal.getInstance(document.getElementById('addDailyExpenseModal')).hide();
+                    // Clear form
+                    expenseType.value = '';
+                    expenseAmount.value = '0';
+                    // Reload expenses list
+                    await loadDailyExpenses();
+                    // Reopen manage modal
+                    setTimeout(() => {
+                        const manageModal = new bootstrap.Modal(manageDailyExpenseModal);
+                        manageModal.show();
+                    }, 300);
+                    alert('Expense added successfully!');
+                } else {
+                    alert(data.message || 'Failed to add expense.');
+                }
+            } catch (error) {
+                console.error('Error adding expense:', error);
+                alert('Error adding expense. Please try again.');
+            }
+        });
+    }
+});
@@ -0,0 +1,607 @@
+// Page script for templates/catering/home.html (moved out of the template so browsers can cache it).
+// Route URLs come from the page's #page-urls JSON block, rendered with url_for.
+const URLS = JSON.parse(document.getElementById('page-urls').textContent);
+
+// Expense Cards functionality
+document.querySelectorAll('.expense-card').forEach(card => {
+    card.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-5px)';
+    });
+    card.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0)';
+    });
+});
+
+// Load employees for wages
+let cateringEmployees = [];
+fetch(URLS.cateringEmployees)
+    .then(res => res.json())
+    .then(data => {
+        cateringEmployees = data.employees || [];
+        const select = document.getElementById('expenseEmployeeId');
+        select.innerHTML = '<option value="">Select Employee</option>';
+        cateringEmployees.forEach(emp => {
+            const option = document.createElement('option');
+            option.value = emp.id;
+            option.textContent = emp.name + (emp.role ? ` (${emp.role})` : '');
+            option.dataset.rate = emp.rate_per_day || '';
+            select.appendChild(option);
+        });
+    });
+
+// Store wages entries
+let wagesEntries = [];
+
+// Handle expense card click (or when opened from booking row, expenseType/bookingId set by caller)
+document.getElementById('expenseModal').addEventListener('show.bs.modal', function(event) {
+    const card = event.relatedTarget;
+    if (card && card.dataset.expenseType) {
+        document.getElementById('expenseBookingId').value = '';
+    }
+    const expenseType = (card && card.dataset.expenseType) || document.getElementById('expenseType').value;
+    document.getElementById('expenseType').value = expenseType;
+    document.getElementById('expenseModalTitle').textContent = `Add ${expenseType}`;
+
+    // Show/hide sections based on expense type
+    const wagesSection = document.getElementById('wagesEmployeeSection');
+    const regularAmountSection = document.getElementById('regularAmountSection');
+    const remarksSection = document.getElementById('remarksSection');
+    const descriptionInput = document.getElementById('expenseDescription');
+
+    if (expenseType === 'Wages') {
+        wagesSection.style.display = 'block';
+        regularAmountSection.style.display = 'none';
+        remarksSection.style.display = 'none';
+        descriptionInput.value = 'Wages';
+        descriptionInput.readOnly = true;
+        wagesEntries = []; // Reset wages entries
+        document.getElementById('employeeWagesList').innerHTML = '';
+        document.getElementById('expenseAmount').value = '0.00';
+        document.getElementById('totalWagesAmount').value = '₱0.00';
+        document.getElementById('expenseNumberOfDays').value = '';
+        document.getElementById('expenseOvertimeHours').value = '';
+        document.getElementById('expenseOvertimeAmount').value = '';
+        document.getElementById('expenseEmployeeAmount').value = '';
+    } else {
+        wagesSection.style.display = 'none';
+        regularAmountSection.style.display = 'block';
+        remarksSection.style.display = 'block';
+        descriptionInput.value = '';
+        descriptionInput.readOnly = false;
+    }
+
+    // Leave date blank; user must enter date
+    document.getElementById('expenseDate').value = '';
+});
+
+// Update employee rate and calculate amount when employee is selected
+document.getElementById('expenseEmployeeId').addEventListener('change', function() {
+    const selectedOption = this.options[this.selectedIndex];
+    const rate = parseFloat(selectedOption.dataset.rate) || 0;
+    document.getElementById('expenseEmployeeRate').value = rate.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    document.getElementById('expenseEmployeeName').value = selectedOption.textContent.split(' (')[0] || '';
+    calculateWageAmount();
+});
+
+// Calculate wage amount when number of days changes
+document.getElementById('expenseNumberOfDays').addEventListener('input', calculateWageAmount);
+document.getElementById('expenseNumberOfDays').addEventListener('change', calculateWageAmount);
+document.getElementById('expenseOvertimeHours').addEventListener('input', calculateWageAmount);
+document.getElementById('expenseOvertimeHours').addEventListener('change', calculateWageAmount);
+
+function calculateWageAmount() {
+    const rate = parseFloat(document.getElementById('expenseEmployeeRate').value.replace(/,/g, '')) || 0;
+    const days = parseFloat(document.getElementById('expenseNumberOfDays').value) || 0;
+    const overtimeHours = parseFloat(document.getElementById('expenseOvertimeHours').value) || 0;
+    const ratePerHour = rate / 8;
+    const overtimeAmount = ratePerHour * overtimeHours;
+    const daysAmount = rate * days;
+    const totalAmount = daysAmount + overtimeAmount;
+    document.getElementById('expenseOvertimeAmount').value = overtimeAmount.toFixed(2);
+    document.getElementById('expenseEmployeeAmount').value = totalAmount.toFixed(2);
+}
+
+// Add employee to wages list
+document.getElementById('addEmployeeBtn').addEventListener('click', function() {
+    const employeeSelect = document.getElementById('expenseEmployeeId');
+    const selectedOption = employeeSelect.options[employeeSelect.selectedIndex];
+
+    if (!selectedOption.value) {
+        alert('Please select an employee.');
+        return;
+    }
+
+    const employeeId = selectedOption.value;
+    const employeeName = document.getElementById('expenseEmployeeName').value;
+    const rate = parseFloat(document.getElementById('expenseEmployeeRate').value.replace(/,/g, '')) || 0;
+    const days = parseFloat(document.getElementById('expenseNumberOfDays').value) || 0;
+    const overtimeHours = parseFloat(document.getElementById('expenseOvertimeHours').value) || 0;
+    const overtimeAmount = parseFloat(document.getElementById('expenseOvertimeAmount').value) || 0;
+    const amount = parseFloat(document.getElementById('expenseEmployeeAmount').value) || 0;
+
+    if (days <= 0 && overtimeHours <= 0) {
+        alert('Please enter number of days and/or overtime hours.');
+        return;
+    }
+
+    // Check if employee already added
+    if (wagesEntries.find(entry => entry.employee_id === employeeId)) {
+        alert('This employee is already in the list.');
+        return;
+    }
+
+    // Add to wages entries (amount = days amount + overtime amount)
+    wagesEntries.push({
+        employee_id: employeeId,
+        employee_name: employeeName,
+        rate_per_day: rate,
+        number_of_days: days,
+        overtime_hours: overtimeHours,
+        overtime_amount: overtimeAmount,
+        amount: amount
+    });
+
+    // Add to list box
+    const listBox = document.getElementById('employeeWagesList');
+    const option = document.createElement('option');
+    option.value = employeeId;
+    let desc = `${employeeName} - ${days} day(s)`;
+    if (overtimeHours > 0) desc += ` + ${overtimeHours} OT`;
+    desc += ` = ₱${amount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}`;
+    option.textContent = desc;
+    option.dataset.index = wagesEntries.length - 1;
+    listBox.appendChild(option);
+
+    // Clear fields
+    employeeSelect.value = '';
+    document.getElementById('expenseEmployeeRate').value = '';
+    document.getElementById('expenseNumberOfDays').value = '';
+    document.getElementById('expenseOvertimeHours').value = '';
+    document.getElementById('expenseOvertimeAmount').value = '';
+    document.getElementById('expenseEmployeeAmount').value = '';
+
+    // Calculate total amount
+    updateTotalWagesAmount();
+});
+
+// Enable/disable Delete button based on selection
+document.getElementById('employeeWagesList').addEventListener('change', function() {
+    const deleteBtn = document.getElementById('deleteEmployeeBtn');
+    deleteBtn.disabled = this.selectedIndex < 0;
+});
+
+// Remove employee from wages list (Delete button)
+document.getElementById('deleteEmployeeBtn').addEventListener('click', function() {
+    const listBox = document.getElementById('employeeWagesList');
+    const selectedIndex = listBox.selectedIndex;
+
+    if (selectedIndex >= 0) {
+        const option = listBox.options[selectedIndex];
+        const entryIndex = parseInt(option.dataset.index);
+
+        // Remove from wages entries array
+        wagesEntries.splice(entryIndex, 1);
+
+        // Remove from list box
+        listBox.remove(selectedIndex);
+
+        // Re-index remaining options
+        Array.from(listBox.options).forEach((opt, idx) => {
+            opt.dataset.index = idx;
+        });
+
+        // Disable delete button if no items left
+        if (listBox.options.length === 0) {
+            this.disabled = true;
+        }
+
+        updateTotalWagesAmount();
+    }
+});
+
+// Keep double-click functionality as well
+document.getElementById('employeeWagesList').addEventListener('dblclick', function() {
+    document.getElementById('deleteEmployeeBtn').click();
+});
+
+function updateTotalWagesAmount() {
+    const total = wagesEntries.reduce((sum, entry) => sum + entry.amount, 0);
+    document.getElementById('expenseAmount').value = total.toFixed(2);
+    // Update the visible Total Wages Amount field
+    document.getElementById('totalWagesAmount').value = `₱${total.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}`;
+}
+
+// Handle expense form submission
+document.getElementById('expenseForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+    const dateInput = document.getElementById('expenseDate');
+    if (!dateInput.value || dateInput.value.trim() === '') {
+        alert('Please enter the date.');
+        dateInput.focus();
+        return;
+    }
+    const expenseType = document.getElementById('expenseType').value;
+
+    // For Wages, submit to catering_wages table
+    if (expenseType === 'Wages') {
+        if (wagesEntries.length === 0) {
+            alert('Please add at least one employee to the wages list.');
+            return;
+        }
+
+        const date = document.getElementById('expenseDate').value;
+        const description = document.getElementById('expenseDescription').value;
+        const bookingId = document.getElementById('expenseBookingId').value || null;
+
+        // Prepare wages data
+        const wagesData = {
+            date: date,
+            description: description,
+            booking_id: bookingId || undefined,
+            wages: wagesEntries.map(entry => ({
+                employee_id: entry.employee_id,
+                employee_name: entry.employee_name,
+                rate_per_day: entry.rate_per_day,
+                number_of_days: entry.number_of_days,
+                amount: entry.amount
+            }))
+        };
+
+        // Submit all wages at once
+        fetch(URLS.addWages, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-Requested-With': 'XMLHttpRequest'
+            },
+            body: JSON.stringify(wagesData)
+        })
+        .then(res => res.json())
+        .then(data => {
+            if(data.success){
+                alert(data.message || `Successfully added ${wagesEntries.length} wage entry/entries!`);
+                bootstrap.Modal.getInstance(document.getElementById('expenseModal')).hide();
+                this.reset();
+                wagesEntries = [];
+                document.getElementById('employeeWagesList').innerHTML = '';
+                document.getElementById('expenseAmount').value = '0.00';
+                document.getElementById('totalWagesAmount').value = '₱0.00';
+            } else {
+                alert(data.error || 'Failed to add wages.');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('An error occurred while adding the wages.');
+        });
+    } else {
+        // For Expenses and Miscellaneous, submit normally
+        const formData = new FormData(this);
+
+        fetch(URLS.addExpense, {
+            method: 'POST',
+            headers: {'X-Requested-With': 'XMLHttpRequest'},
+            body: formData
+        })
+        .then(res => res.json())
+        .then(data => {
+            if(data.success){
+                alert('Expense added successfully!');
+                bootstrap.Modal.getInstance(document.getElementById('expenseModal')).hide();
+                this.reset();
+            } else {
+                alert(data.error || 'Failed to add expense.');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('An error occurred while adding the expense.');
+        });
+    }
+});
+
+// Extract booking amount from items_requested text
+function extractBookingAmount(itemsText) {
+    if (!itemsText) return 0;
+    // Look for "TOTAL AMOUNT: ₱X,XXX.XX" pattern
+    const match = itemsText.match(/TOTAL AMOUNT:\s*₱([\d,]+\.?\d*)/);
+    if (match) {
+        return parseFloat(match[1].replace(/,/g, '')) || 0;
+    }
+    return 0;
+}
+
+// Track current booking totals
+let currentBookingAmount = 0;
+let currentExistingTotal = 0;
+
+// Booking search: filter table by search term (interactive)
+const bookingSearchEl = document.getElementById('bookingSearch');
+if (bookingSearchEl) {
+    bookingSearchEl.addEventListener('input', function() {
+        const q = this.value.trim().toLowerCase();
+        document.querySelectorAll('.booking-row').forEach(function(row) {
+            const actionsRow = row.nextElementSibling;
+            const rowText = (row.textContent || '').toLowerCase();
+            const match = !q || rowText.indexOf(q) !== -1;
+            row.style.display = match ? '' : 'none';
+            if (actionsRow && actionsRow.classList.contains('booking-actions-row')) {
+                if (!match) actionsRow.style.display = 'none';
+            }
+        });
+    });
+}
+
+// Booking row: click to expand/collapse actions
+document.querySelectorAll('.booking-row').forEach(row => {
+    row.addEventListener('click', function(e) {
+        if (e.target.closest('button')) return;
+        const bookingId = this.dataset.bookingId;
+        const actionsRow = document.getElementById('booking-actions-' + bookingId);
+        if (!actionsRow) return;
+        const isHidden = actionsRow.style.display === 'none';
+        document.querySelectorAll('.booking-actions-row').forEach(r => { r.style.display = 'none'; });
+        document.querySelectorAll('.booking-row').forEach(r => { r.classList.remove('expanded'); });
+        if (isHidden) {
+            actionsRow.style.display = 'table-row';
+            this.classList.add('expanded');
+        }
+    });
+    row.addEventListener('mouseenter', function() { this.style.backgroundColor = 'rgba(255, 193, 7, 0.08)'; });
+    row.addEventListener('mouseleave', function() { this.style.backgroundColor = ''; });
+});
+
+// Add Payment: open Add Financial Transaction modal for this booking
+document.querySelectorAll('.booking-action-payment').forEach(btn => {
+    btn.addEventListener('click', function(e) {
+        e.stopPropagation();
+        const bookingId = this.dataset.bookingId;
+        const bookingName = this.dataset.bookingName;
+        const bookingItems = this.dataset.bookingItems;
+        document.getElementById('transactionBookingId').value = bookingId;
+        document.getElementById('transactionBookingName').value = `Booking #${bookingId} - ${bookingName}`;
+        const bookingAmount = extractBookingAmount(bookingItems);
+        currentBookingAmount = bookingAmount;
+        document.getElementById('transactionBookingAmount').value = bookingAmount.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+        fetch(`/catering/booking-transaction-total/${bookingId}`)
+            .then(res => res.json())
+            .then(data => { currentExistingTotal = data.success ? (parseFloat(data.total) || 0) : 0; updateRunningBalance(); })
+            .catch(() => { currentExistingTotal = 0; updateRunningBalance(); });
+        document.getElementById('transactionDate').value = '';
+        new bootstrap.Modal(document.getElementById('addTransactionModal')).show();
+    });
+});
+
+// Add Wages: set booking ref and open expense modal (Wages)
+document.querySelectorAll('.booking-action-wages').forEach(btn => {
+    btn.addEventListener('click', function(e) {
+        e.stopPropagation();
+        document.getElementById('expenseBookingId').value = this.dataset.bookingId || '';
+        document.getElementById('expenseType').value = 'Wages';
+        document.getElementById('expenseModalTitle').textContent = 'Add Wages';
+        document.getElementById('wagesEmployeeSection').style.display = 'block';
+        document.getElementById('regularAmountSection').style.display = 'none';
+        document.getElementById('remarksSection').style.display = 'none';
+        document.getElementById('expenseDescription').value = 'Wages';
+        document.getElementById('expenseDescription').readOnly = true;
+        wagesEntries = [];
+        document.getElementById('employeeWagesList').innerHTML = '';
+        document.getElementById('expenseAmount').value = '0.00';
+        document.getElementById('totalWagesAmount').value = '₱0.00';
+        document.getElementById('expenseDate').value = '';
+        new bootstrap.Modal(document.getElementById('expenseModal')).show();
+    });
+});
+
+// Add Miscellaneous: set booking ref and open expense modal (Miscellaneous)
+document.querySelectorAll('.booking-action-misc').forEach(btn => {
+    btn.addEventListener('click', function(e) {
+        e.stopPropagation();
+        document.getElementById('expenseBookingId').value = this.dataset.bookingId || '';
+        document.getElementById('expenseType').value = 'Miscellaneous';
+        document.getElementById('expenseModalTitle').textContent = 'Add Miscellaneous';
+        document.getElementById('wagesEmployeeSection').style.display = 'none';
+        document.getElementById('regularAmountSection').style.display = 'block';
+        document.getElementById('remarksSection').style.display = 'block';
+        document.getElementById('expenseDescription').value = '';
+        document.getElementById('expenseDescription').readOnly = false;
+        document.getElementById('expenseDate').value = '';
+        new bootstrap.Modal(document.getElementById('expenseModal')).show();
+    });
+});
+
+// Add Purchases: store booking id and open purchases modal (initialized below)
+document.querySelectorAll('.booking-action-purchases').forEach(btn => {
+    btn.addEventListener('click', function(e) {
+        e.stopPropagation();
+        window.currentPurchasesBookingId = this.dataset.bookingId || null;
+        openPurchasesModal();
+    });
+});
+
+// --- Purchases modal: open, add row, calc, save ---
+async function openPurchasesModal() {
+    const dateEl = document.getElementById('purchasesDate');
+    dateEl.value = '';
+    document.getElementById('purchasesReference').value = '';
+    document.getElementById('purchasesTotal').value = '0.00';
+    const tbody = document.getElementById('purchasesModalTableBody');
+    tbody.innerHTML = `
+        <tr class="purchase-modal-row">
+            <td class="purchases-col-desc"><input type="text" class="form-control form-control-sm p-desc" placeholder="Description"></td>
+            <td class="purchases-col-qty"><input type="number" step="0.01" min="0" class="form-control form-control-sm p-qty" placeholder="0"></td>
+            <td class="purchases-col-unit"><input type="text" class="form-control form-control-sm p-unit" placeholder="Unit"></td>
+            <td class="purchases-col-unitprice"><input type="number" step="0.01" min="0" class="form-control form-control-sm p-unitprice" placeholder="0"></td>
+            <td class="purchases-col-amount"><input type="text" class="form-control form-control-sm p-amount" readonly placeholder="0"></td>
+            <td class="purchases-col-action"><button type="button" class="btn btn-sm btn-outline-danger p-remove" style="display:none;">×</button></td>
+        </tr>
+    `;
+    attachPurchaseModalRowListeners();
+    document.getElementById('purchasesDate').addEventListener('change', function() {
+        fetch(URLS.nextPurchaseReference + '?date=' + encodeURIComponent(this.value))
+            .then(r => r.json()).then(d => { if (d.success && d.referenceNumber) document.getElementById('purchasesReference').value = d.referenceNumber; });
+    });
+    new bootstrap.Modal(document.getElementById('purchasesModal')).show();
+}
+function attachPurchaseModalRowListeners() {
+    document.querySelectorAll('#purchasesModalTableBody .purchase-modal-row').forEach(row => {
+        const desc = row.querySelector('.p-desc');
+        const qty = row.querySelector('.p-qty');
+        const unit = row.querySelector('.p-unit');
+        const up = row.querySelector('.p-unitprice');
+        const amt = row.querySelector('.p-amount');
+        const rm = row.querySelector('.p-remove');
+        function calc() {
+            const q = parseFloat(qty.value) || 0;
+            const u = parseFloat(up.value) || 0;
+            amt.value = (q * u).toFixed(2);
+            updatePurchasesModalTotal();
+        }
+        qty.addEventListener('input', calc);
+        up.addEventListener('input', calc);
+        rm.addEventListener('click', function() { row.remove(); updatePurchasesModalTotal(); });
+        // Enter: move to next column; on Unit Price, Enter adds new row
+        desc.addEventListener('keydown', function(e) {
+            if (e.key === 'Enter') { e.preventDefault(); qty.focus(); }
+        });
+        qty.addEventListener('keydown', function(e) {
+            if (e.key === 'Enter') { e.preventDefault(); unit.focus(); }
+        });
+        unit.addEventListener('keydown', function(e) {
+            if (e.key === 'Enter') { e.preventDefault(); up.focus(); }
+        });
+        up.addEventListener('keydown', function(e) {
+            if (e.key === 'Enter') {
+                e.preventDefault();
+                document.getElementById('purchasesAddRow').click();
+                const rows = document.querySelectorAll('#purchasesModalTableBody .purchase-modal-row');
+                const newRow = rows[rows.length - 1];
+                if (newRow) newRow.querySelector('.p-desc').focus();
+            }
+        });
+    });
+    const rows = document.querySelectorAll('#purchasesModalTableBody .purchase-modal-row');
+    rows.forEach((r, i) => { r.querySelector('.p-remove').style.display = rows.length > 1 ? 'inline-block' : 'none'; });
+}
+function updatePurchasesModalTotal() {
+    let t = 0;
+    document.querySelectorAll('#purchasesModalTableBody .p-amount').forEach(inp => { t += parseFloat(inp.value) || 0; });
+    document.getElementById('purchasesTotal').value = t.toFixed(2);
+}
+document.getElementById('purchasesAddRow').addEventListener('click', function() {
+    const tbody = document.getElementById('purchasesModalTableBody');
+    const tr = document.createElement('tr');
+    tr.className = 'purchase-modal-row';
+    tr.innerHTML = `
+        <td class="purchases-col-desc"><input type="text" class="form-control form-control-sm p-desc" placeholder="Description"></td>
+        <td class="purchases-col-qty"><input type="number" step="0.01" min="0" class="form-control form-control-sm p-qty" placeholder="0"></td>
+        <td class="purchases-col-unit"><input type="text" class="form-control form-control-sm p-unit" placeholder="Unit"></td>
+        <td class="purchases-col-unitprice"><input type="number" step="0.01" min="0" class="form-control form-control-sm p-unitprice" placeholder="0"></td>
+        <td class="purchases-col-amount"><input type="text" class="form-control form-control-sm p-amount" readonly placeholder="0"></td>
+        <td class="purchases-col-action"><button type="button" class="btn btn-sm btn-outline-danger p-remove">×</button></td>
+    `;
+    tbody.appendChild(tr);
+    attachPurchaseModalRowListeners();
+});
+document.getElementById('purchasesSaveBtn').addEventListener('click', function() {
+    const dateStr = document.getElementById('purchasesDate').value;
+    if (!dateStr) { alert('Please enter date.'); return; }
+    const ref = document.getElementById('purchasesReference').value.trim();
+    const items = [];
+    document.querySelectorAll('#purchasesModalTableBody .purchase-modal-row').forEach(row => {
+        const desc = (row.querySelector('.p-desc').value || '').trim();
+        const qty = parseFloat(row.querySelector('.p-qty').value) || 0;
+        const unit = (row.querySelector('.p-unit').value || '').trim();
+        const unitPrice = parseFloat(row.querySelector('.p-unitprice').value) || 0;
+        const amount = parseFloat(row.querySelector('.p-amount').value) || 0;
+        if (desc && qty > 0 && unitPrice > 0) items.push({ description: desc, qty: qty, unit: unit, unit_price: unitPrice, amount: amount || (qty * unitPrice) });
+    });
+    if (items.length === 0) { alert('Please add at least one item.'); return; }
+    const payload = { date: dateStr, reference_number: ref, items: items };
+    if (window.currentPurchasesBookingId) payload.booking_id = parseInt(window.currentPurchasesBookingId);
+    this.disabled = true;
+    fetch(URLS.addPurchases, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'X-Requested-With': 'XMLHttpRequest' },
+        body: JSON.stringify(payload)
+    })
+    .then(r => r.json())
+    .then(data => {
+        if (data.success) { alert(data.message || 'Purchases saved.'); bootstrap.Modal.getInstance(document.getElementById('purchasesModal')).hide(); location.reload(); }
+        else { alert(data.error || 'Save failed.'); }
+    })
+    .catch(() => alert('Network error.'))
+    .finally(() => { this.disabled = false; });
+});
+
+// Function to calculate and update running balance
+function updateRunningBalance() {
+    const transAmountInput = document.getElementById('transactionAmount');
+    const runningBalanceInput = document.getElementById('transactionRunningBalance');
+
+    const transAmount = parseFloat(transAmountInput.value) || 0;
+    const runningBalance = currentBookingAmount - currentExistingTotal - transAmount;
+
+    // Format with comma and 2 decimal places
+    runningBalanceInput.value = runningBalance.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+}
+
+// Update running balance when transaction amount changes
+const transAmountInput = document.getElementById('transactionAmount');
+transAmountInput.addEventListener('input', updateRunningBalance);
+transAmountInput.addEventListener('change', updateRunningBalance);
+
+// Auto-fill transaction amount when "Full Payment" is selected
+document.getElementById('transactionDescription').addEventListener('change', function() {
+    if (this.value === 'Full Payment') {
+        // Calculate running balance without current transaction amount
+        const runningBalance = currentBookingAmount - currentExistingTotal;
+
+        // Set transaction amount to the running balance
+        transAmountInput.value = runningBalance.toFixed(2);
+        updateRunningBalance();
+    }
+});
+
+// Handle transaction form submission
+document.getElementById('addTransactionForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+    const dateInput = document.getElementById('transactionDate');
+    if (!dateInput.value || dateInput.value.trim() === '') {
+        alert('Please enter the date of the transaction.');
+        dateInput.focus();
+        return;
+    }
+    // Convert formatted booking amount back to number for submission
+    const bookingAmountInput = document.getElementById('transactionBookingAmount');
+    const bookingAmountValue = bookingAmountInput.value.replace(/,/g, '');
+    bookingAmountInput.value = bookingAmountValue;
+
+    const formData = new FormData(this);
+
+    fetch(URLS.addTransaction, {
+        method: 'POST',
+        headers: {'X-Requested-With': 'XMLHttpRequest'},
+        body: formData
+    })
+    .then(res => res.json())
+    .then(data => {
+        if(data.success){
+            let message = 'Transaction added successfully!';
+            if(data.booking_status_updated) {
+                message += ' Booking status updated to Completed.';
+            }
+            alert(message);
+            bootstrap.Modal.getInstance(document.getElementById('addTransactionModal')).hide();
+            this.reset();
+            // Reload page to refresh the bookings list
+            location.reload();
+        } else {
+            alert(data.error || 'Failed to add transaction.');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('An error occurred while adding the transaction.');
+    });
+});
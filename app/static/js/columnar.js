@@ -0,0 +1,28 @@
+// Columnar report payloads (`?format=columnar`, see app/utils/columnar.py).
+// A table is {schema: [{name, type}], length, columns: [[...], ...]}; these helpers turn it back into rows.
+(function () {
+    function rows(table) {
+        const names = table.schema.map(function (col) { return col.name; });
+        const columns = table.columns;
+        const out = new Array(table.length);
+        for (let i = 0; i < table.length; i++) {
+            const row = {};
+            for (let c = 0; c < names.length; c++) {
+                row[names[c]] = columns[c][i];
+            }
+            out[i] = row;
+        }
+        return out;
+    }
+
+    // {value of `key`: [row, ...]} in table order, e.g. a month's transactions by date
+    function groupBy(table, key) {
+        const groups = {};
+        rows(table).forEach(function (row) {
+            (groups[row[key]] = groups[row[key]] || []).push(row);
+        });
+        return groups;
+    }
+
+    window.Columnar = { rows: rows, groupBy: groupBy };
+})();
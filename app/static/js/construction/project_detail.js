@@ -0,0 +1,1957 @@
+// Page script for templates/construction/project_detail.html (moved out of the template so browsers can cache it).
+// Route URLs come from the page's #page-urls JSON block, rendered with url_for.
+const URLS = JSON.parse(document.getElementById('page-urls').textContent);
+
+document.addEventListener("DOMContentLoaded", async function () {
+
+    /* ==========================================
+       GLOBALS
+    ========================================== */
+    const entryType = document.getElementById("entryType");
+    const materialsCard = document.getElementById("materialsCard");
+    const materialDate = document.getElementById("materialDate");
+    const materialsTableBody = document.querySelector("#materialsTable tbody");
+    const invoiceDisplay = document.getElementById("invoiceDisplay");
+    const materialsTotalAmountDisplay = document.getElementById("materialsTotalAmountDisplay");
+    const submitMaterialsBtn = document.getElementById("submitMaterialsBtn");
+    const cancelMaterialsBtn = document.getElementById("cancelMaterialsBtn");
+    const laborCard = document.getElementById("laborCard");
+    const laborTable = document.getElementById("laborTable");
+    const laborTotalAmountDisplay = document.getElementById("laborTotalAmountDisplay");
+    const laborDate = document.getElementById("laborDate");
+    const laborInvoiceDisplay = document.getElementById("laborInvoiceDisplay");
+    const submitLaborBtn = document.getElementById("submitLaborBtn");
+    const cancelLaborBtn = document.getElementById("cancelLaborBtn");
+    const gasolineCard = document.getElementById("gasolineCard");
+    const gasolineTable = document.getElementById("gasolineTable");
+    const gasolineDate = document.getElementById("gasolineDate");
+    const gasolineInvoiceDisplay = document.getElementById("gasolineInvoiceDisplay");
+    const gasolineTotalAmountDisplay = document.getElementById("gasolineTotalAmountDisplay");
+    const submitGasolineBtn = document.getElementById("submitGasolineBtn");
+    const cancelGasolineBtn = document.getElementById("cancelGasolineBtn");
+    const documentsCard = document.getElementById("documentsCard");
+    const documentsTable = document.getElementById("documentsTable");
+    const documentsDate = document.getElementById("documentsDate");
+    const documentsInvoiceDisplay = document.getElementById("documentsInvoiceDisplay");
+    const documentsTotalAmountDisplay = document.getElementById("documentsTotalAmountDisplay");
+    const submitDocumentsBtn = document.getElementById("submitDocumentsBtn");
+    const cancelDocumentsBtn = document.getElementById("cancelDocumentsBtn");
+    const obligationCard = document.getElementById("obligationCard");
+    const obligationTable = document.getElementById("obligationTable");
+    const obligationDate = document.getElementById("obligationDate");
+    const obligationInvoiceDisplay = document.getElementById("obligationInvoiceDisplay");
+    const obligationTotalAmountDisplay = document.getElementById("obligationTotalAmountDisplay");
+    const submitObligationBtn = document.getElementById("submitObligationBtn");
+    const cancelObligationBtn = document.getElementById("cancelObligationBtn");
+    const activityCard = document.getElementById("activityCard");
+    const activityTable = document.getElementById("activityTable");
+    const activityDate = document.getElementById("activityDate");
+    const submitActivityBtn = document.getElementById("submitActivityBtn");
+    const cancelActivityBtn = document.getElementById("cancelActivityBtn");
+
+    let itemsList = [];
+    let unitsList = [];
+    const activitiesDisplayTableBody = document.getElementById("activitiesDisplayTableBody");
+
+    /* ==========================================
+       LOAD ACTIVITIES
+    ========================================== */
+    async function loadActivities() {
+        // Only load activities if the table exists (Corporate users only)
+        if (!activitiesDisplayTableBody) {
+            return;
+        }
+
+        try {
+            const response = await fetch(URLS.getActivities);
+            const data = await response.json();
+
+            if (data.activities && data.activities.length > 0) {
+                activitiesDisplayTableBody.innerHTML = "";
+                data.activities.forEach((activity) => {
+                    const row = activitiesDisplayTableBody.insertRow();
+                    const formattedDate = formatActivityDateTime(activity.activity_date, activity.activity_time);
+                    row.style.cursor = "pointer";
+                    row.setAttribute("data-activity-id", activity.id);
+                    row.addEventListener("click", function(e) {
+                        // Don't open modal if clicking on delete button
+                        if (e.target.tagName === "BUTTON" || e.target.closest("button")) {
+                            return;
+                        }
+                        openEditActivityModal(activity);
+                    });
+                    row.innerHTML = `
+                        <td>${activity.activity || ""}</td>
+                        <td>${formattedDate}</td>
+                        <td>
+                            <span class="badge ${getStatusBadgeClass(activity.activity_status)}">${activity.activity_status || "Pending"}</span>
+                        </td>
+                        <td>
+                            <button class="btn btn-sm btn-danger" onclick="event.stopPropagation(); deleteActivity(${activity.id})">Delete</button>
+                        </td>
+                    `;
+                });
+            } else {
+                activitiesDisplayTableBody.innerHTML = `
+                    <tr>
+                        <td colspan="4" class="text-center">No activities found.</td>
+                    </tr>
+                `;
+            }
+        } catch (error) {
+            console.error("Error loading activities:", error);
+            if (activitiesDisplayTableBody) {
+                activitiesDisplayTableBody.innerHTML = `
+                    <tr>
+                        <td colspan="4" class="text-center text-danger">Error loading activities.</td>
+                    </tr>
+                `;
+            }
+        }
+    }
+
+    /* ==========================================
+       EDIT ACTIVITY MODAL
+    ========================================== */
+    function openEditActivityModal(activity) {
+        document.getElementById("editActivityId").value = activity.id;
+        document.getElementById("editActivityDescription").value = activity.activity || "";
+
+        // Format datetime for datetime-local input (YYYY-MM-DDTHH:mm)
+        let datetimeValue = "";
+        if (activity.activity_date) {
+            datetimeValue = activity.activity_date;
+            if (activity.activity_time) {
+                datetimeValue += "T" + activity.activity_time;
+            } else if (datetimeValue.includes("T")) {
+                // Already has time
+            } else {
+                datetimeValue += "T00:00";
+            }
+        }
+        document.getElementById("editActivityDateTime").value = datetimeValue;
+        document.getElementById("editActivityStatus").value = activity.activity_status || "Pending";
+
+        // Show modal using Bootstrap
+        const modal = new bootstrap.Modal(document.getElementById("editActivityModal"));
+        modal.show();
+    }
+
+    // Save activity changes
+    const saveActivityBtn = document.getElementById("saveActivityBtn");
+    if (saveActivityBtn) {
+        saveActivityBtn.addEventListener("click", async function() {
+        const activityId = document.getElementById("editActivityId").value;
+        const description = document.getElementById("editActivityDescription").value.trim();
+        const datetime = document.getElementById("editActivityDateTime").value;
+        const status = document.getElementById("editActivityStatus").value;
+
+        if (!description || !datetime) {
+            alert("Please fill in all required fields.");
+            return;
+        }
+
+        const saveBtn = document.getElementById("saveActivityBtn");
+        saveBtn.disabled = true;
+        saveBtn.textContent = "Saving...";
+
+        try {
+            const response = await fetch(URLS.updateActivity.replace('/0', `/${activityId}`), {
+                method: "PUT",
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify({
+                    activity: description,
+                    activity_date: datetime,
+                    activity_status: status
+                })
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                alert(data.message || "Activity updated successfully!");
+                const modal = bootstrap.Modal.getInstance(document.getElementById("editActivityModal"));
+                modal.hide();
+                await loadActivities();
+            } else {
+                alert(data.message || "Error updating activity.");
+            }
+        } catch (error) {
+            console.error("Error updating activity:", error);
+            alert("Error updating activity. Please try again.");
+        } finally {
+            saveBtn.disabled = false;
+            saveBtn.textContent = "Save Changes";
+        }
+        });
+    }
+
+    function formatActivityDateTime(dateStr, timeStr) {
+        if (!dateStr) return "";
+
+        try {
+            // Parse the date string (YYYY-MM-DD format)
+            const date = new Date(dateStr + "T00:00:00");
+
+            if (isNaN(date.getTime())) return dateStr; // Invalid date, return original
+
+            // Format as "18 Dec 2025"
+            const months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"];
+            const day = date.getDate();
+            const month = months[date.getMonth()];
+            const year = date.getFullYear();
+
+            let formatted = `${day} ${month} ${year}`;
+
+            // Add time if available, convert to 12-hour format
+            if (timeStr) {
+                const time12Hour = convertTo12Hour(timeStr);
+                formatted += ` ${time12Hour}`;
+            }
+
+            return formatted;
+        } catch (e) {
+            return dateStr; // Return original if formatting fails
+        }
+    }
+
+    function convertTo12Hour(time24) {
+        if (!time24) return "";
+
+        try {
+            // Parse time string (HH:mm format)
+            const [hours, minutes] = time24.split(":");
+            const hour24 = parseInt(hours, 10);
+            const mins = minutes || "00";
+
+            if (isNaN(hour24)) return time24; // Invalid time, return original
+
+            // Convert to 12-hour format
+            let hour12 = hour24 % 12;
+            if (hour12 === 0) hour12 = 12; // 0 or 12 both become 12
+            const ampm = hour24 < 12 ? "AM" : "PM";
+
+            return `${hour12}:${mins} ${ampm}`;
+        } catch (e) {
+            return time24; // Return original if conversion fails
+        }
+    }
+
+    function getStatusBadgeClass(status) {
+        switch(status) {
+            case "Completed":
+                return "bg-success";
+            case "In Progress":
+                return "bg-primary";
+            case "On Hold":
+                return "bg-warning";
+            default:
+                return "bg-secondary";
+        }
+    }
+
+    // Load activities on page load
+    await loadActivities();
+
+    /* ==========================================
+       FETCH MATERIAL ITEMS/UNITS
+    ========================================== */
+    async function loadItemsUnits() {
+        try {
+            const resp = await fetch(URLS.getItemsUnits);
+            const data = await resp.json();
+            itemsList = data.items || [];
+            unitsList = data.units || [];
+        } catch (e) {
+            console.error("Failed fetching items/units:", e);
+        }
+    }
+
+    function attachAutocomplete(input, list, options = {}) {
+        let index = -1;
+
+        const box = document.createElement("div");
+        box.classList.add("autocomplete-list", "border", "bg-white", "position-absolute");
+        box.style.cssText = "z-index:1000; display:none; max-height:150px; overflow-y:auto;";
+        input.parentElement.style.position = "relative";
+        input.parentElement.appendChild(box);
+
+        function closeBox() {
+            box.style.display = "none";
+            index = -1;
+        }
+
+        function renderList(filtered) {
+            box.innerHTML = filtered
+                .map((v, i) => `<div class="p-1 suggestion-item" data-index="${i}" data-value="${v}">${v}</div>`)
+                .join("");
+            box.style.display = "block";
+        }
+
+        input.addEventListener("input", () => {
+            const val = input.value.trim().toLowerCase();
+            if (!val) return closeBox();
+
+            const filtered = list.filter(item => item.toLowerCase().includes(val));
+            if (!filtered.length) return closeBox();
+
+            renderList(filtered);
+        });
+
+        /* CLICK SELECT */
+        box.addEventListener("click", e => {
+            if (!e.target.classList.contains("suggestion-item")) return;
+            input.value = e.target.dataset.value;
+            closeBox();
+            if (options.nextFocus) options.nextFocus.focus();
+            if (options.onSelect) options.onSelect();
+        });
+
+        /* KEYBOARD CONTROL */
+        input.addEventListener("keydown", e => {
+            const items = box.querySelectorAll(".suggestion-item");
+            const isBoxVisible = box.style.display !== "none";
+
+            if (e.key === "ArrowDown") {
+                if (items.length > 0 && isBoxVisible) {
+                    e.preventDefault();
+                    index = (index + 1) % items.length;
+                    /* Highlight current item */
+                    items.forEach(el => el.classList.remove("bg-primary", "text-white"));
+                    if (index >= 0) {
+                        items[index].classList.add("bg-primary", "text-white");
+                    }
+                }
+            } else if (e.key === "ArrowUp") {
+                if (items.length > 0 && isBoxVisible) {
+                    e.preventDefault();
+                    index = (index - 1 + items.length) % items.length;
+                    /* Highlight current item */
+                    items.forEach(el => el.classList.remove("bg-primary", "text-white"));
+                    if (index >= 0) {
+                        items[index].classList.add("bg-primary", "text-white");
+                    }
+                }
+            } else if (e.key === "Enter") {
+                e.preventDefault();
+                if (items.length > 0 && isBoxVisible) {
+                    if (index >= 0) {
+                        input.value = items[index].dataset.value;
+                    } else {
+                        input.value = items[0].dataset.value;
+                    }
+                    closeBox();
+                }
+                // Always move focus to next field on Enter
+                if (options.nextFocus) options.nextFocus.focus();
+                if (options.onSelect) options.onSelect();
+                return;
+            }
+        });
+
+        document.addEventListener("click", evt => {
+            if (!box.contains(evt.target) && evt.target !== input) closeBox();
+        });
+    }
+
+    /* ==========================================
+       MATERIALS — ADD ROW
+    ========================================== */
+    function addMaterialRow(autoFocus = true) {
+        const row = materialsTableBody.insertRow();
+        row.innerHTML = `
+            <td class="materials-col-item">
+                <div class="position-relative">
+                    <input type="text" class="form-control item-input">
+                </div>
+            </td>
+            <td class="materials-col-qty"><input type="number" class="form-control qty-input" step="0.001"></td>
+            <td class="materials-col-unit">
+                <div class="position-relative">
+                    <input type="text" class="form-control unit-input">
+                </div>
+            </td>
+            <td class="materials-col-unitprice"><input type="number" class="form-control unit-price-input" step="0.01"></td>
+            <td class="materials-col-total"><input type="text" class="form-control total-input" readonly></td>
+            <td class="materials-col-action"><button class="btn btn-danger btn-sm del-row">Delete</button></td>
+        `;
+
+        const item = row.querySelector(".item-input");
+        const qty = row.querySelector(".qty-input");
+        const unit = row.querySelector(".unit-input");
+        const price = row.querySelector(".unit-price-input");
+        const total = row.querySelector(".total-input");
+        const del = row.querySelector(".del-row");
+
+        /* Autocomplete with fixed behavior */
+        attachAutocomplete(item, itemsList, {
+            nextFocus: qty,
+            onSelect: () => qty.focus()
+        });
+
+        attachAutocomplete(unit, unitsList, {
+            nextFocus: price
+        });
+
+        /* Calculation */
+        function updateTotal() {
+            total.value = ((+qty.value || 0) * (+price.value || 0)).toFixed(2);
+            computeMaterialsGrandTotal();
+        }
+        qty.addEventListener("input", updateTotal);
+        price.addEventListener("input", updateTotal);
+
+        /* Excel-like field navigation */
+        item.addEventListener("keydown", e => {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                qty.focus();
+            }
+        });
+
+        qty.addEventListener("keydown", e => {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                unit.focus();
+            }
+        });
+
+        unit.addEventListener("keydown", e => {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                price.focus();
+            }
+        });
+
+        price.addEventListener("keydown", e => {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                addMaterialRow(true);
+            }
+        });
+
+
+        /* Delete row */
+        del.addEventListener("click", () => {
+            if (materialsTableBody.rows.length > 1) {
+                row.remove();
+                computeMaterialsGrandTotal();
+            }
+        });
+
+        if (autoFocus) item.focus();
+    }
+
+    // Initialize first row ONLY AFTER data is loaded:
+    await loadItemsUnits();
+
+    // attach autocomplete to FIRST static row
+    const firstRow = document.querySelector("#materialsTable tbody tr");
+    const firstItem = firstRow.querySelector(".item-input");
+    const firstQty  = firstRow.querySelector(".qty-input");
+    const firstUnit = firstRow.querySelector(".unit-input");
+    const firstPrice = firstRow.querySelector(".unit-price-input");
+    const firstTotal = firstRow.querySelector(".total-amount-input");
+
+    attachAutocomplete(firstItem, itemsList, {
+        nextFocus: firstQty,
+        onSelect: () => firstQty.focus()
+    });
+
+    attachAutocomplete(firstUnit, unitsList, {
+        nextFocus: firstPrice
+    });
+
+    // Add Enter key handler for first row qty input
+    firstQty.addEventListener("keydown", e => {
+        if (e.key === "Enter") {
+            e.preventDefault();
+            firstUnit.focus();
+        }
+    });
+
+    // Add calculation logic for first row
+    function updateFirstTotal() {
+        firstTotal.value = ((+firstQty.value || 0) * (+firstPrice.value || 0)).toFixed(2);
+        computeMaterialsGrandTotal();
+    }
+    firstQty.addEventListener("input", updateFirstTotal);
+    firstPrice.addEventListener("input", updateFirstTotal);
+
+    // Add Enter key handler for first row unit-price input
+    firstPrice.addEventListener("keydown", e => {
+        if (e.key === "Enter") {
+            e.preventDefault();
+            updateFirstTotal(); // Compute total before adding new row
+            addMaterialRow(true); // Add new row and focus first column
+        }
+    });
+
+    // Add delete button handler for first row
+    const firstDeleteBtn = firstRow.querySelector(".delete-row-btn");
+    if (firstDeleteBtn) {
+        firstDeleteBtn.addEventListener("click", () => {
+            if (materialsTableBody.rows.length > 1) {
+                firstRow.remove();
+                computeMaterialsGrandTotal();
+            }
+        });
+    }
+
+    /* ==========================================
+       COMPUTE MATERIALS GRAND TOTAL
+    ========================================== */
+    function computeMaterialsGrandTotal() {
+        if (!materialsTableBody || !materialsTotalAmountDisplay) return;
+
+        let t = 0;
+        [...materialsTableBody.rows].forEach(r => {
+            const totalInput = r.querySelector(".total-amount-input, .total-input");
+            if (totalInput && totalInput.value) {
+                t += parseFloat(totalInput.value) || 0;
+            }
+        });
+        materialsTotalAmountDisplay.textContent = "Total Amount: " + t.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    }
+
+    // Initialize grand total on page load
+    computeMaterialsGrandTotal();
+
+    /* ==========================================
+       FETCH NEXT INVOICE NUMBER
+    ========================================== */
+    async function fetchNextInvoiceNumber() {
+        try {
+            const date = materialDate.value;
+            const url = new URL(URLS.nextInvoiceNumber, window.location.origin);
+            if (date) url.searchParams.append("date", date);
+
+            const resp = await fetch(url);
+            const data = await resp.json();
+            if (data.invoice_number) {
+                invoiceDisplay.textContent = `Next Invoice #: ${data.invoice_number}`;
+                invoiceDisplay.style.display = "block";
+            }
+        } catch(err) {
+            invoiceDisplay.style.display = "none";
+        }
+    }
+    materialDate.addEventListener("change", fetchNextInvoiceNumber);
+
+    /* ==========================================
+       FETCH NEXT INVOICE NUMBER FOR LABOR
+    ========================================== */
+    async function fetchNextLaborInvoiceNumber() {
+        try {
+            const date = laborDate.value;
+            const url = new URL(URLS.nextInvoiceNumber, window.location.origin);
+            if (date) url.searchParams.append("date", date);
+
+            const resp = await fetch(url);
+            const data = await resp.json();
+            if (data.invoice_number) {
+                laborInvoiceDisplay.textContent = `Next Invoice #: ${data.invoice_number}`;
+                laborInvoiceDisplay.style.display = "block";
+            }
+        } catch(err) {
+            laborInvoiceDisplay.style.display = "none";
+        }
+    }
+    laborDate.addEventListener("change", fetchNextLaborInvoiceNumber);
+
+    /* ==========================================
+       FETCH NEXT INVOICE NUMBER FOR GASOLINE
+    ========================================== */
+    async function fetchNextGasolineInvoiceNumber() {
+        try {
+            const date = gasolineDate.value;
+            const url = new URL(URLS.nextInvoiceNumber, window.location.origin);
+            if (date) url.searchParams.append("date", date);
+
+            const resp = await fetch(url);
+            const data = await resp.json();
+            if (data.invoice_number) {
+                gasolineInvoiceDisplay.textContent = `Next Invoice #: ${data.invoice_number}`;
+                gasolineInvoiceDisplay.style.display = "block";
+            }
+        } catch(err) {
+            gasolineInvoiceDisplay.style.display = "none";
+        }
+    }
+    gasolineDate.addEventListener("change", fetchNextGasolineInvoiceNumber);
+
+    /* ==========================================
+       FETCH NEXT INVOICE NUMBER FOR DOCUMENTS
+    ========================================== */
+    async function fetchNextDocumentsInvoiceNumber() {
+        try {
+            const date = documentsDate.value;
+            const url = new URL(URLS.nextInvoiceNumber, window.location.origin);
+            if (date) url.searchParams.append("date", date);
+
+            const resp = await fetch(url);
+            const data = await resp.json();
+            if (data.invoice_number) {
+                documentsInvoiceDisplay.textContent = `Next Invoice #: ${data.invoice_number}`;
+                documentsInvoiceDisplay.style.display = "block";
+            }
+        } catch(err) {
+            documentsInvoiceDisplay.style.display = "none";
+        }
+    }
+    documentsDate.addEventListener("change", fetchNextDocumentsInvoiceNumber);
+
+    /* ==========================================
+       FETCH NEXT INVOICE NUMBER FOR OBLIGATION
+    ========================================== */
+    async function fetchNextObligationInvoiceNumber() {
+        try {
+            const date = obligationDate.value;
+            const url = new URL(URLS.nextInvoiceNumber, window.location.origin);
+            if (date) url.searchParams.append("date", date);
+
+            const resp = await fetch(url);
+            const data = await resp.json();
+            if (data.invoice_number) {
+                obligationInvoiceDisplay.textContent = `Next Invoice #: ${data.invoice_number}`;
+                obligationInvoiceDisplay.style.display = "block";
+            }
+        } catch(err) {
+            obligationInvoiceDisplay.style.display = "none";
+        }
+    }
+    if (obligationDate) {
+        obligationDate.addEventListener("change", fetchNextObligationInvoiceNumber);
+    }
+
+
+    /* ==========================================
+       SUBMIT MATERIALS
+    ========================================== */
+    submitMaterialsBtn.addEventListener("click", async function() {
+        // Validate date
+        if (!materialDate.value) {
+            alert("Please select a date.");
+            materialDate.focus();
+            return;
+        }
+
+        // Collect all material rows
+        const rows = materialsTableBody.querySelectorAll("tr");
+        const materials = [];
+
+        rows.forEach(row => {
+            const itemInput = row.querySelector(".item-input");
+            const qtyInput = row.querySelector(".qty-input");
+            const unitInput = row.querySelector(".unit-input");
+            const priceInput = row.querySelector(".unit-price-input");
+            const totalInput = row.querySelector(".total-amount-input, .total-input");
+
+            const item = (itemInput?.value || "").trim();
+            const qty = parseFloat(qtyInput?.value) || 0;
+            const unit = (unitInput?.value || "").trim();
+            const unitPrice = parseFloat(priceInput?.value) || 0;
+            const materialAmount = parseFloat(totalInput?.value) || (qty * unitPrice);
+
+            // Only add rows with valid item and qty > 0
+            if (item && qty > 0) {
+                materials.push({
+                    item: item,
+                    qty: qty,
+                    unit: unit,
+                    unit_price: unitPrice,
+                    material_amount: materialAmount
+                });
+            }
+        });
+
+        if (materials.length === 0) {
+            alert("Please add at least one valid material entry (item and quantity required).");
+            return;
+        }
+
+        // Disable button during submission
+        submitMaterialsBtn.disabled = true;
+        submitMaterialsBtn.textContent = "Submitting...";
+
+        try {
+            const response = await fetch(URLS.addMaterials, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify({
+                    expense_date: materialDate.value,
+                    expense_type: "Materials",
+                    materials: materials
+                })
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                // Show success message
+                invoiceDisplay.textContent = `✓ ${data.message} Invoice: ${data.invoice_number}`;
+                invoiceDisplay.style.display = "block";
+                invoiceDisplay.classList.remove("text-danger");
+                invoiceDisplay.classList.add("text-success");
+
+                // Clear the form
+                materialDate.value = "";
+                materialsTableBody.innerHTML = `
+                    <tr>
+                        <td class="materials-col-item">
+                            <div class="position-relative">
+                                <input type="text" class="form-control item-input">
+                            </div>
+                        </td>
+                        <td class="materials-col-qty"><input type="number" class="form-control qty-input" min="0" step="0.001"></td>
+                        <td class="materials-col-unit">
+                            <div class="position-relative">
+                                <input type="text" class="form-control unit-input">
+                            </div>
+                        </td>
+                        <td class="materials-col-unitprice"><input type="number" class="form-control unit-price-input" min="0" step="0.01"></td>
+                        <td class="materials-col-total"><input type="text" class="form-control total-amount-input" readonly></td>
+                        <td class="materials-col-action"><button type="button" class="btn btn-sm btn-danger delete-row-btn">Delete</button></td>
+                    </tr>
+                `;
+
+                // Re-initialize first row
+                await loadItemsUnits();
+                const firstRow = document.querySelector("#materialsTable tbody tr");
+                const firstItem = firstRow.querySelector(".item-input");
+                const firstQty = firstRow.querySelector(".qty-input");
+                const firstUnit = firstRow.querySelector(".unit-input");
+                const firstPrice = firstRow.querySelector(".unit-price-input");
+                const firstTotal = firstRow.querySelector(".total-amount-input");
+
+                attachAutocomplete(firstItem, itemsList, {
+                    nextFocus: firstQty,
+                    onSelect: () => firstQty.focus()
+                });
+
+                attachAutocomplete(firstUnit, unitsList, {
+                    nextFocus: firstPrice
+                });
+
+                function updateFirstTotal() {
+                    firstTotal.value = ((+firstQty.value || 0) * (+firstPrice.value || 0)).toFixed(2);
+                    computeMaterialsGrandTotal();
+                }
+                firstQty.addEventListener("input", updateFirstTotal);
+                firstPrice.addEventListener("input", updateFirstTotal);
+
+                firstQty.addEventListener("keydown", e => {
+                    if (e.key === "Enter") {
+                        e.preventDefault();
+                        firstUnit.focus();
+                    }
+                });
+
+                firstPrice.addEventListener("keydown", e => {
+                    if (e.key === "Enter") {
+                        e.preventDefault();
+                        updateFirstTotal();
+                        addMaterialRow(true);
+                    }
+                });
+                computeMaterialsGrandTotal();
+            } else {
+                // Show error message
+                invoiceDisplay.textContent = `✗ ${data.message || "Error submitting materials."}`;
+                invoiceDisplay.style.display = "block";
+                invoiceDisplay.classList.remove("text-success");
+                invoiceDisplay.classList.add("text-danger");
+            }
+        } catch (error) {
+            console.error("Error submitting materials:", error);
+            invoiceDisplay.textContent = `✗ Error submitting materials. Please try again.`;
+            invoiceDisplay.style.display = "block";
+            invoiceDisplay.classList.remove("text-success");
+            invoiceDisplay.classList.add("text-danger");
+        } finally {
+            submitMaterialsBtn.disabled = false;
+            submitMaterialsBtn.textContent = "Submit";
+        }
+    });
+
+    /* ==========================================
+       CANCEL MATERIALS
+    ========================================== */
+    cancelMaterialsBtn.addEventListener("click", function() {
+        if (confirm("Are you sure you want to cancel? All entered data will be lost.")) {
+            materialsCard.style.display = "none";
+            entryType.value = "";
+        }
+    });
+
+    /* ==========================================
+       FETCH EMPLOYEES
+    ========================================== */
+    let employeesList = [];
+    async function loadEmployees() {
+        try {
+            const resp = await fetch(URLS.getEmployees);
+            const data = await resp.json();
+            employeesList = data.employees.map(e => ({id: e.id, name: e.name, rate: e.rate_per_day})) || [];
+            populateLaborEmployeeSelects();
+        } catch(e) { 
+            console.error(e); 
+        }
+    }
+
+    function getEmployeeOptionsHTML() {
+        let opts = '<option value="">-- Select employee --</option>';
+        employeesList.forEach(e => {
+            const rate = e.rate != null ? String(e.rate) : '';
+            const name = (e.name || '').replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+            opts += `<option value="${e.id}" data-rate="${rate}">${name}</option>`;
+        });
+        return opts;
+    }
+
+    function populateLaborEmployeeSelects() {
+        document.querySelectorAll("#laborTable .employee-select").forEach(sel => {
+            const currentVal = sel.value;
+            sel.innerHTML = getEmployeeOptionsHTML();
+            if (currentVal) sel.value = currentVal;
+        });
+    }
+
+    await loadEmployees();
+
+    /* ==========================================
+       SHOW/HIDE CARDS BASED ON ENTRY TYPE
+    ========================================== */
+    entryType.addEventListener("change", () => {
+        materialsCard.style.display = "none";
+        laborCard.style.display = "none";
+        gasolineCard.style.display = "none";
+        documentsCard.style.display = "none";
+        if (obligationCard) obligationCard.style.display = "none";
+        if (activityCard) activityCard.style.display = "none";
+
+        if (entryType.value === "Materials") {
+            materialsCard.style.display = "block";
+            fetchNextInvoiceNumber();
+            setTimeout(() => materialDate.focus(), 80);
+        }
+
+        if (entryType.value === "Labor") {
+            laborCard.style.display = "block";
+            fetchNextLaborInvoiceNumber();
+            // Re-initialize first row when Labor card is shown
+            setTimeout(() => {
+                const firstRow = document.querySelector("#laborTable tbody tr");
+                if (firstRow) {
+                    // Remove old event listeners by cloning the row (cleanest way)
+                    const daysInput = firstRow.querySelector(".days-input");
+                    if (daysInput) {
+                        // Re-attach events to ensure they work
+                        attachLaborRowEvents(firstRow);
+                    }
+                }
+                laborDate.focus();
+            }, 80);
+        }
+
+        if (entryType.value === "Gasoline") {
+            gasolineCard.style.display = "block";
+            fetchNextGasolineInvoiceNumber();
+            setTimeout(() => gasolineDate.focus(), 80);
+        }
+
+        if (entryType.value === "Documents") {
+            documentsCard.style.display = "block";
+            fetchNextDocumentsInvoiceNumber();
+            setTimeout(() => documentsDate.focus(), 80);
+        }
+
+        if (entryType.value === "Obligation" && obligationCard) {
+            obligationCard.style.display = "block";
+            fetchNextObligationInvoiceNumber();
+            setTimeout(() => obligationDate.focus(), 80);
+        }
+
+        if (entryType.value === "Activity" && activityCard) {
+            activityCard.style.display = "block";
+            setTimeout(() => activityDate.focus(), 80);
+        }
+    });
+
+
+    /* ==========================================
+       LABOR ROWS
+    ========================================== */
+    function addLaborRow(autoFocus = true) {
+        const tbody = laborTable.querySelector("tbody");
+        if (!tbody) return;
+
+        const row = tbody.insertRow();
+        row.innerHTML = `
+            <td class="labor-col-employee">
+                <select class="form-select form-select-sm employee-select">${getEmployeeOptionsHTML()}</select>
+            </td>
+            <td class="labor-col-rate"><input class="form-control rate-input" readonly></td>
+            <td class="labor-col-days"><input type="number" class="form-control days-input" step="0.1" min="0"></td>
+            <td class="labor-col-overtime-hours"><input type="number" class="form-control overtime-hours-input" step="0.1" min="0" placeholder="0"></td>
+            <td class="labor-col-overtime-amount"><input class="form-control overtime-amount-input" readonly placeholder="0.00"></td>
+            <td class="labor-col-row-total"><input class="form-control row-total" readonly></td>
+            <td class="labor-col-action"><button type="button" class="btn btn-danger btn-sm del-labor-row">Delete</button></td>
+        `;
+        attachLaborRowEvents(row);
+
+        if (autoFocus) {
+            const empSelect = row.querySelector(".employee-select");
+            if (empSelect) {
+                setTimeout(() => empSelect.focus(), 10);
+            }
+        }
+
+        return row;
+    }
+
+    function attachLaborRowEvents(row) {
+        const empSelect = row.querySelector(".employee-select");
+        const rateInput = row.querySelector(".rate-input");
+        const daysInput = row.querySelector(".days-input");
+        const overtimeHoursInput = row.querySelector(".overtime-hours-input");
+        const overtimeAmountInput = row.querySelector(".overtime-amount-input");
+        const totalInput = row.querySelector(".row-total");
+
+        if (empSelect) {
+            empSelect.addEventListener("change", function() {
+                const selectedId = this.value;
+                if (!selectedId) {
+                    rateInput.value = '';
+                    computeTotal();
+                    return;
+                }
+                const opt = this.options[this.selectedIndex];
+                const rate = opt.getAttribute("data-rate");
+                if (rate != null && rate !== '') rateInput.value = parseFloat(rate).toFixed(2);
+                else rateInput.value = '';
+                // Check duplicate: same employee in another row
+                const allRows = laborTable.querySelectorAll("tbody tr");
+                for (let otherRow of allRows) {
+                    if (otherRow === row) continue;
+                    const otherSelect = otherRow.querySelector(".employee-select");
+                    if (otherSelect && otherSelect.value === selectedId) {
+                        this.value = "";
+                        rateInput.value = '';
+                        alert("This employee is already added. Each employee can only be entered once.");
+                        return;
+                    }
+                }
+                computeTotal();
+            });
+        }
+
+        function computeTotal() {
+            const rate = parseFloat(rateInput.value) || 0;
+            const days = parseFloat(daysInput.value) || 0;
+            const overtimeHours = parseFloat(overtimeHoursInput.value) || 0;
+            const ratePerHour = rate / 8;
+            const overtimeAmount = ratePerHour * overtimeHours;
+            overtimeAmountInput.value = overtimeAmount.toFixed(2);
+            const regularAmount = rate * days;
+            totalInput.value = (regularAmount + overtimeAmount).toFixed(2);
+            computeLaborGrandTotal();
+        }
+
+        daysInput.addEventListener("input", computeTotal);
+        if (overtimeHoursInput) overtimeHoursInput.addEventListener("input", computeTotal);
+
+        function addNewLaborRowOnEnter() {
+            computeTotal();
+            const table = document.getElementById("laborTable");
+            if (!table) return;
+            const tbody = table.querySelector("tbody");
+            if (!tbody) return;
+            const newRow = tbody.insertRow();
+            newRow.innerHTML = `
+                <td class="labor-col-employee">
+                    <select class="form-select form-select-sm employee-select">${getEmployeeOptionsHTML()}</select>
+                </td>
+                <td class="labor-col-rate"><input class="form-control rate-input" readonly></td>
+                <td class="labor-col-days"><input type="number" class="form-control days-input" step="0.1" min="0"></td>
+                <td class="labor-col-overtime-hours"><input type="number" class="form-control overtime-hours-input" step="0.1" min="0" placeholder="0"></td>
+                <td class="labor-col-overtime-amount"><input class="form-control overtime-amount-input" readonly placeholder="0.00"></td>
+                <td class="labor-col-row-total"><input class="form-control row-total" readonly></td>
+                <td class="labor-col-action"><button type="button" class="btn btn-danger btn-sm del-labor-row">Delete</button></td>
+            `;
+            attachLaborRowEvents(newRow);
+            setTimeout(() => {
+                const empSelect = newRow.querySelector(".employee-select");
+                if (empSelect) empSelect.focus();
+            }, 50);
+        }
+
+        // Enter on Days: add new row and focus new row's employee input
+        daysInput.addEventListener("keydown", function(e) {
+            if (e.key === "Enter" || e.keyCode === 13) {
+                e.preventDefault();
+                e.stopPropagation();
+                e.stopImmediatePropagation();
+                addNewLaborRowOnEnter();
+            }
+        });
+
+        // Enter on Overtime Hours: same behavior - add new row and focus new row's employee input
+        if (overtimeHoursInput) {
+            overtimeHoursInput.addEventListener("keydown", function(e) {
+                if (e.key === "Enter" || e.keyCode === 13) {
+                    e.preventDefault();
+                    e.stopPropagation();
+                    e.stopImmediatePropagation();
+                    addNewLaborRowOnEnter();
+                }
+            });
+        }
+
+        const deleteBtn = row.querySelector(".del-labor-row");
+        if (deleteBtn) {
+            deleteBtn.addEventListener("click", () => {
+                if (laborTable.rows.length > 1) row.remove();
+                computeLaborGrandTotal();
+            });
+        }
+    }
+
+    function computeLaborGrandTotal() {
+        if (!laborTable || !laborTotalAmountDisplay) return;
+
+        let t = 0;
+        [...laborTable.rows].forEach(r => {
+            const totalInput = r.querySelector(".row-total");
+            if (totalInput && totalInput.value) {
+                t += parseFloat(totalInput.value) || 0;
+            }
+        });
+        laborTotalAmountDisplay.textContent = "Total Amount: "+ t.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    }
+
+    // Initialize first static labor row AFTER functions are defined
+    // This works even if the table is hidden (display: none)
+    const firstLaborRow = document.querySelector("#laborTable tbody tr");
+    if (firstLaborRow) {
+        console.log("Initializing first labor row");
+        attachLaborRowEvents(firstLaborRow);
+        console.log("First labor row initialized");
+    } else {
+        console.warn("First labor row not found during initialization");
+    }
+
+    /* ==========================================
+       SUBMIT LABOR
+    ========================================== */
+    submitLaborBtn.addEventListener("click", async function() {
+        // Validate date
+        if (!laborDate.value) {
+            alert("Please select a date.");
+            laborDate.focus();
+            return;
+        }
+
+        // Collect all labor rows
+        const rows = laborTable.querySelectorAll("tbody tr");
+        const laborEntries = [];
+
+        rows.forEach(row => {
+            const empSelect = row.querySelector(".employee-select");
+            const rateInput = row.querySelector(".rate-input");
+            const daysInput = row.querySelector(".days-input");
+            const overtimeHoursInput = row.querySelector(".overtime-hours-input");
+            const overtimeAmountInput = row.querySelector(".overtime-amount-input");
+            const totalInput = row.querySelector(".row-total");
+
+            const laborId = empSelect?.value ? parseInt(empSelect.value, 10) : null;
+            const employeeName = empSelect?.selectedIndex > 0 ? (empSelect.options[empSelect.selectedIndex].textContent || "").trim() : "";
+            const ratePerDay = parseFloat(rateInput?.value) || 0;
+            const days = parseFloat(daysInput?.value) || 0;
+            const overtimeHours = parseFloat(overtimeHoursInput?.value) || 0;
+            const overtimeAmount = parseFloat(overtimeAmountInput?.value) || 0;
+            const laborCharge = parseFloat(totalInput?.value) || (ratePerDay * days + overtimeAmount);
+
+            // Only add rows with valid employee selected and (days > 0 or overtime > 0)
+            if (laborId && employeeName && (days > 0 || overtimeHours > 0)) {
+                laborEntries.push({
+                    employee_name: employeeName,
+                    labor_id: laborId,
+                    rate_per_day: ratePerDay,
+                    days: days,
+                    overtime_hours: overtimeHours,
+                    overtime_amount: overtimeAmount,
+                    labor_charge: laborCharge
+                });
+            }
+        });
+
+        if (laborEntries.length === 0) {
+            alert("Please add at least one valid labor entry (employee and days or overtime hours required).");
+            return;
+        }
+
+        // Disable button during submission
+        submitLaborBtn.disabled = true;
+        submitLaborBtn.textContent = "Submitting...";
+
+        try {
+            const response = await fetch(URLS.addLabor, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify({
+                    expense_date: laborDate.value,
+                    expense_type: "Labor",
+                    labor_entries: laborEntries
+                })
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                // Show success message
+                laborInvoiceDisplay.textContent = `✓ ${data.message} Invoice: ${data.invoice_number}`;
+                laborInvoiceDisplay.style.display = "block";
+                laborInvoiceDisplay.classList.remove("text-danger");
+                laborInvoiceDisplay.classList.add("text-success");
+
+                // Clear the form
+                laborDate.value = "";
+                laborTable.querySelector("tbody").innerHTML = `
+                    <tr>
+                        <td class="labor-col-employee">
+                            <select class="form-select form-select-sm employee-select">${getEmployeeOptionsHTML()}</select>
+                        </td>
+                        <td class="labor-col-rate"><input class="form-control rate-input" readonly></td>
+                        <td class="labor-col-days"><input type="number" class="form-control days-input" step="0.1" min="0"></td>
+                        <td class="labor-col-overtime-hours"><input type="number" class="form-control overtime-hours-input" step="0.1" min="0" placeholder="0"></td>
+                        <td class="labor-col-overtime-amount"><input class="form-control overtime-amount-input" readonly placeholder="0.00"></td>
+                        <td class="labor-col-row-total"><input class="form-control row-total" readonly></td>
+                        <td class="labor-col-action"><button type="button" class="btn btn-sm btn-danger del-labor-row">Delete</button></td>
+                    </tr>
+                `;
+
+                // Re-initialize first row
+                await loadEmployees();
+                const firstRow = document.querySelector("#laborTable tbody tr");
+                if (firstRow) {
+                    attachLaborRowEvents(firstRow);
+                }
+                computeLaborGrandTotal();
+
+            } else {
+                // Show error message
+                laborInvoiceDisplay.textContent = `✗ ${data.message || "Error submitting labor entries."}`;
+                laborInvoiceDisplay.style.display = "block";
+                laborInvoiceDisplay.classList.remove("text-success");
+                laborInvoiceDisplay.classList.add("text-danger");
+            }
+        } catch (error) {
+            console.error("Error submitting labor:", error);
+            laborInvoiceDisplay.textContent = `✗ Error submitting labor. Please try again.`;
+            laborInvoiceDisplay.style.display = "block";
+            laborInvoiceDisplay.classList.remove("text-success");
+            laborInvoiceDisplay.classList.add("text-danger");
+        } finally {
+            submitLaborBtn.disabled = false;
+            submitLaborBtn.textContent = "Submit";
+        }
+    });
+
+    /* ==========================================
+       CANCEL LABOR
+    ========================================== */
+    cancelLaborBtn.addEventListener("click", function() {
+        if (confirm("Are you sure you want to cancel? All entered data will be lost.")) {
+            laborCard.style.display = "none";
+            entryType.value = "";
+        }
+    });
+
+    /* ==========================================
+       GASOLINE ROWS
+    ========================================== */
+    function addGasolineRow(autoFocus = true) {
+        const tbody = gasolineTable.querySelector("tbody");
+        if (!tbody) return;
+
+        const row = tbody.insertRow();
+        row.innerHTML = `
+            <td><input type="number" class="form-control gasoline-amount-input" min="0" step="0.01"></td>
+            <td><button type="button" class="btn btn-danger btn-sm del-gasoline-row">Delete</button></td>
+        `;
+        attachGasolineRowEvents(row);
+
+        if (autoFocus) {
+            const amountInput = row.querySelector(".gasoline-amount-input");
+            if (amountInput) {
+                setTimeout(() => amountInput.focus(), 10);
+            }
+        }
+
+        return row;
+    }
+
+    function attachGasolineRowEvents(row) {
+        const amountInput = row.querySelector(".gasoline-amount-input");
+        const deleteBtn = row.querySelector(".del-gasoline-row");
+
+        // Update total when amount changes
+        amountInput.addEventListener("input", computeGasolineGrandTotal);
+
+        // Add Enter key handler to add new row
+        amountInput.addEventListener("keydown", function(e) {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                computeGasolineGrandTotal();
+                addGasolineRow(true);
+            }
+        });
+
+        // Delete button handler
+        if (deleteBtn) {
+            deleteBtn.addEventListener("click", () => {
+                const tbody = gasolineTable.querySelector("tbody");
+                if (tbody && tbody.rows.length > 1) {
+                    row.remove();
+                    computeGasolineGrandTotal();
+                }
+            });
+        }
+    }
+
+    function computeGasolineGrandTotal() {
+        if (!gasolineTable || !gasolineTotalAmountDisplay) return;
+
+        let t = 0;
+        [...gasolineTable.rows].forEach(r => {
+            const amountInput = r.querySelector(".gasoline-amount-input");
+            if (amountInput && amountInput.value) {
+                t += parseFloat(amountInput.value) || 0;
+            }
+        });
+        gasolineTotalAmountDisplay.textContent = "Total Amount: " + t.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    }
+
+    // Initialize first static gasoline row
+    const firstGasolineRow = document.querySelector("#gasolineTable tbody tr");
+    if (firstGasolineRow) {
+        attachGasolineRowEvents(firstGasolineRow);
+    }
+
+    /* ==========================================
+       SUBMIT GASOLINE
+    ========================================== */
+    submitGasolineBtn.addEventListener("click", async function() {
+        // Validate date
+        if (!gasolineDate.value) {
+            alert("Please select a date.");
+            gasolineDate.focus();
+            return;
+        }
+
+        // Collect all gasoline entries
+        const rows = gasolineTable.querySelectorAll("tbody tr");
+        const gasolineEntries = [];
+
+        rows.forEach(row => {
+            const amountInput = row.querySelector(".gasoline-amount-input");
+            const amount = parseFloat(amountInput?.value) || 0;
+
+            // Only add rows with valid amount > 0
+            if (amount > 0) {
+                gasolineEntries.push({
+                    gasoline_amount: amount
+                });
+            }
+        });
+
+        if (gasolineEntries.length === 0) {
+            alert("Please add at least one valid gasoline entry (amount required).");
+            return;
+        }
+
+        // Disable button during submission
+        submitGasolineBtn.disabled = true;
+        submitGasolineBtn.textContent = "Submitting...";
+
+        try {
+            const response = await fetch(URLS.addGasoline, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify({
+                    expense_date: gasolineDate.value,
+                    expense_type: "Gasoline",
+                    gasoline_entries: gasolineEntries
+                })
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                // Show success message
+                gasolineInvoiceDisplay.textContent = `✓ ${data.message} Invoice: ${data.invoice_number}`;
+                gasolineInvoiceDisplay.style.display = "block";
+                gasolineInvoiceDisplay.classList.remove("text-danger");
+                gasolineInvoiceDisplay.classList.add("text-success");
+
+                // Clear the form
+                gasolineDate.value = "";
+                gasolineTable.querySelector("tbody").innerHTML = `
+                    <tr>
+                        <td><input type="number" class="form-control gasoline-amount-input" min="0" step="0.01"></td>
+                        <td><button type="button" class="btn btn-sm btn-danger del-gasoline-row">Delete</button></td>
+                    </tr>
+                `;
+
+                // Re-initialize first row
+                const firstRow = document.querySelector("#gasolineTable tbody tr");
+                if (firstRow) {
+                    attachGasolineRowEvents(firstRow);
+                }
+                computeGasolineGrandTotal();
+
+            } else {
+                // Show error message
+                gasolineInvoiceDisplay.textContent = `✗ ${data.message || "Error submitting gasoline entries."}`;
+                gasolineInvoiceDisplay.style.display = "block";
+                gasolineInvoiceDisplay.classList.remove("text-success");
+                gasolineInvoiceDisplay.classList.add("text-danger");
+            }
+        } catch (error) {
+            console.error("Error submitting gasoline:", error);
+            gasolineInvoiceDisplay.textContent = `✗ Error submitting gasoline. Please try again.`;
+            gasolineInvoiceDisplay.style.display = "block";
+            gasolineInvoiceDisplay.classList.remove("text-success");
+            gasolineInvoiceDisplay.classList.add("text-danger");
+        } finally {
+            submitGasolineBtn.disabled = false;
+            submitGasolineBtn.textContent = "Submit";
+        }
+    });
+
+    /* ==========================================
+       CANCEL GASOLINE
+    ========================================== */
+    cancelGasolineBtn.addEventListener("click", function() {
+        if (confirm("Are you sure you want to cancel? All entered data will be lost.")) {
+            gasolineCard.style.display = "none";
+            entryType.value = "";
+        }
+    });
+
+    /* ==========================================
+       DOCUMENTS ROWS
+    ========================================== */
+    function addDocumentRow(autoFocus = true) {
+        const tbody = documentsTable.querySelector("tbody");
+        if (!tbody) return;
+
+        const row = tbody.insertRow();
+        row.innerHTML = `
+            <td class="documents-col-desc"><input type="text" class="form-control document-ref-input"></td>
+            <td class="documents-col-amount"><input type="number" class="form-control document-amount-input" min="0" step="0.01"></td>
+            <td class="documents-col-action"><button type="button" class="btn btn-danger btn-sm del-document-row">Delete</button></td>
+        `;
+        attachDocumentRowEvents(row);
+
+        if (autoFocus) {
+            const refInput = row.querySelector(".document-ref-input");
+            if (refInput) {
+                setTimeout(() => refInput.focus(), 10);
+            }
+        }
+
+        return row;
+    }
+
+    function attachDocumentRowEvents(row) {
+        const refInput = row.querySelector(".document-ref-input");
+        const amountInput = row.querySelector(".document-amount-input");
+        const deleteBtn = row.querySelector(".del-document-row");
+
+        // Update total when amount changes
+        amountInput.addEventListener("input", computeDocumentsGrandTotal);
+
+        // Add Enter key handler for document ref input
+        refInput.addEventListener("keydown", function(e) {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                amountInput.focus();
+            }
+        });
+
+        // Add Enter key handler for amount input
+        amountInput.addEventListener("keydown", function(e) {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                computeDocumentsGrandTotal();
+                addDocumentRow(true);
+            }
+        });
+
+        // Delete button handler
+        if (deleteBtn) {
+            deleteBtn.addEventListener("click", () => {
+                const tbody = documentsTable.querySelector("tbody");
+                if (tbody && tbody.rows.length > 1) {
+                    row.remove();
+                    computeDocumentsGrandTotal();
+                }
+            });
+        }
+    }
+
+    function computeDocumentsGrandTotal() {
+        if (!documentsTable || !documentsTotalAmountDisplay) return;
+
+        let t = 0;
+        [...documentsTable.rows].forEach(r => {
+            const amountInput = r.querySelector(".document-amount-input");
+            if (amountInput && amountInput.value) {
+                t += parseFloat(amountInput.value) || 0;
+            }
+        });
+        documentsTotalAmountDisplay.textContent = "Total Amount: " + t.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    }
+
+    // Initialize first static document row
+    const firstDocumentRow = document.querySelector("#documentsTable tbody tr");
+    if (firstDocumentRow) {
+        attachDocumentRowEvents(firstDocumentRow);
+    }
+
+    /* ==========================================
+       SUBMIT DOCUMENTS
+    ========================================== */
+    submitDocumentsBtn.addEventListener("click", async function() {
+        // Validate date
+        if (!documentsDate.value) {
+            alert("Please select a date.");
+            documentsDate.focus();
+            return;
+        }
+
+        // Collect all document entries
+        const rows = documentsTable.querySelectorAll("tbody tr");
+        const documentEntries = [];
+
+        rows.forEach(row => {
+            const refInput = row.querySelector(".document-ref-input");
+            const amountInput = row.querySelector(".document-amount-input");
+
+            const documentRef = (refInput?.value || "").trim();
+            const documentAmount = parseFloat(amountInput?.value) || 0;
+
+            // Only add rows with valid reference and amount > 0
+            if (documentRef && documentAmount > 0) {
+                documentEntries.push({
+                    document_ref: documentRef,
+                    document_amount: documentAmount
+                });
+            }
+        });
+
+        if (documentEntries.length === 0) {
+            alert("Please add at least one valid document entry (reference and amount required).");
+            return;
+        }
+
+        // Disable button during submission
+        submitDocumentsBtn.disabled = true;
+        submitDocumentsBtn.textContent = "Submitting...";
+
+        try {
+            const response = await fetch(URLS.addDocuments, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify({
+                    expense_date: documentsDate.value,
+                    expense_type: "Documents",
+                    document_entries: documentEntries
+                })
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                // Show success message
+                documentsInvoiceDisplay.textContent = `✓ ${data.message} Invoice: ${data.invoice_number}`;
+                documentsInvoiceDisplay.style.display = "block";
+                documentsInvoiceDisplay.classList.remove("text-danger");
+                documentsInvoiceDisplay.classList.add("text-success");
+
+                // Clear the form
+                documentsDate.value = "";
+                documentsTable.querySelector("tbody").innerHTML = `
+                    <tr>
+                        <td class="documents-col-desc"><input type="text" class="form-control document-ref-input"></td>
+                        <td class="documents-col-amount"><input type="number" class="form-control document-amount-input" min="0" step="0.01"></td>
+                        <td class="documents-col-action"><button type="button" class="btn btn-sm btn-danger del-document-row">Delete</button></td>
+                    </tr>
+                `;
+
+                // Re-initialize first row
+                const firstRow = document.querySelector("#documentsTable tbody tr");
+                if (firstRow) {
+                    attachDocumentRowEvents(firstRow);
+                }
+                computeDocumentsGrandTotal();
+
+            } else {
+                // Show error message
+                documentsInvoiceDisplay.textContent = `✗ ${data.message || "Error submitting document entries."}`;
+                documentsInvoiceDisplay.style.display = "block";
+                documentsInvoiceDisplay.classList.remove("text-success");
+                documentsInvoiceDisplay.classList.add("text-danger");
+            }
+        } catch (error) {
+            console.error("Error submitting documents:", error);
+            documentsInvoiceDisplay.textContent = `✗ Error submitting documents. Please try again.`;
+            documentsInvoiceDisplay.style.display = "block";
+            documentsInvoiceDisplay.classList.remove("text-success");
+            documentsInvoiceDisplay.classList.add("text-danger");
+        } finally {
+            submitDocumentsBtn.disabled = false;
+            submitDocumentsBtn.textContent = "Submit";
+        }
+    });
+
+    /* ==========================================
+       CANCEL DOCUMENTS
+    ========================================== */
+    cancelDocumentsBtn.addEventListener("click", function() {
+        if (confirm("Are you sure you want to cancel? All entered data will be lost.")) {
+            documentsCard.style.display = "none";
+            entryType.value = "";
+        }
+    });
+
+    /* ==========================================
+       OBLIGATION ROWS
+    ========================================== */
+    function addObligationRow(autoFocus = true) {
+        const tbody = obligationTable.querySelector("tbody");
+        if (!tbody) return;
+
+        const row = tbody.insertRow();
+        row.innerHTML = `
+            <td class="obligation-col-desc"><input type="text" class="form-control obligation-ref-input"></td>
+            <td class="obligation-col-amount"><input type="number" class="form-control obligation-amount-input" min="0" step="0.01"></td>
+            <td class="obligation-col-action"><button type="button" class="btn btn-danger btn-sm del-obligation-row">Delete</button></td>
+        `;
+        attachObligationRowEvents(row);
+
+        if (autoFocus) {
+            const refInput = row.querySelector(".obligation-ref-input");
+            if (refInput) {
+                setTimeout(() => refInput.focus(), 10);
+            }
+        }
+
+        return row;
+    }
+
+    function attachObligationRowEvents(row) {
+        const refInput = row.querySelector(".obligation-ref-input");
+        const amountInput = row.querySelector(".obligation-amount-input");
+        const deleteBtn = row.querySelector(".del-obligation-row");
+
+        // Update total when amount changes
+        amountInput.addEventListener("input", computeObligationGrandTotal);
+
+        // Add Enter key handler for obligation ref input
+        refInput.addEventListener("keydown", function(e) {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                amountInput.focus();
+            }
+        });
+
+        // Add Enter key handler for amount input
+        amountInput.addEventListener("keydown", function(e) {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                computeObligationGrandTotal();
+                addObligationRow(true);
+            }
+        });
+
+        // Delete button handler
+        if (deleteBtn) {
+            deleteBtn.addEventListener("click", () => {
+                const tbody = obligationTable.querySelector("tbody");
+                if (tbody && tbody.rows.length > 1) {
+                    row.remove();
+                    computeObligationGrandTotal();
+                }
+            });
+        }
+    }
+
+    function computeObligationGrandTotal() {
+        if (!obligationTable || !obligationTotalAmountDisplay) return;
+
+        let t = 0;
+        [...obligationTable.rows].forEach(r => {
+            const amountInput = r.querySelector(".obligation-amount-input");
+            if (amountInput && amountInput.value) {
+                t += parseFloat(amountInput.value) || 0;
+            }
+        });
+        obligationTotalAmountDisplay.textContent = "Total Amount: " + t.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    }
+
+    // Initialize first static obligation row
+    const firstObligationRow = document.querySelector("#obligationTable tbody tr");
+    if (firstObligationRow) {
+        attachObligationRowEvents(firstObligationRow);
+    }
+
+    /* ==========================================
+       SUBMIT OBLIGATION
+    ========================================== */
+    if (submitObligationBtn) {
+        submitObligationBtn.addEventListener("click", async function() {
+        // Validate date
+        if (!obligationDate.value) {
+            alert("Please select a date.");
+            obligationDate.focus();
+            return;
+        }
+
+        // Collect all obligation entries
+        const rows = obligationTable.querySelectorAll("tbody tr");
+        const obligationEntries = [];
+
+        rows.forEach(row => {
+            const refInput = row.querySelector(".obligation-ref-input");
+            const amountInput = row.querySelector(".obligation-amount-input");
+
+            const obligationRef = (refInput?.value || "").trim();
+            const obligationAmount = parseFloat(amountInput?.value) || 0;
+
+            // Only add rows with valid reference and amount > 0
+            if (obligationRef && obligationAmount > 0) {
+                obligationEntries.push({
+                    obligation_ref: obligationRef,
+                    obligation_amount: obligationAmount
+                });
+            }
+        });
+
+        if (obligationEntries.length === 0) {
+            alert("Please add at least one valid obligation entry (description and amount required).");
+            return;
+        }
+
+        // Disable button during submission
+        submitObligationBtn.disabled = true;
+        submitObligationBtn.textContent = "Submitting...";
+
+        try {
+            const response = await fetch(URLS.addObligation, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify({
+                    expense_date: obligationDate.value,
+                    expense_type: "Obligation",
+                    obligation_entries: obligationEntries
+                })
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                // Show success message
+                obligationInvoiceDisplay.textContent = `✓ ${data.message} Invoice: ${data.invoice_number}`;
+                obligationInvoiceDisplay.style.display = "block";
+                obligationInvoiceDisplay.classList.remove("text-danger");
+                obligationInvoiceDisplay.classList.add("text-success");
+
+                // Clear the form
+                obligationDate.value = "";
+                obligationTable.querySelector("tbody").innerHTML = `
+                    <tr>
+                        <td class="obligation-col-desc"><input type="text" class="form-control obligation-ref-input"></td>
+                        <td class="obligation-col-amount"><input type="number" class="form-control obligation-amount-input" min="0" step="0.01"></td>
+                        <td class="obligation-col-action"><button type="button" class="btn btn-sm btn-danger del-obligation-row">Delete</button></td>
+                    </tr>
+                `;
+
+                // Re-initialize first row
+                const firstRow = document.querySelector("#obligationTable tbody tr");
+                if (firstRow) {
+                    attachObligationRowEvents(firstRow);
+                }
+                computeObligationGrandTotal();
+
+            } else {
+                // Show error message
+                obligationInvoiceDisplay.textContent = `✗ ${data.message || "Error submitting obligation entries."}`;
+                obligationInvoiceDisplay.style.display = "block";
+                obligationInvoiceDisplay.classList.remove("text-success");
+                obligationInvoiceDisplay.classList.add("text-danger");
+            }
+        } catch (error) {
+            console.error("Error submitting obligation:", error);
+            obligationInvoiceDisplay.textContent = `✗ Error submitting obligation. Please try again.`;
+            obligationInvoiceDisplay.style.display = "block";
+            obligationInvoiceDisplay.classList.remove("text-success");
+            obligationInvoiceDisplay.classList.add("text-danger");
+        } finally {
+            submitObligationBtn.disabled = false;
+            submitObligationBtn.textContent = "Submit";
+        }
+        });
+    }
+
+    /* ==========================================
+       CANCEL OBLIGATION
+    ========================================== */
+    if (cancelObligationBtn) {
+        cancelObligationBtn.addEventListener("click", function() {
+            if (confirm("Are you sure you want to cancel? All entered data will be lost.")) {
+                if (obligationCard) obligationCard.style.display = "none";
+                entryType.value = "";
+            }
+        });
+    }
+
+    /* ==========================================
+       ACTIVITY ROWS
+    ========================================== */
+    function addActivityRow(autoFocus = true) {
+        const tbody = activityTable.querySelector("tbody");
+        if (!tbody) return;
+
+        const row = tbody.insertRow();
+        row.innerHTML = `
+            <td class="activity-col-desc"><input type="text" class="form-control activity-input"></td>
+            <td class="activity-col-datetime"><input type="datetime-local" class="form-control activity-date-input"></td>
+            <td class="activity-col-status">
+                <select class="form-control activity-status-input">
+                    <option value="Pending" selected>Pending</option>
+                    <option value="In Progress">In Progress</option>
+                    <option value="Completed">Completed</option>
+                    <option value="On Hold">On Hold</option>
+                </select>
+            </td>
+            <td class="activity-col-action"><button type="button" class="btn btn-danger btn-sm del-activity-row">Delete</button></td>
+        `;
+        attachActivityRowEvents(row);
+
+        if (autoFocus) {
+            const activityInput = row.querySelector(".activity-input");
+            if (activityInput) {
+                setTimeout(() => activityInput.focus(), 10);
+            }
+        }
+
+        return row;
+    }
+
+    function attachActivityRowEvents(row) {
+        const activityInput = row.querySelector(".activity-input");
+        const dateInput = row.querySelector(".activity-date-input");
+        const statusInput = row.querySelector(".activity-status-input");
+        const deleteBtn = row.querySelector(".del-activity-row");
+
+        // Add Enter key handler for activity input
+        activityInput.addEventListener("keydown", function(e) {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                dateInput.focus();
+            }
+        });
+
+        // Add Enter key handler for date input
+        dateInput.addEventListener("keydown", function(e) {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                statusInput.focus();
+            }
+        });
+
+        // Add Enter key handler for status input
+        statusInput.addEventListener("keydown", function(e) {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                addActivityRow(true);
+            }
+        });
+
+        // Delete button handler
+        if (deleteBtn) {
+            deleteBtn.addEventListener("click", () => {
+                const tbody = activityTable.querySelector("tbody");
+                if (tbody && tbody.rows.length > 1) {
+                    row.remove();
+                }
+            });
+        }
+    }
+
+    // Initialize first static activity row
+    const firstActivityRow = document.querySelector("#activityTable tbody tr");
+    if (firstActivityRow) {
+        attachActivityRowEvents(firstActivityRow);
+    }
+
+    /* ==========================================
+       SUBMIT ACTIVITY
+    ========================================== */
+    if (submitActivityBtn) {
+        submitActivityBtn.addEventListener("click", async function() {
+        // Validate date
+        if (!activityDate.value) {
+            alert("Please select a date.");
+            activityDate.focus();
+            return;
+        }
+
+        // Collect all activity entries
+        const rows = activityTable.querySelectorAll("tbody tr");
+        const activityEntries = [];
+
+        rows.forEach(row => {
+            const activityInput = row.querySelector(".activity-input");
+            const dateInput = row.querySelector(".activity-date-input");
+            const statusInput = row.querySelector(".activity-status-input");
+
+            const activity = (activityInput?.value || "").trim();
+            const activityDate = dateInput?.value || "";
+            const activityStatus = statusInput?.value || "Pending";
+
+            // Only add rows with valid activity description
+            if (activity) {
+                activityEntries.push({
+                    activity: activity,
+                    activity_date: activityDate,
+                    activity_status: activityStatus
+                });
+            }
+        });
+
+        if (activityEntries.length === 0) {
+            alert("Please add at least one valid activity entry (description required).");
+            return;
+        }
+
+        // Disable button during submission
+        submitActivityBtn.disabled = true;
+        submitActivityBtn.textContent = "Submitting...";
+
+        try {
+            const response = await fetch(URLS.addActivity, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify({
+                    expense_date: activityDate.value,
+                    expense_type: "Activity",
+                    activity_entries: activityEntries
+                })
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                // Show success message
+                alert(data.message || "Activity entries saved successfully!");
+
+                // Reload activities table
+                await loadActivities();
+
+                // Clear the form
+                activityDate.value = "";
+                activityTable.querySelector("tbody").innerHTML = `
+                    <tr>
+                        <td class="activity-col-desc"><input type="text" class="form-control activity-input"></td>
+                        <td class="activity-col-datetime"><input type="datetime-local" class="form-control activity-date-input"></td>
+                        <td class="activity-col-status">
+                            <select class="form-control activity-status-input">
+                                <option value="Pending" selected>Pending</option>
+                                <option value="In Progress">In Progress</option>
+                                <option value="Completed">Completed</option>
+                                <option value="On Hold">On Hold</option>
+                            </select>
+                        </td>
+                        <td class="activity-col-action"><button type="button" class="btn btn-sm btn-danger del-activity-row">Delete</button></td>
+                    </tr>
+                `;
+
+                // Re-initialize first row
+                const firstRow = document.querySelector("#activityTable tbody tr");
+                if (firstRow) {
+                    attachActivityRowEvents(firstRow);
+                }
+
+            } else {
+                // Show error message
+                alert(data.message || "Error submitting activity entries.");
+            }
+        } catch (error) {
+            console.error("Error submitting activity:", error);
+            alert("Error submitting activity. Please try again.");
+        } finally {
+            submitActivityBtn.disabled = false;
+            submitActivityBtn.textContent = "Submit";
+        }
+        });
+    }
+
+    /* ==========================================
+       CANCEL ACTIVITY
+    ========================================== */
+    if (cancelActivityBtn) {
+        cancelActivityBtn.addEventListener("click", function() {
+            if (confirm("Are you sure you want to cancel? All entered data will be lost.")) {
+                if (activityCard) activityCard.style.display = "none";
+                entryType.value = "";
+            }
+        });
+    }
+
+    /* ==========================================
+       DELETE ACTIVITY
+    ========================================== */
+    window.deleteActivity = async function(activityId) {
+        if (!confirm("Are you sure you want to delete this activity?")) {
+            return;
+        }
+
+        try {
+            const url = URLS.deleteActivity.replace('/0', `/${activityId}`);
+            const response = await fetch(url, {
+                method: "DELETE"
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                alert(data.message || "Activity deleted successfully!");
+                await loadActivities();
+            } else {
+                alert(data.message || "Error deleting activity.");
+            }
+        } catch (error) {
+            console.error("Error deleting activity:", error);
+            alert("Error deleting activity. Please try again.");
+        }
+    };
+
+});
@@ -0,0 +1,70 @@
+// Background exports: queue the export as a job, poll its status, then download the artifact.
+// Links/buttons opt in with data-export-job-url; if queueing fails the normal link is used.
+(function () {
+    const POLL_MS = 1000;
+
+    function setLabel(el, text) {
+        if (!el.dataset.originalLabel) {
+            el.dataset.originalLabel = el.innerHTML;
+        }
+        el.innerHTML = text;
+    }
+
+    function resetLabel(el) {
+        if (el.dataset.originalLabel) {
+            el.innerHTML = el.dataset.originalLabel;
+        }
+        el.classList.remove('disabled');
+    }
+
+    function poll(statusUrl, el) {
+        return fetch(statusUrl, { credentials: 'same-origin' })
+            .then(function (res) { return res.json(); })
+            .then(function (data) {
+                const job = data.job || {};
+                if (job.status === 'done' && job.download_url) {
+                    resetLabel(el);
+                    window.location = job.download_url;
+                    return;
+                }
+                if (job.status === 'failed') {
+                    resetLabel(el);
+                    alert('Export failed: ' + (job.error || 'unknown error'));
+                    return;
+                }
+                const pct = job.status === 'running' ? ' ' + (job.progress || 0) + '%' : '';
+                setLabel(el, (job.status === 'running' ? 'Exporting' : 'Queued') + pct + '…');
+                return new Promise(function (resolve) { setTimeout(resolve, POLL_MS); })
+                    .then(function () { return poll(statusUrl, el); });
+            });
+    }
+
+    // Returns a promise resolving to true when the export was queued, false to fall back.
+    window.startExportJob = function (enqueueUrl, el) {
+        el.classList.add('disabled');
+        setLabel(el, 'Queued…');
+        return fetch(enqueueUrl, { method: 'POST', credentials: 'same-origin' })
+            .then(function (res) {
+                if (!res.ok) { throw new Error('enqueue failed'); }
+                return res.json();
+            })
+            .then(function (data) {
+                poll(data.job.status_url, el).catch(function () { resetLabel(el); });
+                return true;
+            })
+            .catch(function () {
+                resetLabel(el);
+                return false;
+            });
+    };
+
+    document.addEventListener('click', function (e) {
+        const el = e.target.closest('a[data-export-job-url]');
+        if (!el) { return; }
+        e.preventDefault();
+        if (el.classList.contains('disabled')) { return; }
+        window.startExportJob(el.dataset.exportJobUrl, el).then(function (queued) {
+            if (!queued) { window.open(el.href, el.target || '_self'); }
+        });
+    });
+})();
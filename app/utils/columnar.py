@@ -0,0 +1,37 @@
+# app/utils/columnar.py
+"""
+Columnar JSON for the large report endpoints (opt-in with `?format=columnar`).
+
+The default responses repeat every key for every day and every row. A columnar table sends
+each key once:
+
+    {"schema": [{"name": "date", "type": "date"}, {"name": "amount", "type": "number"}],
+     "length": 2,
+     "columns": [["2025-06-01", "2025-06-01"], [1250.0, 80.5]]}
+
+`columns[i]` holds the values of `schema[i]`, one per row. Nested lists (a day's
+transactions, a purchase's items) become their own table, with a key column (`date`,
+`trans_id`) pointing back at the parent. app/static/js/columnar.js turns tables back into
+row objects and groups them on the client.
+"""
+from flask import request
+
+
+def wants_columnar():
+    """True when the request asked for `?format=columnar`."""
+    return request.args.get("format") == "columnar"
+
+
+def columnar_table(rows, schema):
+    """A table from an iterable of dicts; `schema` is [(name, type)], type one of date/string/integer/number."""
+    columns = [[] for _ in schema]
+    length = 0
+    for row in rows:
+        for column, (name, _type) in zip(columns, schema):
+            column.append(row.get(name))
+        length += 1
+    return {
+        "schema": [{"name": name, "type": type_} for name, type_ in schema],
+        "length": length,
+        "columns": columns,
+    }
@@ -0,0 +1,14 @@
+# app/utils/dates.py
+from datetime import date
+
+
+def month_bounds(month_str):
+    """
+    Return (first_day, first_day_of_next_month) for a "YYYY-MM" string.
+    Filter with `col >= start, col < end` so indexes on the date column are used.
+    Raises ValueError for a malformed month.
+    """
+    year, month = map(int, month_str.split("-"))
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
@@ -0,0 +1,134 @@
+"""
+Cold-start benchmark: time to first response, with a checked-in budget.
+
+Each run starts a fresh Python process that does what a new server process does (import
+the app, create_app(), the wsgi.py warm-up) and then serves requests through the test
+client. Measured per run:
+- import_ms / create_app_ms / warm_up_ms: the startup phases;
+- ttfr_ms: from spawning the process to the end of the first response (GET /auth/login),
+  interpreter start-up included;
+- first_page_max_ms: the slowest first hit among the large module pages (logged in), which
+  is where template compilation lands when it is not done by the warm-up.
+
+The median of --runs runs is compared with benchmarks/cold_start_baseline.json; the exit
+status is 1 when a metric is over budget by more than the file's tolerance:
+
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --no-warm-up        # report only: what the warm-up saves
+    python benchmarks/cold_start.py --update            # accept the current numbers
+
+Like the route budgets, these only hold on the machine they were recorded on.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cold_start_baseline.json")
+
+FIRST_RESPONSE = "/auth/login"
+PAGES = ("/", "/carenderia/home", "/catering/home", "/construction/project/1")
+METRICS = ("import_ms", "create_app_ms", "warm_up_ms", "ttfr_ms", "first_page_max_ms")
+
+
+def child(warm):
+    """One cold process: prints its phase timings as JSON (wall-clock end of first response included)."""
+    started = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    from app import create_app
+
+    imported = time.perf_counter()
+    app = create_app()
+    created = time.perf_counter()
+    if warm:
+        from app.perf.startup import warm_up
+
+        warm_up(app)
+    warmed = time.perf_counter()
+
+    client = app.test_client()
+    client.get(FIRST_RESPONSE).get_data()
+    first_response_at = time.time()
+
+    with client.session_transaction() as s:
+        s.update(user_id=0, username="benchmark", role="Admin", department="Corporate")
+    pages = {}
+    for path in PAGES:
+        page_started = time.perf_counter()
+        response = client.get(path)
+        response.get_data()
+        pages[path] = {"ms": round((time.perf_counter() - page_started) * 1000, 1), "status": response.status_code}
+
+    print(json.dumps({
+        "import_ms": round((imported - started) * 1000, 1),
+        "create_app_ms": round((created - imported) * 1000, 1),
+        "warm_up_ms": round((warmed - created) * 1000, 1),
+        "first_response_at": first_response_at,
+        "pages": pages,
+    }))
+
+
+def run_once(warm):
+    spawned_at = time.time()
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"] + ([] if warm else ["--no-warm-up"]),
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if result.returncode:
+        raise SystemExit(f"Cold-start child failed:\n{result.stderr[-2000:]}")
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    measured["ttfr_ms"] = round((measured.pop("first_response_at") - spawned_at) * 1000, 1)
+    measured["first_page_max_ms"] = max(page["ms"] for page in measured["pages"].values())
+    return measured
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=BASELINE, help="Budgets file.")
+    parser.add_argument("--runs", type=int, default=5, help="Cold processes to start (the median counts).")
+    parser.add_argument("--no-warm-up", action="store_true", help="Skip the warm-up (report only, no budget check).")
+    parser.add_argument("--update", action="store_true", help="Write the measured medians back as the new budgets.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MEMORY_PROFILING", "false")
+    os.environ.setdefault("TRACING", "false")  # keep the span writer's file I/O out of the timings
+    if args.child:
+        child(warm=not args.no_warm_up)
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    runs = [run_once(warm=not args.no_warm_up) for _ in range(args.runs)]
+    medians = {name: round(statistics.median(run[name] for run in runs), 1) for name in METRICS}
+
+    for path in PAGES:
+        hits = [run["pages"][path] for run in runs]
+        print(f"first hit {path:<28}{statistics.median(h['ms'] for h in hits):>9.1f} ms  (status {hits[0]['status']})")
+    tolerance, budgets = baseline["tolerance"], baseline["metrics"]
+    failed = 0
+    print(f"\n{'metric':<22}{'median':>10}{'budget':>10}")
+    for name in METRICS:
+        over = medians[name] > budgets[name] * (1 + tolerance["ratio"]) + tolerance["slack_ms"]
+        check = not args.no_warm_up and not args.update
+        failed += over and check
+        print(f"{name:<22}{medians[name]:>10.1f}{budgets[name]:>10.1f}{'  FAIL' if over and check else ''}")
+
+    if args.update:
+        if args.no_warm_up:
+            raise SystemExit("Budgets are recorded with the warm-up on; drop --no-warm-up.")
+        baseline["metrics"] = medians
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Budgets written to {args.baseline}.")
+        return
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Bytes on the wire and end-to-end latency with response compression, on a throttled link.
+
+Each route is requested through the Flask test client (so through CompressionMiddleware) with
+`Accept-Encoding: identity`, `gzip` and, when the brotli package is installed, `br`.
+Reported per encoding:
+- bytes: the response body as sent;
+- server_ms: the fastest of --repeat runs, compression included;
+- e2e_ms: server_ms plus the modelled transfer on the throttled link,
+  `rtt + bytes / bandwidth`. The defaults are 1.6 Mbit/s and 150 ms RTT, a slow mobile
+  connection. TCP slow start is left out, which flatters large uncompressed bodies, if
+  anything.
+
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/compression.py
+    python benchmarks/compression.py --kbps 400 --rtt-ms 400      # a worse link
+    python benchmarks/compression.py --only catering
+
+The routes are the module home pages plus the report routes of routes_baseline.json. The
+PDF exports are included to show that they pass through unchanged.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routes import BASELINE, _load_baseline  # noqa: E402  (benchmarks/routes.py)
+
+HOME_PAGES = {
+    "carenderia.home": "/carenderia/home",
+    "catering.home": "/catering/home",
+    "construction.project_detail": "/construction/project/{project_id}",
+}
+
+
+def fetch(client, url, encoding):
+    started = time.perf_counter()
+    response = client.get(url, headers={"Accept-Encoding": encoding})
+    body = response.get_data()
+    elapsed = (time.perf_counter() - started) * 1000
+    response.close()
+    return response, len(body), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=BASELINE, help="Routes and dataset (shared with routes.py).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per route and encoding.")
+    parser.add_argument("--kbps", type=float, default=1600, help="Modelled link bandwidth, kbit/s.")
+    parser.add_argument("--rtt-ms", type=float, default=150, help="Modelled round-trip time.")
+    parser.add_argument("--only", default=None, help="Substring filter on route names.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MEMORY_PROFILING", "false")
+    os.environ.setdefault("SLOW_QUERY_EXPLAIN", "false")
+    os.environ.setdefault("TRACING", "false")
+
+    from app import create_app
+    from app.compression import _brotli
+
+    baseline = _load_baseline(args.baseline)
+    routes = {**HOME_PAGES, **{name: route["url"] for name, route in baseline["routes"].items()}}
+    encodings = ["identity", "gzip"] + (["br"] if _brotli() is not None else [])
+
+    app = create_app()
+    client = app.test_client()
+    with client.session_transaction() as s:
+        s.update(user_id=0, username="benchmark", role="Admin", department="Corporate")
+
+    print(f"link: {args.kbps:.0f} kbit/s, {args.rtt_ms:.0f} ms RTT\n")
+    print(f"{'route':<42}{'encoding':>9}{'bytes':>12}{'server ms':>11}{'e2e ms':>10}")
+    for name, url in routes.items():
+        if args.only and args.only not in name:
+            continue
+        url = url.format(**baseline["dataset"])
+        fetch(client, url, "identity")  # warm-up: template compilation, statement cache
+        for encoding in encodings:
+            runs = [fetch(client, url, encoding) for _ in range(args.repeat)]
+            response, size, _elapsed = runs[0]
+            server_ms = min(elapsed for _r, _s, elapsed in runs)
+            e2e_ms = server_ms + args.rtt_ms + size * 8 / args.kbps
+            sent = response.headers.get("Content-Encoding") or "-"
+            note = "" if sent == encoding or encoding == "identity" else f"  (sent as {sent})"
+            if response.status_code != 200:
+                note += f"  (status {response.status_code})"
+            print(f"{name:<42}{encoding:>9}{size:>12,}{server_ms:>11.1f}{e2e_ms:>10.0f}{note}")
+
+
+if __name__ == "__main__":
+    main()
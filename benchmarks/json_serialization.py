@@ -0,0 +1,125 @@
+"""
+JSON serialization microbenchmark: large month payloads, before and after the JSON provider.
+
+Builds the payload shape of /carenderia/get-transactions-by-month and get-wages-by-month in
+memory: one entry per day with its per-type totals and transaction / wage lists, where
+amounts are Decimals and dates are `date` objects, as the ORM returns them. No database is
+involved. Each strategy turns that into a response body:
+
+- float+json: what the routes did before. Every Numeric goes through float(...) and every
+  date through isoformat() in Python loops, then Flask's default provider (stdlib json);
+- provider/json: the rows as they are, through app/json_provider.py with JSON_ORJSON off;
+- provider/orjson: the same with orjson (skipped when orjson is not installed).
+
+    python benchmarks/json_serialization.py
+    python benchmarks/json_serialization.py --per-day 400 --repeat 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TRANS_TYPES = ("Daily Sales", "Wages", "Daily Expense", "Purchases", "Electric Bill", "Water Bill")
+
+
+def build_rows(days, per_day, seed):
+    """{'transactions': [...], 'wages': [...]} of ORM-like dicts (Decimal amounts, date objects)."""
+    rng = random.Random(seed)
+    start = date(2025, 6, 1)
+    transactions, wages = [], []
+    next_id = 1
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        for _ in range(per_day):
+            transactions.append({
+                "id": next_id, "date": day, "trans_type": rng.choice(TRANS_TYPES),
+                "amount": Decimal(rng.randint(100, 5_000_000)) / 100,
+            })
+            wages.append({
+                "id": next_id, "date": day, "emp_id": rng.randint(1, 60), "emp_name": f"Employee {next_id % 60}",
+                "emp_role": "Cook", "emp_rate": Decimal(rng.randint(40_000, 90_000)) / 100,
+                "amount": Decimal(rng.randint(40_000, 90_000)) / 100,
+            })
+            next_id += 1
+    return {"transactions": transactions, "wages": wages}
+
+
+def month_payload(rows, convert):
+    """get-transactions-by-month + get-wages-by-month bodies; `convert` is float for the old route code."""
+    monthly, wage_days = {}, {}
+    for t in rows["transactions"]:
+        key = t["date"].isoformat()
+        day = monthly.setdefault(key, {"date": key, "total": 0, "transactions": []})
+        amount = convert(t["amount"])
+        day["transactions"].append({"id": t["id"], "trans_type": t["trans_type"], "amount": amount})
+        day["total"] += amount
+    for w in rows["wages"]:
+        key = w["date"].isoformat()
+        day = wage_days.setdefault(key, {"date": key, "total_wages": 0, "wages": []})
+        amount = convert(w["amount"])
+        day["wages"].append({
+            "id": w["id"], "emp_id": w["emp_id"], "emp_name": w["emp_name"], "emp_role": w["emp_role"],
+            "emp_rate": convert(w["emp_rate"]), "amount": amount,
+        })
+        day["total_wages"] += amount
+    return {"success": True, "monthly_data": monthly, "wages_by_day": wage_days}
+
+
+def timed(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        runs.append((time.perf_counter() - started) * 1000)
+    return statistics.median(runs), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--per-day", type=int, default=150, help="Transactions (and wage rows) per day.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+
+    from app.json_provider import JSONProvider, _orjson
+
+    rows = build_rows(args.days, args.per_day, args.seed)
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    app.config["JSON_ORJSON"] = False
+    stdlib_provider = JSONProvider(app)
+    app.config["JSON_ORJSON"] = True
+    orjson_provider = JSONProvider(app)
+
+    strategies = {  # name: (provider, conversion the route code applies)
+        "float+json": (default_provider, float),
+        "provider/json": (stdlib_provider, lambda v: v),
+    }
+    if _orjson() is not None:
+        strategies["provider/orjson"] = (orjson_provider, lambda v: v)
+
+    print(f"{len(rows['transactions']):,} transactions + {len(rows['wages']):,} wage rows "
+          f"({args.days} days x {args.per_day})\n")
+    print(f"{'strategy':<18}{'build+dump ms':>15}{'dump ms':>10}{'bytes':>12}{'vs float+json':>15}")
+    with app.app_context():
+        reference = None
+        for name, (provider, convert) in strategies.items():
+            total_ms, size = timed(lambda: provider.response(month_payload(rows, convert)).get_data(), args.repeat)
+            payload = month_payload(rows, convert)
+            dump_ms, _size = timed(lambda: provider.response(payload).get_data(), args.repeat)
+            reference = reference or total_ms
+            print(f"{name:<18}{total_ms:>15.1f}{dump_ms:>10.1f}{size:>12,}{reference / total_ms:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+HTTP load replay against a running server.
+
+Drives many concurrent logged-in sessions (one cookie jar per virtual user) through a
+weighted mix of real routes taken from a scenario file, then reports per endpoint:
+requests, throughput, p50/p95/p99 latency and error rate. A request counts as an error on
+a connection failure, an HTTP status >= 400, a redirect to the login page, or a JSON body
+with `"success": false`.
+
+Only the standard library is used for the HTTP side, so this runs from any checkout:
+
+    python benchmarks/load.py benchmarks/scenarios/carenderia_rush.json --base-url http://127.0.0.1:8000
+    python benchmarks/load.py benchmarks/scenarios/month_end_reports.json --duration 30 --sessions 20
+    LOAD_USERNAME=admin LOAD_PASSWORD=... python benchmarks/load.py benchmarks/scenarios/daily_mix.json
+
+Scenario files (JSON):
+- `stages`: [{"duration": seconds, "sessions": active virtual users}, ...], run in order
+  (a ramp or a rush); --duration/--sessions replace them with one flat stage;
+- `think_time`: [min, max] seconds each virtual user waits between requests;
+- `vars`: template values; [lo, hi] picks an integer per request, a list of strings picks
+  one, anything else is used as is. Built in: today, month, last_month, session, seq;
+- `mix`: requests with `name`, `weight`, `method`, `path` and optionally `json` / `form`
+  bodies. Strings are templates ("{booking_id}"; a string that is exactly one placeholder
+  keeps the value's type). `capture` names a JSON response field holding an allocated
+  number (invoice / reference) that must never be handed out twice.
+
+Contention on reference numbers and invoice counters shows up as:
+- duplicates among the captured numbers (two requests were given the same number);
+- with --database-url (default: DATABASE_URL), duplicate purchase reference numbers
+  written during the run, and on Postgres the lock waits sampled from pg_stat_activity
+  while the load runs, grouped by statement;
+- the latency and error rate of the allocating endpoints themselves.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date, datetime, timedelta
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+_LOCK_SAMPLE_SECONDS = 0.5
+
+# Tables whose reference_number is allocated by counting the day's rows (PUR-YYYY-MM-DD-###)
+REFERENCE_TABLES = ("carenderia_transaction", "catering_expense")
+
+
+# ----------------------------
+# SCENARIO
+# ----------------------------
+def load_scenario(path, duration=None, sessions=None):
+    with open(path, encoding="utf-8") as f:
+        scenario = json.load(f)
+    if duration or sessions:
+        stages = scenario.get("stages") or [{"duration": 60, "sessions": 10}]
+        scenario["stages"] = [{
+            "duration": duration or sum(s["duration"] for s in stages),
+            "sessions": sessions or max(s["sessions"] for s in stages),
+        }]
+    if not scenario.get("mix"):
+        raise SystemExit(f"{path}: the scenario has no `mix`.")
+    return scenario
+
+
+class Templates:
+    def __init__(self, variables):
+        today = date.today()
+        self.variables = {
+            "today": today.isoformat(),
+            "month": today.strftime("%Y-%m"),
+            "last_month": (today.replace(day=1) - timedelta(days=1)).strftime("%Y-%m"),
+            **variables,
+        }
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _value(self, name, rng, session):
+        if name == "session":
+            return session
+        if name == "seq":
+            with self._lock:
+                self._seq += 1
+                return self._seq
+        value = self.variables[name]
+        if isinstance(value, list) and len(value) == 2 and all(isinstance(v, int) for v in value):
+            return rng.randint(*value)
+        if isinstance(value, list):
+            return rng.choice(value)
+        return value
+
+    def render(self, template, rng, session):
+        if isinstance(template, dict):
+            return {k: self.render(v, rng, session) for k, v in template.items()}
+        if isinstance(template, list):
+            return [self.render(v, rng, session) for v in template]
+        if not isinstance(template, str):
+            return template
+        whole = _PLACEHOLDER.fullmatch(template)
+        if whole:
+            return self._value(whole.group(1), rng, session)
+        return _PLACEHOLDER.sub(lambda m: str(self._value(m.group(1), rng, session)), template)
+
+
+# ----------------------------
+# RESULTS
+# ----------------------------
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}  # endpoint -> [seconds]
+        self.errors = {}     # endpoint -> {reason: count}
+        self.captured = {}   # (endpoint, field) -> [values]
+
+    def record(self, endpoint, seconds, error=None, captured=None):
+        with self.lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if error:
+                reasons = self.errors.setdefault(endpoint, {})
+                reasons[error] = reasons.get(error, 0) + 1
+            if captured:
+                self.captured.setdefault(captured[0], []).append(captured[1])
+
+    def report(self, elapsed):
+        print(f"\n{'endpoint':<38}{'requests':>9}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        total = failed = 0
+        for endpoint in sorted(self.latencies):
+            samples = sorted(self.latencies[endpoint])
+            errors = sum(self.errors.get(endpoint, {}).values())
+            total += len(samples)
+            failed += errors
+            print(f"{endpoint:<38}{len(samples):>9}{len(samples) / elapsed:>8.1f}"
+                  f"{percentile(samples, 50) * 1000:>9.0f}{percentile(samples, 95) * 1000:>9.0f}"
+                  f"{percentile(samples, 99) * 1000:>9.0f}{errors / len(samples):>8.1%}")
+        print(f"{'total':<38}{total:>9}{total / elapsed:>8.1f}{'':>27}{failed / max(total, 1):>8.1%}")
+
+        for endpoint, reasons in sorted(self.errors.items()):
+            top = sorted(reasons.items(), key=lambda item: -item[1])[:3]
+            print(f"  {endpoint}: " + "; ".join(f"{count}x {reason}" for reason, count in top))
+
+        if self.captured:
+            print("\nAllocated numbers (from responses):")
+            for (endpoint, field), values in sorted(self.captured.items()):
+                duplicates = len(values) - len(set(values))
+                print(f"  {endpoint} {field}: {len(values)} issued, {duplicates} duplicate"
+                      f"{'  <-- counter race' if duplicates else ''}")
+        return failed, total
+
+
+# ----------------------------
+# VIRTUAL USERS
+# ----------------------------
+class Session:
+    """One logged-in browser: its own cookie jar, templates rendered with its own RNG."""
+
+    def __init__(self, index, base_url, timeout, seed):
+        self.index = index
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.rng = random.Random(seed * 1000 + index)
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def login(self, username, password):
+        body = urllib.parse.urlencode({"username": username, "password": password}).encode()
+        with self.opener.open(self.base_url + "/auth/login", data=body, timeout=self.timeout) as response:
+            response.read()
+            if "/auth/login" in response.geturl():
+                raise SystemExit(f"Login failed for {username!r} (session {self.index}).")
+
+    def request(self, step, templates):
+        """(error or None, captured value or None) for one request of the mix."""
+        path = templates.render(step["path"], self.rng, self.index)
+        data, headers = None, {}
+        if "json" in step:
+            data = json.dumps(templates.render(step["json"], self.rng, self.index)).encode()
+            headers["Content-Type"] = "application/json"
+        elif "form" in step:
+            data = urllib.parse.urlencode(templates.render(step["form"], self.rng, self.index)).encode()
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers,
+                                         method=step.get("method", "POST" if data else "GET"))
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                body = response.read()
+                if "/auth/login" in response.geturl() or "/auth/unauthorized" in response.geturl():
+                    return "redirected to login", None
+                content_type = response.headers.get("Content-Type", "")
+        except urllib.error.HTTPError as e:
+            return f"HTTP {e.code}{_error_detail(e.read())}", None
+        except (urllib.error.URLError, OSError) as e:
+            return type(getattr(e, "reason", e)).__name__, None
+
+        if not content_type.startswith("application/json"):
+            return None, None
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return "invalid JSON", None
+        if isinstance(payload, dict) and payload.get("success") is False:
+            return (str(payload.get("error") or "success: false"))[:60], None
+        field = step.get("capture")
+        if field and isinstance(payload, dict) and payload.get(field) is not None:
+            return None, ((step["name"], field), payload[field])
+        return None, None
+
+
+def _error_detail(body):
+    """`: <error>` from a JSON error body, so a 500 says why (e.g. `database is locked`)."""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return ""
+    if not isinstance(payload, dict):
+        return ""
+    detail = payload.get("error") or payload.get("message")
+    return f": {str(detail)[:60]}" if detail else ""
+
+
+def _pick(mix, rng):
+    return rng.choices(mix, weights=[step.get("weight", 1) for step in mix])[0]
+
+
+def run_user(session, scenario, templates, results, active, stop):
+    think_lo, think_hi = scenario.get("think_time", [0.5, 2.0])
+    while not stop.is_set():
+        if session.index >= active[0]:
+            stop.wait(0.2)
+            continue
+        step = _pick(scenario["mix"], session.rng)
+        started = time.perf_counter()
+        error, captured = session.request(step, templates)
+        results.record(step["name"], time.perf_counter() - started, error, captured)
+        stop.wait(session.rng.uniform(think_lo, think_hi))
+
+
+# ----------------------------
+# CONTENTION (DATABASE SIDE)
+# ----------------------------
+class LockSampler(threading.Thread):
+    """Samples Postgres backends waiting on a lock, grouped by the statement they are stuck in."""
+
+    def __init__(self, engine):
+        super().__init__(daemon=True)
+        self.engine = engine
+        self.samples = 0
+        self.waits = {}  # (wait_event, statement) -> sampled backends
+        self.stop = threading.Event()
+
+    def run(self):
+        from sqlalchemy import text
+
+        query = text(
+            "SELECT wait_event, left(regexp_replace(query, '\\s+', ' ', 'g'), 90) FROM pg_stat_activity "
+            "WHERE wait_event_type = 'Lock' AND datname = current_database()"
+        )
+        with self.engine.connect() as conn:
+            while not self.stop.wait(_LOCK_SAMPLE_SECONDS):
+                self.samples += 1
+                for wait_event, statement in conn.execute(query):
+                    key = (wait_event, statement)
+                    self.waits[key] = self.waits.get(key, 0) + 1
+                conn.rollback()
+
+    def report(self):
+        print(f"\nLock waits ({self.samples} samples, every {_LOCK_SAMPLE_SECONDS}s):")
+        if not self.waits:
+            print("  none sampled")
+        for (wait_event, statement), count in sorted(self.waits.items(), key=lambda item: -item[1])[:10]:
+            print(f"  {count:>6} x {wait_event:<14} {statement}")
+
+
+def duplicate_references(engine, since):
+    """Reference numbers written since `since` that appear on more than one row, per table."""
+    from sqlalchemy import text
+
+    found = {}
+    with engine.connect() as conn:
+        for table in REFERENCE_TABLES:
+            rows = conn.execute(text(
+                f"SELECT reference_number, count(*) FROM {table} "
+                "WHERE reference_number IS NOT NULL AND created_at >= :since "
+                "GROUP BY reference_number HAVING count(*) > 1"
+            ), {"since": since}).all()
+            found[table] = rows
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", help="Scenario file (see benchmarks/scenarios/).")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--username", default=os.environ.get("LOAD_USERNAME", "admin"))
+    parser.add_argument("--password", default=os.environ.get("LOAD_PASSWORD"), help="Default: LOAD_PASSWORD.")
+    parser.add_argument("--duration", type=float, help="Run one flat stage of this many seconds.")
+    parser.add_argument("--sessions", type=int, help="Virtual users of that flat stage.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed of the request mix.")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="Exit 1 when more than this fraction of all requests failed.")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                        help="Check allocated references (and sample lock waits on Postgres) in this database.")
+    args = parser.parse_args()
+    if args.password is None:
+        parser.error("set --password or LOAD_PASSWORD")
+
+    scenario = load_scenario(args.scenario, args.duration, args.sessions)
+    stages = scenario["stages"]
+    templates = Templates(scenario.get("vars", {}))
+    results = Results()
+    max_sessions = max(stage["sessions"] for stage in stages)
+
+    engine = sampler = None
+    if args.database_url:
+        from sqlalchemy import create_engine
+
+        engine = create_engine(args.database_url)
+        if engine.dialect.name == "postgresql":
+            sampler = LockSampler(engine)
+
+    print(f"{scenario.get('description', args.scenario)}")
+    print(f"Logging in {max_sessions} sessions at {args.base_url}...")
+    sessions = [Session(i, args.base_url, args.timeout, args.seed) for i in range(max_sessions)]
+    for session in sessions:
+        session.login(args.username, args.password)
+
+    active, stop = [0], threading.Event()
+    threads = [threading.Thread(target=run_user, args=(s, scenario, templates, results, active, stop), daemon=True)
+               for s in sessions]
+    started_at = min(datetime.now(), datetime.utcnow())  # created_at is local time in some tables, UTC in others
+    started = time.perf_counter()
+    if sampler:
+        sampler.start()
+    for thread in threads:
+        thread.start()
+    try:
+        for number, stage in enumerate(stages, 1):
+            active[0] = stage["sessions"]
+            print(f"stage {number}/{len(stages)}: {stage['sessions']} sessions for {stage['duration']}s")
+            time.sleep(stage["duration"])
+    except KeyboardInterrupt:
+        print("interrupted")
+    stop.set()
+    for thread in threads:
+        thread.join(args.timeout)
+    elapsed = time.perf_counter() - started
+    if sampler:
+        sampler.stop.set()
+        sampler.join()
+
+    failed, total = results.report(elapsed)
+    if sampler:
+        sampler.report()
+    if engine is not None:
+        print("\nDuplicate reference numbers written during the run:")
+        for table, rows in duplicate_references(engine, started_at).items():
+            sample = ", ".join(f"{ref} x{count}" for ref, count in rows[:5])
+            print(f"  {table}: {len(rows)}{'  (' + sample + ')' if rows else ''}")
+    sys.exit(1 if failed > args.max_error_rate * total else 0)
+
+
+if __name__ == "__main__":
+    main()
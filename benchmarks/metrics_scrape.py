@@ -0,0 +1,187 @@
+"""
+Scrape check for /metrics over plain HTTP, across separate server processes.
+
+Starts three app processes on local ports, each with `werkzeug.serving.make_server`:
+- A and B share a METRICS_DIR and a METRICS_TOKEN, as two gunicorn workers would;
+- C has no METRICS_TOKEN.
+
+Then checks:
+- C answers /metrics with 404;
+- A answers 401 (with a WWW-Authenticate header) without a token and with a wrong one;
+- A answers 200 with the Prometheus text content type, for both `Authorization: Bearer` and `?token=`;
+- after --requests GETs of /auth/login on A and as many on B, a scrape of either process shows
+  wvc_http_requests_total{endpoint="auth.login"} grown by both processes' requests, and
+  wvc_metrics_processes counts both. That is the METRICS_DIR aggregation.
+
+Exits 1 if any check fails. Only the standard library is used on the client side.
+
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/metrics_scrape.py
+    python benchmarks/metrics_scrape.py --requests 50
+"""
+import argparse
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TOKEN = "scrape-check-token"
+FLUSH_SECONDS = 0.5
+SAMPLE = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>.*)\})? (?P<value>\S+)$')
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def serve(port):
+    """Child process: run the app on `port` until killed (configured through the environment)."""
+    from werkzeug.serving import make_server
+
+    from app import create_app
+
+    make_server("127.0.0.1", port, create_app(), threaded=True).serve_forever()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(metrics_dir, token):
+    port = _free_port()
+    env = dict(os.environ, METRICS_FLUSH_SECONDS=str(FLUSH_SECONDS), PYTHONPATH=ROOT)
+    env.pop("METRICS_TOKEN", None)
+    env.pop("METRICS_DIR", None)
+    if token:
+        env["METRICS_TOKEN"] = token
+    if metrics_dir:
+        env["METRICS_DIR"] = metrics_dir
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(port)], env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server on port {port} exited with {process.returncode}")
+        try:
+            get(base_url + "/auth/login")
+            return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def get(url, headers=None):
+    """(status, headers, body) of a GET; HTTP errors are returned, not raised."""
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=30) as response:
+            return response.status, response.headers, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read().decode()
+
+
+def parse(text):
+    """{(name, ((label, value), ...)): value} from Prometheus text format."""
+    samples = {}
+    for line in text.splitlines():
+        match = SAMPLE.match(line)
+        if match:
+            labels = tuple(sorted(LABEL.findall(match.group("labels") or "")))
+            samples[(match.group("name"), labels)] = float(match.group("value"))
+    return samples
+
+
+def total(samples, name, **labels):
+    """Sum of `name` over the series whose labels include `labels`."""
+    return sum(
+        value for (sample_name, sample_labels), value in samples.items()
+        if sample_name == name and set(labels.items()) <= set(sample_labels)
+    )
+
+
+def scrape(base_url):
+    status, _headers, body = get(base_url + "/metrics", {"Authorization": f"Bearer {TOKEN}"})
+    if status != 200:
+        raise RuntimeError(f"{base_url}/metrics answered {status}")
+    return parse(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="GETs of /auth/login sent to each of A and B.")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve)
+        return
+
+    os.environ.setdefault("MEMORY_PROFILING", "false")
+    os.environ.setdefault("SLOW_QUERY_EXPLAIN", "false")
+    os.environ.setdefault("TRACING", "false")
+
+    failures = []
+
+    def check(name, ok, detail=""):
+        print(f"{'ok  ' if ok else 'FAIL'}  {name}{f'  ({detail})' if detail and not ok else ''}")
+        if not ok:
+            failures.append(name)
+
+    metrics_dir = tempfile.mkdtemp(prefix="wvc-metrics-")
+    servers = []
+    try:
+        for directory, token in ((metrics_dir, TOKEN), (metrics_dir, TOKEN), (None, None)):
+            servers.append(start_server(directory, token))
+        (_a, a_url), (_b, b_url), (_c, c_url) = servers
+
+        status, _headers, _body = get(c_url + "/metrics", {"Authorization": f"Bearer {TOKEN}"})
+        check("no METRICS_TOKEN -> 404", status == 404, f"got {status}")
+        status, headers, _body = get(a_url + "/metrics")
+        check("no token -> 401", status == 401, f"got {status}")
+        check("401 carries WWW-Authenticate", (headers.get("WWW-Authenticate") or "").startswith("Bearer"))
+        status, _headers, _body = get(a_url + "/metrics", {"Authorization": "Bearer wrong"})
+        check("wrong token -> 401", status == 401, f"got {status}")
+        status, headers, body = get(a_url + "/metrics", {"Authorization": f"Bearer {TOKEN}"})
+        check("bearer token -> 200", status == 200, f"got {status}")
+        check("Prometheus content type", (headers.get("Content-Type") or "").startswith("text/plain; version=0.0.4"),
+              headers.get("Content-Type"))
+        check("exposition has # TYPE lines", "# TYPE wvc_http_requests_total counter" in body)
+        status, _headers, _body = get(a_url + f"/metrics?token={TOKEN}")
+        check("?token= -> 200", status == 200, f"got {status}")
+
+        time.sleep(3 * FLUSH_SECONDS)  # both processes have flushed their start-up requests
+        before = total(scrape(a_url), "wvc_http_requests_total", endpoint="auth.login")
+        for base_url in (a_url, b_url):
+            for _ in range(args.requests):
+                get(base_url + "/auth/login")
+        time.sleep(3 * FLUSH_SECONDS)
+
+        expected = before + 2 * args.requests
+        for label, base_url in (("A", a_url), ("B", b_url)):
+            samples = scrape(base_url)
+            logins = total(samples, "wvc_http_requests_total", endpoint="auth.login")
+            check(f"scrape of {label} sums both processes' /auth/login requests", logins == expected,
+                  f"{logins:.0f}, expected {expected:.0f}")
+            processes = total(samples, "wvc_metrics_processes")
+            check(f"scrape of {label} counts 2 processes", processes == 2, f"got {processes:.0f}")
+        files = [name for name in os.listdir(metrics_dir) if name.endswith(".json")]
+        check("one metrics file per process in METRICS_DIR", len(files) == 2, f"{len(files)} files")
+    finally:
+        for process, _url in servers:
+            process.terminate()
+        for process, _url in servers:
+            process.wait(timeout=10)
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+    print(f"\n{len(failures)} check(s) failed" if failures else "\nall checks passed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Partition pruning benchmark (Postgres only).
+
+Loads the same synthetic ledger into a plain table and a year-partitioned copy,
+for a growing number of years, and compares a month-scoped range query (the
+shape the monthly report routes now use) on both:
+
+    python benchmarks/partition_pruning.py --years 1 3 5 10 --rows-per-day 200
+
+For each size it prints execution time (median of --runs EXPLAIN ANALYZE runs)
+and how many partitions the plan actually touched. Everything happens in a
+scratch schema that is dropped afterwards.
+"""
+import argparse
+import os
+import statistics
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+SCHEMA = "bench_partitions"
+
+
+def _setup(conn, years, rows_per_day):
+    first_year = date.today().year - years + 1
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"""
+        CREATE TABLE {SCHEMA}.plain (
+            id bigserial PRIMARY KEY, date date NOT NULL, trans_type varchar(50), amount numeric(12, 2)
+        )
+    """))
+    conn.execute(text(f"CREATE INDEX ON {SCHEMA}.plain (date)"))
+    conn.execute(text(f"""
+        CREATE TABLE {SCHEMA}.partitioned (
+            id bigserial, date date NOT NULL, trans_type varchar(50), amount numeric(12, 2),
+            PRIMARY KEY (id, date)
+        ) PARTITION BY RANGE (date)
+    """))
+    for year in range(first_year, first_year + years):
+        conn.execute(text(
+            f"CREATE TABLE {SCHEMA}.partitioned_y{year} PARTITION OF {SCHEMA}.partitioned "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        ))
+    conn.execute(text(f"CREATE INDEX ON {SCHEMA}.partitioned (date)"))
+
+    load = f"""
+        INSERT INTO {{table}} (date, trans_type, amount)
+        SELECT d::date, (ARRAY['Sales', 'Purchases', 'Wages'])[1 + (n % 3)], (random() * 5000)::numeric(12, 2)
+        FROM generate_series(:start, :end, interval '1 day') AS d,
+             generate_series(1, :per_day) AS n
+    """
+    params = {"start": date(first_year, 1, 1), "end": date(first_year + years - 1, 12, 31), "per_day": rows_per_day}
+    for table in ("plain", "partitioned"):
+        conn.execute(text(load.format(table=f"{SCHEMA}.{table}")), params)
+        conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+    return first_year + years - 1
+
+
+def _count_scans(plan):
+    """Number of table/index scans on distinct relations in an EXPLAIN JSON plan."""
+    relations = set()
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Relation Name" in node:
+            relations.add(node["Relation Name"])
+        stack.extend(node.get("Plans", ()))
+    return len(relations)
+
+
+def _measure(conn, table, year, runs):
+    query = f"""
+        EXPLAIN (ANALYZE, FORMAT JSON)
+        SELECT date, trans_type, sum(amount) FROM {SCHEMA}.{table}
+        WHERE date >= :start AND date < :end
+        GROUP BY date, trans_type
+    """
+    params = {"start": date(year, 6, 1), "end": date(year, 7, 1)}
+    timings, scanned = [], 0
+    for _ in range(runs):
+        result = conn.execute(text(query), params).scalar()
+        timings.append(result[0]["Execution Time"])
+        scanned = _count_scans(result[0]["Plan"])
+    return statistics.median(timings), scanned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--rows-per-day", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            sys.exit("This benchmark needs DATABASE_URL pointing at Postgres.")
+
+        print(f"{'years':>5} {'rows':>10} {'plain ms':>10} {'partitioned ms':>15} {'partitions scanned':>19}")
+        try:
+            for years in args.years:
+                with db.engine.begin() as conn:
+                    last_year = _setup(conn, years, args.rows_per_day)
+                with db.engine.connect() as conn:
+                    rows = conn.execute(text(f"SELECT count(*) FROM {SCHEMA}.plain")).scalar()
+                    plain_ms, _ = _measure(conn, "plain", last_year, args.runs)
+                    part_ms, scanned = _measure(conn, "partitioned", last_year, args.runs)
+                print(f"{years:>5} {rows:>10} {plain_ms:>10.2f} {part_ms:>15.2f} {scanned:>10} of {years:<6}")
+        finally:
+            with db.engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
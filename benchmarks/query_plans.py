@@ -0,0 +1,314 @@
+"""
+Query-plan regression checks for the hot report queries.
+
+Runs the routes of benchmarks/routes_baseline.json through the Flask test client, captures
+every SELECT they issue (deduplicated by slow-query-log fingerprint) and EXPLAINs it with
+the parameters it actually ran with: `EXPLAIN (FORMAT JSON)` on Postgres, `EXPLAIN QUERY
+PLAN` on SQLite. Plans are reduced to their shape (node types, tables, indexes and join
+types; no costs or row estimates; Postgres partitions folded into their parent table) and:
+
+- checked against the rules in benchmarks/query_plans/rules.json:
+  * no full scan of a table (on Postgres: a partition) with more than `min_rows` rows, unless
+    the route/table pair is listed under `allow_full_scan` with a reason (whole-table
+    aggregates, list pages);
+  * a range filter on one of the `date_columns` must reach that table through an index;
+  * no full scan of a table over `min_rows` on the inner side of a nested loop (rescanned
+    once per outer row), allowed or not;
+- compared with the golden plans in benchmarks/query_plans/<dialect>/<route>.json, so a
+  changed plan shows up as a diff in review. After changing a query on purpose, rewrite
+  the goldens with --update and commit the diff with the change.
+
+The exit status is 1 on any rule violation or plan difference:
+
+    DATABASE_URL=postgresql://localhost/wvc_bench python benchmarks/query_plans.py --seed
+    python benchmarks/query_plans.py --only catering      # substring filter on route names
+    python benchmarks/query_plans.py --update             # accept the current plans
+
+Plans depend on the data, so goldens are recorded on the baseline dataset (--seed), which
+the routes benchmark uses as well. A dialect without a golden directory fails at once
+instead of running the rules only. Goldens are kept for postgresql/ (production) and sqlite/.
+"""
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routes import BASELINE, _load_baseline, _seed  # noqa: E402  (benchmarks/routes.py)
+
+PLANS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_plans")
+RULES = os.path.join(PLANS_DIR, "rules.json")
+
+_PARTITION_SUFFIX = re.compile(r"_(?:y\d{4}|default)(?=_|$)")
+_DATE_RANGE = re.compile(r"\b(\w+)\.(\w+) (?:>=|>|<=|<|BETWEEN) ", re.I)
+_SQLITE_ACCESS = re.compile(r"^(SCAN|SEARCH) (\w+)")
+_PG_INDEXED = ("Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+
+
+# ----------------------------
+# CAPTURE
+# ----------------------------
+class StatementCapture:
+    """SELECT statements (with their parameters) run while capturing, first run of each fingerprint only."""
+
+    def __init__(self, engines):
+        from sqlalchemy import event
+
+        self.statements = None
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._capture)
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if self.statements is None or executemany:
+            return
+        from app.perf.slow_queries import fingerprint, normalize_sql
+
+        normalized = normalize_sql(statement)
+        if not normalized.lower().startswith(("select", "with")):
+            return
+        self.statements.setdefault(fingerprint(normalized), (conn.engine, statement, parameters, normalized))
+
+    def run(self, client, url):
+        self.statements = {}
+        try:
+            response = client.get(url)
+            response.get_data()  # streamed bodies query while they are read
+            response.close()
+        finally:
+            captured, self.statements = self.statements, None
+        return response.status_code, list(captured.values())
+
+
+# ----------------------------
+# PLAN SHAPES
+# ----------------------------
+def _fold(name):
+    """Partition (`project_expenses_y2025`, `..._default`) or partition index name -> parent's."""
+    return _PARTITION_SUFFIX.sub("", name) if name else name
+
+
+def _sqlite_shape(rows):
+    """Indented plan lines plus the table accesses: (table, indexed, inner side of a loop, relation read)."""
+    depth, lines, accesses, loops = {0: -1}, [], [], {}
+    for node_id, parent, _notused, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+        match = _SQLITE_ACCESS.match(detail)
+        if match:
+            # Each SCAN/SEARCH after the first under the same parent is a nested loop's inner side
+            inner = loops.get(parent, 0) > 0
+            loops[parent] = loops.get(parent, 0) + 1
+            accesses.append((match.group(2), match.group(1) == "SEARCH", inner, match.group(2)))
+    return lines, accesses
+
+
+def _pg_shape(plan):
+    lines, accesses = [], []
+
+    def label(node):
+        text = node["Node Type"]
+        if node.get("Join Type") and ("Join" in text or text == "Nested Loop"):
+            text += f" ({node.get('Join Type', 'Inner')})"
+        if node.get("Relation Name"):
+            text += f" on {_fold(node['Relation Name'])}"
+        if node.get("Index Name"):
+            text += f" using {_fold(node['Index Name'])}"
+        return text
+
+    def children(node):
+        # Appends over partitions repeat one subtree per surviving partition: keep one of each shape
+        seen, unique = set(), []
+        for child in node.get("Plans", []):
+            key = json.dumps(_strip(child), sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                unique.append(child)
+        return unique
+
+    def walk(node, level, inner):
+        lines.append("  " * level + ("-> " if level else "") + label(node))
+        if node.get("Relation Name"):
+            indexed = node["Node Type"] in _PG_INDEXED
+            # Row counts are taken from the partition actually scanned
+            accesses.append((_fold(node["Relation Name"]), indexed, inner, node["Relation Name"]))
+        for child in children(node):
+            walk(child, level + 1,
+                 inner or (node["Node Type"] == "Nested Loop" and child.get("Parent Relationship") == "Inner"))
+
+    walk(plan[0]["Plan"], 0, False)
+    return lines, accesses
+
+
+def _strip(node):
+    """A plan node without costs/estimates and with partitions folded, for comparing Append children."""
+    return {
+        "type": node["Node Type"],
+        "relation": _fold(node.get("Relation Name")),
+        "index": _fold(node.get("Index Name")),
+        "join": node.get("Join Type"),
+        "plans": [_strip(child) for child in node.get("Plans", [])],
+    }
+
+
+def plan_shape(engine, statement, parameters):
+    from app.perf.slow_queries import explain_statement
+
+    plan = explain_statement(engine, statement, parameters)
+    if plan is None:
+        raise SystemExit(f"Query plans are not supported on {engine.dialect.name}.")
+    if isinstance(plan, dict):  # {"error": ...}
+        return [f"EXPLAIN failed: {plan['error']}"], []
+    return _pg_shape(plan) if engine.dialect.name == "postgresql" else _sqlite_shape(plan)
+
+
+# ----------------------------
+# RULES
+# ----------------------------
+class RowCounts(dict):
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+
+    def __missing__(self, table):
+        from sqlalchemy import inspect, text
+
+        if not inspect(self.engine).has_table(table):  # subquery / CTE aliases
+            self[table] = 0
+        else:
+            with self.engine.connect() as conn:
+                self[table] = conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+        return self[table]
+
+
+def violations(route, normalized, accesses, rules, row_counts):
+    found = []
+    big = lambda table: row_counts[table] > rules["min_rows"]  # noqa: E731
+    allowed = rules.get("allow_full_scan", {}).get(route, {})
+    for table, indexed, inner, relation in accesses:
+        if indexed or not big(relation):
+            continue
+        name = table if relation == table else f"{table} ({relation})"
+        if inner:
+            found.append(f"nested loop rescans {name} ({row_counts[relation]} rows) without an index")
+        elif table not in allowed:
+            found.append(f"full scan of {name} ({row_counts[relation]} rows)")
+    date_columns = rules.get("date_columns", {})
+    for table, column in set(_DATE_RANGE.findall(normalized)):
+        if date_columns.get(table) != column or not big(table):
+            continue
+        scans = [(indexed, relation) for t, indexed, _inner, relation in accesses if t == table]
+        if any(indexed for indexed, _relation in scans):
+            continue
+        if scans and not any(big(relation) for _indexed, relation in scans):
+            continue  # pruned to partitions too small to need an index
+        found.append(f"range filter on {table}.{column} does not use an index")
+    return found
+
+
+# ----------------------------
+# GOLDEN PLANS
+# ----------------------------
+def _golden_path(dialect, route):
+    return os.path.join(PLANS_DIR, dialect, f"{route}.json")
+
+
+def _dump(queries):
+    return json.dumps(queries, indent=2) + "\n"
+
+
+def golden_diff(path, queries):
+    """Unified diff between the golden plans and `queries` ('' when they match)."""
+    if not os.path.exists(path):
+        return f"no golden plans at {path} (record them with --update)"
+    with open(path, encoding="utf-8") as f:
+        expected = f.read()
+    actual = _dump(queries)
+    if expected == actual:
+        return ""
+    return "".join(difflib.unified_diff(
+        expected.splitlines(keepends=True), actual.splitlines(keepends=True),
+        fromfile=os.path.relpath(path), tofile="current",
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=BASELINE, help="Routes and dataset (shared with routes.py).")
+    parser.add_argument("--rules", default=RULES, help="Plan rules file.")
+    parser.add_argument("--only", default=None, help="Substring filter on route names.")
+    parser.add_argument("--seed", action="store_true", help="Recreate the baseline dataset first (deletes the seeded tables).")
+    parser.add_argument("--update", action="store_true", help="Write the current plans as the new goldens.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MEMORY_PROFILING", "false")
+    os.environ.setdefault("SLOW_QUERY_EXPLAIN", "false")
+    os.environ.setdefault("TRACING", "false")
+
+    from app import create_app
+    from app.extensions import db
+
+    baseline = _load_baseline(args.baseline)
+    rules = _load_baseline(args.rules)
+    app = create_app()
+    if args.seed:
+        _seed(app, baseline["dataset"])
+
+    with app.app_context():
+        engine = db.engine
+        capture = StatementCapture(db.engines.values())
+    dialect = engine.dialect.name
+    if not args.update and not os.path.isdir(os.path.join(PLANS_DIR, dialect)):
+        sys.exit(
+            f"No golden plans for {dialect} in {os.path.join(PLANS_DIR, dialect)}.\n"
+            f"Record them on the baseline dataset (--seed --update) and commit them; "
+            f"without them plan changes on {dialect} go unnoticed."
+        )
+    row_counts = RowCounts(engine)
+
+    client = app.test_client()
+    with client.session_transaction() as s:
+        s.update(user_id=0, username="benchmark", role="Admin", department="Corporate")
+
+    failed = 0
+    for name, route in baseline["routes"].items():
+        if args.only and args.only not in name:
+            continue
+        status, statements = capture.run(client, route["url"].format(**baseline["dataset"]))
+        queries, problems = [], []
+        for query_engine, statement, parameters, normalized in statements:
+            lines, accesses = plan_shape(query_engine, statement, parameters)
+            queries.append({"sql": normalized, "plan": lines})
+            problems += [f"{v}\n      in: {normalized[:120]}"
+                         for v in violations(name, normalized, accesses, rules, row_counts)]
+        if status != 200:
+            problems.append(f"status {status}")
+
+        path = _golden_path(dialect, name)
+        if args.update:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_dump(queries))
+            diff = ""
+        else:
+            diff = golden_diff(path, queries)
+
+        failed += bool(problems or diff)
+        print(f"{name:<42}{len(queries):>3} queries  {'FAIL' if problems or diff else 'ok'}")
+        for problem in problems:
+            print(f"    {problem}")
+        if diff:
+            print("    plan changed:" if diff.startswith("---") else f"    {diff}")
+            if diff.startswith("---"):
+                print("".join(f"      {line}" for line in diff.splitlines(keepends=True)))
+
+    if args.update:
+        print(f"Golden plans written to {os.path.join(PLANS_DIR, dialect)}.")
+    print(f"failing routes: {failed}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Route benchmarks with performance budgets.
+
+Runs the key report routes through the Flask test client against the current DATABASE_URL
+and measures, per route:
+- wall time: best of --repeat runs after one warm-up run (the least noisy statistic on a
+  shared machine; a real regression slows every run);
+- SQL statements executed (including those run while a streamed body is read);
+- peak Python memory, from one extra run under tracemalloc (kept apart from the timed runs,
+  which tracemalloc would slow down).
+
+Budgets live in benchmarks/routes_baseline.json, together with the dataset they were measured
+on. A route fails when its wall time or peak memory goes over budget by more than the file's
+tolerance, or when it runs more SQL statements than budgeted. The exit status is 1 if any
+route fails, so this can gate CI:
+
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/routes.py --seed
+    python benchmarks/routes.py --only catering          # substring filter on route names
+    python benchmarks/routes.py --update                 # accept current numbers as the new budgets
+
+--seed first (re)creates the baseline's dataset with `flask seed --reset` (same seed, scale and
+months), so numbers are comparable between runs and machines. Wall-time budgets are only
+meaningful on the machine and database they were recorded on: regenerate them with --update
+there.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "routes_baseline.json")
+
+
+def _load_baseline(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _seed(app, dataset):
+    from app.extensions import db
+    from app.seed.cli import seed_command
+
+    with app.app_context():
+        db.create_all()  # a fresh scratch database; no-op where migrations already ran
+    result = app.test_cli_runner().invoke(seed_command, [
+        "--scale", str(dataset["scale"]), "--seed", str(dataset["seed"]), "--years", str(dataset["years"]),
+        "--through", dataset["through"], "--reset", "--yes",
+    ])
+    print(result.output.strip().splitlines()[-1] if result.output else "")
+    if result.exit_code:
+        raise SystemExit(f"Seeding failed: {result.output}{result.exception or ''}")
+
+
+class SqlCounter:
+    def __init__(self, engines):
+        from sqlalchemy import event
+
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def _request(client, url):
+    response = client.get(url)
+    response.get_data()  # read streamed bodies to the end
+    response.close()
+    return response.status_code
+
+
+def measure(client, counter, url, repeat):
+    status = _request(client, url)  # warm-up: template compilation, statement cache
+    timings = []
+    sql_counts = set()
+    for _ in range(repeat):
+        gc.collect()
+        counter.count = 0
+        started = time.perf_counter()
+        _request(client, url)
+        timings.append((time.perf_counter() - started) * 1000)
+        sql_counts.add(counter.count)
+
+    tracemalloc.start()
+    try:
+        _request(client, url)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "status": status,
+        "wall_ms": round(min(timings), 1),
+        "sql_count": max(sql_counts),
+        "peak_mb": round(peak / 2**20, 1),
+    }
+
+
+def check(measured, budget, tolerance):
+    """Names of the metrics of one route that are over budget."""
+    failures = []
+    if measured["wall_ms"] > budget["wall_ms"] * (1 + tolerance["wall_ms"]) + tolerance["wall_ms_slack"]:
+        failures.append("wall_ms")
+    if measured["peak_mb"] > budget["peak_mb"] * (1 + tolerance["peak_mb"]) + tolerance["peak_mb_slack"]:
+        failures.append("peak_mb")
+    if measured["sql_count"] > budget["sql_count"] + tolerance["sql_count"]:
+        failures.append("sql_count")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=BASELINE, help="Budgets file.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per route.")
+    parser.add_argument("--only", default=None, help="Substring filter on route names.")
+    parser.add_argument("--seed", action="store_true", help="Recreate the baseline dataset first (deletes the seeded tables).")
+    parser.add_argument("--update", action="store_true", help="Write the measured numbers back as the new budgets.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MEMORY_PROFILING", "false")
+    os.environ.setdefault("SLOW_QUERY_EXPLAIN", "false")
+    os.environ.setdefault("TRACING", "false")  # the span writer thread adds jitter to SQL-heavy routes
+
+    from app import create_app
+    from app.extensions import db
+
+    baseline = _load_baseline(args.baseline)
+    dataset, tolerance = baseline["dataset"], baseline["tolerance"]
+    app = create_app()
+    if args.seed:
+        _seed(app, dataset)
+
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        counter = SqlCounter(db.engines.values())
+    if dialect != baseline.get("dialect"):
+        print(f"warning: budgets were recorded on {baseline.get('dialect')}, running on {dialect}")
+
+    client = app.test_client()
+    with client.session_transaction() as s:
+        s.update(user_id=0, username="benchmark", role="Admin", department="Corporate")
+
+    failed = 0
+    print(f"{'route':<42}{'status':>7}{'wall ms':>10}{'budget':>9}{'SQL':>6}{'budget':>8}{'peak MB':>9}{'budget':>8}")
+    for name, route in baseline["routes"].items():
+        if args.only and args.only not in name:
+            continue
+        url = route["url"].format(**dataset)
+        measured = measure(client, counter, url, args.repeat)
+        failures = check(measured, route, tolerance) if measured["status"] == 200 else ["status"]
+        failed += bool(failures)
+        print(f"{name:<42}{measured['status']:>7}{measured['wall_ms']:>10.1f}{route['wall_ms']:>9.1f}"
+              f"{measured['sql_count']:>6}{route['sql_count']:>8}{measured['peak_mb']:>9.1f}{route['peak_mb']:>8.1f}"
+              f"{'  FAIL: ' + ', '.join(failures) if failures else ''}")
+        if args.update and measured["status"] == 200:
+            route.update(wall_ms=measured["wall_ms"], sql_count=measured["sql_count"], peak_mb=measured["peak_mb"])
+
+    if args.update:
+        baseline["dialect"] = dialect
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Budgets written to {args.baseline}.")
+        return
+    print(f"over budget: {failed}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
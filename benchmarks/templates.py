@@ -0,0 +1,129 @@
+"""
+First-render latency of the large module templates, with and without the bytecode cache.
+
+Every measurement runs in a fresh Python process, the way a newly started worker meets the
+template (the wsgi.py warm-up is not run). For each template:
+- first_hit_ms / second_hit_ms: the first and second GET of the page that renders it (logged
+  in, after one GET /auth/login to absorb the app's other first-request costs); the
+  difference is roughly what the first hit pays for getting the template ready;
+- load_ms: get_template() on a fresh Jinja environment afterwards: a full compile without
+  the cache, a bytecode load with it.
+
+Modes: `compile` runs with TEMPLATE_CACHE_DIR="" (what every worker did before the cache);
+`cached` runs against a scratch cache filled by `flask startup compile-templates` first:
+
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/templates.py
+    python benchmarks/templates.py --runs 7 --only project_detail
+
+Report only: there is no budget file, the medians are printed side by side.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# template -> a page that renders it (seeded dataset: project 1 exists)
+TEMPLATES = {
+    "carenderia/home.html": "/carenderia/home",
+    "construction/project_detail.html": "/construction/project/1",
+    "catering/home.html": "/catering/home",
+}
+
+
+def child(template):
+    """One cold process: prints the template's timings as JSON."""
+    sys.path.insert(0, ROOT)
+    from app import create_app
+
+    app = create_app()
+    client = app.test_client()
+    client.get("/auth/login").get_data()
+    with client.session_transaction() as s:
+        s.update(user_id=0, username="benchmark", role="Admin", department="Corporate")
+
+    hits = []
+    for _ in range(2):
+        started = time.perf_counter()
+        response = client.get(TEMPLATES[template])
+        response.get_data()
+        hits.append(round((time.perf_counter() - started) * 1000, 1))
+
+    env = app.create_jinja_environment()
+    started = time.perf_counter()
+    env.get_template(template)
+    load_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    print(json.dumps({
+        "status": response.status_code,
+        "first_hit_ms": hits[0],
+        "second_hit_ms": hits[1],
+        "load_ms": load_ms,
+    }))
+
+
+def run_child(template, cache_dir):
+    env = {**os.environ, "TEMPLATE_CACHE_DIR": cache_dir}
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", template],
+        capture_output=True, text=True, cwd=ROOT, env=env,
+    )
+    if result.returncode:
+        raise SystemExit(f"Template benchmark child failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def fill_cache(cache_dir):
+    env = {**os.environ, "TEMPLATE_CACHE_DIR": cache_dir,
+           "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "run:app", "startup", "compile-templates", "--clear"],
+        capture_output=True, text=True, cwd=ROOT, env=env,
+    )
+    if result.returncode:
+        raise SystemExit(f"compile-templates failed:\n{result.stderr[-2000:]}")
+    print(result.stdout.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Cold processes per template and mode (the median counts).")
+    parser.add_argument("--only", default=None, help="Substring filter on template names.")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MEMORY_PROFILING", "false")
+    os.environ.setdefault("SLOW_QUERY_EXPLAIN", "false")
+    os.environ.setdefault("TRACING", "false")
+    if args.child:
+        child(args.child)
+        return
+
+    cache_dir = tempfile.mkdtemp(prefix="wvc-jinja-")
+    try:
+        fill_cache(cache_dir)
+        print(f"\n{'template':<36}{'lines':>7}{'mode':>9}{'first hit':>11}{'2nd hit':>9}{'load':>9}  (ms, median)")
+        for template in TEMPLATES:
+            if args.only and args.only not in template:
+                continue
+            with open(os.path.join(ROOT, "app", "templates", template), encoding="utf-8") as f:
+                lines = sum(1 for _ in f)
+            for mode, directory in (("compile", ""), ("cached", cache_dir)):
+                runs = [run_child(template, directory) for _ in range(args.runs)]
+                median = {name: statistics.median(run[name] for run in runs)
+                          for name in ("first_hit_ms", "second_hit_ms", "load_ms")}
+                status = "" if runs[0]["status"] == 200 else f"  (status {runs[0]['status']})"
+                print(f"{template:<36}{lines:>7}{mode:>9}{median['first_hit_ms']:>11.1f}"
+                      f"{median['second_hit_ms']:>9.1f}{median['load_ms']:>9.1f}{status}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Gunicorn settings for `gunicorn wsgi:app` (gunicorn reads ./gunicorn.conf.py automatically).
+
+Sizing
+- workers: 2 x CPUs + 1, capped by the memory available to the container
+  (cgroup limit, else physical RAM) divided by WEB_WORKER_MEMORY_MB. WEB_CONCURRENCY overrides.
+- worker class gthread with GUNICORN_THREADS threads per worker (default 4). Keep
+  threads <= DB_POOL_SIZE + DB_MAX_OVERFLOW, or requests queue for a connection.
+
+Preload / copy-on-write
+- preload_app imports the app once in the master; workers are forked from it and share those
+  pages. Automatic GC is off in the master and gc.freeze() runs right before each fork, so the
+  collector never writes to (and so copies) the shared objects; workers re-enable GC.
+- post_fork discards the engine pools inherited from the master (dispose(close=False)) so no
+  two processes ever share a database socket.
+
+Warm-up
+- wsgi.py warms the app up (mappers, URL map, compiled templates) when it is loaded, so with
+  preload_app the workers are forked warm; post_worker_init then opens each worker's first
+  pool connections (WARM_UP_DB_CONNECTIONS) before it accepts requests.
+
+Metrics
+- /metrics sums every worker's numbers through METRICS_DIR (default: a directory per bind port
+  under the temp dir); its files are cleared when the server starts.
+"""
+import gc
+import multiprocessing
+import os
+import tempfile
+
+WORKER_MEMORY_MB_DEFAULT = 256
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _memory_limit_bytes():
+    """The container's memory limit (cgroup v2 / v1), else physical memory; None if unknown."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                raw = f.read().strip()
+        except OSError:
+            continue
+        if raw.isdigit() and int(raw) < 1 << 60:  # v1 reports "no limit" as a huge number
+            return int(raw)
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _default_workers():
+    by_cpu = 2 * multiprocessing.cpu_count() + 1
+    memory = _memory_limit_bytes()
+    if memory is None:
+        return by_cpu
+    per_worker = int(os.environ.get("WEB_WORKER_MEMORY_MB", WORKER_MEMORY_MB_DEFAULT)) * 1024 * 1024
+    return max(1, min(by_cpu, memory // per_worker))
+
+
+bind = os.environ.get("GUNICORN_BIND") or f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY") or _default_workers())
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "4")) if worker_class == "gthread" else 1
+preload_app = _env_bool("GUNICORN_PRELOAD", True)
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))  # PDF / XLSX exports can take a while
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then; with preload they are re-forked from the frozen master
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None  # empty: no access log
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+# Set before the app is loaded so the master and every worker agree on it
+os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), f"wvc-metrics-{bind.rsplit(':', 1)[-1]}"))
+
+if preload_app:
+    # The config is read before the app is preloaded: keep the collector from touching
+    # (and un-sharing) the app's objects in the master.
+    gc.disable()
+
+
+def on_starting(server):
+    from app.perf.metrics import clear_directory
+
+    clear_directory(os.environ["METRICS_DIR"])
+
+
+def pre_fork(server, worker):
+    if server.cfg.preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return  # the worker builds its own app (and engines) after this hook
+    gc.enable()
+    from app.extensions import db
+    from app.database.pool import reset_after_fork
+
+    reset_after_fork(server.app.wsgi(), db)
+
+
+def post_worker_init(worker):
+    app = worker.wsgi
+    if app.config.get("WARM_UP"):
+        from app.extensions import db
+        from app.perf.startup import warm_up_pool
+
+        warm_up_pool(app, db)
@@ -36,6 +36,10 @@ def get_engine_url():
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
+# Migrations (partitioning, backfills) may run long: no web statement_timeout
+from app.database.pool import set_db_role  # noqa: E402
+set_db_role("cli")
+
 config.set_main_option('sqlalchemy.url', get_engine_url())
 target_db = current_app.extensions['migrate'].db
 
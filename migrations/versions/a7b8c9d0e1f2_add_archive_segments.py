@@ -0,0 +1,53 @@
+"""add archive_segments and archive_segment_refs for the cold archive
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a7b8c9d0e1f2"
+down_revision = "f6a7b8c9d0e1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('archive_segments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('venture', sa.String(length=20), nullable=False),
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('storage', sa.String(length=10), nullable=False),
+    sa.Column('location', sa.String(length=500), nullable=True),
+    sa.Column('payload', sa.LargeBinary(), nullable=True),
+    sa.Column('byte_size', sa.Integer(), nullable=False),
+    sa.Column('checksum', sa.String(length=64), nullable=False),
+    sa.Column('archived_by', sa.BigInteger(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['archived_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('table_name', 'period', name='uix_archive_segment_table_period')
+    )
+    op.create_index('ix_archive_segments_venture_period', 'archive_segments', ['venture', 'period'], unique=False)
+    op.create_table('archive_segment_refs',
+    sa.Column('segment_id', sa.Integer(), nullable=False),
+    sa.Column('ref_id', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['segment_id'], ['archive_segments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('segment_id', 'ref_id')
+    )
+    op.create_index('ix_archive_segment_refs_ref_id', 'archive_segment_refs', ['ref_id'], unique=False)
+    if op.get_bind().dialect.name == "postgresql":
+        # Payloads are already gzip-compressed; skip TOAST's second compression pass
+        op.execute("ALTER TABLE archive_segments ALTER COLUMN payload SET STORAGE EXTERNAL")
+
+
+def downgrade():
+    op.drop_index('ix_archive_segment_refs_ref_id', table_name='archive_segment_refs')
+    op.drop_table('archive_segment_refs')
+    op.drop_index('ix_archive_segments_venture_period', table_name='archive_segments')
+    op.drop_table('archive_segments')
@@ -0,0 +1,58 @@
+"""index the ledger columns the report queries filter and join on
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-19
+
+Found by benchmarks/query_plans.py:
+- project overview filters project_expenses by contract_id (and orders by date);
+- collectibles / booking payments look up catering_transaction and
+  catering_expense by booking_id.
+
+The date and purchase-item foreign-key indexes already exist on Postgres (the
+partitioning migration creates them); other databases get them here too, and
+downgrade only drops them where this migration created them.
+"""
+from alembic import op
+
+
+revision = "b8c9d0e1f2a3"
+down_revision = "a7b8c9d0e1f2"
+branch_labels = None
+depends_on = None
+
+
+# name -> (table, columns)
+NEW_INDEXES = {
+    "ix_project_expenses_contract_id_expense_date": ("project_expenses", ["contract_id", "expense_date"]),
+    "ix_catering_transaction_booking_id": ("catering_transaction", ["booking_id"]),
+    "ix_catering_expense_booking_id": ("catering_expense", ["booking_id"]),
+}
+
+# Created by f6a7b8c9d0e1 on Postgres only
+PARTITION_INDEXES = {
+    "ix_project_expenses_expense_date": ("project_expenses", ["expense_date"]),
+    "ix_carenderia_transaction_date": ("carenderia_transaction", ["date"]),
+    "ix_carenderia_wages_date": ("carenderia_wages", ["date"]),
+    "ix_catering_transaction_date": ("catering_transaction", ["date"]),
+    "ix_catering_expense_date": ("catering_expense", ["date"]),
+    "ix_carenderia_purchase_items_trans_id": ("carenderia_purchase_items", ["trans_id"]),
+    "ix_catering_purchase_items_expense_id": ("catering_purchase_items", ["expense_id"]),
+    "ix_catering_wages_expense_id": ("catering_wages", ["expense_id"]),
+}
+
+
+def _created_here():
+    if op.get_bind().dialect.name == "postgresql":
+        return NEW_INDEXES
+    return {**NEW_INDEXES, **PARTITION_INDEXES}
+
+
+def upgrade():
+    for name, (table, columns) in _created_here().items():
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, (table, _columns) in reversed(list(_created_here().items())):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,31 @@
+"""add sequence_counters for purchase reference numbers
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-19
+
+PUR-<date>-### references were numbered by counting the existing purchases of the
+date, which hands the same number to concurrent saves. They are now allocated from
+a counter row per venture and date (app/database/sequences.py).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c9d0e1f2a3b4"
+down_revision = "b8c9d0e1f2a3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sequence_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('key', sa.String(length=50), nullable=False),
+    sa.Column('last_value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name', 'key')
+    )
+
+
+def downgrade():
+    op.drop_table('sequence_counters')
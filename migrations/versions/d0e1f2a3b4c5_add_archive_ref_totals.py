@@ -0,0 +1,67 @@
+"""add per-booking totals to archive_segment_refs
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-19
+
+Collectibles and booking totals need each booking's archived payments. Reading them
+meant opening every archived catering_transaction segment, so each ref now carries the
+booking's paid total (amount) and contract total (amount_due) for its segment.
+Segments archived before this migration are backfilled from their rows.
+"""
+import gzip
+import json
+import os
+from decimal import Decimal
+
+from alembic import op
+from flask import current_app
+import sqlalchemy as sa
+
+
+revision = "d0e1f2a3b4c5"
+down_revision = "c9d0e1f2a3b4"
+branch_labels = None
+depends_on = None
+
+
+def _segment_lines(segment):
+    if segment.storage == "file":
+        with open(os.path.join(current_app.config["ARCHIVE_DIR"], segment.location), "rb") as fh:
+            blob = fh.read()
+    else:
+        blob = segment.payload
+    return [json.loads(line) for line in gzip.decompress(blob).decode("utf-8").splitlines() if line]
+
+
+def upgrade():
+    op.add_column('archive_segment_refs', sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=True))
+    op.add_column('archive_segment_refs', sa.Column('amount_due', sa.Numeric(precision=14, scale=2), nullable=True))
+
+    connection = op.get_bind()
+    segments = connection.execute(sa.text(
+        "SELECT id, storage, location, payload FROM archive_segments WHERE table_name = 'catering_transaction'"
+    )).all()
+    for segment in segments:
+        totals = {}
+        for line in _segment_lines(segment):
+            if line.get("booking_id") is None:
+                continue
+            paid, due = totals.get(line["booking_id"], (Decimal("0"), None))
+            paid += Decimal(line.get("trans_amount") or "0")
+            if line.get("booking_amount") is not None:
+                due = Decimal(line["booking_amount"]) if due is None else max(due, Decimal(line["booking_amount"]))
+            totals[line["booking_id"]] = (paid, due)
+        for ref_id, (paid, due) in totals.items():
+            connection.execute(
+                sa.text(
+                    "UPDATE archive_segment_refs SET amount = :amount, amount_due = :amount_due "
+                    "WHERE segment_id = :segment_id AND ref_id = :ref_id"
+                ),
+                {"amount": paid, "amount_due": due, "segment_id": segment.id, "ref_id": ref_id},
+            )
+
+
+def downgrade():
+    op.drop_column('archive_segment_refs', 'amount_due')
+    op.drop_column('archive_segment_refs', 'amount')
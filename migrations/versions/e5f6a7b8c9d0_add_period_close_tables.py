@@ -0,0 +1,46 @@
+"""add closed_periods and period_snapshots for period close
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "e5f6a7b8c9d0"
+down_revision = "d4e5f6a7b8c9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('closed_periods',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('venture', sa.String(length=20), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('closed_by', sa.BigInteger(), nullable=True),
+    sa.Column('closed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['closed_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('venture', 'period', name='uix_closed_period_venture_period')
+    )
+    op.create_table('period_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('venture', sa.String(length=20), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('ref_id', sa.BigInteger(), nullable=True),
+    sa.Column('day', sa.Date(), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_period_snapshots_venture_period', 'period_snapshots', ['venture', 'period'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_period_snapshots_venture_period', table_name='period_snapshots')
+    op.drop_table('period_snapshots')
+    op.drop_table('closed_periods')
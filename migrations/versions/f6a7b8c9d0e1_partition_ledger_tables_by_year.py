@@ -0,0 +1,240 @@
+"""partition ledger tables by year (Postgres declarative range partitioning)
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19
+
+Converts project_expenses, carenderia_transaction, carenderia_wages,
+catering_transaction and catering_expense into tables partitioned by year on
+their date column, with one partition per year (from the oldest row up to next
+year) plus a DEFAULT partition for NULL / not-yet-created years.
+
+Notes:
+- The primary key becomes (id, <date>) because Postgres requires the partition
+  key in every unique constraint. project_expenses.expense_date is nullable, so
+  that table gets UNIQUE (id, expense_date) instead of a primary key.
+- Foreign keys *into* these tables (purchase items, catering_wages.expense_id)
+  cannot reference id alone on a partitioned table; they are dropped here and
+  the ORM relationships/cascades keep working. Downgrade restores them.
+- wvc_ensure_year_partitions() creates the current and next year's partitions;
+  it is called by `flask partitions ensure` and daily by `flask worker`.
+- Non-Postgres databases are left untouched.
+"""
+from alembic import op
+
+
+revision = "f6a7b8c9d0e1"
+down_revision = "e5f6a7b8c9d0"
+branch_labels = None
+depends_on = None
+
+
+# table -> (partition key, key is nullable)
+PARTITIONED_TABLES = {
+    "project_expenses": ("expense_date", True),
+    "carenderia_transaction": ("date", False),
+    "carenderia_wages": ("date", False),
+    "catering_transaction": ("date", False),
+    "catering_expense": ("date", False),
+}
+
+# Foreign keys into the partitioned tables that are dropped on upgrade / restored on downgrade
+INCOMING_FOREIGN_KEYS = [
+    ("carenderia_purchase_items", "trans_id", "carenderia_transaction", "CASCADE"),
+    ("catering_purchase_items", "expense_id", "catering_expense", "CASCADE"),
+    ("catering_wages", "expense_id", "catering_expense", "SET NULL"),
+]
+
+
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION wvc_create_year_partition(parent text, yr int) RETURNS void AS $$
+DECLARE
+    part text := format('%s_y%s', parent, yr);
+    default_part text := parent || '_default';
+    lo date := make_date(yr, 1, 1);
+    hi date := make_date(yr + 1, 1, 1);
+    key text;
+BEGIN
+    IF to_regclass(part) IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    SELECT a.attname INTO key
+    FROM pg_partitioned_table p
+    JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0]
+    WHERE p.partrelid = parent::regclass;
+
+    IF to_regclass(default_part) IS NOT NULL THEN
+        -- Rows for this year may already sit in the default partition; move them before attaching
+        EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part, parent);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *) INSERT INTO %I SELECT * FROM moved',
+            default_part, key, lo, key, hi, part
+        );
+        EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', parent, part, lo, hi);
+    ELSE
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)', part, parent, lo, hi);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CREATE_ENSURE_FUNCTION = """
+CREATE OR REPLACE FUNCTION wvc_ensure_year_partitions(years_ahead int DEFAULT 1) RETURNS void AS $$
+DECLARE
+    t text;
+    y int;
+    this_year int := EXTRACT(YEAR FROM CURRENT_DATE)::int;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[%s] LOOP
+        IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(t)) THEN
+            FOR y IN this_year .. this_year + years_ahead LOOP
+                PERFORM wvc_create_year_partition(t, y);
+            END LOOP;
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+""" % ", ".join(f"'{t}'" for t in PARTITIONED_TABLES)
+
+
+def _partition_table(table, key, key_nullable):
+    unique_clause = (
+        f"ALTER TABLE {table} ADD CONSTRAINT uq_{table}_id_{key} UNIQUE (id, {key});"
+        if key_nullable
+        else f"ALTER TABLE {table} ADD PRIMARY KEY (id, {key});"
+    )
+    return f"""
+    DO $$
+    DECLARE
+        seq text := pg_get_serial_sequence('{table}', 'id');
+        fk record;
+        lo int;
+        hi int := EXTRACT(YEAR FROM CURRENT_DATE)::int + 1;
+        y int;
+    BEGIN
+        IF to_regclass('{table}') IS NULL
+           OR EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = '{table}'::regclass) THEN
+            RETURN;
+        END IF;
+
+        -- Foreign keys into this table cannot target id alone once it is partitioned
+        FOR fk IN
+            SELECT conname, conrelid::regclass AS child FROM pg_constraint
+            WHERE contype = 'f' AND confrelid = '{table}'::regclass
+        LOOP
+            EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.child, fk.conname);
+        END LOOP;
+
+        ALTER TABLE {table} RENAME TO {table}_unpartitioned;
+        -- Free the primary key / index names for the new table
+        FOR fk IN
+            SELECT conname FROM pg_constraint
+            WHERE contype = 'p' AND conrelid = '{table}_unpartitioned'::regclass
+        LOOP
+            EXECUTE format('ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT %I TO %I', fk.conname, fk.conname || '_old');
+        END LOOP;
+        CREATE TABLE {table} (
+            LIKE {table}_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING IDENTITY
+        ) PARTITION BY RANGE ({key});
+        {unique_clause}
+
+        -- Outgoing foreign keys (contract, user, employee, booking ...) move to the new table
+        FOR fk IN
+            SELECT conname, pg_get_constraintdef(oid) AS def FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = '{table}_unpartitioned'::regclass
+        LOOP
+            EXECUTE format('ALTER TABLE {table} ADD CONSTRAINT %I %s', fk.conname, fk.def);
+        END LOOP;
+
+        -- Keep the id sequence when the old table is dropped
+        IF seq IS NOT NULL THEN
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY {table}.id', seq);
+        END IF;
+
+        SELECT EXTRACT(YEAR FROM min({key}))::int INTO lo FROM {table}_unpartitioned;
+        lo := GREATEST(COALESCE(lo, hi - 1), hi - 50);
+        FOR y IN lo .. hi LOOP
+            PERFORM wvc_create_year_partition('{table}', y);
+        END LOOP;
+        CREATE TABLE {table}_default PARTITION OF {table} DEFAULT;
+
+        INSERT INTO {table} SELECT * FROM {table}_unpartitioned;
+        PERFORM setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT max(id) FROM {table}), 0) + 1, false);
+
+        DROP TABLE {table}_unpartitioned;
+        CREATE INDEX IF NOT EXISTS ix_{table}_{key} ON {table} ({key});
+    END $$;
+    """
+
+
+def _unpartition_table(table, key):
+    return f"""
+    DO $$
+    DECLARE
+        seq text := pg_get_serial_sequence('{table}', 'id');
+        fk record;
+    BEGIN
+        IF to_regclass('{table}') IS NULL
+           OR NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = '{table}'::regclass) THEN
+            RETURN;
+        END IF;
+
+        ALTER TABLE {table} RENAME TO {table}_partitioned;
+        -- Free the key / index names for the new table
+        DROP INDEX IF EXISTS ix_{table}_{key};
+        FOR fk IN
+            SELECT conname FROM pg_constraint
+            WHERE contype IN ('p', 'u') AND conrelid = '{table}_partitioned'::regclass
+        LOOP
+            EXECUTE format('ALTER TABLE {table}_partitioned RENAME CONSTRAINT %I TO %I', fk.conname, fk.conname || '_old');
+        END LOOP;
+        CREATE TABLE {table} (
+            LIKE {table}_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING IDENTITY
+        );
+        ALTER TABLE {table} ADD PRIMARY KEY (id);
+
+        FOR fk IN
+            SELECT conname, pg_get_constraintdef(oid) AS def FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = '{table}_partitioned'::regclass AND conparentid = 0
+        LOOP
+            EXECUTE format('ALTER TABLE {table} ADD CONSTRAINT %I %s', fk.conname, fk.def);
+        END LOOP;
+
+        IF seq IS NOT NULL THEN
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY {table}.id', seq);
+        END IF;
+
+        INSERT INTO {table} SELECT * FROM {table}_partitioned;
+        PERFORM setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT max(id) FROM {table}), 0) + 1, false);
+        DROP TABLE {table}_partitioned CASCADE;
+        CREATE INDEX IF NOT EXISTS ix_{table}_{key} ON {table} ({key});
+    END $$;
+    """
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(CREATE_PARTITION_FUNCTION)
+    op.execute(CREATE_ENSURE_FUNCTION)
+    for table, (key, key_nullable) in PARTITIONED_TABLES.items():
+        op.execute(_partition_table(table, key, key_nullable))
+    # Incoming foreign-key columns lose their constraint; keep them indexed for joins / cascades
+    for child, column, _parent, _on_delete in INCOMING_FOREIGN_KEYS:
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{child}_{column} ON {child} ({column});")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, (key, _key_nullable) in PARTITIONED_TABLES.items():
+        op.execute(_unpartition_table(table, key))
+    for child, column, parent, on_delete in INCOMING_FOREIGN_KEYS:
+        op.execute(f"DROP INDEX IF EXISTS ix_{child}_{column};")
+        op.execute(
+            f"ALTER TABLE {child} ADD CONSTRAINT {child}_{column}_fkey "
+            f"FOREIGN KEY ({column}) REFERENCES {parent}(id) ON DELETE {on_delete};"
+        )
+    op.execute("DROP FUNCTION IF EXISTS wvc_ensure_year_partitions(int);")
+    op.execute("DROP FUNCTION IF EXISTS wvc_create_year_partition(text, int);")
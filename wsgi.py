@@ -0,0 +1,42 @@
+"""
+Production entry point.
+
+    gunicorn wsgi:app                 # settings come from gunicorn.conf.py
+    python wsgi.py                    # waitress fallback (e.g. Windows, where gunicorn does not run)
+
+`run.py` stays the development server (`python run.py`, debug on).
+
+With WARM_UP on (the default) the app is warmed up here, before it serves anything: under
+gunicorn's preload_app that happens once in the master and the workers inherit it. Pool
+connections are opened per worker (gunicorn.conf.py post_worker_init) or in serve().
+"""
+import os
+
+from app import create_app
+from app.extensions import db
+from app.perf.startup import warm_up, warm_up_pool
+
+app = create_app()
+if app.config["WARM_UP"]:
+    warm_up(app)
+
+
+def serve():
+    """Serve with waitress: one process, WAITRESS_THREADS threads (default 8)."""
+    from waitress import serve as waitress_serve
+
+    if app.config["WARM_UP"]:
+        warm_up_pool(app, db)
+    waitress_serve(
+        app,
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8000")),
+        threads=int(os.environ.get("WAITRESS_THREADS", "8")),
+        connection_limit=int(os.environ.get("WAITRESS_CONNECTION_LIMIT", "100")),
+        channel_timeout=int(os.environ.get("WAITRESS_CHANNEL_TIMEOUT", "120")),
+        ident="wvc",
+    )
+
+
+if __name__ == "__main__":
+    serve()